@@ -28,5 +28,5 @@ __license__ = "Apache License, Version 2.0"
 from . import system
 from . import test
 
-from .system import Authentication
+from .system import Authentication, AuthenticationCache
 from .test import AuthenticationTest
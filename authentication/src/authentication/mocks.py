@@ -28,6 +28,8 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import colony
+
 
 class MockPlugin(object):
     def __init__(self):
@@ -40,11 +42,13 @@ class MockAuthHandler(object):
         self.return_value = {"valid": False}
         self.raise_exception = False
         self.exception = None
+        self.calls = 0
 
     def get_handler_name(self):
         return self.handler_name
 
     def handle_request(self, request):
+        self.calls += 1
         if self.raise_exception:
             raise self.exception
         return self.return_value
@@ -54,3 +58,9 @@ class MockAuthException(Exception):
     def __init__(self, message):
         self.message = message
         super(MockAuthException, self).__init__(message)
+
+
+class MockAuthError(colony.ColonyException):
+    def __init__(self, message):
+        colony.ColonyException.__init__(self, message)
+        self.message = message
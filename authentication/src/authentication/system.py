@@ -28,8 +28,14 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import os
 import sys
+import hmac
+import time
+import hashlib
+import threading
 import traceback
+import collections
 
 import colony
 
@@ -54,12 +60,44 @@ TRACEBACK_VALUE = "traceback"
 NO_AUTHENTICATION_METHOD_MESSAGE = "no authentication method found"
 """ The no authentication method found message """
 
+DEFAULT_CACHE_TTL = 60.0
+""" The default amount of seconds for which a successful
+authentication result is kept in cache, a zero value
+disables the caching of authentication results """
+
+DEFAULT_CACHE_NEGATIVE_TTL = 5.0
+""" The default amount of seconds for which a failed
+authentication result is kept in cache (negative caching),
+a zero value disables the caching of failures """
+
+DEFAULT_CACHE_SIZE = 4096
+""" The default maximum number of entries in the cache of
+authentication results, the least recently used entries
+are evicted once this limit is reached """
+
 
 class Authentication(colony.System):
     """
     The authentication class.
     """
 
+    cache = None
+    """ The cache of authentication results, used to avoid
+    the dispatching of repeated authentication requests to
+    the (possibly remote) authentication handlers """
+
+    def __init__(self, plugin):
+        colony.System.__init__(self, plugin)
+        self.cache = AuthenticationCache(
+            ttl=colony.conf("AUTHENTICATION_CACHE_TTL", DEFAULT_CACHE_TTL, cast=float),
+            negative_ttl=colony.conf(
+                "AUTHENTICATION_CACHE_NEGATIVE_TTL",
+                DEFAULT_CACHE_NEGATIVE_TTL,
+                cast=float,
+            ),
+            size=colony.conf("AUTHENTICATION_CACHE_SIZE", DEFAULT_CACHE_SIZE, cast=int),
+        )
+
     def authenticate_user(self, username, password, authentication_handler, arguments):
         """
         Authenticates a user in the general service.
@@ -92,6 +130,14 @@ class Authentication(colony.System):
         # sets the arguments in the authentication request
         authentication_request.set_arguments(arguments)
 
+        # tries to retrieve a previous result for the same credentials
+        # from the cache, avoiding the dispatching of the request
+        return_value = self.cache.get(
+            username, password, authentication_handler, arguments
+        )
+        if return_value:
+            return return_value
+
         # iterates over all the authentication handler plugins
         for authentication_handler_plugin in self.plugin.authentication_handler_plugins:
             # retrieves the authentication handler plugin handler name
@@ -110,11 +156,23 @@ class Authentication(colony.System):
                 return_value = authentication_handler_plugin.handle_request(
                     authentication_request
                 )
-            except Exception as exception:
+            except colony.ColonyException as exception:
                 # retrieves the exception map for the exception
                 # and then sets the return value to invalid
                 exception_map = self.get_exception_map(exception)
                 return_value = {VALID_VALUE: False, EXCEPTION_VALUE: exception_map}
+            except Exception as exception:
+                # retrieves the exception map for the (unexpected) exception
+                # and returns the invalid value without caching it, as the
+                # failure may be caused by a transient problem (eg: network)
+                exception_map = self.get_exception_map(exception)
+                return {VALID_VALUE: False, EXCEPTION_VALUE: exception_map}
+
+            # stores the return value in the cache so that further
+            # requests with the same credentials are not dispatched
+            self.cache.set(
+                username, password, authentication_handler, arguments, return_value
+            )
 
             # returns the return value
             return return_value
@@ -129,6 +187,28 @@ class Authentication(colony.System):
         # returns return value
         return return_value
 
+    def invalidate_user(self, username, authentication_handler=None):
+        """
+        Invalidates the cached authentication results for the
+        user with the given username, should be called whenever
+        the credentials of the user are changed or revoked.
+
+        :type username: String
+        :param username: The username of the user to be invalidated.
+        :type authentication_handler: String
+        :param authentication_handler: The authentication handler to
+        restrict the invalidation to, if not provided all of them are used.
+        """
+
+        self.cache.invalidate(username, authentication_handler=authentication_handler)
+
+    def clear_cache(self):
+        """
+        Clears the complete cache of authentication results.
+        """
+
+        self.cache.clear()
+
     def process_authentication_string(self, authentication_string):
         """
         Processes the given authentication string.
@@ -218,6 +298,180 @@ class Authentication(colony.System):
         return exception_map
 
 
+class AuthenticationCache(object):
+    """
+    The authentication cache class, that stores the results of
+    the authentication requests for a bounded amount of time.
+
+    Entries are indexed by handler, username and arguments and
+    store a salted digest of the password, so that the password
+    itself is never kept in memory by the cache.
+    """
+
+    ttl = None
+    """ The amount of seconds for which a valid result is cached """
+
+    negative_ttl = None
+    """ The amount of seconds for which an invalid result is cached """
+
+    size = None
+    """ The maximum number of entries to be stored in the cache """
+
+    entries = None
+    """ The ordered map of entries, ordered from the least recently
+    used to the most recently used entry (eviction order) """
+
+    salt = None
+    """ The random salt used in the digest of the passwords, unique
+    for each cache so that digests are not reusable """
+
+    lock = None
+    """ The lock that controls the access to the entries """
+
+    def __init__(
+        self,
+        ttl=DEFAULT_CACHE_TTL,
+        negative_ttl=DEFAULT_CACHE_NEGATIVE_TTL,
+        size=DEFAULT_CACHE_SIZE,
+    ):
+        """
+        Constructor of the class.
+
+        :type ttl: float
+        :param ttl: The amount of seconds for which a valid result is cached.
+        :type negative_ttl: float
+        :param negative_ttl: The amount of seconds for which an invalid
+        result is cached.
+        :type size: int
+        :param size: The maximum number of entries in the cache.
+        """
+
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.size = size
+        self.entries = collections.OrderedDict()
+        self.salt = os.urandom(16)
+        self.lock = threading.Lock()
+
+    def get(self, username, password, authentication_handler, arguments):
+        """
+        Retrieves the cached authentication result for the given
+        credentials, in case no valid entry exists none is returned.
+
+        :type username: String
+        :param username: The username to be used in the authentication.
+        :type password: String
+        :param password: The password to be used in the authentication.
+        :type authentication_handler: String
+        :param authentication_handler: The authentication handler.
+        :type arguments: Dictionary
+        :param arguments: The arguments to be used in the authentication.
+        :rtype: Dictionary
+        :return: The cached authentication result (copy) or none.
+        """
+
+        if not self.size:
+            return None
+        key = self._key(username, authentication_handler, arguments)
+        digest = self._digest(password)
+        self.lock.acquire()
+        try:
+            entry = self.entries.pop(key, None)
+            if not entry:
+                return None
+            entry_digest, return_value, expire_time = entry
+            if time.time() > expire_time:
+                return None
+            self.entries[key] = entry
+        finally:
+            self.lock.release()
+        if not hmac.compare_digest(entry_digest, digest):
+            return None
+        return dict(return_value)
+
+    def set(self, username, password, authentication_handler, arguments, return_value):
+        """
+        Stores the given authentication result in the cache for the
+        provided credentials, using the proper (negative) ttl.
+
+        :type username: String
+        :param username: The username used in the authentication.
+        :type password: String
+        :param password: The password used in the authentication.
+        :type authentication_handler: String
+        :param authentication_handler: The authentication handler.
+        :type arguments: Dictionary
+        :param arguments: The arguments used in the authentication.
+        :type return_value: Dictionary
+        :param return_value: The authentication result to be cached.
+        """
+
+        valid = return_value.get(VALID_VALUE, False)
+        ttl = self.ttl if valid else self.negative_ttl
+        if not self.size or not ttl:
+            return
+        key = self._key(username, authentication_handler, arguments)
+        entry = (self._digest(password), dict(return_value), time.time() + ttl)
+        self.lock.acquire()
+        try:
+            self.entries.pop(key, None)
+            self.entries[key] = entry
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+        finally:
+            self.lock.release()
+
+    def invalidate(self, username, authentication_handler=None):
+        """
+        Removes the entries associated with the given username
+        and optionally restricted to the given handler.
+
+        :type username: String
+        :param username: The username of the entries to be removed.
+        :type authentication_handler: String
+        :param authentication_handler: The authentication handler to
+        restrict the removal to.
+        """
+
+        self.lock.acquire()
+        try:
+            keys = [
+                key
+                for key in self.entries
+                if key[1] == username
+                and (authentication_handler == None or key[0] == authentication_handler)
+            ]
+            for key in keys:
+                del self.entries[key]
+        finally:
+            self.lock.release()
+
+    def clear(self):
+        """
+        Removes all the entries from the cache.
+        """
+
+        self.lock.acquire()
+        try:
+            self.entries.clear()
+        finally:
+            self.lock.release()
+
+    def _key(self, username, authentication_handler, arguments):
+        # creates a stable representation of the arguments, so that
+        # requests with the same arguments share the same entry
+        arguments_s = repr(sorted(colony.legacy.items(arguments or {})))
+        arguments_s = arguments_s.encode("utf-8")
+        arguments_h = hashlib.sha1(arguments_s).hexdigest()
+        return (authentication_handler, username, arguments_h)
+
+    def _digest(self, password):
+        if colony.legacy.is_unicode(password):
+            password = password.encode("utf-8")
+        password = password or b""
+        return hmac.new(self.salt, password, hashlib.sha256).digest()
+
+
 class AuthenticationRequest(object):
     """
     The authentication request class.
@@ -28,8 +28,12 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import time
+
 import colony
 
+import authentication_ldap
+
 from . import system
 from . import mocks
 
@@ -41,9 +45,15 @@ class AuthenticationTest(colony.Test):
     """
 
     def get_bundle(self):
+        # the authentication handlers test cases are run as part of
+        # the authentication bundle, as the handler plugins depend on
+        # client plugins that may not be available (eg: LDAP client)
+        # and the handlers are tested against mock clients anyway
         return (
             AuthenticationRequestTestCase,
             AuthenticationBaseTestCase,
+            AuthenticationCacheTestCase,
+            authentication_ldap.test.AuthenticationLDAPTestCase,
         )
 
     def set_up(self, test_case):
@@ -231,3 +241,117 @@ class AuthenticationBaseTestCase(colony.ColonyTestCase):
             exception_map = authentication.get_exception_map(e)
 
         self.assertNotEqual(exception_map.get("traceback"), None)
+
+
+class AuthenticationCacheTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Authentication Cache test case"
+
+    def setUp(self):
+        colony.ColonyTestCase.setUp(self)
+        self.handler = mocks.MockAuthHandler("python")
+        self.handler.return_value = {"valid": True, "username": "testuser"}
+        plugin = mocks.MockPlugin()
+        plugin.authentication_handler_plugins = [self.handler]
+        self.authentication = system.Authentication(plugin)
+
+    def test_cache_hit(self):
+        for _index in range(3):
+            result = self.authentication.authenticate_user(
+                "testuser", "testpass", "python", {"key": "value"}
+            )
+            self.assertEqual(result["valid"], True)
+            self.assertEqual(result["username"], "testuser")
+
+        self.assertEqual(self.handler.calls, 1)
+
+    def test_cache_password(self):
+        self.authentication.authenticate_user("testuser", "testpass", "python", {})
+        self.authentication.authenticate_user("testuser", "otherpass", "python", {})
+        self.authentication.authenticate_user("testuser", "otherpass", "python", {})
+
+        self.assertEqual(self.handler.calls, 2)
+
+    def test_cache_arguments(self):
+        self.authentication.authenticate_user(
+            "testuser", "testpass", "python", {"key": "value"}
+        )
+        self.authentication.authenticate_user(
+            "testuser", "testpass", "python", {"key": "other"}
+        )
+
+        self.assertEqual(self.handler.calls, 2)
+
+    def test_cache_negative(self):
+        self.handler.raise_exception = True
+        self.handler.exception = mocks.MockAuthError("password mismatch")
+
+        for _index in range(3):
+            result = self.authentication.authenticate_user(
+                "testuser", "testpass", "python", {}
+            )
+            self.assertEqual(result["valid"], False)
+
+        self.assertEqual(self.handler.calls, 1)
+
+    def test_cache_unexpected(self):
+        self.handler.raise_exception = True
+        self.handler.exception = mocks.MockAuthException("connection refused")
+
+        self.authentication.authenticate_user("testuser", "testpass", "python", {})
+        self.authentication.authenticate_user("testuser", "testpass", "python", {})
+
+        self.assertEqual(self.handler.calls, 2)
+
+    def test_cache_expire(self):
+        self.authentication.cache.ttl = 0.05
+
+        self.authentication.authenticate_user("testuser", "testpass", "python", {})
+        time.sleep(0.1)
+        self.authentication.authenticate_user("testuser", "testpass", "python", {})
+
+        self.assertEqual(self.handler.calls, 2)
+
+    def test_cache_size(self):
+        self.authentication.cache.size = 2
+
+        self.authentication.authenticate_user("user1", "testpass", "python", {})
+        self.authentication.authenticate_user("user2", "testpass", "python", {})
+        self.authentication.authenticate_user("user1", "testpass", "python", {})
+        self.authentication.authenticate_user("user3", "testpass", "python", {})
+
+        self.assertEqual(len(self.authentication.cache.entries), 2)
+        self.assertEqual(self.handler.calls, 3)
+
+        # the least recently used entry (user2) must have been
+        # evicted while the recently used one (user1) is kept
+        self.authentication.authenticate_user("user1", "testpass", "python", {})
+        self.assertEqual(self.handler.calls, 3)
+        self.authentication.authenticate_user("user2", "testpass", "python", {})
+        self.assertEqual(self.handler.calls, 4)
+
+    def test_invalidate_user(self):
+        self.authentication.authenticate_user("user1", "testpass", "python", {})
+        self.authentication.authenticate_user("user2", "testpass", "python", {})
+
+        self.authentication.invalidate_user("user1")
+
+        self.authentication.authenticate_user("user1", "testpass", "python", {})
+        self.authentication.authenticate_user("user2", "testpass", "python", {})
+
+        self.assertEqual(self.handler.calls, 3)
+
+        self.authentication.clear_cache()
+
+        self.authentication.authenticate_user("user2", "testpass", "python", {})
+
+        self.assertEqual(self.handler.calls, 4)
+
+    def test_cache_disabled(self):
+        self.authentication.cache.ttl = 0
+
+        self.authentication.authenticate_user("testuser", "testpass", "python", {})
+        self.authentication.authenticate_user("testuser", "testpass", "python", {})
+
+        self.assertEqual(self.handler.calls, 2)
@@ -27,6 +27,7 @@ __license__ = "Apache License, Version 2.0"
 
 from . import exceptions
 from . import system
+from . import test
 
 from .exceptions import AuthenticationLDAPHandlerException, AuthenticationError
 from .system import AuthenticationLDAP
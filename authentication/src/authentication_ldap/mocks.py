@@ -0,0 +1,97 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import socket
+
+
+class MockPlugin(object):
+    def __init__(self):
+        self.client_ldap_plugin = MockClientLDAPPlugin()
+
+
+class MockClientLDAPPlugin(object):
+    def __init__(self):
+        self.clients = []
+        self.user_password = None
+        self.errors = []
+
+    def create_client(self, parameters):
+        # creates the client assigning it the next pending error (if
+        # any) so that its search operation fails with it
+        error = self.errors.pop(0) if self.errors else None
+        client = MockLDAPClient(self.user_password, error=error)
+        self.clients.append(client)
+        return client
+
+
+class MockLDAPClient(object):
+    def __init__(self, user_password, error=None):
+        self.user_password = user_password
+        self.error = error
+        self.opened = False
+        self.connected = False
+        self.searches = 0
+
+    def open(self, parameters):
+        self.opened = True
+
+    def close(self, parameters):
+        self.opened = False
+
+    def connect(self, host, name=None, password=None):
+        self.connected = True
+
+    def disconnect(self):
+        if not self.connected:
+            raise socket.error("not connected")
+        self.connected = False
+
+    def search(self, search_dn, username, password):
+        self.searches += 1
+        if self.error:
+            raise self.error
+        return self.user_password
+
+
+class MockRequest(object):
+    def __init__(self, username, password, arguments):
+        self.username = username
+        self.password = password
+        self.arguments = arguments
+
+    def get_username(self):
+        return self.username
+
+    def get_password(self):
+        return self.password
+
+    def get_arguments(self):
+        return self.arguments
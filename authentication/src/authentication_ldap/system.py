@@ -29,8 +29,11 @@ __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
 import re
+import time
 import base64
+import socket
 import hashlib
+import threading
 
 import colony
 
@@ -81,12 +84,39 @@ PASSWORD_VALUE_REGEX = re.compile(PASSWORD_VALUE_REGEX_VALUE)
 MD5_CRYPT_SALT_VALUE_REGEX = re.compile(MD5_CRYPT_SALT_VALUE_REGEX_VALUE)
 """ The MD5 crypt salt value regex """
 
+DEFAULT_POOL_SIZE = 4
+""" The default maximum number of idle (already bound) LDAP
+clients kept in the pool for each server and root dn """
+
+DEFAULT_POOL_IDLE = 300.0
+""" The default amount of seconds a pooled LDAP client may
+remain idle before being considered stale and replaced by
+a new connection (avoids server side idle timeouts) """
+
+CONNECTION_ERRORS = (socket.error, IOError, EOFError)
+""" The sequence of exception types that are considered to
+be the result of a broken connection, a pooled client failing
+with one of them is replaced and the request retried """
+
 
 class AuthenticationLDAP(colony.System):
     """
     The authentication LDAP class.
     """
 
+    pools = None
+    """ The map associating the connection key (host, root dn and
+    root password) with the list of idle bound clients and the
+    timestamp of their last usage """
+
+    pools_lock = None
+    """ The lock that controls the access to the pools map """
+
+    def __init__(self, plugin):
+        colony.System.__init__(self, plugin)
+        self.pools = {}
+        self.pools_lock = threading.Lock()
+
     def get_handler_name(self):
         """
         Retrieves the handler name.
@@ -105,9 +135,6 @@ class AuthenticationLDAP(colony.System):
         :param request: The authentication request to be handled.
         """
 
-        # retrieves the client LDAP plugin
-        client_ldap_plugin = self.plugin.client_ldap_plugin
-
         # retrieves the request username
         username = request.get_username()
 
@@ -136,67 +163,176 @@ class AuthenticationLDAP(colony.System):
                 "an username and a password must be provided"
             )
 
-        # creates a new LDAP client
-        ldap_client = client_ldap_plugin.create_client({})
+        # creates the key that identifies the pool of (bound) clients
+        # to be used for the current server and root credentials
+        key = (host, root_dn, root_password)
 
-        # opens the LDAP client
-        ldap_client.open({})
+        # retrieves an already bound LDAP client from the pool, or
+        # creates (and binds) a new one in case none is available
+        ldap_client, pooled = self._acquire_client(key)
 
         try:
-            # connects the LDAP client
-            ldap_client.connect(host, name=root_dn, password=root_password)
-
             # retrieves the user password searching in the LDAP client
             user_password = ldap_client.search(search_dn, username, password)
+        except CONNECTION_ERRORS:
+            # discards the failed client as its connection is no longer
+            # considered healthy, then in case it was a pooled one (may
+            # have been closed by the server) retries with a new client
+            self._discard_client(ldap_client)
+            if not pooled:
+                raise
+            ldap_client = self._create_client(key)
+            try:
+                user_password = ldap_client.search(search_dn, username, password)
+            except Exception:
+                self._discard_client(ldap_client)
+                raise
+        except Exception:
+            # any other error (eg: invalid search) is not related with
+            # the connection and so the request is not retried, the client
+            # is discarded anyway as its protocol state is unknown
+            self._discard_client(ldap_client)
+            raise
+
+        # returns the (healthy) client to the pool so that it may
+        # be re-used by the next authentication request
+        self._release_client(key, ldap_client)
+
+        # tries to match the user password
+        user_password_match = PASSWORD_VALUE_REGEX.match(user_password)
+
+        # retrieves the user password hash and value
+        user_password_hash = user_password_match.group(HASH_VALUE)
+        user_password_value = user_password_match.group(VALUE_VALUE)
+
+        # converts the user password hash to lower case
+        user_password_hash_lower = user_password_hash.lower()
+
+        # in case the user password hash is of type MD5 crypt
+        if user_password_hash_lower == MD5_CRYPT_VALUE:
+            # processes the password using MD5 crypt
+            processed_password_value = self._process_password_md5_crypt(
+                password, user_password_value
+            )
+        # in case the user password hash is of type SSHA
+        elif user_password_hash_lower == SSHA_VALUE:
+            # processes the password using SSHA
+            processed_password_value = self._process_password_ssha(
+                password, user_password_value
+            )
+        # otherwise it must be a "normal" hash
+        else:
+            # processes the password using hash
+            processed_password_value = self._process_password_hash(
+                password, user_password_hash_lower
+            )
 
-            # tries to match the user password
-            user_password_match = PASSWORD_VALUE_REGEX.match(user_password)
-
-            # retrieves the user password hash and value
-            user_password_hash = user_password_match.group(HASH_VALUE)
-            user_password_value = user_password_match.group(VALUE_VALUE)
-
-            # converts the user password hash to lower case
-            user_password_hash_lower = user_password_hash.lower()
-
-            # in case the user password hash is of type MD5 crypt
-            if user_password_hash_lower == MD5_CRYPT_VALUE:
-                # processes the password using MD5 crypt
-                processed_password_value = self._process_password_md5_crypt(
-                    password, user_password_value
-                )
-            # in case the user password hash is of type SSHA
-            elif user_password_hash_lower == SSHA_VALUE:
-                # processes the password using SSHA
-                processed_password_value = self._process_password_ssha(
-                    password, user_password_value
-                )
-            # otherwise it must be a "normal" hash
-            else:
-                # processes the password using hash
-                processed_password_value = self._process_password_hash(
-                    password, user_password_hash_lower
-                )
-
-            # in case the processed password value and
-            # the user password value are equal
-            if processed_password_value == user_password_value:
-                # creates the return value
-                return_value = {VALID_VALUE: True, USERNAME_VALUE: username}
-            # otherwise there is an error in authentication
-            else:
-                # raises the authentication error
-                raise exceptions.AuthenticationError("password mismatch")
-
-            # disconnects from the LDAP client
-            ldap_client.disconnect()
-        finally:
-            # closes the LDAP client
-            ldap_client.close({})
+        # in case the processed password value and
+        # the user password value are equal
+        if processed_password_value == user_password_value:
+            # creates the return value
+            return_value = {VALID_VALUE: True, USERNAME_VALUE: username}
+        # otherwise there is an error in authentication
+        else:
+            # raises the authentication error
+            raise exceptions.AuthenticationError("password mismatch")
 
         # returns the return value
         return return_value
 
+    def close_clients(self):
+        """
+        Closes all the pooled LDAP clients, should be called
+        upon the unloading of the plugin.
+        """
+
+        self.pools_lock.acquire()
+        try:
+            pools = self.pools
+            self.pools = {}
+        finally:
+            self.pools_lock.release()
+
+        for pool in colony.legacy.values(pools):
+            for ldap_client, _timestamp in pool:
+                self._discard_client(ldap_client)
+
+    def _acquire_client(self, key):
+        # retrieves the maximum idle time for the pooled clients, the
+        # ones that exceeded it are considered stale and discarded
+        pool_idle = colony.conf("LDAP_POOL_IDLE", DEFAULT_POOL_IDLE, cast=float)
+        current = time.time()
+        stale = []
+
+        self.pools_lock.acquire()
+        try:
+            pool = self.pools.get(key, [])
+            ldap_client = None
+            while pool:
+                _ldap_client, timestamp = pool.pop()
+                if current - timestamp > pool_idle:
+                    stale.append(_ldap_client)
+                    continue
+                ldap_client = _ldap_client
+                break
+        finally:
+            self.pools_lock.release()
+
+        for _ldap_client in stale:
+            self._discard_client(_ldap_client)
+
+        if ldap_client:
+            return ldap_client, True
+        return self._create_client(key), False
+
+    def _release_client(self, key, ldap_client):
+        pool_size = colony.conf("LDAP_POOL_SIZE", DEFAULT_POOL_SIZE, cast=int)
+
+        self.pools_lock.acquire()
+        try:
+            pool = self.pools.setdefault(key, [])
+            pooled = len(pool) < pool_size
+            pooled and pool.append((ldap_client, time.time()))
+        finally:
+            self.pools_lock.release()
+
+        if not pooled:
+            self._discard_client(ldap_client)
+
+    def _create_client(self, key):
+        # unpacks the key into the connection parameters
+        host, root_dn, root_password = key
+
+        # retrieves the client LDAP plugin
+        client_ldap_plugin = self.plugin.client_ldap_plugin
+
+        # creates a new LDAP client and opens it
+        ldap_client = client_ldap_plugin.create_client({})
+        ldap_client.open({})
+
+        try:
+            # connects the LDAP client binding it with the root
+            # credentials (this is the expensive operation)
+            ldap_client.connect(host, name=root_dn, password=root_password)
+        except Exception:
+            ldap_client.close({})
+            raise
+
+        # returns the (bound) LDAP client
+        return ldap_client
+
+    def _discard_client(self, ldap_client):
+        # tries to disconnect the client, ignoring any failure as the
+        # connection may already be broken, and then closes it
+        try:
+            ldap_client.disconnect()
+        except Exception:
+            pass
+        try:
+            ldap_client.close({})
+        except Exception:
+            pass
+
     def _process_password_md5_crypt(self, password, user_password_value):
         # matches the user password value against the
         # MD5 crypt salt value regex
@@ -0,0 +1,175 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import time
+import socket
+
+import colony
+
+from . import mocks
+from . import system
+
+USER_PASSWORD = "{crypt}$1$salt$ez2vlPGdaLYkJam5pWs/Y1"
+""" The user password as stored in the LDAP server, corresponds
+to the MD5 crypt of the "secret" password using "salt" """
+
+ARGUMENTS = dict(
+    root_dn="cn=admin,dc=hive,dc=pt",
+    root_password="admin",
+    host="localhost",
+    search_dn="ou=users,dc=hive,dc=pt",
+)
+""" The arguments (connection settings) used in the requests """
+
+KEY = ("localhost", "cn=admin,dc=hive,dc=pt", "admin")
+""" The pool key that is associated with the arguments """
+
+
+class AuthenticationLDAPTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Authentication LDAP test case"
+
+    def setUp(self):
+        colony.ColonyTestCase.setUp(self)
+        self.plugin = mocks.MockPlugin()
+        self.plugin.client_ldap_plugin.user_password = USER_PASSWORD
+        self.authentication = system.AuthenticationLDAP(self.plugin)
+
+    def tearDown(self):
+        colony.conf_r("LDAP_POOL_SIZE")
+        colony.conf_r("LDAP_POOL_IDLE")
+
+    def test_handle_request(self):
+        request = mocks.MockRequest("user", "secret", ARGUMENTS)
+        result = self.authentication.handle_request(request)
+        self.assertEqual(result, dict(valid=True, username="user"))
+
+        # runs a second request and verifies that the previously bound
+        # client is re-used instead of a new one being created
+        result = self.authentication.handle_request(request)
+        self.assertEqual(result, dict(valid=True, username="user"))
+        clients = self.plugin.client_ldap_plugin.clients
+        self.assertEqual(len(clients), 1)
+        self.assertEqual(clients[0].searches, 2)
+        self.assertEqual(len(self.authentication.pools[KEY]), 1)
+
+        request = mocks.MockRequest("user", "invalid", ARGUMENTS)
+        self.assertRaises(
+            system.exceptions.AuthenticationError,
+            self.authentication.handle_request,
+            request,
+        )
+
+    def test_acquire_client(self):
+        ldap_client, pooled = self.authentication._acquire_client(KEY)
+        self.assertEqual(pooled, False)
+        self.assertEqual(ldap_client.connected, True)
+        self.authentication._release_client(KEY, ldap_client)
+
+        _ldap_client, pooled = self.authentication._acquire_client(KEY)
+        self.assertEqual(pooled, True)
+        self.assertEqual(_ldap_client, ldap_client)
+        self.authentication._release_client(KEY, ldap_client)
+
+        # ages the pooled client beyond the idle limit and verifies that
+        # it's discarded as stale and that a new client is created
+        colony.conf_s("LDAP_POOL_IDLE", 10.0)
+        self.authentication.pools[KEY] = [(ldap_client, time.time() - 20.0)]
+        _ldap_client, pooled = self.authentication._acquire_client(KEY)
+        self.assertEqual(pooled, False)
+        self.assertNotEqual(_ldap_client, ldap_client)
+        self.assertEqual(ldap_client.connected, False)
+        self.assertEqual(ldap_client.opened, False)
+        self.assertEqual(self.authentication.pools[KEY], [])
+
+    def test_release_client(self):
+        colony.conf_s("LDAP_POOL_SIZE", 2)
+        ldap_clients = [
+            self.authentication._acquire_client(KEY)[0] for _index in range(3)
+        ]
+        for ldap_client in ldap_clients:
+            self.authentication._release_client(KEY, ldap_client)
+
+        # verifies that only the pool size clients are kept and that
+        # the one in excess is disconnected and closed
+        pool = self.authentication.pools[KEY]
+        self.assertEqual(
+            [ldap_client for ldap_client, _timestamp in pool], ldap_clients[:2]
+        )
+        self.assertEqual(ldap_clients[2].connected, False)
+        self.assertEqual(ldap_clients[2].opened, False)
+
+    def test_retry(self):
+        request = mocks.MockRequest("user", "secret", ARGUMENTS)
+        ldap_client, _pooled = self.authentication._acquire_client(KEY)
+        self.authentication._release_client(KEY, ldap_client)
+
+        # breaks the connection of the pooled client and verifies that the
+        # request is retried with a new client that is then pooled
+        ldap_client.error = socket.error("connection reset")
+        result = self.authentication.handle_request(request)
+        self.assertEqual(result, dict(valid=True, username="user"))
+        clients = self.plugin.client_ldap_plugin.clients
+        self.assertEqual(len(clients), 2)
+        self.assertEqual(ldap_client.connected, False)
+        self.assertEqual(
+            self.authentication.pools[KEY],
+            [(clients[1], self.authentication.pools[KEY][0][1])],
+        )
+
+        # makes the search fail with an error not related with the
+        # connection and verifies that there's no retry
+        clients[1].error = ValueError("invalid search")
+        self.assertRaises(ValueError, self.authentication.handle_request, request)
+        self.assertEqual(len(clients), 2)
+        self.assertEqual(clients[1].connected, False)
+        self.assertEqual(self.authentication.pools[KEY], [])
+
+        # verifies that a connection error in a new (non pooled) client
+        # is raised as there's no reason to believe a retry would work
+        self.plugin.client_ldap_plugin.errors.append(socket.error("refused"))
+        self.assertRaises(socket.error, self.authentication.handle_request, request)
+        self.assertEqual(len(clients), 3)
+        self.assertEqual(self.authentication.pools[KEY], [])
+
+    def test_close_clients(self):
+        ldap_clients = [
+            self.authentication._acquire_client(KEY)[0] for _index in range(2)
+        ]
+        for ldap_client in ldap_clients:
+            self.authentication._release_client(KEY, ldap_client)
+
+        self.authentication.close_clients()
+        self.assertEqual(self.authentication.pools, {})
+        for ldap_client in ldap_clients:
+            self.assertEqual(ldap_client.connected, False)
+            self.assertEqual(ldap_client.opened, False)
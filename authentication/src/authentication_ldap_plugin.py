@@ -52,6 +52,10 @@ class AuthenticationLDAPPlugin(colony.Plugin):
 
         self.system = authentication_ldap.AuthenticationLDAP(self)
 
+    def unload_plugin(self):
+        colony.Plugin.unload_plugin(self)
+        self.system.close_clients()
+
     def get_handler_name(self):
         return self.system.get_handler_name()
 
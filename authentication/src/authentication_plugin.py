@@ -60,3 +60,11 @@ class AuthenticationPlugin(colony.Plugin):
 
     def process_authentication_string(self, authentication_string):
         return self.system.process_authentication_string(authentication_string)
+
+    def invalidate_user(self, username, authentication_handler=None):
+        return self.system.invalidate_user(
+            username, authentication_handler=authentication_handler
+        )
+
+    def clear_cache(self):
+        return self.system.clear_cache()
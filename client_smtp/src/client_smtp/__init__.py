@@ -27,11 +27,14 @@ __license__ = "Apache License, Version 2.0"
 
 from . import exceptions
 from . import system
+from . import test
 
 from .exceptions import (
     ClientSMTPException,
     SMTPRuntimeException,
     SMTPInvalidDataException,
     SMTPResponseError,
+    SMTPPipelineError,
 )
 from .system import ClientSMTP
+from .test import ClientSMTPTest
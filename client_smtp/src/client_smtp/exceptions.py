@@ -117,3 +117,31 @@ class SMTPResponseError(SMTPRuntimeException):
         """
 
         return "SMTP response error - %s" % self.message
+
+
+class SMTPPipelineError(SMTPRuntimeException):
+    """
+    The SMTP pipeline error, raised when a pipelined command is
+    refused after the server already accepted the data command,
+    leaving the session in the middle of the data transaction.
+    """
+
+    def __init__(self, message):
+        """
+        Constructor of the class.
+
+        :type message: String
+        :param message: The message to be printed.
+        """
+
+        SMTPRuntimeException.__init__(self, message)
+
+    def __str__(self):
+        """
+        Returns the string representation of the class.
+
+        :rtype: String
+        :return: The string representation of the class.
+        """
+
+        return "SMTP pipeline error - %s" % self.message
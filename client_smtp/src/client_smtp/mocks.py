@@ -0,0 +1,178 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import threading
+
+
+class MockPlugin(object):
+    def __init__(self, server):
+        self.client_utils_plugin = MockClientUtilsPlugin(server)
+
+
+class MockClientUtilsPlugin(object):
+    def __init__(self, server):
+        self.server = server
+
+    def generate_client(self, parameters):
+        return MockClient(self.server)
+
+
+class MockClient(object):
+    def __init__(self, server):
+        self.server = server
+
+    def start_client(self):
+        pass
+
+    def stop_client(self):
+        pass
+
+    def get_client_connection(self, connection_parameters):
+        return self.server.connect()
+
+
+class MockServer(object):
+    """
+    The fake SMTP server (relay), that replies to the commands
+    sent by the connections and keeps the statistics of the
+    commands, messages and connections.
+    """
+
+    def __init__(self, pipelining=True, lenient=False, chunk_size=None):
+        self.pipelining = pipelining
+        self.lenient = lenient
+        self.chunk_size = chunk_size
+        self.commands = []
+        self.messages = []
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def connect(self):
+        connection = MockConnection(self)
+        self.lock.acquire()
+        try:
+            self.connections.append(connection)
+        finally:
+            self.lock.release()
+        return connection
+
+    def count(self, command):
+        return self.commands.count(command)
+
+
+class MockConnection(object):
+    def __init__(self, server):
+        self.server = server
+        self.pending = [b"220 mock.relay.com ready\r\n"]
+        self.sends = []
+        self.closed = False
+        self.broken = False
+        self.returned = []
+        self._data = None
+        self._sender = False
+        self._recipients = 0
+
+    def send(self, data):
+        self.sends.append(data)
+        for line in data.split("\r\n")[:-1]:
+            if self._data == None:
+                self._command(line)
+            elif line == ".":
+                self._deliver()
+            else:
+                self._data.append(line)
+
+    def receive(self, timeout=None, size=None):
+        if self.broken:
+            return b""
+        data = b"".join(self.pending)
+        chunk_size = self.server.chunk_size or len(data)
+        self.pending = [data[chunk_size:]] if data[chunk_size:] else []
+        return data[:chunk_size]
+
+    def return_data(self, data):
+        self.returned.append(data)
+        self.pending.insert(0, data)
+
+    def close(self):
+        self.closed = True
+
+    def _command(self, line):
+        command = line.split(" ", 1)[0].lower()
+        self.server.lock.acquire()
+        try:
+            self.server.commands.append(command)
+        finally:
+            self.server.lock.release()
+
+        if command == "ehlo":
+            if self.server.pipelining:
+                self._reply(b"250-mock.relay.com\r\n250-PIPELINING\r\n250 SIZE 1024")
+            else:
+                self._reply(b"250 mock.relay.com")
+        elif command == "mail":
+            self._sender = not "refused" in line
+            self._reply(b"250 ok" if self._sender else b"550 sender refused")
+        elif command == "rcpt":
+            accepted = not "refused" in line
+            self._recipients += 1 if accepted else 0
+            self._reply(b"250 ok" if accepted else b"550 no such user")
+        elif command == "data":
+            valid = self._sender and self._recipients
+            if valid or self.server.lenient:
+                self._data = []
+                self._reply(b"354 start mail input")
+            else:
+                self._reply(b"554 no valid recipients")
+        elif command == "rset":
+            self._reset()
+            self._reply(b"250 ok")
+        elif command == "quit":
+            self._reply(b"221 bye")
+        else:
+            self._reply(b"250 ok")
+
+    def _deliver(self):
+        self.server.lock.acquire()
+        try:
+            self.server.messages.append("\r\n".join(self._data))
+        finally:
+            self.server.lock.release()
+        self._reset()
+        self._reply(b"250 queued")
+
+    def _reset(self):
+        self._data = None
+        self._sender = False
+        self._recipients = 0
+
+    def _reply(self, message):
+        self.pending.append(message + b"\r\n")
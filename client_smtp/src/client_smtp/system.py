@@ -50,6 +50,10 @@ DEFAULT_SOCKET_PARAMETERS = {}
 DEFAULT_AUTHENTICATION_METHOD = "plain"
 """ The default authentication method """
 
+DEFAULT_WORKERS = 1
+""" The default number of workers (sessions) to be used
+in the parallel delivery of a batch of messages """
+
 REQUEST_TIMEOUT = 60
 """ The request timeout """
 
@@ -68,6 +72,10 @@ END_TOKEN_VALUE = b"\r\n"
 AUTHENTICATION_METHOD_VALUE = "authentication_method"
 """ The authentication method value """
 
+PIPELINING_VALUE = b"PIPELINING"
+""" The name of the extension that allows the sending of
+multiple commands without waiting for each response """
+
 
 class ClientSMTP(colony.System):
     """
@@ -115,6 +123,18 @@ class SMTPClient(object):
     _smtp_client_lock = None
     """ Lock to control the fetching of the queries """
 
+    _parameters = None
+    """ The parameters used in the opening of the client, re-used
+    in the creation of the worker clients (parallel delivery) """
+
+    _session = None
+    """ The currently open (and authenticated) SMTP session, that
+    is kept across messages when the keep alive mode is used """
+
+    _session_key = None
+    """ The key (connection parameters and credentials) that
+    identifies the currently open SMTP session """
+
     def __init__(self, client_smtp):
         """
         Constructor of the class.
@@ -133,6 +153,9 @@ class SMTPClient(object):
         self._smtp_client_lock = threading.RLock()
 
     def open(self, parameters):
+        # stores the parameters for latter usage (worker clients)
+        self._parameters = parameters
+
         # generates the parameters
         client_parameters = self._generate_client_parameters(parameters)
 
@@ -145,6 +168,14 @@ class SMTPClient(object):
         self._smtp_client.start_client()
 
     def close(self, parameters):
+        # in case there's a persistent session still open, tries
+        # to finish it gracefully (quit) before stopping the client
+        if self._session:
+            try:
+                self._close_session(parameters)
+            except Exception:
+                pass
+
         # stops the SMTP client
         self._smtp_client.stop_client()
 
@@ -163,69 +194,147 @@ class SMTPClient(object):
         # defines the connection parameters
         connection_parameters = (host, port, persistent, socket_name, socket_parameters)
 
-        # retrieves the corresponding (SMTP) client connection
-        self.client_connection = self._smtp_client.get_client_connection(
-            connection_parameters
-        )
+        # retrieves the keep alive flag, that controls if the (authenticated)
+        # session should be kept open to be re-used by the next messages
+        keep_alive = parameters.get("keep_alive", False)
 
         # acquires the SMTP client lock
         self._smtp_client_lock.acquire()
 
         try:
-            # creates the session object
-            session = SMTPSession()
-
-            # runs the initial login process and
-            # then runs the initial ehlo command
-            self.login(session, parameters)
-            self.ehlo(session, parameters)
-
-            # retrieves the use TLS flag
-            tls = parameters.get("tls", False)
-
-            # in case the TLS flag is active
-            if tls:
-                # tries to start TLS and then runs the
-                # ehlo command (again, because of TLS)
-                self.starttls(session, parameters)
-                self.ehlo(session, parameters)
+            # retrieves the session to be used, re-using the persistent
+            # one in case it exists or starting a new one otherwise
+            session = self._get_session(connection_parameters, parameters)
+
+            try:
+                # sends the message using the session (transaction)
+                self._send_message(
+                    session, sender, recipients_list, message, parameters
+                )
+            except Exception:
+                # closes the session without the quit command as the
+                # state of the session is no longer known
+                self._close_session(parameters, quit=False)
+                raise
+
+            # in case the session is not meant to be kept open
+            # runs the quit command and closes the connection
+            if not keep_alive:
+                self._close_session(parameters)
+        finally:
+            # releases the SMTP client lock
+            self._smtp_client_lock.release()
 
-            # retrieves the verify user flag
-            verify_user = parameters.get("verify_user", False)
+    def send_mails(
+        self,
+        host,
+        port,
+        messages,
+        parameters={},
+        persistent=DEFAULT_PERSISTENT,
+        socket_name=DEFAULT_SOCKET_NAME,
+        socket_parameters=DEFAULT_SOCKET_PARAMETERS,
+        workers=DEFAULT_WORKERS,
+    ):
+        """
+        Sends the given batch of messages re-using the same authenticated
+        session between them (reset in between), avoiding the connection
+        and authentication overhead for each of the messages.
 
-            # in case the verify user flag is active, must
-            # run the proper vrfy comment (as expected)
-            if verify_user:
-                self.vrfy(session, parameters)
+        In case more than one worker is requested the messages are
+        distributed among a pool of sessions (one client each) that
+        deliver them in parallel to the relay.
 
-            # tries to retrieve the username from the parameters
-            username = parameters.get("username", "")
+        :type host: String
+        :param host: The host of the SMTP relay.
+        :type port: int
+        :param port: The port of the SMTP relay.
+        :type messages: List
+        :param messages: The list of tuples containing the sender, the
+        list of recipients and the contents of each message.
+        :type parameters: Dictionary
+        :param parameters: The parameters to the sending of the messages.
+        :type persistent: bool
+        :param persistent: If the connection should be persistent.
+        :type socket_name: String
+        :param socket_name: The name of the socket to be used.
+        :type socket_parameters: Dictionary
+        :param socket_parameters: The parameters for the socket.
+        :type workers: int
+        :param workers: The number of sessions to be used in parallel.
+        :rtype: List
+        :return: The list with the result of the sending of each of the
+        messages (in order), none for success or the raised exception.
+        """
+
+        # in case more than one worker is required the messages
+        # are delivered in parallel using a pool of clients
+        workers = min(workers, len(messages))
+        if workers > 1:
+            return self._send_mails_parallel(
+                host,
+                port,
+                messages,
+                parameters,
+                persistent,
+                socket_name,
+                socket_parameters,
+                workers,
+            )
 
-            # in case a username is defined
-            if username:
-                # tries to retrieve the password from the parameters
-                password = parameters.get("password", "")
+        # defines the connection parameters
+        connection_parameters = (host, port, persistent, socket_name, socket_parameters)
 
-                # runs the auth command (starting the authentication process)
-                self.auth(session, username, password, parameters)
+        # retrieves the keep alive flag, that controls if the (authenticated)
+        # session should be kept open after the batch of messages
+        keep_alive = parameters.get("keep_alive", False)
 
-            # runs the main command (starting the mail sending)
-            self.mail(session, sender, parameters)
+        # creates the list that will hold the result for each message
+        results = []
 
-            # runs the rcpt command
-            self.rcpt(session, recipients_list, parameters)
+        # acquires the SMTP client lock
+        self._smtp_client_lock.acquire()
 
-            # runs the data command and sends the raw data (message)
-            self.data(session, message, parameters)
+        try:
+            for index, (sender, recipients_list, message) in enumerate(messages):
+                try:
+                    # retrieves the session, that is going to be reset in
+                    # case it's being re-used from a previous message
+                    session = self._get_session(connection_parameters, parameters)
+                except Exception as exception:
+                    # the session could not be started (relay problem) so
+                    # the remaining messages are all considered failed
+                    results.extend([exception] * (len(messages) - index))
+                    break
+
+                try:
+                    # sends the message using the session (transaction)
+                    self._send_message(
+                        session, sender, recipients_list, message, parameters
+                    )
+                except exceptions.SMTPResponseError as exception:
+                    # the message was refused by the server, the session is
+                    # still valid and is reset before the next message
+                    results.append(exception)
+                except Exception as exception:
+                    # the session is in an unknown state (eg: aborted pipelined
+                    # data transaction) and is closed, a new one is started
+                    # for the next message
+                    self._close_session(parameters, quit=False)
+                    results.append(exception)
+                else:
+                    results.append(None)
 
-            # runs the quit command
-            self.quit(session, parameters)
+            # in case the session is not meant to be kept open
+            # runs the quit command and closes the connection
+            if not keep_alive and self._session:
+                self._close_session(parameters)
         finally:
             # releases the SMTP client lock
             self._smtp_client_lock.release()
 
-            # closes the client connection explicitly
-            self.client_connection.close()
+        # returns the results of the sending of the messages
+        return results
 
     def send_request(self, command, message, session, parameters):
         """
@@ -243,17 +352,8 @@ class SMTPClient(object):
         :return: The sent request for the given parameters.
         """
 
-        # creates the SMTP request
-        request = SMTPRequest()
-
-        # sets the session object in the request
-        request.set_session(session)
-
-        # sets the command in the request
-        request.set_command(command)
-
-        # sets the message in the request
-        request.set_message(message)
+        # creates the SMTP request for the command
+        request = self._create_request(command, message, session)
 
         # retrieves the result value from the request
         result_value = request.get_result()
@@ -329,97 +429,71 @@ class SMTPClient(object):
             # retrieves the message value from the string buffer
             message_value = message.get_value()
 
-            # retrieves the message value length
-            message_value_length = len(message_value)
-
-            # finds the first end token value
-            end_token_index = message_value.rfind(END_TOKEN_VALUE)
-
-            # calculates the last end token index, using the message
-            # value length as reference
-            last_end_token_index = message_value_length - 2
-
-            # in case the end token is found in the last position
-            # of the message
-            if end_token_index == last_end_token_index:
-                # tries to find a previous value of the newline
-                # in order to check if it is the "last newline"
-                value = message_value.rfind(END_TOKEN_VALUE, 0, last_end_token_index)
-
-                # in case no previous newline is found
-                if value == -1:
-                    # sets the base value as zero (string initial)
-                    base_value = 0
+            # finds the end of the final line of the reply, in case
+            # the reply is not yet complete continues receiving data
+            end_token_index = self._find_reply_end(message_value)
+            if end_token_index == -1:
+                continue
+
+            # returns the data after the reply to the connection, as it
+            # belongs to the next replies (pipelined commands)
+            remaining = message_value[end_token_index + 2 :]
+            if remaining:
+                self.client_connection.return_data(remaining)
+
+            # retrieves the SMTP message, by extracting the content
+            # until the end token value and then splits the message
+            # contents by each of the lines and retrieves the size
+            # of such lines list (going to be used as reference)
+            smtp_message = message_value[:end_token_index]
+            smtp_message_lines = smtp_message.split(b"\r\n")
+            smtp_message_lines_length = len(smtp_message_lines)
+
+            # starts the index counter
+            index = 1
+
+            # iterates over all the SMTP message lines
+            for smtp_message_line in smtp_message_lines:
+                # in case it's the last line
+                if index == smtp_message_lines_length:
+                    # splits the SMTP message line
+                    smtp_message_line_splitted = smtp_message_line.split(b" ", 1)
+
+                    # retrieves the SMTP code
+                    smtp_code = int(smtp_message_line_splitted[0])
+
+                    # retrieves the SMTP message
+                    smtp_message = smtp_message_line_splitted[1]
+
+                    # sets the SMTP code in the response
+                    response.set_code(smtp_code)
+
+                    # sets the SMTP message in the response
+                    response.set_message(smtp_message)
+
+                    # adds the SMTP message to the list of
+                    # messages in response
+                    response.add_message(smtp_message)
+                # in case it's not the last line
                 else:
-                    # sets the base value as the index of the find
-                    # plus two indexes (the length of the end token value)
-                    base_value = value + 2
-
-                # retrieves the comparison character (the character that
-                # indicates if it is the final line)
-                comparison_character = message_value[base_value + 3]
-
-                # in case the comparison character is a dash (not the final line)
-                if comparison_character == b"-":
-                    continue
-                elif not comparison_character == b" ":
-                    raise exceptions.SMTPInvalidDataException(
-                        "invalid comparison character"
-                    )
-
-                # retrieves the SMTP message, by extracting the content
-                # until the end token value and then splits the message
-                # contents by each of the lines and retrieves the size
-                # of such lines list (going to be used as reference)
-                smtp_message = message_value[:end_token_index]
-                smtp_message_lines = smtp_message.split(b"\r\n")
-                smtp_message_lines_length = len(smtp_message_lines)
-
-                # starts the index counter
-                index = 1
-
-                # iterates over all the SMTP message lines
-                for smtp_message_line in smtp_message_lines:
-                    # in case it's the last line
-                    if index == smtp_message_lines_length:
-                        # splits the SMTP message line
-                        smtp_message_line_splitted = smtp_message_line.split(b" ", 1)
-
-                        # retrieves the SMTP code
-                        smtp_code = int(smtp_message_line_splitted[0])
+                    # splits the SMTP message line
+                    smtp_message_line_splitted = smtp_message_line.split(b"-", 1)
 
-                        # retrieves the SMTP message
-                        smtp_message = smtp_message_line_splitted[1]
+                    # retrieves the SMTP message
+                    smtp_message = smtp_message_line_splitted[1]
 
-                        # sets the SMTP code in the response
-                        response.set_code(smtp_code)
+                    # adds the SMTP message to the list of
+                    # messages in response
+                    response.add_message(smtp_message)
 
-                        # sets the SMTP message in the response
-                        response.set_message(smtp_message)
+                # increments the index counter
+                index += 1
 
-                        # adds the SMTP message to the list of
-                        # messages in response
-                        response.add_message(smtp_message)
-                    # in case it's not the last line
-                    else:
-                        # splits the SMTP message line
-                        smtp_message_line_splitted = smtp_message_line.split(b"-", 1)
+            # sets the session object in the response
+            response.set_session(session)
 
-                        # retrieves the SMTP message
-                        smtp_message = smtp_message_line_splitted[1]
-
-                        # adds the SMTP message to the list of
-                        # messages in response
-                        response.add_message(smtp_message)
-
-                    # increments the index counter
-                    index += 1
-
-                # sets the session object in the response
-                response.set_session(session)
-
-                # returns the response
-                return response
+            # returns the response
+            return response
 
     def login(self, session, parameters={}):
         # retrieves the initial response value
@@ -442,6 +516,16 @@ class SMTPClient(object):
             response, (250,), "problem establishing connection: "
         )
 
+        # sets the extensions advertised by the server in the session, the
+        # first line of the response is the greeting and the remaining ones
+        # contain the extension keywords (and their parameters)
+        session.set_extensions(
+            set(
+                message.split(b" ", 1)[0].upper()
+                for message in response.get_messages()[1:]
+            )
+        )
+
     def starttls(self, session, parameters={}):
         # sends the starttls request
         request = self.send_request("starttls", None, session, parameters)
@@ -540,6 +624,63 @@ class SMTPClient(object):
         # checks the response for errors
         self._check_response_error(response, (250, 354), "problem sending email: ")
 
+        # sends the contents of the message
+        self._send_data(session, data, parameters)
+
+    def pipeline(self, session, sender, recipients_list, data, parameters={}):
+        # creates the requests for the mail, rcpt and data commands that
+        # are going to be sent as a single group (pipelining extension)
+        requests = [self._create_request("mail", "from:<" + sender + ">", session)]
+        for recipient in recipients_list:
+            requests.append(
+                self._create_request("rcpt", "to:<" + recipient + ">", session)
+            )
+        requests.append(self._create_request("data", None, session))
+
+        # sends the complete group of requests in a single write
+        # avoiding the round trip for each of the commands
+        buffer = colony.StringBuffer()
+        for request in requests:
+            buffer.write(request.get_result())
+        self.client_connection.send(buffer.get_value())
+
+        # retrieves the responses for each of the requests (in order), note
+        # that all of them must be retrieved to keep the connection in sync
+        # and that only the first error is going to be raised
+        error = None
+        for request in requests:
+            response = self.retrieve_response(request, session)
+            accepted_codes = (250, 354) if request.get_command() == "data" else (250,)
+            try:
+                self._check_response_error(
+                    response, accepted_codes, "problem sending email: "
+                )
+            except exceptions.SMTPResponseError as exception:
+                error = error or exception
+
+        # in case there was an error and the server accepted the data
+        # command (some recipients accepted) terminating the transaction
+        # would deliver an empty message, so the session is considered
+        # broken and must be dropped (without quit) by the caller
+        if error:
+            if response.get_code() == 354:
+                raise exceptions.SMTPPipelineError(error.message)
+            raise error
+
+        # sends the contents of the message
+        self._send_data(session, data, parameters)
+
+    def rset(self, session, parameters={}):
+        # sends the rset request
+        request = self.send_request("rset", None, session, parameters)
+
+        # retrieves the response
+        response = self.retrieve_response(request, session)
+
+        # checks the response for errors
+        self._check_response_error(response, (250,), "problem resetting session: ")
+
+    def _send_data(self, session, data, parameters={}):
         # retrieves the data length
         data_length = len(data)
 
@@ -626,6 +767,241 @@ class SMTPClient(object):
             response, (235,), "problem in login authentication: "
         )
 
+    def _get_session(self, connection_parameters, parameters):
+        """
+        Retrieves the session to be used for the given connection
+        parameters, re-using the persistent session (after resetting
+        it) or starting a new one in case that's not possible.
+
+        :type connection_parameters: Tuple
+        :param connection_parameters: The connection parameters.
+        :type parameters: Dictionary
+        :param parameters: The parameters to the session.
+        :rtype: SMTPSession
+        :return: The (authenticated) session ready for a new message.
+        """
+
+        # creates the key that identifies the session from the connection
+        # parameters and the parameters that change the session state
+        session_key = (
+            connection_parameters,
+            parameters.get("tls", False),
+            parameters.get("username", ""),
+            parameters.get("password", ""),
+        )
+
+        # in case there's a persistent session for the same key tries to
+        # re-use it resetting its state, if that fails the session is
+        # considered broken (eg: timed out) and a new one is started
+        if self._session and self._session_key == session_key:
+            try:
+                self.rset(self._session, parameters)
+                return self._session
+            except Exception:
+                self._close_session(parameters, quit=False)
+
+        # in case there's a persistent session for a different key
+        # it must be finished before starting the new one
+        if self._session:
+            self._close_session(parameters)
+
+        # retrieves the corresponding (SMTP) client connection
+        self.client_connection = self._smtp_client.get_client_connection(
+            connection_parameters
+        )
+
+        # creates the session object and starts it (handshake)
+        # closing the connection in case there's a problem
+        session = SMTPSession()
+        try:
+            self._start_session(session, parameters)
+        except Exception:
+            self.client_connection.close()
+            raise
+
+        # sets the session as the current (persistent) one
+        self._session = session
+        self._session_key = session_key
+
+        # returns the session
+        return session
+
+    def _start_session(self, session, parameters):
+        # runs the initial login process and
+        # then runs the initial ehlo command
+        self.login(session, parameters)
+        self.ehlo(session, parameters)
+
+        # retrieves the use TLS flag
+        tls = parameters.get("tls", False)
+
+        # in case the TLS flag is active
+        if tls:
+            # tries to start TLS and then runs the
+            # ehlo command (again, because of TLS)
+            self.starttls(session, parameters)
+            self.ehlo(session, parameters)
+
+        # retrieves the verify user flag
+        verify_user = parameters.get("verify_user", False)
+
+        # in case the verify user flag is active, must
+        # run the proper vrfy comment (as expected)
+        if verify_user:
+            self.vrfy(session, parameters)
+
+        # tries to retrieve the username from the parameters
+        username = parameters.get("username", "")
+
+        # in case a username is defined
+        if username:
+            # tries to retrieve the password from the parameters
+            password = parameters.get("password", "")
+
+            # runs the auth command (starting the authentication process)
+            self.auth(session, username, password, parameters)
+
+    def _close_session(self, parameters, quit=True):
+        # retrieves the current session and unsets it
+        # so that it's no longer re-used
+        session = self._session
+        self._session = None
+        self._session_key = None
+
+        try:
+            # runs the quit command in case it's requested
+            if quit and session:
+                self.quit(session, parameters)
+        finally:
+            # closes the client connection explicitly
+            self.client_connection.close()
+
+    def _send_message(self, session, sender, recipients_list, message, parameters):
+        # in case the server supports the pipelining extension (and
+        # it's not disabled) the commands are sent as a single group
+        pipelining = parameters.get("pipelining", True)
+        if pipelining and session.has_extension(PIPELINING_VALUE):
+            self.pipeline(session, sender, recipients_list, message, parameters)
+            return
+
+        # runs the main command (starting the mail sending)
+        self.mail(session, sender, parameters)
+
+        # runs the rcpt command
+        self.rcpt(session, recipients_list, parameters)
+
+        # runs the data command and sends the raw data (message)
+        self.data(session, message, parameters)
+
+    def _send_mails_parallel(
+        self,
+        host,
+        port,
+        messages,
+        parameters,
+        persistent,
+        socket_name,
+        socket_parameters,
+        workers,
+    ):
+        # creates the list of results and the parameters for the worker
+        # clients, that must close their sessions at the end
+        results = [None] * len(messages)
+        worker_parameters = colony.map_extend(parameters, dict(keep_alive=False))
+
+        def worker(offset):
+            # retrieves the indexes of the messages handled by the
+            # worker (interleaved distribution)
+            indexes = range(offset, len(messages), workers)
+
+            # creates a new client for the worker so that it uses its
+            # own connection (session) to the relay
+            smtp_client = SMTPClient(self.client_smtp)
+            try:
+                smtp_client.open(self._parameters or {})
+                try:
+                    _results = smtp_client.send_mails(
+                        host,
+                        port,
+                        [messages[index] for index in indexes],
+                        parameters=worker_parameters,
+                        persistent=persistent,
+                        socket_name=socket_name,
+                        socket_parameters=socket_parameters,
+                    )
+                finally:
+                    smtp_client.close({})
+            except Exception as exception:
+                _results = [exception] * len(indexes)
+            for index, result in zip(indexes, _results):
+                results[index] = result
+
+        # creates and starts the worker threads and waits
+        # for all of them to finish the delivery
+        threads = [
+            threading.Thread(target=worker, args=(offset,))
+            for offset in colony.legacy.xrange(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # returns the results of the sending of the messages
+        return results
+
+    def _create_request(self, command, message, session):
+        # creates the SMTP request
+        request = SMTPRequest()
+
+        # sets the session object in the request
+        request.set_session(session)
+
+        # sets the command in the request
+        request.set_command(command)
+
+        # sets the message in the request
+        request.set_message(message)
+
+        # returns the request
+        return request
+
+    def _find_reply_end(self, message_value):
+        """
+        Finds the index of the end token of the final line of the
+        first (complete) reply in the given message value.
+
+        :type message_value: String
+        :param message_value: The received data to be searched.
+        :rtype: int
+        :return: The index of the end token of the final line of
+        the reply or minus one in case the reply is not complete.
+        """
+
+        # iterates over the complete lines of the message value
+        # until the final line (space after the code) is found
+        start_index = 0
+        while True:
+            end_token_index = message_value.find(END_TOKEN_VALUE, start_index)
+            if end_token_index == -1:
+                return -1
+
+            # retrieves the comparison character (the character that
+            # indicates if it is the final line)
+            comparison_character = message_value[start_index + 3 : start_index + 4]
+
+            # in case the comparison character is a space or the line
+            # contains only the code, this is the final line
+            if comparison_character in (b" ", b"\r"):
+                return end_token_index
+            elif not comparison_character == b"-":
+                raise exceptions.SMTPInvalidDataException(
+                    "invalid comparison character"
+                )
+
+            # moves the start index to the next line
+            start_index = end_token_index + 2
+
     def _get_transaction_id(self):
         """
         Retrieves the transaction id, incrementing the
@@ -922,6 +1298,7 @@ class SMTPResponse(object):
 
         self.request = request
 
+        self.messages = []
         self.properties = {}
 
     def __repr__(self):
@@ -1082,6 +1459,9 @@ class SMTPSession(object):
     current_message = None
     """ The current message being processed """
 
+    extensions = set()
+    """ The set of extensions (keywords) advertised by the server """
+
     messages = []
     """ The messages associated with the session """
 
@@ -1089,6 +1469,7 @@ class SMTPSession(object):
     """ The properties of the current session """
 
     def __init__(self):
+        self.extensions = set()
         self.messages = []
         self.properties = {}
 
@@ -1220,6 +1601,39 @@ class SMTPSession(object):
 
         self.current_message = current_message
 
+    def has_extension(self, extension):
+        """
+        Checks if the given extension has been advertised
+        by the server for the current session.
+
+        :type extension: String
+        :param extension: The keyword of the extension to check.
+        :rtype: bool
+        :return: If the extension is supported by the server.
+        """
+
+        return extension in self.extensions
+
+    def get_extensions(self):
+        """
+        Retrieves the extensions.
+
+        :rtype: Set
+        :return: The extensions.
+        """
+
+        return self.extensions
+
+    def set_extensions(self, extensions):
+        """
+        Sets the extensions.
+
+        :type extensions: Set
+        :param extensions: The extensions.
+        """
+
+        self.extensions = extensions
+
     def get_messages(self):
         """
         Retrieves the messages.
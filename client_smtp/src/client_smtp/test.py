@@ -0,0 +1,321 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import colony
+
+from . import mocks
+from . import system
+from . import exceptions
+
+
+class ClientSMTPTest(colony.Test):
+    """
+    The client SMTP infra-structure test class, responsible
+    for the returning of the associated tests.
+    """
+
+    def get_bundle(self):
+        return (ReplyTestCase, SMTPClientTestCase)
+
+    def set_up(self, test_case):
+        colony.Test.set_up(self, test_case)
+
+    def tear_down(self, test_case):
+        colony.Test.tear_down(self, test_case)
+
+
+def create_client(server):
+    client_smtp = system.ClientSMTP(mocks.MockPlugin(server))
+    smtp_client = client_smtp.create_client({})
+    smtp_client.open({})
+    return smtp_client
+
+
+def create_messages(count, refused=()):
+    messages = []
+    for index in range(count):
+        recipient = "refused@hive.pt" if index in refused else "user@hive.pt"
+        message = "message %d\r\n.dotted" % index
+        messages.append(("sender@hive.pt", [recipient], message))
+    return messages
+
+
+class ReplyTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Reply test case"
+
+    def test_find_reply_end(self):
+        smtp_client = system.SMTPClient(None)
+
+        self.assertEqual(smtp_client._find_reply_end(b"250 ok\r\n"), 6)
+        self.assertEqual(smtp_client._find_reply_end(b"250\r\n"), 3)
+        self.assertEqual(smtp_client._find_reply_end(b"250 ok"), -1)
+        self.assertEqual(smtp_client._find_reply_end(b"250-first\r\n"), -1)
+        self.assertEqual(smtp_client._find_reply_end(b"250-first\r\n250 last\r\n"), 19)
+        self.assertEqual(smtp_client._find_reply_end(b"250 first\r\n250 second\r\n"), 9)
+        self.assertRaises(
+            exceptions.SMTPInvalidDataException,
+            smtp_client._find_reply_end,
+            b"250+invalid\r\n",
+        )
+
+    def test_retrieve_response(self):
+        server = mocks.MockServer()
+        smtp_client = system.SMTPClient(None)
+        smtp_client.client_connection = server.connect()
+        smtp_client.client_connection.pending = [
+            b"250-mock.relay.com\r\n250-PIPELINING\r\n250 SIZE 1024\r\n",
+            b"550 no such user\r\n354 start mail input\r\n",
+        ]
+
+        # retrieves the first reply and verifies that the remaining
+        # (pipelined) replies are returned to the connection
+        response = smtp_client.retrieve_response(None, None)
+        self.assertEqual(response.get_code(), 250)
+        self.assertEqual(response.get_message(), b"SIZE 1024")
+        self.assertEqual(
+            response.get_messages(), [b"mock.relay.com", b"PIPELINING", b"SIZE 1024"]
+        )
+        self.assertEqual(
+            smtp_client.client_connection.returned,
+            [b"550 no such user\r\n354 start mail input\r\n"],
+        )
+
+        response = smtp_client.retrieve_response(None, None)
+        self.assertEqual(response.get_code(), 550)
+        self.assertEqual(response.get_message(), b"no such user")
+        response = smtp_client.retrieve_response(None, None)
+        self.assertEqual(response.get_code(), 354)
+        self.assertEqual(smtp_client.client_connection.pending, [])
+
+    def test_retrieve_response_fragmented(self):
+        server = mocks.MockServer(chunk_size=5)
+        smtp_client = system.SMTPClient(None)
+        smtp_client.client_connection = server.connect()
+        smtp_client.client_connection.pending = [
+            b"250-first\r\n250 last\r\n221 bye\r\n"
+        ]
+
+        # retrieves the replies received in small chunks that split
+        # both the lines and the codes of the replies
+        response = smtp_client.retrieve_response(None, None)
+        self.assertEqual(response.get_code(), 250)
+        self.assertEqual(response.get_messages(), [b"first", b"last"])
+        response = smtp_client.retrieve_response(None, None)
+        self.assertEqual(response.get_code(), 221)
+        self.assertEqual(response.get_message(), b"bye")
+
+        # verifies that a closed connection (empty data) is
+        # reported as invalid data instead of blocking
+        self.assertRaises(
+            exceptions.SMTPInvalidDataException,
+            smtp_client.retrieve_response,
+            None,
+            None,
+        )
+
+
+class SMTPClientTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "SMTP Client test case"
+
+    def test_pipeline(self):
+        server = mocks.MockServer()
+        smtp_client = create_client(server)
+        results = smtp_client.send_mails("localhost", 25, create_messages(3))
+
+        # verifies that the messages are sent using a single session,
+        # reset in between, and that the commands of each message are
+        # sent in a single write (mail, rcpt and data)
+        self.assertEqual(results, [None, None, None])
+        self.assertEqual(len(server.connections), 1)
+        self.assertEqual(server.count("rset"), 2)
+        self.assertEqual(server.count("quit"), 1)
+        self.assertEqual(
+            server.messages, ["message %d\r\n..dotted" % index for index in range(3)]
+        )
+        connection = server.connections[0]
+        self.assertEqual(
+            connection.sends[1],
+            "mail from:<sender@hive.pt>\r\nrcpt to:<user@hive.pt>\r\ndata\r\n",
+        )
+
+    def test_pipeline_error(self):
+        server = mocks.MockServer(lenient=True)
+        smtp_client = create_client(server)
+        messages = create_messages(3)
+        messages[1] = ("refused@hive.pt", ["user@hive.pt"], "refused")
+        results = smtp_client.send_mails("localhost", 25, messages)
+
+        # verifies that the refused sender (accepted data command) drops
+        # the connection without terminating the data transaction, so
+        # that no empty message is delivered, and that a new session is
+        # started for the next message
+        self.assertEqual(results[0], None)
+        self.assertEqual(isinstance(results[1], exceptions.SMTPPipelineError), True)
+        self.assertEqual(results[2], None)
+        self.assertEqual(
+            server.messages, ["message 0\r\n..dotted", "message 2\r\n..dotted"]
+        )
+        self.assertEqual(len(server.connections), 2)
+        self.assertEqual(server.connections[0].closed, True)
+        self.assertEqual(server.connections[0].sends[-1].endswith("data\r\n"), True)
+        self.assertEqual(server.count("quit"), 1)
+
+    def test_pipeline_refused(self):
+        server = mocks.MockServer()
+        smtp_client = create_client(server)
+        results = smtp_client.send_mails(
+            "localhost", 25, create_messages(3, refused=(1,))
+        )
+
+        # verifies that the refused recipient (refused data command)
+        # keeps the session valid, being reset for the next message
+        self.assertEqual(results[0], None)
+        self.assertEqual(isinstance(results[1], exceptions.SMTPResponseError), True)
+        self.assertEqual(results[2], None)
+        self.assertEqual(len(server.messages), 2)
+        self.assertEqual(len(server.connections), 1)
+        self.assertEqual(server.count("rset"), 2)
+
+    def test_no_pipelining(self):
+        server = mocks.MockServer(pipelining=False)
+        smtp_client = create_client(server)
+        results = smtp_client.send_mails(
+            "localhost", 25, create_messages(3, refused=(1,))
+        )
+
+        self.assertEqual(results[0], None)
+        self.assertEqual(isinstance(results[1], exceptions.SMTPResponseError), True)
+        self.assertEqual(results[2], None)
+        self.assertEqual(len(server.messages), 2)
+        self.assertEqual(len(server.connections), 1)
+        self.assertEqual(server.count("data"), 2)
+
+        # verifies that the pipelining may be disabled even when the
+        # extension is advertised by the server
+        server = mocks.MockServer()
+        smtp_client = create_client(server)
+        smtp_client.send_mails(
+            "localhost", 25, create_messages(2), parameters=dict(pipelining=False)
+        )
+        connection = server.connections[0]
+        self.assertEqual(connection.sends[1], "mail from:<sender@hive.pt>\r\n")
+
+    def test_keep_alive(self):
+        server = mocks.MockServer()
+        smtp_client = create_client(server)
+        parameters = dict(keep_alive=True)
+        for _index in range(3):
+            smtp_client.send_mail(
+                "localhost",
+                25,
+                "sender@hive.pt",
+                ["user@hive.pt"],
+                "message",
+                parameters=parameters,
+            )
+
+        # verifies that the session is re-used (reset) and that
+        # it's only finished upon the closing of the client
+        self.assertEqual(len(server.connections), 1)
+        self.assertEqual(server.count("rset"), 2)
+        self.assertEqual(server.count("quit"), 0)
+        smtp_client.close({})
+        self.assertEqual(server.count("quit"), 1)
+        self.assertEqual(server.connections[0].closed, True)
+
+    def test_reconnect(self):
+        server = mocks.MockServer()
+        smtp_client = create_client(server)
+        parameters = dict(keep_alive=True)
+        smtp_client.send_mail(
+            "localhost",
+            25,
+            "sender@hive.pt",
+            ["user@hive.pt"],
+            "first",
+            parameters=parameters,
+        )
+
+        # breaks the connection of the persistent session (eg: timed out
+        # by the server) and verifies that the failed reset triggers the
+        # start of a new session for the message
+        server.connections[0].broken = True
+        smtp_client.send_mail(
+            "localhost",
+            25,
+            "sender@hive.pt",
+            ["user@hive.pt"],
+            "second",
+            parameters=parameters,
+        )
+        self.assertEqual(len(server.connections), 2)
+        self.assertEqual(server.connections[0].closed, True)
+        self.assertEqual(server.connections[1].closed, False)
+        self.assertEqual(server.messages, ["first", "second"])
+        smtp_client.close({})
+
+    def test_send_mails_order(self):
+        refused = (0, 3, 4, 8)
+        server = mocks.MockServer()
+        smtp_client = create_client(server)
+        results = smtp_client.send_mails(
+            "localhost", 25, create_messages(10, refused=refused)
+        )
+
+        # verifies that the result for each message is set in the
+        # index of the message, both for the sequential and for the
+        # parallel delivery (interleaved among the workers)
+        self.assertEqual(len(results), 10)
+        for index, result in enumerate(results):
+            self.assertEqual(result == None, not index in refused)
+
+        server = mocks.MockServer()
+        smtp_client = create_client(server)
+        results = smtp_client.send_mails(
+            "localhost", 25, create_messages(10, refused=refused), workers=3
+        )
+        self.assertEqual(len(results), 10)
+        for index, result in enumerate(results):
+            self.assertEqual(result == None, not index in refused)
+        self.assertEqual(len(server.connections), 3)
+        self.assertEqual(server.count("quit"), 3)
+        self.assertEqual(
+            sorted(server.messages),
+            sorted(
+                "message %d\r\n..dotted" % index
+                for index in range(10)
+                if not index in refused
+            ),
+        )
@@ -42,7 +42,7 @@ class ClientSMTPPlugin(colony.Plugin):
     version = "1.0.0"
     author = "Hive Solutions Lda. <development@hive.pt>"
     platforms = [colony.CPYTHON_ENVIRONMENT, colony.JYTHON_ENVIRONMENT]
-    capabilities = ["client.smtp"]
+    capabilities = ["client.smtp", "test"]
     dependencies = [colony.PluginDependency("pt.hive.colony.plugins.client.utils")]
     main_modules = ["client_smtp"]
 
@@ -51,6 +51,7 @@ class ClientSMTPPlugin(colony.Plugin):
         import client_smtp
 
         self.system = client_smtp.ClientSMTP(self)
+        self.test = client_smtp.ClientSMTPTest(self)
 
     def create_client(self, parameters):
         return self.system.create_client(parameters)
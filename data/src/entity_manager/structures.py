@@ -29,6 +29,7 @@ __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
 import copy
+import time
 import types
 import calendar
 import datetime
@@ -99,6 +100,7 @@ INVALID_NAMES = set(
         "_scope",
         "_attached",
         "_attach_level",
+        "_siblings",
         "_names",
         "_items",
         "_generated",
@@ -377,6 +379,355 @@ class Connection(object):
             self.handlers_lock.release()
 
 
+class ConnectionPool(object):
+    """
+    Bounded and thread safe pool of "physical" connections
+    to be used by the engines that are backed by a remote
+    data source (eg: MySQL, PgSQL).
+
+    A connection is checked out and bound to the calling
+    thread on first use and returned to the pool once the
+    top level transaction is completed, idle connections
+    are reaped after a timeout and connections held by
+    threads that are no longer alive are reclaimed.
+
+    Statements outside of a transaction keep the connection
+    bound to the thread (no extra round trips per statement)
+    and idle connections are only health checked when they
+    have been unused for longer than the check interval.
+    """
+
+    open_callable = None
+    """ The callable to be used in the creation of a new
+    "physical" connection, no arguments are provided """
+
+    close_callable = None
+    """ The callable to be called with a connection when
+    it's going to be discarded from the pool """
+
+    check_callable = None
+    """ The callable used to health check an idle connection
+    before handing it out, should return a valid boolean """
+
+    max_size = None
+    """ The maximum number of connections (both busy and idle)
+    that may be open at the same time for the pool """
+
+    idle_timeout = None
+    """ The amount of time (in seconds) that an idle connection
+    may remain in the pool before being reaped """
+
+    check_interval = None
+    """ The amount of time (in seconds) that an idle connection
+    may remain unused before requiring a health check on re-use """
+
+    timeout = None
+    """ The maximum amount of time (in seconds) to wait for
+    a connection to be available when the pool is exhausted """
+
+    busy = {}
+    """ The map associating the thread identifier with the
+    connection currently checked out by it """
+
+    idle = []
+    """ The list of tuples containing the idle connections and
+    the timestamp of their return to the pool (LIFO ordered) """
+
+    size = 0
+    """ The total number of connections currently owned by the
+    pool, including the ones being created """
+
+    counters = {}
+    """ The map containing the various counters for the pool
+    operations, to be exposed for diagnostics """
+
+    condition = None
+    """ The condition that controls the access to the internal
+    structures and the waiting for returned connections """
+
+    last_reap = 0
+    """ The timestamp of the last reaping operation, used to
+    throttle the (expensive) reaping of connections """
+
+    def __init__(
+        self,
+        open_callable,
+        close_callable=None,
+        check_callable=None,
+        max_size=None,
+        idle_timeout=None,
+        check_interval=None,
+        timeout=None,
+    ):
+        """
+        Constructor of the class.
+
+        :type open_callable: Function
+        :param open_callable: The callable to be used for the
+        creation of new connections for the pool.
+        :type close_callable: Function
+        :param close_callable: The callable to be used to close
+        a connection that is going to be discarded.
+        :type check_callable: Function
+        :param check_callable: The callable to be used to verify
+        if an idle connection is still valid before its re-use.
+        :type max_size: int
+        :param max_size: The maximum number of connections to be
+        kept open (busy and idle) at the same time.
+        :type idle_timeout: float
+        :param idle_timeout: The amount of seconds an idle connection
+        may remain unused before being closed.
+        :type check_interval: float
+        :param check_interval: The amount of seconds an idle connection
+        may remain unused before being health checked on re-use.
+        :type timeout: float
+        :param timeout: The maximum number of seconds to wait for a
+        connection when the pool is exhausted.
+        """
+
+        if max_size == None:
+            max_size = colony.conf("DB_POOL_SIZE", 64, cast=int)
+        if idle_timeout == None:
+            idle_timeout = colony.conf("DB_POOL_IDLE", 300.0, cast=float)
+        if check_interval == None:
+            check_interval = colony.conf("DB_POOL_CHECK", 30.0, cast=float)
+        if timeout == None:
+            timeout = colony.conf("DB_POOL_TIMEOUT", 30.0, cast=float)
+
+        self.open_callable = open_callable
+        self.close_callable = close_callable
+        self.check_callable = check_callable
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        self.timeout = timeout
+
+        self.busy = {}
+        self.idle = []
+        self.size = 0
+        self.counters = dict(
+            created=0, reused=0, reaped=0, reclaimed=0, failed=0, waits=0
+        )
+        self.condition = threading.Condition()
+        self.last_reap = 0
+
+    def acquire(self, create=True):
+        """
+        Retrieves the connection bound to the current thread,
+        checking out a connection from the pool (or creating a
+        new one) in case there's none bound.
+
+        :type create: bool
+        :param create: If a connection should be checked out in
+        case there's none bound to the current thread.
+        :rtype: Object
+        :return: The connection bound to the current thread or an
+        invalid value in case there's none and no creation is requested.
+        """
+
+        # retrieves the identifier of the current thread and tries
+        # to obtain the connection that is bound to it, returning
+        # immediately in case it exists (fast path)
+        thread_id = threading.current_thread().ident
+        connection = self.busy.get(thread_id, None)
+        if connection or not create:
+            return connection
+
+        # computes the deadline for the waiting of an available
+        # connection in case the pool is currently exhausted
+        deadline = time.time() + self.timeout
+
+        while True:
+            self.condition.acquire()
+            try:
+                # reaps the expired idle connections and the ones held
+                # by dead threads, this may release room in the pool
+                self._reap()
+
+                # in case there's an idle connection available it's
+                # popped (most recently used first) and bound to the
+                # current thread, to be health checked before usage in
+                # case it has been unused for longer than the interval
+                if self.idle:
+                    connection, timestamp = self.idle.pop()
+                    self.busy[thread_id] = connection
+                    self.counters["reused"] += 1
+                    reuse = True
+                    check = time.time() - timestamp > self.check_interval
+                elif self.size < self.max_size:
+                    self.size += 1
+                    reuse = False
+                else:
+                    # verifies that the deadline has not been reached
+                    # and if that's the case raises an exception, otherwise
+                    # waits (in small slices) for a returned connection
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise exceptions.RuntimeError(
+                            "connection pool exhausted (%d connections)" % self.max_size
+                        )
+                    self.counters["waits"] += 1
+                    self.condition.wait(min(remaining, 1.0))
+                    continue
+            finally:
+                self.condition.release()
+
+            # in case the connection is being re-used runs the health
+            # check on it and if it fails discards it and retries
+            if reuse:
+                if not check or self._check(connection):
+                    return connection
+                self.counters["failed"] += 1
+                self.discard()
+                continue
+
+            # creates a new connection (outside of the lock) and then
+            # binds it to the current thread, in case the creation fails
+            # the reserved slot is released and the exception re-raised
+            try:
+                connection = self.open_callable()
+            except:
+                self.condition.acquire()
+                try:
+                    self.size -= 1
+                    self.busy.pop(thread_id, None)
+                    self.condition.notify()
+                finally:
+                    self.condition.release()
+                raise
+            self.condition.acquire()
+            try:
+                self.busy[thread_id] = connection
+                self.counters["created"] += 1
+            finally:
+                self.condition.release()
+            return connection
+
+    def release(self):
+        """
+        Returns the connection bound to the current thread to the
+        pool, so that it may be re-used by other threads.
+        """
+
+        thread_id = threading.current_thread().ident
+        self.condition.acquire()
+        try:
+            connection = self.busy.pop(thread_id, None)
+            if not connection:
+                return
+            self.idle.append((connection, time.time()))
+            self.condition.notify()
+        finally:
+            self.condition.release()
+
+    def discard(self):
+        """
+        Closes the connection bound to the current thread removing
+        it from the pool, this should be used for broken connections.
+        """
+
+        thread_id = threading.current_thread().ident
+        self.condition.acquire()
+        try:
+            connection = self.busy.pop(thread_id, None)
+            if not connection:
+                return
+            self.size -= 1
+            self.condition.notify()
+        finally:
+            self.condition.release()
+        self._close(connection)
+
+    def close(self):
+        """
+        Closes all of the connections owned by the pool (both busy
+        and idle) resetting it to the original (empty) state.
+        """
+
+        self.condition.acquire()
+        try:
+            connections = list(self.busy.values())
+            connections += [connection for connection, _timestamp in self.idle]
+            self.busy.clear()
+            del self.idle[:]
+            self.size = 0
+            self.condition.notify_all()
+        finally:
+            self.condition.release()
+        for connection in connections:
+            self._close(connection)
+
+    def stats(self):
+        """
+        Retrieves a map containing the current statistics of the
+        pool, to be used for diagnostics.
+
+        :rtype: Dictionary
+        :return: The map with the sizes and counters of the pool.
+        """
+
+        self.condition.acquire()
+        try:
+            stats = dict(
+                size=self.size,
+                busy=len(self.busy),
+                idle=len(self.idle),
+                max_size=self.max_size,
+                idle_timeout=self.idle_timeout,
+            )
+            stats.update(self.counters)
+        finally:
+            self.condition.release()
+        return stats
+
+    def _reap(self, force=False):
+        # verifies if the reaping operation has been run recently
+        # and if that's the case returns immediately (throttling)
+        current = time.time()
+        if not force and current - self.last_reap < 1.0:
+            return
+        self.last_reap = current
+
+        # closes the idle connections that have been waiting
+        # for longer than the idle timeout, note that as the
+        # list is LIFO ordered the oldest ones are first
+        while self.idle:
+            connection, timestamp = self.idle[0]
+            if current - timestamp < self.idle_timeout:
+                break
+            self.idle.pop(0)
+            self.size -= 1
+            self.counters["reaped"] += 1
+            self._close(connection)
+
+        # reclaims the connections that are bound to threads that
+        # are no longer alive (they would never be returned)
+        alive = set(thread.ident for thread in threading.enumerate())
+        for thread_id in list(self.busy.keys()):
+            if thread_id in alive:
+                continue
+            connection = self.busy.pop(thread_id)
+            self.size -= 1
+            self.counters["reclaimed"] += 1
+            self._close(connection)
+
+    def _check(self, connection):
+        if not self.check_callable:
+            return True
+        try:
+            return self.check_callable(connection)
+        except Exception:
+            return False
+
+    def _close(self, connection):
+        if not self.close_callable:
+            return
+        try:
+            self.close_callable(connection)
+        except Exception:
+            pass
+
+
 class EntityClass(object):
     """
     The base entity class used for the entity manager.
@@ -414,6 +765,11 @@ class EntityClass(object):
     zero or less the entity is considered detached otherwise the entity
     is considered attached (on-line) """
 
+    _siblings = None
+    """ The list of entities of the same class that have been loaded
+    together with the current entity (same query), used to load the
+    lazy relations of the complete set at once (batch loading) """
+
     def __init__(self):
         """
         Constructor of the class.
@@ -4261,6 +4617,86 @@ class EntityClass(object):
             # into string
             return value_string
 
+    @classmethod
+    def _get_sql_parameter(cls, name, value):
+        # retrieves the (attribute) data type for
+        # the attribute with the given name for
+        # the current entity class
+        data_type = cls._get_data_type(name)
+
+        # in case the value is none it's returned
+        # immediately as the driver is going to bind
+        # it as the proper null value
+        if value == None:
+            return None
+
+        # in case the attribute data type is text, the value
+        # is bound "as is" (no escaping is required), note that
+        # the string data type must still be truncated
+        if data_type in ("text", "string", "data"):
+            if data_type == "string" and len(value) > 255:
+                value = value[:255]
+            return value
+
+        # in case the attribute data type is date, the date time
+        # structure must be converted to a timestamp (float) value
+        elif data_type == "date":
+            # retrieves the type from the current value so that it
+            # may be used for conditional execution and interpreting
+            # of the provided values
+            value_type = type(value)
+
+            # in case the attribute is given in the date time format
+            # converts it into the equivalent (utc based) timestamp
+            if value_type == datetime.datetime:
+                date_time_tuple = value.utctimetuple()
+                return calendar.timegm(date_time_tuple)
+
+            # in case the attribute value type is an integer
+            # or float (must be a timestamp value) it's
+            # converted into a float value
+            elif value_type in (int, float):
+                return float(value)
+
+            # otherwise it's an unknown value and must be
+            # bound without any kind of conversion
+            else:
+                return value
+
+        elif data_type == "metadata":
+            # retrieves the type from the current value so that it
+            # may be used for conditional execution and interpreting
+            # of the provided values
+            value_type = type(value)
+
+            # in case the value is of type string direct
+            # binding is made into the data source
+            if value_type in colony.legacy.STRINGS:
+                return value
+
+            # in case the value is of type dictionary the
+            # default dump operation must be performed
+            elif value_type == dict:
+                serializer, name = cls.get_serializer()
+                value_string = serializer.dumps(value)
+                return name + ":" + value_string
+
+            # otherwise the default string encoding is used
+            # on the value, this is only a fallback strategy
+            else:
+                return str(value)
+
+        # in case the attribute data type is decimal the value is
+        # converted into a float as the drivers may not be able to
+        # bind the decimal type (stored as double precision)
+        elif data_type == "decimal":
+            return float(value)
+
+        # otherwise it must be a default value and it's
+        # bound directly as the driver knows how to handle it
+        else:
+            return value
+
     @classmethod
     def _from_sql_value(cls, name, value, encoding=None):
         # retrieves the (attribute) data type for
@@ -4788,6 +5224,13 @@ class EntityClass(object):
         if table_id_value == None:
             return colony.Lazy
 
+        # tries to load the relation for the complete set of siblings
+        # of the entity (single query) and in case the relation has been
+        # loaded for the entity returns it immediately (no more loading)
+        loaded = self._load_lazy_batch(name)
+        if loaded:
+            return getattr(self, name)
+
         # creates the map of options to load the various
         # entities that are associated with the current
         # entity in the appropriate (reverse) relation
@@ -4821,6 +5264,68 @@ class EntityClass(object):
         # attribute is not going to be "lazy loaded" again)
         return attribute
 
+    def _load_lazy_batch(self, name):
+        """
+        Loads a lazy loaded relation for the complete set of siblings
+        of the current entity (entities loaded in the same query) using
+        a single (in filter based) query to the data source.
+
+        The loaded relation values are set in the sibling entities as
+        they are shared through the entities map of the diffusion scope.
+
+        :type name: String
+        :param name: The name of the relation attribute to be loaded
+        for the current entity and its siblings.
+        :rtype: bool
+        :return: If the relation has been loaded for the current entity,
+        in case it's not the normal (single) loading should be used.
+        """
+
+        # in case there are no siblings for the current entity
+        # there's nothing to be batched (single entity load)
+        if not self._siblings:
+            return False
+
+        # gathers the identifiers of the siblings for which the relation
+        # is still lazy (not loaded) and that share the same entities map,
+        # as only these are going to be populated by the loading query
+        id_values = []
+        for sibling in self._siblings:
+            if not sibling._entities is self._entities:
+                continue
+            if sibling.has_value(name):
+                continue
+            id_value = sibling.get_id_value()
+            if id_value == None:
+                continue
+            id_values.append(id_value)
+
+        # in case there's no other sibling to have its relation loaded
+        # the batch loading is not worth it (single entity load)
+        if len(id_values) < 2:
+            return False
+
+        # creates the map of options to load the relation for the complete
+        # set of siblings, note that the cache and minimal flags are set so
+        # that the values already set in the entities are not changed
+        cls = self.__class__
+        options = dict(
+            filters=(
+                dict(type="in", fields=(dict(name=cls.get_id(), value=id_values),)),
+            ),
+            eager=(name,),
+            entities=self._entities,
+            scope=self._scope,
+            minimal=True,
+            cache=True,
+        )
+
+        # runs the finding of the sibling entities, which populates the
+        # relation in the entities from the shared entities map and then
+        # returns if the relation is now set in the current entity
+        self._entity_manager.find(cls, options)
+        return self.has_value(name)
+
     def _load_lazy_attr(self, name, force=False):
         """
         Loads a lazy loaded base attribute, this will be used in
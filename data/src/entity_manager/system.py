@@ -81,6 +81,22 @@ reserved (special cases) for the queries """
 SEQUENCE_TYPES = (list, tuple)
 """ The tuple containing the various sequence types """
 
+BULK_SIZE = 256
+""" The maximum number of rows that are going to be inserted
+using a single (multiple row) insert query in bulk operations """
+
+STATEMENTS_LIMIT = 256
+""" The maximum number of (find) statements that are going to be
+cached per entity class, after this limit the cache is flushed """
+
+SIGNATURE_IGNORE = ("entities", "scope", "_normalized")
+""" The options keys that are ignored for the computation of the
+signature of a statement, as they don't change the generated SQL """
+
+SIGNATURE_LIMIT = ("start_record", "number_records")
+""" The options keys of the limit values, that are bound as
+parameters so only their presence is part of the signature """
+
 OPTIONS_KEYS = (
     "filters",
     "names",
@@ -99,6 +115,7 @@ OPTIONS_KEYS = (
     "scope",
     "sort",
     "order_names",
+    "batch",
     "lock",
 )
 """ The list of keys that may appear in an options map """
@@ -344,6 +361,11 @@ class EntityManager(object):
     schema created in the underlying data source and are considered
     to exist in the data source """
 
+    statements = {}
+    """ Map associating an entity class with the map of (find) statements
+    already generated for it, indexed by the signature of the options
+    and containing the placeholder based query and the field names """
+
     def __init__(
         self, entity_manager_plugin, engine_plugin, id, entities_map, options={}
     ):
@@ -377,6 +399,7 @@ class EntityManager(object):
         self.commit_callbacks = {}
         self.rollback_callbacks = {}
         self._exists = {}
+        self.statements = {}
 
         self.apply_types()
 
@@ -446,6 +469,32 @@ class EntityManager(object):
 
         return structures.EntityClass
 
+    def get_pool_class(self):
+        """
+        Retrieves the class to be used by the engines in the
+        pooling of the "physical" connections to the data source.
+
+        :rtype: ConnectionPool
+        :return: The connection pool class to be used by the
+        engines that support connection pooling.
+        """
+
+        return structures.ConnectionPool
+
+    def get_pool_stats(self):
+        """
+        Retrieves the statistics of the connection pool in use
+        by the current engine, for diagnostics purposes.
+
+        :rtype: Dictionary
+        :return: The map containing the statistics of the pool or
+        an invalid value in case the engine does not pool connections.
+        """
+
+        if not hasattr(self.engine, "get_pool_stats"):
+            return None
+        return self.engine.get_pool_stats()
+
     def get_engine_name(self):
         """
         Retrieves the engine name for the current
@@ -1127,6 +1176,7 @@ class EntityManager(object):
             return
         self._flush_callbacks(self.commit_callbacks)
         self._flush_callbacks(self.rollback_callbacks, call=False)
+        self._release()
 
     def rollback(self):
         result = self.engine.rollback()
@@ -1134,6 +1184,7 @@ class EntityManager(object):
             return
         self._flush_callbacks(self.rollback_callbacks)
         self._flush_callbacks(self.commit_callbacks, call=False)
+        self._release()
 
     def after_commit(self, callable):
         if not self.has_transaction():
@@ -1935,6 +1986,11 @@ class EntityManager(object):
         current_id = next_id - 1
         return current_id
 
+    def grab_ids(self, name, count):
+        next_id = self.increment_id(name, count=count)
+        current_id = next_id - count
+        return colony.legacy.xrange(current_id, next_id)
+
     def next_id(self, name):
         query = self._next_id_query(name)
         cursor = self.execute_query(query, False)
@@ -1944,8 +2000,8 @@ class EntityManager(object):
             cursor.close()
         return next_id
 
-    def increment_id(self, name):
-        query, next_id = self._increment_id_query(name)
+    def increment_id(self, name, count=1):
+        query, next_id = self._increment_id_query(name, count=count)
         self.execute_query(query)
         return next_id
 
@@ -2095,6 +2151,86 @@ class EntityManager(object):
             # current data (orm) operation in stack
             colony.notify_g("orm.end", identifier)
 
+    def save_many(self, entities, generate=True):
+        # generates the unique identifier of the current operation
+        # this will generate a fast oriented identifier
+        identifier = colony.unique()
+
+        # triggers a notify operation about the beginning of a new
+        # data (orm) operation to be performed (may be used for debug)
+        colony.notify_g("orm.begin", identifier, "save_many")
+
+        try:
+            # generates all the generated attributes of the entities
+            # (in case any is set to be generated), the table based
+            # identifiers are reserved in a single round trip
+            if generate:
+                self._generate_fields_many(entities)
+
+            # runs the global set of validations for each of the
+            # entities so that integrity for them is ensured
+            for entity in entities:
+                entity.validate_s()
+
+            # generates the (multiple row) queries for the saving
+            # operation and executes them in the data source
+            queries = self._save_many_query(entities)
+            self.execute_query(queries)
+
+            # maps (saves) all relations for the entities that are
+            # considered to be not mapped directly by the associated
+            # tables, the relation table rows are inserted in bulk
+            queries = self._map_many_query(entities)
+            self.execute_query(queries)
+
+            # iterates over all the entities to enable them and update
+            # their data state to saved (as in the single save)
+            for entity in entities:
+                self.enable(entity)
+                entity.data_state = SAVED_STATE_VALUE
+        finally:
+            # notifies the colony infra-structure about the ending of the
+            # current data (orm) operation in stack (includes count)
+            colony.notify_g("orm.end", identifier, len(entities))
+
+    def update_many(self, entities, immutable=True):
+        # generates the unique identifier of the current operation
+        # this will generate a fast oriented identifier
+        identifier = colony.unique()
+
+        # triggers a notify operation about the beginning of a new
+        # data (orm) operation to be performed (may be used for debug)
+        colony.notify_g("orm.begin", identifier, "update_many")
+
+        try:
+            # runs the global set of validations for each of the
+            # entities so that integrity for them is ensured
+            for entity in entities:
+                entity.validate_u()
+
+            # generates the queries for the updating operation of the
+            # complete set of entities and executes them in sequence
+            queries = []
+            for entity in entities:
+                queries.extend(self._update_query(entity, immutable=immutable))
+            self.execute_query(queries)
+
+            # maps (saves) all relations for the entities that are
+            # considered to be not mapped directly by the associated
+            # tables, the relation table rows are inserted in bulk
+            queries = self._map_many_query(entities)
+            self.execute_query(queries)
+
+            # iterates over all the entities to enable them and update
+            # their data state to updated (as in the single update)
+            for entity in entities:
+                self.enable(entity)
+                entity.data_state = UPDATED_STATE_VALUE
+        finally:
+            # notifies the colony infra-structure about the ending of the
+            # current data (orm) operation in stack (includes count)
+            colony.notify_g("orm.end", identifier, len(entities))
+
     def remove(self, entity, lock=False):
         # generates the unique identifier of the current operation
         # this will generate a fast oriented identifier
@@ -2556,8 +2692,8 @@ class EntityManager(object):
             # the provided options, the executes the query (avoiding the
             # closing of the cursor) and runs the find result operation
             # in order to obtain the proper find result entities
-            query, field_names = self._find_query(entity_class, options)
-            cursor = self.execute_query(query, False)
+            query, field_names, parameters = self._find_query(entity_class, options)
+            cursor = self.execute_query(query, False, parameters)
             try:
                 result = self._find_result(entity_class, field_names, options, cursor)
             finally:
@@ -2694,7 +2830,7 @@ class EntityManager(object):
             cursor.close()
         return result_set
 
-    def execute_query(self, query, close_cursor=True):
+    def execute_query(self, query, close_cursor=True, parameters=None):
         # checks if the current engine requires the
         # the query to have its slash characters escaped
         # in such case they must be escaped
@@ -2736,8 +2872,12 @@ class EntityManager(object):
                 query = query.replace("\\", "\\\\")
 
             # executes the query in the engine and retrieves
-            # the resulting cursor for execution
-            cursor = self.engine.execute_query(query)
+            # the resulting cursor for execution, note that the
+            # parameters are only passed in case they are set
+            if parameters:
+                cursor = self.engine.execute_query(query, parameters=parameters)
+            else:
+                cursor = self.engine.execute_query(query)
 
         # in case the close cursor flag is set
         # the cursor must be closed (avoiding leaks)
@@ -2748,6 +2888,20 @@ class EntityManager(object):
         # execution, for data retrieval
         return cursor
 
+    def _release(self):
+        # in case the engine does not support the returning of
+        # the connection to a pool there's nothing to be done
+        if not hasattr(self.engine, "release"):
+            return
+
+        # removes the (already flushed) callback lists associated
+        # with the connection as it may be re-used by another thread
+        # and then returns the connection to the engine's pool
+        connection = self.engine.connection
+        self.commit_callbacks.pop(connection, None)
+        self.rollback_callbacks.pop(connection, None)
+        self.engine.release()
+
     def _flush_callbacks(self, callbacks, call=True):
         # obtains the list of callbacks pending for the current
         # connection (for the current thread)
@@ -2845,11 +2999,68 @@ class EntityManager(object):
             # the current entity context
             generate_method(entity, generated)
 
-    def _generate_table(self, entity, name):
-        # retrieves the (entity) class associated with
-        # the entity to generate the value
-        entity_class = entity.__class__
+    def _generate_fields_many(self, entities):
+        """
+        Generates the various values for the given sequence of
+        entities, the table based values are generated using a
+        single generator round trip for each of the generator
+        field names (range of values reserved at once).
+
+        :type entities: List
+        :param entities: The sequence of entities to be used for
+        values generation, will be changed during the generation.
+        """
+
+        # creates the map that is going to associate the generator
+        # field names with the sequence of entity and name tuples
+        # that are pending a table generated value
+        pending = {}
+
+        # iterates over all the entities to generate their values,
+        # note that the table generated values are only scheduled
+        for entity in entities:
+            # retrieves the (entity) class associated with the entity
+            # and the map containing all the generated fields
+            entity_class = entity.__class__
+            generated_map = entity_class.get_generated_map()
+
+            # iterates over all the generated names to generate (or
+            # schedule) their respective values
+            for generated in generated_map:
+                # in case the entity already has a value for the current
+                # generated name no need to generate a new value
+                value = entity.get_value(generated)
+                if not value == None:
+                    continue
+
+                # uses the name (generated) to retrieve the value (map)
+                # containing the definition of the attribute and the
+                # generator type that is going to be used
+                generated_value = getattr(entity_class, generated)
+                generator_type = generated_value.get("generator_type", "table")
+
+                # in case the generator type is not table the value is
+                # generated immediately as no round trip is required
+                if not generator_type == "table":
+                    generate_method = getattr(self, "_generate_" + generator_type)
+                    generate_method(entity, generated)
+                    continue
 
+                # retrieves the field name of the generator for the name
+                # and schedules the entity for the generation of the value
+                field_name = self._generator_field_name(entity_class, generated)
+                if not field_name in pending:
+                    pending[field_name] = []
+                pending[field_name].append((entity, generated))
+
+        # iterates over all the pending generator field names to reserve
+        # the complete range of values at once and set them in the entities
+        for field_name, items in colony.legacy.iteritems(pending):
+            values = self.grab_ids(field_name, len(items))
+            for (entity, name), value in zip(items, values):
+                entity.set_value(name, int(value))
+
+    def _generator_field_name(self, entity_class, name):
         # uses the name to retrieve the value (map)
         # containing the definition of the attribute
         value = getattr(entity_class, name)
@@ -2867,9 +3078,17 @@ class EntityManager(object):
         field_name = "%s_%s" % (table_name, name)
 
         # tries to retrieves the (generator) field name defaulting
-        # to the name of the default field name, then "grabs" an id
-        # value for the selected field name
-        field_name = value.get("generator_field_name", field_name)
+        # to the name of the default field name
+        return value.get("generator_field_name", field_name)
+
+    def _generate_table(self, entity, name):
+        # retrieves the (entity) class associated with
+        # the entity to generate the value
+        entity_class = entity.__class__
+
+        # retrieves the field name to be used in the generator
+        # and then "grabs" an id value for the selected field name
+        field_name = self._generator_field_name(entity_class, name)
         value = self.grab_id(field_name)
         value = int(value)
 
@@ -2976,7 +3195,7 @@ class EntityManager(object):
         # (casted into a single value)
         return id_value
 
-    def _increment_id_query(self, name):
+    def _increment_id_query(self, name, count=1):
         # retrieves the current next id value
         next_id = self.next_id(name)
 
@@ -2995,9 +3214,9 @@ class EntityManager(object):
             # sets the initial id value, the value should
             # be greater or equal to one plus one in order to avoid
             # enumeration validation collision, this value should
-            # reflect the second value in the chain (because it's
-            # the next value in chain)
-            next_id = 2
+            # reflect the value after the reserved ones in the chain
+            # (because it's the next value in chain)
+            next_id = 1 + count
 
             # creates the query to save a new entry in the generator
             # table setting the initial next id value and the initial
@@ -3012,9 +3231,9 @@ class EntityManager(object):
         # table in the data source, and so an update is the
         # necessary operation (update query)
         else:
-            # increments the next id value by one, this will
-            # be the "new" next id value
-            next_id += 1
+            # increments the next id value by the number of reserved
+            # values, this will be the "new" next id value
+            next_id += count
 
             # creates the query to update the generator table set
             # the new next id and update the modification time
@@ -3256,7 +3475,7 @@ class EntityManager(object):
         # returns the generated "dropping" query
         return query
 
-    def _save_query(self, entity):
+    def _save_query(self, entity, rows=None):
         # retrieves the entity class associated with
         # the entity
         entity_class = entity.__class__
@@ -3356,8 +3575,11 @@ class EntityManager(object):
             is_first = not is_first and query_buffer.write(", ")
             query_buffer.write("_mtime")
 
-            # writes the values middle part of the insert query
-            query_buffer.write(") values(")
+            # writes the end of the names part of the insert query and
+            # creates the buffer that is going to hold the values part
+            query_buffer.write(")")
+            values_buffer = colony.StringBuffer()
+            values_buffer.write("(")
 
             # sets the is first flag for the query
             # generation (provides way control comma)
@@ -3402,7 +3624,7 @@ class EntityManager(object):
 
                 # writes the comma to the query buffer only in case the
                 # is first flag is not set
-                is_first = not is_first and query_buffer.write(", ")
+                is_first = not is_first and values_buffer.write(", ")
 
                 # validates that the current field attribute
                 # contains the appropriate type for the
@@ -3413,7 +3635,7 @@ class EntityManager(object):
                 # retrieves the SQL value for the field and writes
                 # it into the save query
                 sql_value = entity.get_sql_value(field_name, field_value, force=True)
-                query_buffer.write(sql_value)
+                values_buffer.write(sql_value)
 
             # in case the entity class has no parents (it's
             # the top level class) time to write the class
@@ -3421,10 +3643,10 @@ class EntityManager(object):
             if not _entity_class.has_parents():
                 # writes the comma to the query buffer only in case the
                 # is first flag is not set
-                is_first = not is_first and query_buffer.write(", ")
+                is_first = not is_first and values_buffer.write(", ")
 
                 # writes the class column value into the insert query
-                query_buffer.write("'%s'" % entity_class.__name__)
+                values_buffer.write("'%s'" % entity_class.__name__)
 
             # retrieves the proper modification time either from
             # the entity or from the current system time, this allows
@@ -3434,20 +3656,125 @@ class EntityManager(object):
             # writes the comma to the query buffer only in case the
             # is first flag is not set, then writes the modified time
             # into the insert query
-            is_first = not is_first and query_buffer.write(", ")
-            query_buffer.write("%f" % _mtime)
+            is_first = not is_first and values_buffer.write(", ")
+            values_buffer.write("%f" % _mtime)
+
+            # writes the "final" values character
+            values_buffer.write(")")
+
+            # retrieves both the prefix of the query (table and names)
+            # and the values part of it from the buffers
+            prefix = query_buffer.get_value()
+            values = values_buffer.get_value()
+
+            # in case the rows list is provided (bulk mode) the prefix
+            # and the values are added to it, to be latter inserted
+            # using a multiple row query, otherwise the query is created
+            if not rows == None:
+                rows.append((prefix, values))
+            else:
+                query = prefix + " values" + values
+                queries.append(query)
 
-            # writes the "final" save query character
-            query_buffer.write(")")
+        # returns the generated "insert" set of
+        # queries (multiple inserts)
+        return queries
 
-            # retrieves the "final" query value from
-            # the query (string) buffer and adds it
-            # to the list of queries
-            query = query_buffer.get_value()
-            queries.append(query)
+    def _save_many_query(self, entities):
+        # creates the list of blocks, each of them holding the runs
+        # (prefix and values) of consecutive entities that share the
+        # same sequence of insert prefixes (same structure)
+        blocks = []
+
+        # iterates over all the entities to gather the rows for their
+        # insertion and merge them into the blocks, note that in bulk
+        # mode no queries are returned by the save query generation
+        for entity in entities:
+            rows = []
+            self._save_query(entity, rows=rows)
+            self._merge_rows(blocks, rows)
+
+        # creates the multiple row insert queries for the blocks, in
+        # the original order of the entities, and returns them
+        return self._insert_many_query(blocks)
+
+    def _map_many_query(self, entities):
+        # creates the list to hold the set of queries and the
+        # ordered maps that are going to associate the insert
+        # prefixes with the values to be inserted under them
+        # and the relation tables with the ids to be deleted
+        queries = []
+        blocks = []
+        deletes = colony.OrderedMap()
+
+        # iterates over all the entities to gather the map queries
+        # (updates), the relation table rows and the ids for which
+        # the relation table rows are going to be deleted
+        for entity in entities:
+            rows = []
+            queries.extend(self._map_query(entity, rows=rows, deletes=deletes))
+            self._merge_rows(blocks, rows)
+
+        # creates the delete queries for the relation tables in bulk
+        # (using the in operator) so that the relation rows are removed
+        # before the inserts are executed
+        for (relation_unique, table_name), id_sql_values in deletes.items():
+            for index in colony.legacy.xrange(0, len(id_sql_values), BULK_SIZE):
+                _id_sql_values = id_sql_values[index : index + BULK_SIZE]
+                query = "delete from %s where %s in (%s)" % (
+                    relation_unique,
+                    table_name,
+                    ", ".join(_id_sql_values),
+                )
+                queries.append(query)
+
+        # creates the multiple row insert queries for the gathered
+        # blocks and returns the complete set of queries
+        queries.extend(self._insert_many_query(blocks))
+        return queries
+
+    def _merge_rows(self, blocks, rows):
+        # groups the consecutive rows (of the entity) that share the
+        # same prefix into runs, keeping the order of the rows
+        runs = []
+        for prefix, values in rows:
+            if runs and runs[-1][0] == prefix:
+                runs[-1][1].append(values)
+            else:
+                runs.append((prefix, [values]))
+
+        # retrieves the last block and in case the sequence of prefixes
+        # of its runs matches the one of the new runs, these are merged
+        # into the block (consecutive entities with the same structure)
+        # so that the original order of the statements is kept
+        block = blocks[-1] if blocks else None
+        prefixes = [prefix for prefix, _values in runs]
+        if block and [prefix for prefix, _values in block] == prefixes:
+            for run, (_prefix, values) in zip(block, runs):
+                run[1].extend(values)
+
+        # otherwise the runs are added as a new block (no merge
+        # is possible with the previous statements)
+        elif runs:
+            blocks.append(runs)
+
+    def _insert_many_query(self, blocks):
+        # creates the list to hold the set of queries generated
+        # for the multiple row inserts
+        queries = []
+
+        # iterates over all the runs of the blocks (in order) to create
+        # the insert queries, each of them with a maximum number of rows
+        # (bulk size) to avoid large queries
+        for block in blocks:
+            for prefix, values in block:
+                for index in colony.legacy.xrange(0, len(values), BULK_SIZE):
+                    _values = values[index : index + BULK_SIZE]
+                    query = prefix + " values" + ", ".join(_values)
+                    queries.append(query)
 
         # returns the generated "insert" set of
-        # queries (multiple inserts)
+        # queries (multiple row inserts)
         return queries
 
     def _update_query(self, entity, immutable=True, safe=True):
@@ -3686,7 +4013,7 @@ class EntityManager(object):
         # queries (multiple deletes)
         return queries
 
-    def _map_query(self, entity):
+    def _map_query(self, entity, rows=None, deletes=None):
         # retrieves the entity class associated with
         # the entity
         entity_class = entity.__class__
@@ -3771,15 +4098,25 @@ class EntityManager(object):
                 if not is_to_many:
                     relation_value = [relation_value]
 
-                # creates the query to delete the rows that are currently
-                # associated with the entity, then adds the query to the
-                # list of queries to be executed
-                query = "delete from %s where %s = %s" % (
-                    relation_unique,
-                    table_name,
-                    id_sql_value,
-                )
-                queries.append(query)
+                # in case the deletes map is provided (bulk mode) the id of
+                # the entity is added to it so that the rows currently
+                # associated with the entity are deleted in bulk
+                if not deletes == None:
+                    key = (relation_unique, table_name)
+                    if not key in deletes:
+                        deletes[key] = []
+                    deletes[key].append(id_sql_value)
+
+                # otherwise creates the query to delete the rows that are
+                # currently associated with the entity, then adds the query
+                # to the list of queries to be executed
+                else:
+                    query = "delete from %s where %s = %s" % (
+                        relation_unique,
+                        table_name,
+                        id_sql_value,
+                    )
+                    queries.append(query)
 
                 # iterates over all the relation values to update the
                 # appropriate relation table
@@ -3805,17 +4142,24 @@ class EntityManager(object):
                         or "null"
                     )
 
-                    # creates the query to be used to insert the various values
-                    # into the relation table with the appropriates casts and
-                    # then appends it to the list of queries to be executed
-                    query = "insert into %s (%s, %s) values(%s, %s)" % (
+                    # creates the prefix and the values of the query to be used
+                    # to insert the various values into the relation table with
+                    # the appropriates casts
+                    prefix = "insert into %s (%s, %s)" % (
                         relation_unique,
                         table_name,
                         target_name,
-                        id_sql_value,
-                        relation_id_sql_value,
                     )
-                    queries.append(query)
+                    values = "(%s, %s)" % (id_sql_value, relation_id_sql_value)
+
+                    # in case the rows list is provided (bulk mode) the prefix
+                    # and the values are added to it, otherwise the query is
+                    # created and added to the list of queries to be executed
+                    if not rows == None:
+                        rows.append((prefix, values))
+                    else:
+                        query = prefix + " values" + values
+                        queries.append(query)
 
         # iterates over all the entity classes and direct relations
         # in the direct relations map to create the map queries for all
@@ -4073,9 +4417,30 @@ class EntityManager(object):
         # map of values
         options = self.normalize_options(options)
 
+        # retrieves the parameter marker for the current engine, in
+        # case there's one the values are going to be bound by the
+        # driver and the statement (shape) may be cached for the
+        # signature of the options (values are not part of it)
+        marker = self._parameter_marker()
+        signature = self._signature(options) if marker else None
+        statements = self.statements.get(entity_class, {})
+        statement = statements.get(signature, None) if signature else None
+
+        # in case there's a cached statement for the signature only
+        # the filter part of the query is processed, so that the
+        # parameters are collected in the same order as the markers
+        if statement:
+            query, field_names = statement
+            query_buffer = QueryBuffer(marker)
+            self._filter_query_f(entity_class, options, query_buffer)
+            self._limit_query_f(entity_class, options, query_buffer)
+            parameters = tuple(query_buffer.parameters)
+            return query, list(field_names), parameters
+
         # creates the string buffer to hold the select query
-        # and write the initial select token
-        query_buffer = colony.StringBuffer()
+        # and write the initial select token, note that the
+        # query buffer is used in case parameters are supported
+        query_buffer = QueryBuffer(marker) if marker else colony.StringBuffer()
         query_buffer.write("select ")
 
         # writes the part of find query dedicated to the selecting
@@ -4116,10 +4481,22 @@ class EntityManager(object):
         # the query (string) buffer
         query = query_buffer.get_value()
 
-        # returns the generated "finding" query
-        # and list containing the field names in
-        # the order used in the select statement
-        return query, field_names
+        # retrieves the sequence of parameters that were collected
+        # during the generation of the query (if any)
+        parameters = tuple(query_buffer.parameters) if marker else None
+
+        # in case the statement is considered to be cacheable it's
+        # stored for the signature (flushing the cache on overflow)
+        if signature and query_buffer.cacheable:
+            if len(statements) >= STATEMENTS_LIMIT:
+                statements.clear()
+            statements[signature] = (query, list(field_names))
+            self.statements[entity_class] = statements
+
+        # returns the generated "finding" query, the
+        # list containing the field names in the order
+        # used in the select statement and the parameters
+        return query, field_names, parameters
 
     def _names_query_f(self, entity_class, options, query_buffer):
         # retrieves the associated table as the id
@@ -4923,7 +5300,7 @@ class EntityManager(object):
             # writes the offset part of the filter query
             # according to the defined number of records
             query_buffer.write(" limit ")
-            query_buffer.write(str(number_records))
+            self._write_limit_value(number_records, query_buffer)
 
         # writes the offset part of the query to set the offset
         # according to the options defined offset, in case no
@@ -4932,7 +5309,18 @@ class EntityManager(object):
             # writes the offset part of the filter query
             # according to the defined start record
             query_buffer.write(" offset ")
-            query_buffer.write(str(start_record))
+            self._write_limit_value(start_record, query_buffer)
+
+    def _write_limit_value(self, value, query_buffer):
+        # in case the query buffer is collecting parameters the value is
+        # bound by the driver, so that the statement is the same for all
+        # the pages of a paginated find, otherwise the value is inlined
+        parameters = getattr(query_buffer, "parameters", None)
+        if parameters == None:
+            query_buffer.write(str(value))
+            return
+        parameters.append(value)
+        query_buffer.write(query_buffer.marker)
 
     def _lock_query_f(self, entity_class, options, query_buffer):
         # tries to retrieve the lock option from the options map
@@ -4976,6 +5364,87 @@ class EntityManager(object):
         # taking into account the collation for the current engine
         query_buffer.write(" collate %s" % collation)
 
+    def _parameter_marker(self):
+        # verifies if the current engine is able to provide a marker
+        # for the driver level parameters, in case it's not the values
+        # are going to be inlined in the query (no parameters)
+        if not hasattr(self.engine, "_parameter_marker"):
+            return None
+        return self.engine._parameter_marker()
+
+    def _signature(self, options):
+        # in case the lock flag is set the statement is not meant
+        # to be cached as the locking of the tables is a side effect
+        # of the generation of the query (for some engines)
+        if options.get("lock", False):
+            return None
+
+        # "freezes" the options into an hashable structure where
+        # the filter values are replaced by their "shape", in case
+        # that's not possible (unhashable value) no signature is used
+        signature = self._freeze(options)
+        try:
+            hash(signature)
+        except TypeError:
+            return None
+        return signature
+
+    def _freeze(self, value, key=None):
+        # in case the value refers a filter value only its shape is
+        # relevant for the statement (number of markers for sequences)
+        if key == "value":
+            return len(value) if type(value) in SEQUENCE_TYPES else None
+
+        # in case the value is a limit one (bound as a parameter) only
+        # its presence is relevant, so that pages share the statement
+        if key in SIGNATURE_LIMIT:
+            return value > -1
+
+        # retrieves the type of the value to be frozen and uses it
+        # to convert maps and sequences into (sorted) tuples
+        value_type = type(value)
+        if value_type == dict:
+            items = [
+                (_key, self._freeze(_value, _key))
+                for _key, _value in colony.legacy.iteritems(value)
+                if not _key in SIGNATURE_IGNORE
+            ]
+            items.sort(key=lambda item: item[0])
+            return tuple(items)
+        if value_type in SEQUENCE_TYPES:
+            return tuple(self._freeze(_value) for _value in value)
+        return value
+
+    def _process_sql_value(self, entity_class, name, value, query_buffer):
+        # in case the query buffer is not collecting parameters (no
+        # driver level parameters) the value is inlined in the query
+        parameters = getattr(query_buffer, "parameters", None)
+        if parameters == None:
+            return entity_class._get_sql_value(name, value)
+
+        # in case the name is a reserved one the value is inlined and
+        # the statement can no longer be cached (value dependent)
+        if name in RESERVED_NAMES:
+            query_buffer.cacheable = False
+            return entity_class._get_sql_value(name, value)
+
+        # adds the driver compatible value to the sequence of parameters
+        # and returns the marker to be written in the query
+        parameters.append(entity_class._get_sql_parameter(name, value))
+        return query_buffer.marker
+
+    def _process_sql_parameter(self, value, sql_value, query_buffer):
+        # in case the query buffer is not collecting parameters the
+        # (already converted) SQL value is returned to be inlined
+        parameters = getattr(query_buffer, "parameters", None)
+        if parameters == None:
+            return sql_value
+
+        # adds the (raw) value to the sequence of parameters and
+        # returns the marker to be written in the query
+        parameters.append(value)
+        return query_buffer.marker
+
     def _process_filter(
         self, entity_class, table_name, filter, query_buffer, is_first=True
     ):
@@ -5121,8 +5590,8 @@ class EntityManager(object):
 
             # converts the filter field value into an appropriate SQL representation
             # and writes the filter into the SQL query value
-            filter_field_sql_value = entity_class._get_sql_value(
-                filter_field_name, filter_field_value
+            filter_field_sql_value = self._process_sql_value(
+                entity_class, filter_field_name, filter_field_value, query_buffer
             )
             query_buffer.write(field_name + " = " + filter_field_sql_value)
 
@@ -5172,8 +5641,8 @@ class EntityManager(object):
 
             # converts the filter field value into an appropriate SQL representation
             # and writes the filter into the SQL query value
-            filter_field_sql_value = entity_class._get_sql_value(
-                filter_field_name, filter_field_value
+            filter_field_sql_value = self._process_sql_value(
+                entity_class, filter_field_name, filter_field_value, query_buffer
             )
             query_buffer.write("not " + field_name + " = " + filter_field_sql_value)
 
@@ -5230,7 +5699,9 @@ class EntityManager(object):
             # creates the SQL value for the filter field to be used in the in filter
             # this value is a list of values casted with the proper SQL value
             filter_field_sql_value_list = [
-                entity_class._get_sql_value(filter_field_name, value)
+                self._process_sql_value(
+                    entity_class, filter_field_name, value, query_buffer
+                )
                 for value in filter_field_value
             ]
             filter_field_sql_value = "(" + ", ".join(filter_field_sql_value_list) + ")"
@@ -5292,7 +5763,9 @@ class EntityManager(object):
             # creates the SQL value for the filter field to be used in the in filter
             # this value is a list of values casted with the proper SQL value
             filter_field_sql_value_list = [
-                entity_class._get_sql_value(filter_field_name, value)
+                self._process_sql_value(
+                    entity_class, filter_field_name, value, query_buffer
+                )
                 for value in filter_field_value
             ]
             filter_field_sql_value = "(" + ", ".join(filter_field_sql_value_list) + ")"
@@ -5347,11 +5820,8 @@ class EntityManager(object):
             entity_class._validate_value(filter_field_name, filter_field_value)
 
             # validates the filter field value defaulting to an empty
-            # string in case an invalid value is found and then
-            # escapes the filter field value, to remove any
-            # possible problem (or injection) in the value field
+            # string in case an invalid value is found
             filter_field_value = filter_field_value or ""
-            filter_field_value = self._escape_text(filter_field_value)
 
             # process the "complete" table name (includes back relation references)
             # and then uses it to construct the complete field name
@@ -5387,40 +5857,35 @@ class EntityManager(object):
                 # the filter field value buffer
                 filter_field_value_buffer.write(splitted_filter_value)
 
-            # writes the initial part of the like operand
-            # in the query buffer
-            query_buffer.write(field_name + " like ")
-
-            # in case the like type is left
-            # or both, the initial part must be wildcard
+            # in case the like type is left or both, the initial
+            # part of the pattern must be wildcard
             if like_type in ("left", "both") and left:
-                # writes the wildcard to the query
-                # buffer
-                query_buffer.write("'%")
-            # otherwise no wildcard is set at the
-            # initial (left) part of the string
+                filter_field_value_string = "%"
             else:
-                # writes the initial string to the
-                # query buffer
-                query_buffer.write("'")
+                filter_field_value_string = ""
 
             # retrieves the filter field value string (from buffer) and
-            # writes it into the query buffer
-            filter_field_value_string = filter_field_value_buffer.get_value()
-            query_buffer.write(filter_field_value_string)
+            # adds it to the pattern that is being constructed
+            filter_field_value_string += filter_field_value_buffer.get_value()
 
-            # in case the like type is right
-            # or both, the final part must be wildcard
+            # in case the like type is right or both, the final
+            # part of the pattern must be wildcard
             if like_type in ("right", "both") and right:
-                # writes the wildcard to the query
-                # buffer
-                query_buffer.write("%'")
-            # otherwise no wildcard is set at the
-            # final (right) part of the string
-            else:
-                # writes the final string to the
-                # query buffer
-                query_buffer.write("'")
+                filter_field_value_string += "%"
+
+            # escapes the pattern string, to remove any possible
+            # problem (or injection) in the value field, and uses
+            # it as the SQL value in case no parameters are used
+            filter_field_sql_value = (
+                "'" + self._escape_text(filter_field_value_string) + "'"
+            )
+            filter_field_sql_value = self._process_sql_parameter(
+                filter_field_value_string, filter_field_sql_value, query_buffer
+            )
+
+            # writes the complete like operand (with the pattern
+            # value) in the query buffer
+            query_buffer.write(field_name + " like " + filter_field_sql_value)
 
             # in case the collate flat is set, the case insensitive collation
             # mode is enabled so that a more broad search is enabled
@@ -5481,8 +5946,8 @@ class EntityManager(object):
 
             # converts the filter field value into an appropriate SQL representation
             # and writes the filter into the SQL query value
-            filter_field_sql_value = entity_class._get_sql_value(
-                filter_field_name, filter_field_value
+            filter_field_sql_value = self._process_sql_value(
+                entity_class, filter_field_name, filter_field_value, query_buffer
             )
             query_buffer.write(field_name + " > " + filter_field_sql_value)
 
@@ -5532,8 +5997,8 @@ class EntityManager(object):
 
             # converts the filter field value into an appropriate SQL representation
             # and writes the filter into the SQL query value
-            filter_field_sql_value = entity_class._get_sql_value(
-                filter_field_name, filter_field_value
+            filter_field_sql_value = self._process_sql_value(
+                entity_class, filter_field_name, filter_field_value, query_buffer
             )
             query_buffer.write(field_name + " >= " + filter_field_sql_value)
 
@@ -5581,8 +6046,8 @@ class EntityManager(object):
 
             # converts the filter field value into an appropriate SQL representation
             # and writes the filter into the SQL query value
-            filter_field_sql_value = entity_class._get_sql_value(
-                filter_field_name, filter_field_value
+            filter_field_sql_value = self._process_sql_value(
+                entity_class, filter_field_name, filter_field_value, query_buffer
             )
             query_buffer.write(field_name + " < " + filter_field_sql_value)
 
@@ -5632,8 +6097,8 @@ class EntityManager(object):
 
             # converts the filter field value into an appropriate SQL representation
             # and writes the filter into the SQL query value
-            filter_field_sql_value = entity_class._get_sql_value(
-                filter_field_name, filter_field_value
+            filter_field_sql_value = self._process_sql_value(
+                entity_class, filter_field_name, filter_field_value, query_buffer
             )
             query_buffer.write(field_name + " <= " + filter_field_sql_value)
 
@@ -5811,9 +6276,14 @@ class EntityManager(object):
             top_timestamp = base_timestamp + 86400
 
             # converts both the base timestamp and the top timestamp
-            # to the string representation (normal conversion)
-            base_timestamp = str(base_timestamp)
-            top_timestamp = str(top_timestamp)
+            # to the string representation (normal conversion) or to
+            # the parameter markers in case parameters are used
+            base_timestamp = self._process_sql_parameter(
+                base_timestamp, str(base_timestamp), query_buffer
+            )
+            top_timestamp = self._process_sql_parameter(
+                top_timestamp, str(top_timestamp), query_buffer
+            )
 
             # creates the SQL query using the float base interval range to constrain
             # the domain of the result to a certain day range
@@ -5968,6 +6438,7 @@ class EntityManager(object):
         scope = options.get("scope", None)
         sort = options.get("sort", True)
         cache = options.get("cache", False)
+        batch = options.get("batch", True)
 
         # creates the map that will hold the various
         # retrieved entities, organized by entity class,
@@ -6243,6 +6714,12 @@ class EntityManager(object):
                     attribute_name, item_value, encoding=database_encoding
                 )
 
+        # in case the batch flag is set the visited entities are
+        # registered as siblings of each other (per class) so that
+        # their lazy relations are loaded together (single query)
+        if batch:
+            self._set_siblings_e(_visited_map)
+
         # in case the sort flag is not set no need to
         # continue (only sorting is missing) returns
         # the list of retrieved entities immediately
@@ -6580,6 +7057,43 @@ class EntityManager(object):
         # the final result set (ordered list)
         return _entities_list, _entities_map, _visited_map
 
+    def _set_siblings_e(self, visited_map):
+        """
+        Groups the provided visited entities (from the same query)
+        by their class and sets each group as the siblings of the
+        entities contained in it.
+
+        The siblings of an entity are used to load a lazy relation
+        for all of them at once (batch), avoiding a query for each
+        of the entities (N+1 problem).
+
+        Entities that already have siblings (from a previous query
+        in the same diffusion scope) keep them unchanged.
+
+        :type visited_map: Dictionary
+        :param visited_map: The map containing the tuples of entity
+        and class for the entities visited in the unpack operation.
+        """
+
+        # creates the map that is going to hold the list of entities
+        # (siblings) for each of the classes and populates it with the
+        # entities that don't have their siblings set yet
+        siblings_map = {}
+        for entity, entity_class in colony.legacy.values(visited_map):
+            if entity._siblings:
+                continue
+            siblings = siblings_map.setdefault(entity_class, [])
+            siblings.append(entity)
+
+        # iterates over the complete set of sibling groups to set
+        # them in the entities, note that single entity groups are
+        # ignored as there's nothing to batch in such case
+        for siblings in colony.legacy.values(siblings_map):
+            if len(siblings) < 2:
+                continue
+            for entity in siblings:
+                entity._siblings = siblings
+
     def _sort_to_many_e(self, entity, entity_class, options, visited=None):
         # retrieves the reference to the eager loaded relations
         # for the current result set, these are going to be the
@@ -6748,6 +7262,35 @@ class EntityManager(object):
                 # are at least ordered by their identifier value (some order)
                 value.sort(key=lambda item: item.get(target_id, None))
 
+    def _verify_many(self, entities):
+        # creates the list that will hold the result of the verification
+        # of each of the entities and the map that associates the entity
+        # classes with the indexes of the entities of that class
+        exists = [False] * len(entities)
+        indexes_map = {}
+
+        # iterates over all the entities to group their indexes
+        # by entity class (verification is done per class)
+        for index, entity in enumerate(entities):
+            entity_class = entity.__class__
+            if not entity_class in indexes_map:
+                indexes_map[entity_class] = []
+            indexes_map[entity_class].append(index)
+
+        # iterates over all the entity classes to verify the entities
+        # in chunks (bulk size), setting the result for each of them
+        for entity_class, indexes in colony.legacy.iteritems(indexes_map):
+            for index in colony.legacy.xrange(0, len(indexes), BULK_SIZE):
+                _indexes = indexes[index : index + BULK_SIZE]
+                id_value = tuple(entities[_index].get_id_value() for _index in _indexes)
+                result = self.verify(entity_class, id_value)
+                for _index, _exists in zip(_indexes, result):
+                    exists[_index] = _exists
+
+        # returns the list containing the verification result
+        # for each of the entities (in the same order)
+        return exists
+
     def _import_class(self, entity_class, serializer, data, full_mode, depth=1):
         # loads the various entity maps from the data
         # using the currently "selected" serializer, this
@@ -6786,8 +7329,14 @@ class EntityManager(object):
         self.begin()
 
         try:
-            # iterates over all the entity reference to persist
-            # them correctly into the data source
+            # creates the list that will hold the (unique) relation
+            # values of the entities and the set of keys (class and
+            # identifier) used to avoid duplicated values
+            values = []
+            values_keys = set()
+
+            # iterates over all the entity reference to gather
+            # the relation values that may have to be persisted
             for entity in entities:
                 # retrieves the complete set of relation names
                 # for the entity class so that is possible to
@@ -6795,7 +7344,7 @@ class EntityManager(object):
                 relations = entity_class.get_all_relations()
 
                 # iterates over all the relations in the entity
-                # to process them and persist them in case it's
+                # to process them and gather the values in case it's
                 # necessary for relation
                 for relation in relations:
                     # retrieves the value for the relation and
@@ -6810,23 +7359,30 @@ class EntityManager(object):
                         value = [value]
 
                     # iterates over all the relation values (entities)
-                    # to process them (verify if they exist and save
-                    # if they don't)
+                    # to add them to the list of values (avoiding duplicates)
                     for _value in value:
-                        # retrieves the entity class and the id value
-                        # for the current iteration value
-                        _entity_class = _value.__class__
-                        id_value = _value.get_id_value()
-
-                        # verifies if the current entity value already
-                        # exists in the data source and if does not saves it
-                        if self.verify(_entity_class, id_value):
+                        key = (_value.__class__, _value.get_id_value())
+                        if key in values_keys:
                             continue
-                        self.save(_value, generate=False)
-
-                # saves or updates the current entity values
-                # into the data source
-                self.save_update(entity, generate=False)
+                        values_keys.add(key)
+                        values.append(_value)
+
+            # verifies which of the relation values already exist in
+            # the data source and saves the ones that do not (bulk)
+            exists = self._verify_many(values)
+            values = [_value for _value, _exists in zip(values, exists) if not _exists]
+            self.save_many(values, generate=False)
+
+            # verifies which of the entities already exist in the
+            # data source and saves or updates them accordingly
+            exists = self._verify_many(entities)
+            self.save_many(
+                [entity for entity, _exists in zip(entities, exists) if not _exists],
+                generate=False,
+            )
+            self.update_many(
+                [entity for entity, _exists in zip(entities, exists) if _exists]
+            )
         except:
             # "rollsback" the transaction and re-raises the exception
             # to be caught at the upper levels
@@ -8080,3 +8636,37 @@ class EntityManager(object):
         first_name = first_class.get_name()
         second_name = second_class.get_name()
         return cmp(first_name, second_name)  # @UndefinedVariable
+
+
+class QueryBuffer(colony.StringBuffer):
+    """
+    Specialized string buffer used for the generation of
+    parameterized queries, it keeps track of the values that
+    are going to be bound by the driver upon execution.
+    """
+
+    marker = None
+    """ The marker (placeholder) to be written in the query
+    for each of the values that are going to be bound """
+
+    parameters = []
+    """ The sequence of values collected during the generation
+    of the query, in the same order as the markers """
+
+    cacheable = True
+    """ If the generated query may be cached for later re-use,
+    this is not the case if a value is inlined in the query """
+
+    def __init__(self, marker, *args, **kwargs):
+        """
+        Constructor of the class.
+
+        :type marker: String
+        :param marker: The marker (placeholder) to be used for
+        the values to be bound by the driver.
+        """
+
+        colony.StringBuffer.__init__(self, *args, **kwargs)
+        self.marker = marker
+        self.parameters = []
+        self.cacheable = True
@@ -28,6 +28,10 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import json
+import time
+import threading
+
 import colony
 
 from . import mocks
@@ -41,7 +45,11 @@ class EntityManagerTest(colony.Test):
     """
 
     def get_bundle(self):
-        return (EntityManagerBaseTestCase, EntityManagerRsetTestCase)
+        return (
+            EntityManagerBaseTestCase,
+            EntityManagerRsetTestCase,
+            EntityManagerPoolTestCase,
+        )
 
     def set_up(self, test_case):
         colony.Test.set_up(self, test_case)
@@ -1511,6 +1519,343 @@ class EntityManagerBaseTestCase(colony.ColonyTestCase):
         self.assertEqual(person.name, cached_person.name)
         self.assertEqual(cached_person.name, "name_person")
 
+    def test_batch(self):
+        # creates the required entity classes in the data source
+        self.entity_manager.create(mocks.Person)
+        self.entity_manager.create(mocks.Dog)
+        self.entity_manager.create(mocks.Employee)
+
+        # creates a series of persons (one of them without dogs)
+        # and associates dogs with the other ones, saving all of
+        # them in the data source for the batch loading test
+        for index in range(4):
+            person = mocks.Person()
+            person.object_id = index + 1
+            person.name = "name_person_%d" % index
+            self.entity_manager.save(person)
+
+            for _index in range(index):
+                dog = mocks.Dog()
+                dog.object_id = (index + 1) * 10 + _index
+                dog.name = "name_dog_%d" % _index
+                dog.owner = person
+                self.entity_manager.save(dog)
+
+        # wraps the query execution method of the entity manager
+        # so that the number of executed queries may be counted
+        queries = []
+        execute_query = self.entity_manager.execute_query
+
+        def _execute_query(query, *args, **kwargs):
+            queries.append(query)
+            return execute_query(query, *args, **kwargs)
+
+        self.entity_manager.execute_query = _execute_query
+
+        # retrieves the complete set of persons and verifies that the
+        # loading of the dogs relation for all of them is done using a
+        # single query (batch loading of the lazy relation)
+        persons = self.entity_manager.find(
+            mocks.Person, dict(order_by=(("object_id", "ascending"),))
+        )
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(persons), 4)
+
+        dogs = [person.dogs for person in persons]
+        self.assertEqual(len(queries), 2)
+        self.assertEqual([len(_dogs) for _dogs in dogs], [0, 1, 2, 3])
+        self.assertEqual([dog.object_id for dog in dogs[3]], [40, 41, 42])
+
+        # verifies that the dogs loaded in batch are siblings of each other
+        # and so the owner relation is loaded for all of them at once
+        self.assertEqual(dogs[2][0].owner, persons[2])
+        self.assertEqual(len(queries), 3)
+
+        # retrieves the complete set of dogs and verifies that the owners
+        # of them are loaded in a single query and that the owner instances
+        # are shared between the dogs (same diffusion scope)
+        dogs = self.entity_manager.find(
+            mocks.Dog, dict(order_by=(("object_id", "ascending"),))
+        )
+        owners = [dog.owner for dog in dogs]
+        self.assertEqual(len(queries), 5)
+        self.assertEqual([owner.object_id for owner in owners], [2, 3, 3, 4, 4, 4])
+        self.assertEqual(id(owners[1]), id(owners[2]))
+
+        # retrieves a single person and verifies that the lazy relation
+        # is loaded using the normal (single) loading strategy
+        person = self.entity_manager.get(mocks.Person, 4)
+        self.assertEqual(person._siblings, None)
+        self.assertEqual(len(person.dogs), 3)
+        self.assertEqual(len(queries), 7)
+
+        # retrieves the complete set of persons with the batch mode
+        # disabled and verifies that a query is executed for each
+        # of the lazy relations that are accessed
+        persons = self.entity_manager.find(mocks.Person, dict(batch=False))
+        dogs = [person.dogs for person in persons]
+        self.assertEqual(len(queries), 12)
+
+    def test_save_many(self):
+        # creates the required entity classes in the data source
+        self.entity_manager.create(mocks.Person)
+        self.entity_manager.create(mocks.Employee)
+        self.entity_manager.create(mocks.Car)
+
+        # creates a series of cars with no identifier and saves them
+        # in bulk, verifying that the identifiers are generated in
+        # sequence (single generator range reservation)
+        cars = []
+        for index in range(3):
+            car = mocks.Car()
+            car.name = "name_car_%d" % index
+            cars.append(car)
+        self.entity_manager.save_many(cars)
+        object_ids = [car.object_id for car in cars]
+        self.assertEqual(object_ids, list(range(object_ids[0], object_ids[0] + 3)))
+
+        # creates a series of persons (with cars) and employees (multiple
+        # table inheritance) and saves them in bulk, counting the number
+        # of executed queries so that the bulk nature is verified, note
+        # that only consecutive entities of the same class are merged
+        persons = []
+        for index in range(20):
+            person = mocks.Employee() if index >= 10 else mocks.Person()
+            person.name = "name_person_%d" % index
+            person.cars = cars[: index % 4]
+            persons.append(person)
+
+        queries = []
+        execute_query = self.entity_manager.execute_query
+
+        def _execute_query(query, *args, **kwargs):
+            queries.extend(query if type(query) == list else [query])
+            return execute_query(query, *args, **kwargs)
+
+        self.entity_manager.execute_query = _execute_query
+        self.entity_manager.save_many(persons)
+        self.entity_manager.execute_query = execute_query
+        self.assertTrue(len(queries) < len(persons))
+
+        # retrieves the persisted persons (and employees) and verifies
+        # that both the values and the (indirect) relations are stored
+        saved = self.entity_manager.find(
+            mocks.Person,
+            dict(eager=("cars",), order_by=(("object_id", "ascending"),)),
+        )
+        self.assertEqual(len(saved), 20)
+        self.assertEqual(
+            [person.name for person in saved],
+            ["name_person_%d" % index for index in range(20)],
+        )
+        self.assertEqual(
+            [len(person.cars) for person in saved],
+            [index % 4 for index in range(20)],
+        )
+        self.assertEqual(self.entity_manager.count(mocks.Employee), 10)
+
+        # changes the names of the persons and updates them in bulk
+        # verifying that the new values are persisted
+        for person in persons:
+            person.name = person.name.upper()
+        self.entity_manager.update_many(persons)
+        saved = self.entity_manager.find(
+            mocks.Person, dict(order_by=(("object_id", "ascending"),))
+        )
+        self.assertEqual(
+            [person.name for person in saved],
+            ["NAME_PERSON_%d" % index for index in range(20)],
+        )
+
+    def test_save_many_order(self):
+        # creates the required entity classes in the data source
+        self.entity_manager.create(mocks.Person)
+        self.entity_manager.create(mocks.Dog)
+
+        # creates a sequence of persons and dogs (owned by the previous
+        # persons) so that the order of the statements is relevant
+        person_1 = mocks.Person()
+        person_1.name = "person_1"
+        dog_1 = mocks.Dog()
+        dog_1.name = "dog_1"
+        dog_1.owner = person_1
+        person_2 = mocks.Person()
+        person_2.name = "person_2"
+        person_3 = mocks.Person()
+        person_3.name = "person_3"
+        dog_2 = mocks.Dog()
+        dog_2.name = "dog_2"
+        dog_2.owner = person_3
+
+        queries = []
+        execute_query = self.entity_manager.execute_query
+
+        def _execute_query(query, *args, **kwargs):
+            queries.extend(query if type(query) == list else [query])
+            return execute_query(query, *args, **kwargs)
+
+        self.entity_manager.execute_query = _execute_query
+        self.entity_manager.save_many((person_1, dog_1, person_2, person_3, dog_2))
+        self.entity_manager.execute_query = execute_query
+
+        # verifies that the insert statements keep the original order of
+        # the entities and that only consecutive entities are merged
+        inserts = [
+            (query.split(" ")[2].split("(")[0], query.count("), (") + 1)
+            for query in queries
+            if query.startswith("insert into _") and not "_generator" in query
+        ]
+        self.assertEqual(
+            inserts,
+            [
+                ("_root_entity", 1),
+                ("_person", 1),
+                ("_root_entity", 1),
+                ("_dog", 1),
+                ("_root_entity", 2),
+                ("_person", 2),
+                ("_root_entity", 1),
+                ("_dog", 1),
+            ],
+        )
+
+        # retrieves the persisted dogs and verifies that the
+        # owners have been correctly associated
+        dogs = self.entity_manager.find(
+            mocks.Dog,
+            dict(eager=("owner",), order_by=(("object_id", "ascending"),)),
+        )
+        self.assertEqual([dog.name for dog in dogs], ["dog_1", "dog_2"])
+        self.assertEqual([dog.owner.name for dog in dogs], ["person_1", "person_3"])
+
+    def test_import_class(self):
+        # creates the required entity classes in the data source
+        self.entity_manager.create(mocks.Person)
+        self.entity_manager.create(mocks.Dog)
+
+        # creates the serialized data for a set of dogs, one of them
+        # referring an owner that does not exist in the data source
+        data = json.dumps(
+            [
+                dict(object_id=10, name="dog_1", _class="Dog", _mtime=1.0),
+                dict(
+                    object_id=11,
+                    name="dog_2",
+                    owner=dict(object_id=20, name="person_1", _class="Person"),
+                    _class="Dog",
+                    _mtime=1.0,
+                ),
+            ]
+        )
+
+        # imports the data verifying that both the dogs and the
+        # relation value (owner) are saved in the data source
+        self.entity_manager._import_class(mocks.Dog, json, data, False)
+        dogs = self.entity_manager.find(
+            mocks.Dog, dict(order_by=(("object_id", "ascending"),))
+        )
+        self.assertEqual([dog.object_id for dog in dogs], [10, 11])
+        self.assertEqual([dog.name for dog in dogs], ["dog_1", "dog_2"])
+        self.assertEqual(self.entity_manager.count(mocks.Person), 1)
+        dog = self.entity_manager.get(mocks.Dog, 11, dict(eager=("owner",)))
+        self.assertEqual(dog.owner.object_id, 20)
+
+        # imports changed data for the same dogs, verifying that the
+        # existing entities are updated (not duplicated)
+        data = json.dumps(
+            [
+                dict(object_id=10, name="dog_1_changed", _class="Dog", _mtime=2.0),
+                dict(object_id=11, name="dog_2_changed", _class="Dog", _mtime=2.0),
+            ]
+        )
+        self.entity_manager._import_class(mocks.Dog, json, data, False)
+        dogs = self.entity_manager.find(
+            mocks.Dog, dict(order_by=(("object_id", "ascending"),))
+        )
+        self.assertEqual([dog.name for dog in dogs], ["dog_1_changed", "dog_2_changed"])
+        self.assertEqual(self.entity_manager.count(mocks.Dog), 2)
+
+    def test_statements(self):
+        # creates the required entity classes in the data source
+        self.entity_manager.create(mocks.Person)
+
+        # creates a series of persons and saves them in the
+        # data source, one of them with a quote in the name
+        for index, name in enumerate(("name_person", "o'person", "other")):
+            person = mocks.Person()
+            person.object_id = index + 1
+            person.name = name
+            self.entity_manager.save(person)
+
+        # wraps the query execution method of the entity manager
+        # so that the executed queries and parameters are stored
+        queries = []
+        execute_query = self.entity_manager.execute_query
+
+        def _execute_query(query, close_cursor=True, parameters=None):
+            queries.append((query, parameters))
+            return execute_query(query, close_cursor, parameters)
+
+        self.entity_manager.execute_query = _execute_query
+
+        # runs two find operations with the same options shape and
+        # different values and verifies that the same statement is
+        # used with the values being bound as parameters
+        persons = self.entity_manager.find(mocks.Person, dict(name="name_person"))
+        self.assertEqual([person.object_id for person in persons], [1])
+        persons = self.entity_manager.find(mocks.Person, dict(name="o'person"))
+        self.assertEqual([person.object_id for person in persons], [2])
+        self.assertEqual(queries[0][0], queries[1][0])
+        self.assertEqual(queries[0][1], ("name_person",))
+        self.assertEqual(queries[1][1], ("o'person",))
+        self.assertEqual(len(self.entity_manager.statements[mocks.Person]), 1)
+
+        # runs an in filter with a different number of values, this
+        # should generate a new statement (different number of markers)
+        persons = self.entity_manager.find(
+            mocks.Person,
+            dict(
+                filters=(
+                    dict(type="in", fields=(dict(name="object_id", value=(1, 3)),)),
+                ),
+                order_by=(("object_id", "ascending"),),
+            ),
+        )
+        self.assertEqual([person.object_id for person in persons], [1, 3])
+        self.assertEqual(queries[2][1], (1, 3))
+        self.assertEqual(len(self.entity_manager.statements[mocks.Person]), 2)
+
+        # runs a like filter with a quote in the value and verifies
+        # that the pattern is bound as a parameter (no escaping)
+        persons = self.entity_manager.find(
+            mocks.Person,
+            dict(
+                filters=(dict(type="like", fields=(dict(name="name", value="'per"),)),)
+            ),
+        )
+        self.assertEqual([person.object_id for person in persons], [2])
+        self.assertEqual(queries[3][1], ("%'per%",))
+
+        # runs a paginated find for each of the pages and verifies that
+        # the limit values are bound as parameters, so that all the pages
+        # share the same (cached) statement
+        for start_record in range(3):
+            persons = self.entity_manager.find(
+                mocks.Person,
+                dict(
+                    start_record=start_record,
+                    number_records=1,
+                    order_by=(("object_id", "ascending"),),
+                ),
+            )
+            self.assertEqual(
+                [person.object_id for person in persons], [start_record + 1]
+            )
+            self.assertEqual(queries[-1][1], (1, start_record))
+        self.assertEqual(queries[-1][0], queries[-2][0])
+        self.assertEqual(queries[-1][0], queries[-3][0])
+        self.assertEqual(len(self.entity_manager.statements[mocks.Person]), 4)
+
     def test_nullify(self):
         # creates the required entity classes in the data source
         self.entity_manager.create(mocks.Person)
@@ -1760,3 +2105,157 @@ class EntityManagerRsetTestCase(colony.ColonyTestCase):
 
         result = set.data()
         self.assertEqual(result, [["First", 30, 100], ["Second", 30, 100]])
+
+
+class EntityManagerPoolTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Entity Manager Pool test case"
+
+    def test_simple(self):
+        # creates the lists that will hold the connections that have
+        # been opened and closed by the pool and the pool itself
+        opened = []
+        closed = []
+
+        def open_callable():
+            connection = dict(index=len(opened))
+            opened.append(connection)
+            return connection
+
+        pool = structures.ConnectionPool(
+            open_callable, close_callable=closed.append, max_size=2, timeout=0.0
+        )
+
+        # acquires a connection and verifies that the same one is
+        # returned for the same thread (binding) and that no connection
+        # is created when the create flag is unset
+        connection = pool.acquire()
+        self.assertEqual(connection, dict(index=0))
+        self.assertEqual(pool.acquire() is connection, True)
+        self.assertEqual(len(opened), 1)
+
+        # releases the connection and verifies that it's re-used
+        # on the next acquire operation (no new connection created)
+        pool.release()
+        self.assertEqual(pool.acquire(create=False), None)
+        self.assertEqual(pool.acquire() is connection, True)
+        self.assertEqual(len(opened), 1)
+
+        # acquires a connection from another thread and then tries
+        # to acquire a third one, which should fail as the pool
+        # is exhausted (maximum size reached)
+        results = []
+
+        def acquire():
+            try:
+                results.append(pool.acquire())
+            except exceptions.RuntimeError as exception:
+                results.append(exception)
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        thread.join()
+        self.assertEqual(results[0], dict(index=1))
+
+        # verifies that the connection held by the (dead) thread is
+        # reclaimed once the reaping operation is forced
+        pool._reap(force=True)
+        self.assertEqual(closed, [dict(index=1)])
+        self.assertEqual(pool.stats()["reclaimed"], 1)
+
+        # fills the pool with another thread's connection so that the
+        # next acquire from a third thread fails (exhausted pool)
+        acquired = threading.Event()
+        event = threading.Event()
+
+        def hold():
+            results.append(pool.acquire())
+            acquired.set()
+            event.wait()
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        acquired.wait()
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        thread.join()
+        event.set()
+        holder.join()
+        self.assertEqual(isinstance(results[2], exceptions.RuntimeError), True)
+
+        # releases the connection of the current thread, expires it
+        # and verifies that it's reaped as an idle connection
+        pool.release()
+        pool.idle_timeout = 0.0
+        pool._reap(force=True)
+        self.assertEqual(pool.stats()["idle"], 0)
+        self.assertEqual(pool.stats()["reaped"], 1)
+
+        # verifies that a connection recently returned to the pool is
+        # re-used without any health check (avoids the round trip)
+        checked = []
+        pool.check_callable = lambda connection: checked.append(connection)
+        pool.idle_timeout = 300.0
+        connection = pool.acquire()
+        pool.release()
+        self.assertEqual(pool.acquire() is connection, True)
+        self.assertEqual(checked, [])
+
+        # verifies that a connection failing the health check (after
+        # the check interval) is discarded and a new one is created
+        pool.check_callable = lambda connection: False
+        pool.check_interval = 0.0
+        pool.release()
+        time.sleep(0.01)
+        other = pool.acquire()
+        self.assertEqual(other is connection, False)
+        self.assertEqual(pool.stats()["failed"], 1)
+
+        # closes the pool and verifies that all the connections
+        # have been closed and that the statistics are reset
+        pool.close()
+        stats = pool.stats()
+        self.assertEqual(stats["size"], 0)
+        self.assertEqual(stats["busy"], 0)
+        self.assertEqual(stats["max_size"], 2)
+
+    def test_release(self):
+        class PooledEngine(object):
+            def __init__(self, engine):
+                self.engine = engine
+                self.released = 0
+
+            def __getattr__(self, name):
+                return getattr(self.engine, name)
+
+            def release(self):
+                self.released += 1
+
+        # replaces the engine of the entity manager with one that
+        # records the returning of the connection to the pool
+        engine = self.entity_manager.engine
+        pooled = PooledEngine(engine)
+        self.entity_manager.engine = pooled
+
+        try:
+            self.entity_manager.create(mocks.RootEntity)
+            self.entity_manager.create(mocks.Person)
+
+            # verifies that the top level commit returns the
+            # connection of the current thread to the pool
+            self.entity_manager.execute_query("select 1")
+            self.assertEqual(pooled.released, 0)
+            self.entity_manager.commit()
+            self.assertEqual(pooled.released, 1)
+
+            # runs a series of statements outside of a transaction and
+            # verifies that the connection remains bound to the thread
+            # (no release and commit round trips per statement)
+            self.entity_manager.execute_query("select 1")
+            self.assertEqual(self.entity_manager.execute("select 1"), [(1,)])
+            self.entity_manager.find(mocks.Person)
+            self.assertEqual(pooled.released, 1)
+        finally:
+            self.entity_manager.engine = engine
+            self.entity_manager.begin()
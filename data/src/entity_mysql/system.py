@@ -199,6 +199,7 @@ class MySQLEngine(object):
             password=password,
             database=database,
             isolation=isolation,
+            pool_class=self.entity_manager.get_pool_class(),
         )
         connection._transaction_level = 0
         connection._user = user
@@ -225,6 +226,16 @@ class MySQLEngine(object):
         _connection = connection._connection
         return _connection.is_empty_transaction()
 
+    def release(self):
+        connection = self.entity_manager.get_connection()
+        _connection = connection._connection
+        _connection.release()
+
+    def get_pool_stats(self):
+        connection = self.entity_manager.get_connection()
+        _connection = connection._connection
+        return _connection.get_pool_stats()
+
     def destroy(self):
         connection = self.entity_manager.get_connection()
         self._execute_query_t("drop database %s" % connection._database).close()
@@ -382,7 +393,7 @@ class MySQLEngine(object):
             cursor.close()
         return result
 
-    def execute_query(self, query, cursor=None, retries=3):
+    def execute_query(self, query, cursor=None, retries=3, parameters=None):
         """
         Executes the given query using the provided cursor
         or "inside" a new cursor context in case none is
@@ -403,6 +414,10 @@ class MySQLEngine(object):
         :param retries: The current number of retries pending
         for the execution of the query. This is used to solve
         the reconnection related issues.
+        :type parameters: Tuple
+        :param parameters: The sequence of values to be bound by the
+        driver to the placeholders of the query, in case this value
+        is not provided the query is executed without binding.
         :rtype: Cursor
         :return: The cursor that was used for the query execution
         it must be closed in the outside context.
@@ -456,10 +471,14 @@ class MySQLEngine(object):
             initial = time.time()
 
             # executes the query in the current cursor context
-            # for the engine, in case there's an exception during
-            # the execution of the query the query is logged
+            # for the engine (binding the parameters if provided),
+            # in case there's an exception during the execution
+            # of the query the query is logged
             try:
-                cursor.execute(query)
+                if parameters:
+                    cursor.execute(query, parameters)
+                else:
+                    cursor.execute(query)
             except Exception:
                 self.mysql_system.info(
                     "[%s] [%s] [exception] %s" % (ENGINE_NAME, database, query_s)
@@ -515,7 +534,9 @@ class MySQLEngine(object):
             # execution) tries to re-execute the query otherwise raises
             # an error, indicating the issue with the query
             if is_valid and retries:
-                return self.execute_query(query, cursor=cursor, retries=retries - 1)
+                return self.execute_query(
+                    query, cursor=cursor, retries=retries - 1, parameters=parameters
+                )
             # otherwise closes the current cursor and re-raises the exception
             # to the upper layer (for proper handling)
             else:
@@ -867,6 +888,9 @@ class MySQLEngine(object):
     def _allow_for_update(self):
         return True
 
+    def _parameter_marker(self):
+        return "%s"
+
 
 class MySQLConnection(object):
     """
@@ -904,9 +928,9 @@ class MySQLConnection(object):
     """ The map associating the MySQL connection with the
     transaction depth (nesting) level """
 
-    connections_map = {}
-    """ The map associating the thread identifier with the
-    connection """
+    pool = None
+    """ The pool of MySQL connections, responsible for the
+    binding of the connections to the current thread """
 
     def __init__(
         self,
@@ -916,6 +940,7 @@ class MySQLConnection(object):
         password="root",
         database="default",
         isolation=ISOLATION_LEVEL,
+        pool_class=None,
     ):
         self.host = host
         self.port = port
@@ -925,58 +950,17 @@ class MySQLConnection(object):
         self.isolation = isolation
 
         self.transaction_level_map = {}
-        self.connections_map = {}
+        self.pool = pool_class(
+            self._open_connection,
+            close_callable=self._close_connection,
+            check_callable=self._check_connection,
+        )
 
     def get_connection(self, create=True):
-        # retrieves the thread identifier for the
-        # current executing thread, then uses it
-        # to retrieve the corresponding connection
-        thread_id = threading.current_thread().ident
-        connection = self.connections_map.get(thread_id, None)
-
-        # in case a connection is not available for the
-        # current thread, and the create flag is set
-        # a new one must be created (singleton pattern)
-        if not connection and create:
-            # creates a new connection and sets it in the
-            # connections map for the current thread
-            connection = MySQLdb.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                passwd=self.password,
-                db=self.database,
-            )
-            self.connections_map[thread_id] = connection
-
-            # creates a new transaction context for the connection
-            # in the current thread, setting the transaction level
-            # to the pre-defined zero value
-            self.transaction_level_map[connection] = 0
-
-            # retrieves the encoding in use by the database and then
-            # uses it as the character set to be used in the communication
-            # with the database server, note that a verification is
-            # previously done to ensure that the method exists avoiding
-            # possible issues with the character setting operation
-            has_charset = hasattr(connection, "set_charset")
-            has_character_set = hasattr(connection, "set_character_set")
-            encoding = self.get_database_encoding()
-            if has_charset and encoding:
-                connection.set_charset(encoding)
-            if has_character_set and encoding:
-                connection.set_character_set(encoding)
-
-            # sets the isolation level for the connection as the one defined
-            # to be the default one by the "driver"
-            self._execute_query(
-                "set session transaction isolation level %s" % self.isolation,
-                connection=connection,
-            ).close()
-
-        # returns the correct connection
-        # for the current thread
-        return connection
+        # retrieves the connection bound to the current thread
+        # from the pool, checking out a new one from it in case
+        # there's none bound and the create flag is set
+        return self.pool.acquire(create=create)
 
     def ensure_connection(self):
         # by default ensure a connection is exactly the same operation
@@ -984,22 +968,10 @@ class MySQLConnection(object):
         self.get_connection()
 
     def close(self):
-        # iterates over all the connection in the connections
-        # map to closes them (will close all the connections)
-        for _thread_id, connection in colony.legacy.iteritems(self.connections_map):
-            # closes the current connection, disables
-            # all the pending operations in the connection
-            # with the remote database
-            connection.close()
-
-            # deletes the transaction level reference
-            # for the connection in the transaction
-            # level map (not going to be used anymore)
-            del self.transaction_level_map[connection]
-
-        # clears the connections map, eliminating
-        # any pending connection reference
-        self.connections_map.clear()
+        # closes all the connections owned by the pool (busy
+        # and idle) the transaction levels are removed as part
+        # of the closing of each connection
+        self.pool.close()
 
     def reopen(self):
         """
@@ -1011,28 +983,26 @@ class MySQLConnection(object):
         thread all the other connection in the other threads remain open.
         """
 
-        # retrieves the thread identifier for the
-        # current executing thread, then uses it
-        # to retrieve the corresponding connection
-        thread_id = threading.current_thread().ident
-        connection = self.connections_map.get(thread_id, None)
+        # discards the connection bound to the current thread from
+        # the pool, closing it so that there is no more communication
+        # with it, a new one is created on the next access
+        self.pool.discard()
 
-        # in case there is no connection defined for
-        # the current context (thread) returns immediately
+    def release(self):
+        # in case there's an open transaction for the current thread
+        # the connection can't be returned to the pool
+        connection = self.get_connection(create=False)
         if not connection:
             return
+        if not self.transaction_level_map.get(connection, 0) == 0:
+            return
 
-        # closes the connection, so that there is no more
-        # communication with the connection, no reconnection
-        # should be attempted on this "old" connection
-        connection.close()
+        # returns the connection of the current thread to the pool
+        # so that it may be re-used by any other thread
+        self.pool.release()
 
-        # deletes the transaction level reference for the
-        # connection in the transaction level map and then
-        # removes the connection reference for the current
-        # thread from the connections map
-        del self.transaction_level_map[connection]
-        del self.connections_map[thread_id]
+    def get_pool_stats(self):
+        return self.pool.stats()
 
     def cursor(self):
         connection = self.get_connection()
@@ -1080,7 +1050,7 @@ class MySQLConnection(object):
     def get_query_encoding(self):
         return "utf-8"
 
-    def get_database_encoding(self, alias=True):
+    def get_database_encoding(self, alias=True, connection=None):
         # checks if the current object already contains the encoding
         # attribute set for such cases the retrieval is immediate
         if hasattr(self, "_encoding"):
@@ -1098,7 +1068,7 @@ class MySQLConnection(object):
         # database encoding and executes it retrieving the encoding
         # used in the current database
         query = self._database_encoding_query(self.database)
-        cursor = self._execute_query(query)
+        cursor = self._execute_query(query, connection=connection)
         try:
             result = self._database_encoding_result(cursor)
         finally:
@@ -1148,6 +1118,57 @@ class MySQLConnection(object):
         # encoding from the data source
         return database_encoding
 
+    def _open_connection(self):
+        # creates a new "physical" connection to the database
+        # using the currently defined connection parameters
+        connection = MySQLdb.connect(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            passwd=self.password,
+            db=self.database,
+        )
+
+        # creates a new transaction context for the connection
+        # setting the transaction level to the pre-defined zero value
+        self.transaction_level_map[connection] = 0
+
+        # retrieves the encoding in use by the database and then
+        # uses it as the character set to be used in the communication
+        # with the database server, note that a verification is
+        # previously done to ensure that the method exists avoiding
+        # possible issues with the character setting operation
+        has_charset = hasattr(connection, "set_charset")
+        has_character_set = hasattr(connection, "set_character_set")
+        encoding = self.get_database_encoding(connection=connection)
+        if has_charset and encoding:
+            connection.set_charset(encoding)
+        if has_character_set and encoding:
+            connection.set_character_set(encoding)
+
+        # sets the isolation level for the connection as the one defined
+        # to be the default one by the "driver"
+        self._execute_query(
+            "set session transaction isolation level %s" % self.isolation,
+            connection=connection,
+        ).close()
+
+        # returns the newly created connection so that
+        # it's bound to the current thread by the pool
+        return connection
+
+    def _close_connection(self, connection):
+        # removes the transaction level reference for the connection
+        # (not going to be used anymore) and then closes it
+        self.transaction_level_map.pop(connection, None)
+        connection.close()
+
+    def _check_connection(self, connection):
+        # pings the server (without automatic reconnection) so
+        # that a broken connection is detected before its usage
+        connection.ping(False)
+        return True
+
     def _execute_query(self, query, connection=None):
         # retrieves the current connection and creates
         # a new cursor object for query execution
@@ -154,6 +154,7 @@ class PgSQLEngine(object):
             password=password,
             database=database,
             isolation=isolation,
+            pool_class=self.entity_manager.get_pool_class(),
         )
         connection._transaction_level = 0
         connection._user = user
@@ -175,6 +176,16 @@ class PgSQLEngine(object):
         _connection = connection._connection
         _connection.reopen()
 
+    def release(self):
+        connection = self.entity_manager.get_connection()
+        _connection = connection._connection
+        _connection.release()
+
+    def get_pool_stats(self):
+        connection = self.entity_manager.get_connection()
+        _connection = connection._connection
+        return _connection.get_pool_stats()
+
     def destroy(self):
         # runs the proper queries that will drop the complete set of
         # tables in the currently selected schema
@@ -326,7 +337,7 @@ class PgSQLEngine(object):
             cursor.close()
         return result
 
-    def execute_query(self, query, cursor=None):
+    def execute_query(self, query, cursor=None, parameters=None):
         """
         Executes the given query using the provided cursor
         or "inside" a new cursor context in case none is
@@ -339,6 +350,10 @@ class PgSQLEngine(object):
         :param cursor: The cursor that is going to be execute
         the query in the engine, this cursor must have been
         created for this engine.
+        :type parameters: Tuple
+        :param parameters: The sequence of values to be bound by the
+        driver to the placeholders of the query, in case this value
+        is not provided the query is executed without binding.
         :rtype: Cursor
         :return: The cursor that was used for the query execution
         it must be closed in the outside context.
@@ -376,10 +391,14 @@ class PgSQLEngine(object):
             initial = time.time()
 
             # executes the query in the current cursor context
-            # for the engine, in case there's an exception during
-            # the execution of the query the query is logged
+            # for the engine (binding the parameters if provided),
+            # in case there's an exception during the execution
+            # of the query the query is logged
             try:
-                cursor.execute(query)
+                if parameters:
+                    cursor.execute(query, parameters)
+                else:
+                    cursor.execute(query)
             except Exception:
                 self.pgsql_system.info(
                     "[%s] [%s] [exception] %s" % (ENGINE_NAME, database, query)
@@ -696,6 +715,9 @@ class PgSQLEngine(object):
         # this is considered a major drawback towards PgSQL usage
         return False
 
+    def _parameter_marker(self):
+        return "%s"
+
 
 class PgSQLConnection(object):
     """
@@ -724,14 +746,13 @@ class PgSQLConnection(object):
     """ The isolation level that is currently in use
     for the connection, may be changed at run-time """
 
-    connection = None
-    """ The reference to the underlying connection that handles
-    the proper pipelining of the execution """
+    transaction_level_map = {}
+    """ The map associating the PgSQL connection with the
+    transaction depth (nesting) level """
 
-    transaction_level = 0
-    """ The current transaction depth for the connection, this value
-    should be increment by opening a transaction and decremented for
-    each close of a transaction """
+    pool = None
+    """ The pool of PgSQL connections, responsible for the
+    binding of the connections to the current thread """
 
     def __init__(
         self,
@@ -740,6 +761,7 @@ class PgSQLConnection(object):
         password="root",
         database="default",
         isolation=ISOLATION_LEVEL,
+        pool_class=None,
     ):
         self.host = host
         self.user = user
@@ -747,38 +769,18 @@ class PgSQLConnection(object):
         self.database = database
         self.isolation = isolation
 
-        self.connection = None
-        self.transaction_level = 0
-
-    def get_connection(self, create=True):
-        # in case there's a connection already defined (and open)
-        # for the current logical connection returns it to the
-        # proper caller method, otherwise goes for creation
-        if self.connection:
-            return self.connection
-        if not create:
-            return None
-
-        # creates a new connection and sets it in the current
-        # instance so that it may be properly re-used latter
-        self.connection = pgdb.connect(
-            host=self.host,
-            user=self.user,
-            password=self.password,
-            database=self.database,
+        self.transaction_level_map = {}
+        self.pool = pool_class(
+            self._open_connection,
+            close_callable=self._close_connection,
+            check_callable=self._check_connection,
         )
-        self.transaction_level = 0
 
-        # sets the isolation level for the connection as the one
-        # defined to be the default one by the "driver"
-        self._execute_query(
-            "set session characteristics as transaction isolation level %s"
-            % self.isolation
-        ).close()
-
-        # returns the correct connection that has been created
-        # to the caller method, os that it may be used
-        return self.connection
+    def get_connection(self, create=True):
+        # retrieves the connection bound to the current thread
+        # from the pool, checking out a new one from it in case
+        # there's none bound and the create flag is set
+        return self.pool.acquire(create=create)
 
     def ensure_connection(self):
         # by default ensure a connection is exactly the same operation
@@ -786,13 +788,10 @@ class PgSQLConnection(object):
         self.get_connection()
 
     def close(self):
-        # verifies if there's an open and valid "physical" connection
-        # and if taht's the case closes it and unsets the value
-        if not self.connection:
-            return
-        self.connection.close()
-        self.connection = None
-        self.transaction_level = 0
+        # closes all the connections owned by the pool (busy
+        # and idle) the transaction levels are removed as part
+        # of the closing of each connection
+        self.pool.close()
 
     def reopen(self):
         """
@@ -802,12 +801,27 @@ class PgSQLConnection(object):
 
         This method only invalidates the proper connection for the current
         thread all the other connection in the other threads remain open.
-
-        For this kind of strategy (single thread support) this operations
-        is equivalent to the close one.
         """
 
-        self.close()
+        # discards the connection bound to the current thread from
+        # the pool, a new one is created on the next access
+        self.pool.discard()
+
+    def release(self):
+        # in case there's an open transaction for the current thread
+        # the connection can't be returned to the pool
+        connection = self.get_connection(create=False)
+        if not connection:
+            return
+        if not self.transaction_level_map.get(connection, 0) == 0:
+            return
+
+        # returns the connection of the current thread to the pool
+        # so that it may be re-used by any other thread
+        self.pool.release()
+
+    def get_pool_stats(self):
+        return self.pool.stats()
 
     def cursor(self):
         connection = self.get_connection()
@@ -822,15 +836,16 @@ class PgSQLConnection(object):
         connection.rollback()
 
     def push_transaction(self):
-        self.ensure_connection()
-        self.transaction_level += 1
+        connection = self.get_connection()
+        self.transaction_level_map[connection] += 1
 
     def pop_transaction(self):
-        self.ensure_connection()
-        self.transaction_level -= 1
+        connection = self.get_connection()
+        self.transaction_level_map[connection] -= 1
 
     def reset_transaction(self):
-        self.transaction_level = 0
+        connection = self.get_connection()
+        self.transaction_level_map[connection] = 0
 
     def isolation_level(self, isolation):
         self.isolation = isolation
@@ -852,7 +867,7 @@ class PgSQLConnection(object):
     def get_database(self):
         return self.database
 
-    def get_database_encoding(self):
+    def get_database_encoding(self, connection=None):
         # checks if the current object already contains the encoding
         # attribute set for such cases the retrieval is immediate
         if hasattr(self, "_encoding"):
@@ -862,7 +877,7 @@ class PgSQLConnection(object):
         # database encoding and executes it retrieving the encoding
         # used in the current database
         query = self._database_encoding_query(self.database)
-        cursor = self._execute_query(query)
+        cursor = self._execute_query(query, connection=connection)
         try:
             result = self._database_encoding_result(cursor)
         finally:
@@ -874,6 +889,15 @@ class PgSQLConnection(object):
         self._encoding = result
         return result
 
+    @property
+    def connection(self):
+        return self.get_connection()
+
+    @property
+    def transaction_level(self):
+        connection = self.get_connection()
+        return self.transaction_level_map[connection]
+
     def _database_encoding_query(self, database_name):
         query = (
             "select pg_encoding_to_char(encoding) from pg_database where datname = '%s';"
@@ -898,6 +922,50 @@ class PgSQLConnection(object):
         # encoding from the data source
         return database_encoding
 
+    def _open_connection(self):
+        # creates a new "physical" connection to the database
+        # using the currently defined connection parameters
+        connection = pgdb.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+        )
+
+        # creates a new transaction context for the connection
+        # setting the transaction level to the pre-defined zero value
+        self.transaction_level_map[connection] = 0
+
+        # sets the isolation level for the connection as the one
+        # defined to be the default one by the "driver"
+        self._execute_query(
+            "set session characteristics as transaction isolation level %s"
+            % self.isolation,
+            connection=connection,
+        ).close()
+
+        # returns the newly created connection so that
+        # it's bound to the current thread by the pool
+        return connection
+
+    def _close_connection(self, connection):
+        # removes the transaction level reference for the connection
+        # (not going to be used anymore) and then closes it
+        self.transaction_level_map.pop(connection, None)
+        connection.close()
+
+    def _check_connection(self, connection):
+        # runs a trivial query against the server so that a broken
+        # connection is detected before its usage, rolling back the
+        # implicit transaction that has been opened by the query
+        cursor = connection.cursor()
+        try:
+            cursor.execute("select 1")
+        finally:
+            cursor.close()
+        connection.rollback()
+        return True
+
     def _execute_query(self, query, connection=None):
         # retrieves the current connection and creates
         # a new cursor object for query execution
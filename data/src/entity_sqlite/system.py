@@ -228,7 +228,7 @@ class SQLiteEngine(object):
             cursor.close()
         return result
 
-    def execute_query(self, query, cursor=None):
+    def execute_query(self, query, cursor=None, parameters=None):
         """
         Executes the given query using the provided cursor
         or "inside" a new cursor context in case none is
@@ -241,6 +241,10 @@ class SQLiteEngine(object):
         :param cursor: The cursor that is going to be execute
         the query in the engine, this cursor must have been
         created for this engine.
+        :type parameters: Tuple
+        :param parameters: The sequence of values to be bound by the
+        driver to the placeholders of the query, in case this value
+        is not provided the query is executed without binding.
         :rtype: Cursor
         :return: The cursor that was used for the query execution
         it must be closed in the outside context.
@@ -280,10 +284,14 @@ class SQLiteEngine(object):
             initial = time.time()
 
             # executes the query in the current cursor context
-            # for the engine, in case there's an exception during
-            # the execution of the query the query is logged
+            # for the engine (binding the parameters if provided),
+            # in case there's an exception during the execution
+            # of the query the query is logged
             try:
-                cursor.execute(query)
+                if parameters:
+                    cursor.execute(query, parameters)
+                else:
+                    cursor.execute(query)
             except Exception:
                 self.sqlite_system.info(
                     "[%s] [%s] [exception] %s" % (ENGINE_NAME, database, query)
@@ -544,6 +552,9 @@ class SQLiteEngine(object):
     def _allow_for_update(self):
         return False
 
+    def _parameter_marker(self):
+        return "?"
+
 
 class SQLiteConnection(object):
     """
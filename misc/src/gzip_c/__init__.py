@@ -26,5 +26,7 @@ __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
 from . import system
+from . import test
 
-from .system import Gzip
+from .system import Gzip, GzipStream
+from .test import GzipTest, GzipBaseTestCase
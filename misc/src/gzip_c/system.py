@@ -58,77 +58,111 @@ class Gzip(colony.System):
         :return: The string containing the compressed buffer.
         """
 
-        # creates a new string buffer
-        string_buffer = colony.StringBuffer()
+        # creates a new gzip stream and runs the complete set
+        # of contents through it, joining the resulting header,
+        # compressed data and trailer into a single buffer
+        gzip_stream = self.gzip_stream(file_name=file_name)
+        return gzip_stream.compress(contents_string) + gzip_stream.flush()
 
-        # writes the magic header
-        string_buffer.write("\x1f\x8b")
-
-        # writes the compression method
-        string_buffer.write("\x08")
+    def gzip_stream(self, file_name=None, level=DEFAULT_COMPRESSION_LEVEL):
+        """
+        Creates a new streaming gzip compressor, that is able to
+        compress a sequence of chunks with bounded memory usage.
 
-        # writes the flag values
-        file_name and string_buffer.write("\x08") or string_buffer.write("\x00")
+        :type file_name: String
+        :param file_name: The name to be set to the file in the
+        generated compressed stream.
+        :type level: int
+        :param level: The compression level to be used by the
+        underlying deflate compressor.
+        :rtype: GzipStream
+        :return: The newly created streaming gzip compressor.
+        """
 
-        # writes the timestamp value
-        string_buffer.write(struct.pack("<L", colony.legacy.LONG(time.time())))
+        return GzipStream(file_name=file_name, level=level)
 
-        # writes some extra heading values
-        # (includes operating system)
-        string_buffer.write("\x02")
-        string_buffer.write("\xff")
 
-        # writes the file name
-        file_name and string_buffer.write(file_name + "\0")
+class GzipStream(object):
+    """
+    Streaming gzip compressor, that produces the gzip file
+    format from a sequence of chunks keeping a running CRC 32
+    and size of the uncompressed data for the trailer.
+    """
 
-        # compresses the contents with the zlib, note that the
-        # complete set of contents are compressed at a time, so
-        # this operation may take a while to complete
-        contents_string_compressed = zlib.compress(
-            contents_string, DEFAULT_COMPRESSION_LEVEL
-        )
+    file_name = None
+    """ The name of the file to be set in the gzip header,
+    in case it's not set no name is written """
 
-        # writes the the contents string compressed into the string buffer
-        string_buffer.write(contents_string_compressed[2:-4])
+    compressor = None
+    """ The underlying (raw) deflate compressor object used
+    for the compression of the chunks """
 
-        # computes the contents string crc 32
-        # and convert it to unsigned number
-        contents_string_crc32 = zlib.crc32(contents_string)
-        contents_string_crc32_unsigned = self._unsigned(contents_string_crc32)
+    crc32 = 0
+    """ The running CRC 32 value of the uncompressed data
+    that has been provided to the stream """
 
-        # writes the crc 32 lower values
-        string_buffer.write(struct.pack("<L", contents_string_crc32_unsigned))
+    size = 0
+    """ The running size of the uncompressed data that has
+    been provided to the stream """
 
-        # retrieves the contents string size
-        # and the writes the size lower values
-        contents_string_length = len(contents_string)
-        contents_string_length_unsigned = self._unsigned(contents_string_length)
-        string_buffer.write(struct.pack("<L", contents_string_length_unsigned))
+    started = False
+    """ Flag that controls if the gzip header has already
+    been written to the stream """
 
-        # retrieves the string value from the string buffer
-        string_value = string_buffer.get_value()
+    def __init__(self, file_name=None, level=DEFAULT_COMPRESSION_LEVEL):
+        self.file_name = file_name
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self.crc32 = 0
+        self.size = 0
+        self.started = False
 
-        # returns the string value
-        return string_value
+    def compress(self, data):
+        """
+        Compresses the given chunk of data, returning the compressed
+        data that is available (may be empty as the compressor buffers).
 
-    def _unsigned(self, number):
+        :type data: String
+        :param data: The chunk of uncompressed data to be compressed.
+        :rtype: String
+        :return: The compressed data available, prefixed by the header
+        in case this is the first chunk of the stream.
         """
-        Converts the given number to unsigned assuming
-        a 32 bit value.
 
-        :type number: int
-        :param number: The number to be converted to unsigned.
-        :rtype: int
-        :return: The given number converted to unsigned.
+        # updates the running CRC 32 and size values of the uncompressed
+        # data and then runs the compression for the chunk
+        self.crc32 = zlib.crc32(data, self.crc32)
+        self.size += len(data)
+        return self._header() + self.compressor.compress(data)
+
+    def flush(self):
         """
+        Flushes the remaining compressed data and writes the gzip
+        trailer (CRC 32 and size), ending the stream.
 
-        # in case the number is positive or zero
-        # (no need to convert)
-        if number >= 0:
-            # returns the immediately with
-            # the current number value
-            return number
+        :rtype: String
+        :return: The final compressed data and the trailer.
+        """
 
-        # runs the modulus in the number
-        # to convert it to unsigned
-        return number + 4294967296
+        # retrieves the remaining compressed data and builds the trailer
+        # using the lower 32 bits of both the CRC 32 and the size values
+        data = self._header() + self.compressor.flush()
+        trailer = struct.pack("<LL", self.crc32 & 0xFFFFFFFF, self.size & 0xFFFFFFFF)
+        return data + trailer
+
+    def _header(self):
+        # in case the header has already been written there's
+        # nothing to be returned (empty value)
+        if self.started:
+            return b""
+        self.started = True
+
+        # builds the header with the magic value, the compression method,
+        # the flag values, the timestamp, the extra heading values (includes
+        # operating system) and the optional file name
+        header = b"\x1f\x8b\x08"
+        header += b"\x08" if self.file_name else b"\x00"
+        header += struct.pack("<L", colony.legacy.LONG(time.time()))
+        header += b"\x02\xff"
+        if self.file_name:
+            header += colony.legacy.bytes(self.file_name) + b"\x00"
+        return header
@@ -0,0 +1,76 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import zlib
+
+import colony
+
+
+class GzipTest(colony.Test):
+    """
+    The gzip class, responsible for the
+    management of the associated test cases.
+    """
+
+    def get_bundle(self):
+        return (GzipBaseTestCase,)
+
+
+class GzipBaseTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Gzip Base test case"
+
+    def test_gzip_contents(self):
+        contents = b"hello world " * 1024
+        result = self.system.gzip_contents(contents)
+        self.assertEqual(result[:3], b"\x1f\x8b\x08")
+        self.assertEqual(zlib.decompress(result, 16 + zlib.MAX_WBITS), contents)
+
+        result = self.system.gzip_contents(contents, file_name="hello.txt")
+        self.assertEqual(result[10:20], b"hello.txt\x00")
+        self.assertEqual(zlib.decompress(result, 16 + zlib.MAX_WBITS), contents)
+
+    def test_gzip_stream(self):
+        # compresses a sequence of chunks using the streaming
+        # compressor and verifies that the joined result is a
+        # valid gzip buffer with the complete contents
+        chunks = [colony.legacy.bytes(str(index)) * 4096 for index in range(16)]
+        gzip_stream = self.system.gzip_stream()
+        result = b"".join([gzip_stream.compress(chunk) for chunk in chunks])
+        result += gzip_stream.flush()
+        self.assertEqual(zlib.decompress(result, 16 + zlib.MAX_WBITS), b"".join(chunks))
+        self.assertEqual(gzip_stream.size, sum(len(chunk) for chunk in chunks))
+
+        # verifies that an empty stream still generates a valid
+        # gzip buffer (header and trailer)
+        gzip_stream = self.system.gzip_stream()
+        result = gzip_stream.flush()
+        self.assertEqual(zlib.decompress(result, 16 + zlib.MAX_WBITS), b"")
@@ -42,7 +42,7 @@ class GzipPlugin(colony.Plugin):
     version = "1.0.0"
     author = "Hive Solutions Lda. <development@hive.pt>"
     platforms = [colony.CPYTHON_ENVIRONMENT, colony.JYTHON_ENVIRONMENT]
-    capabilities = ["zip"]
+    capabilities = ["zip", "test"]
     main_modules = ["gzip_c"]
 
     def load_plugin(self):
@@ -50,6 +50,10 @@ class GzipPlugin(colony.Plugin):
         import gzip_c
 
         self.system = gzip_c.Gzip(self)
+        self.test = gzip_c.GzipTest(self)
 
     def gzip_contents(self, contents_string):
         return self.system.gzip_contents(contents_string)
+
+    def gzip_stream(self, file_name=None):
+        return self.system.gzip_stream(file_name=file_name)
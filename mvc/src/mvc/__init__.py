@@ -30,6 +30,7 @@ from . import communication
 from . import exceptions
 from . import file_handler
 from . import system
+from . import test
 
 from .handlers import *
 from .communication import (
@@ -49,4 +50,5 @@ from .exceptions import (
     CommunicationCommandException,
 )
 from .file_handler import MVCFileHandler, ChunkHandler
-from .system import MVC
+from .system import MVC, RouteTree
+from .test import MVCTest
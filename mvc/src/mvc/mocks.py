@@ -0,0 +1,103 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+
+class MockManager(object):
+    def __init__(self):
+        self.allow_threads = False
+
+    def is_development(self):
+        return False
+
+
+class MockPlugin(object):
+    def __init__(self):
+        self.short_name = "mock"
+        self.manager = MockManager()
+
+
+class MockController(object):
+    def __init__(self, plugin):
+        self.plugin = plugin
+        self.calls = []
+
+    def index(self, request):
+        self.calls.append(("index",))
+
+    def show(self, request, id):
+        self.calls.append(("show", id))
+
+    def show_name(self, request, name):
+        self.calls.append(("show_name", name))
+
+    def create(self, request):
+        self.calls.append(("create",))
+
+    def search(self, request):
+        self.calls.append(("search",))
+
+
+class MockServicePlugin(object):
+    def __init__(self, patterns):
+        self._patterns = patterns
+
+    def get_patterns(self):
+        return self._patterns
+
+
+class MockRequest(object):
+    def __init__(self, operation_type):
+        self.operation_type = operation_type
+
+
+class MockRestRequest(object):
+    def __init__(self, path, operation_type="GET", encoder_name=None):
+        self.path = path
+        self.encoder_name = encoder_name
+        self.request = MockRequest(operation_type)
+        self.status_code = None
+
+    def clear_sessions(self):
+        pass
+
+    def get_path_list(self):
+        return self.path.split("/")
+
+    def get_request(self):
+        return self.request
+
+    def get_attribute(self, name):
+        return None
+
+    def get_status_code(self):
+        return self.status_code
+
+    def set_status_code(self, status_code):
+        self.status_code = status_code
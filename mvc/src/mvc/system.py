@@ -74,6 +74,28 @@ TYPES_R = dict(int=int, str=str, regex=str)
 """ Map that resolves a data type from the string representation
 to the proper type value to be used in casting """
 
+SEGMENT_REGEX = re.compile(r"^\<((\w+):)?(\w+)\>$")
+""" The regular expression that matches a route segment that
+is composed of a single (typed) name, the kind of segments
+that may be represented in the route tree """
+
+INT_SEGMENT_REGEX = re.compile(r"[\d]+\Z")
+""" The regular expression used to validate the values of
+the integer based segments of the route tree """
+
+STR_SEGMENT_REGEX = re.compile(r"[\@\+\:\.\s\w-]+\Z")
+""" The regular expression used to validate the values of
+the (default) string based segments of the route tree """
+
+SPECIAL_CHARACTERS = "\\.^$*+?{}[]|()<>"
+""" The set of characters that have a special meaning in the
+context of a regular expression, a literal route segment
+containing any of them may not be represented in the tree """
+
+DEFAULT_OPERATION_TYPES = ("get", "put", "post", "delete")
+""" The default operation types (HTTP methods) that are
+handled by a pattern that does not define them """
+
 
 class MVC(colony.System):
     """
@@ -147,6 +169,21 @@ class MVC(colony.System):
     pattern tuple, this is going to be used for runtime based resolution
     of routes as defined by the specification """
 
+    route_tree = None
+    """ The tree of routes containing the patterns that are
+    simple enough to be resolved segment by segment, avoiding
+    the matching of the (expensive) regex lists """
+
+    matching_patterns_list = []
+    """ The list of patterns that could not be represented in
+    the route tree and that are (still) matched using the list
+    of matching regex, indexed by the base map values """
+
+    patterns_priority_map = {}
+    """ The map associating each pattern with its priority (index)
+    in the patterns list, used to resolve the order between the
+    route tree and the matching regex list """
+
     def __init__(self, plugin):
         colony.System.__init__(self, plugin)
 
@@ -165,6 +202,9 @@ class MVC(colony.System):
         self.resource_patterns_map = {}
         self.resource_patterns_list = []
         self.patterns_index = {}
+        self.route_tree = RouteTree()
+        self.matching_patterns_list = []
+        self.patterns_priority_map = {}
 
         self.mvc_file_handler = file_handler.MVCFileHandler(plugin)
         self.mvc_communication_handler = communication.MVCCommunicationHandler(plugin)
@@ -292,6 +332,12 @@ class MVC(colony.System):
             # returns immediately
             return
 
+        # tries to resolve the (dynamic) request using the route tree
+        # retrieving the handle tuple and the priority of the matched
+        # pattern, that is going to be used to decide if any of the
+        # patterns in the matching regex list should take precedence
+        route_tuple, route_priority = self._validate_route(rest_request, resource_path)
+
         # iterates over all the (dynamic) matching regex in the
         # (dynamic) matching regex list to try to match any of
         # them and execute the proper action if such occurs
@@ -302,12 +348,18 @@ class MVC(colony.System):
             if not resource_path_match:
                 continue
 
+            # retrieves the pattern that was matched and in case it
+            # has been registered after the one resolved by the route
+            # tree breaks the loop (route tree takes precedence), note
+            # that the remaining regex contain only later patterns
+            pattern = self._match_pattern(resource_path_match, matching_regex)
+            if self.patterns_priority_map[pattern] > route_priority:
+                break
+
             # validate the match and retrieves the handle tuple and in
             # case the handle tuple is invalid continues immediately
             # because it's not possible to process the request
-            handle_tuple = self._validate_match(
-                rest_request, resource_path, resource_path_match, matching_regex
-            )
+            handle_tuple = self._validate_match(rest_request, resource_path, pattern)
             if not handle_tuple:
                 continue
 
@@ -320,6 +372,14 @@ class MVC(colony.System):
             # returns immediately
             return
 
+        # in case a valid handle tuple has been resolved by the route
+        # tree handles it and processes the request (post handling)
+        # returning immediately as the request has been handled
+        if route_tuple:
+            self._handle_match(rest_request, route_tuple)
+            self._process_request(rest_request)
+            return
+
         # raises the MVC request not handled exception, because no MVC
         # service was found for the current request constraints
         raise exceptions.MVCRequestNotHandled(
@@ -750,7 +810,7 @@ class MVC(colony.System):
             rest_request, delegate, connection_name
         )
 
-    def _validate_match(self, rest_request, resource_path, path_match, matching_regex):
+    def _match_pattern(self, path_match, matching_regex):
         # retrieves the base index (offset index) for the matching regex
         # this is going to be used in the calculus of the service index
         base_index = self.matching_regex_base_map[matching_regex]
@@ -762,8 +822,9 @@ class MVC(colony.System):
         # the group index and subtracts one value and uses it to
         # retrieve the pattern
         mvc_service_index = base_index + group_index - 1
-        pattern = self.patterns_list[mvc_service_index]
+        return self.matching_patterns_list[mvc_service_index]
 
+    def _validate_match(self, rest_request, resource_path, pattern):
         # retrieves the pattern attributes list from the
         # MVC service patterns map
         pattern_attributes_list = self.patterns_map[pattern]
@@ -792,6 +853,44 @@ class MVC(colony.System):
         # returns the return value
         return return_value
 
+    def _validate_route(self, rest_request, resource_path):
+        """
+        Tries to resolve the given resource path using the route
+        tree, validating the matched patterns (in order) against
+        the provided REST request.
+
+        :type rest_request: RestRequest
+        :param rest_request: The REST request to be validated.
+        :type resource_path: String
+        :param resource_path: The resource path to be resolved.
+        :rtype: Tuple
+        :return: Tuple containing the handle tuple for the first valid
+        pattern and the priority of such pattern, in case there's no
+        valid pattern the handle tuple is invalid and the priority is
+        the lowest possible one.
+        """
+
+        # retrieves the (lower cased) operation type of the request
+        # as the HTTP method is part of the key in the route tree
+        request = rest_request.get_request()
+        operation_type = request.operation_type.lower()
+
+        # retrieves the complete set of (ordered) matches from the route
+        # tree and iterates over them to find the first one that is valid
+        # according to the remaining attributes of the pattern
+        matches = self.route_tree.match(resource_path, operation_type)
+        for priority, arguments, pattern_names in matches:
+            handle_tuple = self.__validate_arguments(
+                rest_request, arguments, pattern_names
+            )
+            if not handle_tuple:
+                continue
+            return handle_tuple, priority
+
+        # returns an invalid handle tuple with a priority that is lower
+        # than the one of any registered pattern (no route match)
+        return None, len(self.patterns_list)
+
     def _handle_match(self, rest_request, handler_tuple):
         """
         Handles a regular expression match, redirecting the
@@ -919,6 +1018,45 @@ class MVC(colony.System):
         defined in the internal structures.
         """
 
+        # re-creates the route tree and clears the list of patterns
+        # that are going to be matched using the regex list as well
+        # as the map with the priority of each pattern (reset operation)
+        self.route_tree = RouteTree()
+        self.matching_patterns_list = []
+        self.patterns_priority_map.clear()
+
+        # iterates over all the patterns in the patterns list (by order)
+        # to add them either to the route tree or to the list of patterns
+        # to be matched using the regex list (fallback strategy)
+        for priority, pattern in enumerate(self.patterns_list):
+            # sets the priority of the pattern and retrieves the list
+            # of pattern attributes (handler attributes) for it
+            self.patterns_priority_map[pattern] = priority
+            pattern_attributes_list = self.patterns_map[pattern]
+
+            # parses the original expression of each of the pattern
+            # attributes into the route segments, and in case any of
+            # them is not representable in the route tree adds the
+            # pattern to the list to be matched using the regex
+            segments_list = [
+                self.route_tree.parse(arguments[4]["original"])
+                for _validation_regex, arguments in pattern_attributes_list
+            ]
+            if None in segments_list:
+                self.matching_patterns_list.append(pattern)
+                continue
+
+            # adds the complete set of pattern attributes to the route
+            # tree under the priority of the pattern (so that the order
+            # of the patterns is respected) for each of its operation types
+            for segments, pattern_attributes in zip(
+                segments_list, pattern_attributes_list
+            ):
+                _validation_regex, arguments = pattern_attributes
+                operation_types = arguments[1] or DEFAULT_OPERATION_TYPES
+                operation_types = self.__cast_tuple(operation_types)
+                self.route_tree.add(segments, priority, operation_types, arguments)
+
         # starts the matching regex value buffer
         matching_regex_buffer = colony.StringBuffer()
 
@@ -933,10 +1071,10 @@ class MVC(colony.System):
         current_base_index = 0
         is_first = True
 
-        # iterates over all the patterns in the patterns list to
-        # add then to the matching regex buffer and to calculate
+        # iterates over all the patterns in the matching patterns list
+        # to add then to the matching regex buffer and to calculate
         # their base indexes
-        for pattern in self.patterns_list:
+        for pattern in self.matching_patterns_list:
             # in case it's not the first iteration adds the
             # or operand to the matching regex value buffer
             if is_first:
@@ -1258,6 +1396,14 @@ class MVC(colony.System):
                 "invalid resource path validation match"
             )
 
+        # retrieves the (resource path) validation match groups map
+        # and uses it to validate the remaining handler arguments
+        validation_match_groups_map = validation_match.groupdict()
+        return self.__validate_arguments(
+            rest_request, arguments, validation_match_groups_map
+        )
+
+    def __validate_arguments(self, rest_request, arguments, pattern_names):
         # retrieves the length of the handler arguments, in order to be able
         # to conditionally validate the various parameters from it
         arguments_length = len(arguments)
@@ -1266,7 +1412,7 @@ class MVC(colony.System):
         # to be used as attributes by the handler
         method = arguments_length > 0 and arguments[0] or None
         operation_types = (
-            arguments_length > 1 and arguments[1] or ("get", "put", "post", "delete")
+            arguments_length > 1 and arguments[1] or DEFAULT_OPERATION_TYPES
         )
         encoders = arguments_length > 2 and arguments[2] or None
         constraints = arguments_length > 3 and arguments[3] or {}
@@ -1323,9 +1469,6 @@ class MVC(colony.System):
             if attribute_value_c == constraint_value:
                 return None
 
-        # retrieves the (resource path) validation match groups map
-        validation_match_groups_map = validation_match.groupdict()
-
         # creates the map containing the various parameters to be
         # "pushed" to the lower layer of the MVC stack
         parameters = dict(
@@ -1333,7 +1476,7 @@ class MVC(colony.System):
             communication_handler=self.mvc_communication_handler,
             method=operation_type_r,
             encoder_name=encoder_name_r,
-            pattern_names=validation_match_groups_map,
+            pattern_names=pattern_names,
             meta=meta,
         )
 
@@ -1363,3 +1506,165 @@ class MVC(colony.System):
         # the value to the caller method
         tuple_value = type(value) == tuple and value or (value,)
         return tuple_value
+
+
+class RouteTree(object):
+    """
+    The route tree class, that indexes the (simple) route
+    patterns segment by segment so that the patterns matching
+    a certain path may be found in time proportional to the
+    number of segments of such path.
+
+    Each node of the tree is a tuple containing the map of the
+    static (literal) children, the map of the parameter children
+    (by type) and the map of the entries by operation type.
+    """
+
+    root = None
+    """ The root node of the tree, from which the matching of
+    every path starts (first segment) """
+
+    def __init__(self):
+        self.root = ({}, {}, {})
+
+    def parse(self, expression):
+        """
+        Parses the given (original) route expression into a list
+        of segments that may be added to the tree, each segment is
+        either a literal string or a tuple with the type and name.
+
+        :type expression: String
+        :param expression: The original route expression to be parsed.
+        :rtype: List
+        :return: The list of parsed segments or an invalid value in
+        case the expression can not be represented in the tree.
+        """
+
+        # removes the start and end of line tokens from the
+        # expression as they are implicit in the tree
+        if expression.startswith("^"):
+            expression = expression[1:]
+        if expression.endswith("$"):
+            expression = expression[:-1]
+
+        # creates the list that will hold the various segments
+        # and iterates over the (slash separated) expression parts
+        # to parse each of them into a proper segment
+        segments = []
+        for part in expression.split("/"):
+            # tries to match the part as a single (typed) name and
+            # in case it succeeds adds it as a parameter segment
+            match = SEGMENT_REGEX.match(part)
+            if match:
+                _type_s, type_t, name = match.groups()
+                segments.append((type_t or "str", name))
+                continue
+
+            # verifies if the part contains any of the special regex
+            # characters and if that's the case the expression may not
+            # be represented (must be matched using the regex)
+            for character in part:
+                if character in SPECIAL_CHARACTERS:
+                    return None
+
+            # adds the part as a literal segment, that must be
+            # matched exactly against the path segment
+            segments.append(part)
+
+        # returns the final list of parsed segments
+        return segments
+
+    def add(self, segments, priority, operation_types, arguments):
+        """
+        Adds the given (parsed) segments to the tree associating
+        them with the provided arguments for each operation type.
+
+        :type segments: List
+        :param segments: The list of segments as returned by the
+        parse operation.
+        :type priority: int
+        :param priority: The priority (order) of the pattern, lower
+        values take precedence.
+        :type operation_types: Tuple
+        :param operation_types: The operation types (HTTP methods)
+        handled by the pattern.
+        :type arguments: Tuple
+        :param arguments: The handler arguments to be associated with
+        the entry, returned when matching.
+        """
+
+        # creates the list that will hold the names of the parameter
+        # segments (by order) to be used in the matching of values
+        names = []
+
+        # iterates over the complete set of segments walking the tree
+        # and creating the nodes as required
+        node = self.root
+        for segment in segments:
+            statics, parameters, _entries = node
+            if colony.legacy.is_string(segment):
+                node = statics.setdefault(segment, ({}, {}, {}))
+                continue
+            type_t, name = segment
+            regex = INT_SEGMENT_REGEX if type_t == "int" else STR_SEGMENT_REGEX
+            _regex, node = parameters.setdefault(regex, (regex, ({}, {}, {})))
+            names.append(name)
+
+        # adds the entry to the final node for each of the operation
+        # types and keeps the entries sorted by priority
+        _statics, _parameters, entries = node
+        for operation_type in operation_types:
+            entries_l = entries.setdefault(operation_type, [])
+            entries_l.append((priority, names, arguments))
+            entries_l.sort(key=lambda entry: entry[0])
+
+    def match(self, path, operation_type):
+        """
+        Retrieves the complete set of entries matching the given
+        path and operation type, ordered by priority.
+
+        :type path: String
+        :param path: The (slash separated) path to be matched.
+        :type operation_type: String
+        :param operation_type: The (lower cased) operation type.
+        :rtype: List
+        :return: The list of tuples containing the priority, the
+        arguments and the map of pattern names for each match.
+        """
+
+        # creates the list that will hold the matches and splits
+        # the path into the segments that are going to be walked
+        matches = []
+        segments = path.split("/")
+        segments_l = len(segments)
+
+        # walks the tree using an explicit stack, as both the static
+        # and the parameter children may match the same segment
+        stack = [(self.root, 0, [])]
+        while stack:
+            node, index, values = stack.pop()
+            statics, parameters, entries = node
+
+            # in case all the segments have been consumed adds the
+            # entries of the node for the operation type as matches
+            if index == segments_l:
+                for priority, names, arguments in entries.get(operation_type, ()):
+                    pattern_names = dict(zip(names, values))
+                    matches.append((priority, arguments, pattern_names))
+                continue
+
+            # tries to walk both the static child and the parameter
+            # children that match the current segment
+            segment = segments[index]
+            child = statics.get(segment, None)
+            if child:
+                stack.append((child, index + 1, values))
+            for regex, child in colony.legacy.values(parameters):
+                if not regex.match(segment):
+                    continue
+                stack.append((child, index + 1, values + [segment]))
+
+        # sorts the matches by priority so that the first pattern
+        # (in order) is the first one to be validated
+        matches.sort(key=lambda match: match[0])
+        return matches
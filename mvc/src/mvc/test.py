@@ -0,0 +1,176 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import colony
+
+from . import system
+from . import mocks
+from . import exceptions
+
+
+class MVCTest(colony.Test):
+    """
+    The MVC infra-structure test class, responsible
+    for the returning of the associated tests.
+    """
+
+    def get_bundle(self):
+        return (MVCDispatchTestCase, RouteTreeTestCase)
+
+    def set_up(self, test_case):
+        colony.Test.set_up(self, test_case)
+
+    def tear_down(self, test_case):
+        colony.Test.tear_down(self, test_case)
+
+
+class MVCDispatchTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "MVC Dispatch test case"
+
+    def _create_mvc(self, patterns):
+        mock_plugin = mocks.MockPlugin()
+        mvc = system.MVC(mock_plugin)
+        controller = mocks.MockController(mock_plugin)
+        service_plugin = mocks.MockServicePlugin(patterns(controller))
+        mvc.load_mvc_service_plugin(service_plugin)
+        return mvc, controller, service_plugin
+
+    def test_route_tree(self):
+        mvc, controller, _service_plugin = self._create_mvc(
+            lambda controller: (
+                (r"items", controller.index, "get"),
+                (r"items", controller.create, "post"),
+                (r"items/search", controller.search, "get"),
+                (r"items/<int:id>", controller.show, "get"),
+                (r"items/<name>", controller.show_name, "get"),
+            )
+        )
+
+        self.assertEqual(mvc.matching_regex_list, [])
+
+        mvc.handle_rest_request(mocks.MockRestRequest("items"))
+        mvc.handle_rest_request(mocks.MockRestRequest("items", "POST"))
+        mvc.handle_rest_request(mocks.MockRestRequest("items/search"))
+        mvc.handle_rest_request(mocks.MockRestRequest("items/42"))
+        mvc.handle_rest_request(mocks.MockRestRequest("items/hello"))
+
+        self.assertEqual(
+            controller.calls,
+            [
+                ("index",),
+                ("create",),
+                ("search",),
+                ("show", 42),
+                ("show_name", "hello"),
+            ],
+        )
+
+        rest_request = mocks.MockRestRequest("items/42/extra")
+        self.assertRaises(
+            exceptions.MVCRequestNotHandled, mvc.handle_rest_request, rest_request
+        )
+
+        rest_request = mocks.MockRestRequest("items/42", "DELETE")
+        self.assertRaises(
+            exceptions.MVCRequestNotHandled, mvc.handle_rest_request, rest_request
+        )
+
+    def test_fallback(self):
+        mvc, controller, service_plugin = self._create_mvc(
+            lambda controller: (
+                (r"items/?", controller.index, "get"),
+                (r"items/<regex('[a-z]+'):name>", controller.show_name, "get"),
+                (r"items/<int:id>", controller.show, "get"),
+                (r"items/search", controller.search, "get"),
+            )
+        )
+
+        self.assertEqual(len(mvc.matching_regex_list), 1)
+        self.assertEqual(len(mvc.matching_patterns_list), 2)
+
+        mvc.handle_rest_request(mocks.MockRestRequest("items/"))
+        mvc.handle_rest_request(mocks.MockRestRequest("items/12"))
+        mvc.handle_rest_request(mocks.MockRestRequest("items/search"))
+
+        self.assertEqual(
+            controller.calls,
+            [("index",), ("show", 12), ("show_name", "search")],
+        )
+
+        mvc.unload_mvc_service_plugin(service_plugin)
+
+        self.assertEqual(mvc.matching_regex_list, [])
+        self.assertEqual(mvc.matching_patterns_list, [])
+
+        rest_request = mocks.MockRestRequest("items/12")
+        self.assertRaises(
+            exceptions.MVCRequestNotHandled, mvc.handle_rest_request, rest_request
+        )
+
+
+class RouteTreeTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Route Tree test case"
+
+    def test_parse(self):
+        route_tree = system.RouteTree()
+
+        self.assertEqual(route_tree.parse("items"), ["items"])
+        self.assertEqual(
+            route_tree.parse("^items/<int:id>/<name>$"),
+            ["items", ("int", "id"), ("str", "name")],
+        )
+        self.assertEqual(route_tree.parse("items/?"), None)
+        self.assertEqual(route_tree.parse("items/<id>.json"), None)
+        self.assertEqual(route_tree.parse("items/<regex('[a-z]+'):name>"), None)
+
+    def test_match(self):
+        route_tree = system.RouteTree()
+        route_tree.add(route_tree.parse("items/<name>"), 1, ("get",), "name")
+        route_tree.add(route_tree.parse("items/<int:id>"), 2, ("get",), "id")
+        route_tree.add(route_tree.parse("items/latest"), 0, ("get", "put"), "latest")
+
+        matches = route_tree.match("items/latest", "get")
+        self.assertEqual(matches, [(0, "latest", {}), (1, "name", dict(name="latest"))])
+
+        matches = route_tree.match("items/42", "get")
+        self.assertEqual(
+            matches, [(1, "name", dict(name="42")), (2, "id", dict(id="42"))]
+        )
+
+        matches = route_tree.match("items/latest", "put")
+        self.assertEqual(matches, [(0, "latest", {})])
+
+        self.assertEqual(route_tree.match("items/a b/c", "get"), [])
+        self.assertEqual(route_tree.match("items/a/b", "get"), [])
+        self.assertEqual(route_tree.match("items/latest", "post"), [])
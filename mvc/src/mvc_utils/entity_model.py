@@ -1106,6 +1106,185 @@ def _class_apply_context(
     return options
 
 
+@utils.transaction_m
+def _class_store_many(
+    cls,
+    models,
+    persist_type=PERSIST_UPDATE | PERSIST_SAVE,
+    validate=True,
+    hooks=True,
+    immutable=True,
+    force_persist=False,
+    entity_manager=None,
+):
+    """
+    "Transactional" class method to be used for the persistence
+    of a large sequence of entity models in bulk, the saving and
+    updating of the models is done using the many based methods
+    of the entity manager (multiple row queries).
+
+    Note that the relations of the models are not stored in a
+    chained fashion, they must have been previously persisted.
+
+    :type models: List
+    :param models: The sequence of (entity) models to be stored
+    in the data source.
+    :type persist_type: int
+    :param persist_type: The type of persist to be used
+    in the entities.
+    :type validate: bool
+    :param validate: Flag controlling if a validation should
+    be run in the models before persisting them.
+    :type hooks: bool
+    :param hooks: Flag controlling if the hooks should be executed.
+    :type immutable: bool
+    :param immutable: Flag that controls/defines if the immutable
+    rules should be respected for update operations.
+    :type force_persist: bool
+    :param force_persist: Flag controlling if the persistence
+    should be forced in which case the persist type mask is completely
+    ignored by the persistence engine.
+    :type entity_manager: EntityManager
+    :param entity_manager: The optional entity manager
+    reference to be used.
+    """
+
+    # in case the read only mode is active then no persistence is
+    # allowed, this is a security measure to avoid data loss
+    if READ_ONLY:
+        raise RuntimeError("read only mode, no persistence allowed")
+
+    # in case the force persist flag is set (persistence is ignored)
+    # the persist type is set to the all permission (no control)
+    persist_type = force_persist and PERSIST_ALL or persist_type
+
+    # retrieves the entity manager to be used or the
+    # default "embedded" entity manager
+    entity_manager = entity_manager or cls._entity_manager
+
+    # creates the lists that will hold the models that are
+    # going to be saved and updated and the list with the
+    # persisted flag for each of the models (hooks control)
+    saved = []
+    updated = []
+    persisted = []
+
+    # iterates over all the models to run the pre and on hooks
+    # and the validation, separating them by persistence mode
+    for model in models:
+        # checks if the current model is already persisted in the
+        # data source, this value will be useful for the conditional
+        # calling of the handlers and for the persistence mode
+        is_persisted = model.is_persisted()
+        persisted.append(is_persisted)
+
+        # tries to call the pre store methods, in order to notify the
+        # model about the starting of the store procedure
+        if hooks:
+            if hasattr(model, "pre_store") and persist_type & (
+                PERSIST_SAVE | PERSIST_UPDATE
+            ):
+                model.pre_store(persist_type)
+            if (
+                hasattr(model, "pre_save")
+                and not is_persisted
+                and persist_type & PERSIST_SAVE
+            ):
+                model.pre_save(persist_type)
+            if (
+                hasattr(model, "pre_update")
+                and is_persisted
+                and persist_type & PERSIST_UPDATE
+            ):
+                model.pre_update(persist_type)
+
+        # runs the "preemptive" validation process in the model so
+        # that any problem is detected before the persistence
+        if validate:
+            model.preemptive_validate(persist_type)
+
+        # tries to call the on store methods, in order to notify the
+        # model about the starting of the store procedure
+        if hooks:
+            if hasattr(model, "on_store") and persist_type & (
+                PERSIST_SAVE | PERSIST_UPDATE
+            ):
+                model.on_store(persist_type)
+            if (
+                hasattr(model, "on_save")
+                and not is_persisted
+                and persist_type & PERSIST_SAVE
+            ):
+                model.on_save(persist_type)
+            if (
+                hasattr(model, "on_update")
+                and is_persisted
+                and persist_type & PERSIST_UPDATE
+            ):
+                model.on_update(persist_type)
+
+        # sets the context information in the model and adds it
+        # to the proper list according to the persistence mode
+        model.set_context(entity_manager=entity_manager)
+        if is_persisted and persist_type & PERSIST_UPDATE:
+            updated.append(model)
+        elif not is_persisted and persist_type & PERSIST_SAVE:
+            saved.append(model)
+
+    # detaches the models in order to avoid any possible
+    # loading of relations during the persistence
+    for model in models:
+        model.detach_l(force=False)
+
+    try:
+        # saves and updates the models in bulk using the entity
+        # manager, this should reduce the number of queries
+        entity_manager.save_many(saved)
+        entity_manager.update_many(updated, immutable=immutable)
+    except BaseException as exception:
+        # tries to call the fail store methods, in order to notify
+        # the models about the failure of the store procedure
+        if hooks:
+            for model, is_persisted in zip(models, persisted):
+                if hasattr(model, "fail_store"):
+                    model.fail_store(persist_type, exception)
+                if hasattr(model, "fail_save") and not is_persisted:
+                    model.fail_save(persist_type, exception)
+                if hasattr(model, "fail_update") and is_persisted:
+                    model.fail_update(persist_type, exception)
+
+        # re-raises the exception to the upper levels, no need to
+        # to except at this level
+        raise
+    finally:
+        # attaches the models back enabling them to communicate
+        # with the data source for loading of relations
+        for model in models:
+            model.attach_l(force=False)
+
+    # tries to call the post store methods, in order to notify the
+    # models about the finishing of the store procedure
+    if not hooks:
+        return
+    for model, is_persisted in zip(models, persisted):
+        if hasattr(model, "post_store") and persist_type & (
+            PERSIST_SAVE | PERSIST_UPDATE
+        ):
+            model.post_store(persist_type)
+        if (
+            hasattr(model, "post_save")
+            and not is_persisted
+            and persist_type & PERSIST_SAVE
+        ):
+            model.post_save(persist_type)
+        if (
+            hasattr(model, "post_update")
+            and is_persisted
+            and persist_type & PERSIST_UPDATE
+        ):
+            model.post_update(persist_type)
+
+
 @utils.transaction_m
 def delete(self, persist_type=PERSIST_UPDATE | PERSIST_SAVE, entity_manager=None):
     """
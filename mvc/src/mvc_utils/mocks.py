@@ -163,3 +163,64 @@ class MockTemplateVisitor(object):
 
     def _validate_accept_node(self, node, accept_node):
         return accept_node
+
+
+class MockEntityManager(object):
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def begin(self):
+        self.calls.append(("begin",))
+
+    def commit(self):
+        self.calls.append(("commit",))
+
+    def rollback(self):
+        self.calls.append(("rollback",))
+
+    def save_many(self, entities):
+        self.calls.append(("save_many", list(entities)))
+        if self.fail:
+            raise RuntimeError("save many failed")
+
+    def update_many(self, entities, immutable=True):
+        self.calls.append(("update_many", list(entities), immutable))
+
+
+class MockEntityModel(object):
+    def __init__(self, name, persisted=False):
+        self.name = name
+        self.persisted = persisted
+        self.events = []
+        self.entity_manager = None
+
+    def is_persisted(self):
+        return self.persisted
+
+    def preemptive_validate(self, persist_type):
+        self.events.append("validate")
+
+    def set_context(self, entity_manager=None):
+        self.entity_manager = entity_manager
+
+    def detach_l(self, force=True):
+        self.events.append("detach")
+
+    def attach_l(self, force=True):
+        self.events.append("attach")
+
+    def pre_save(self, persist_type):
+        self.events.append("pre_save")
+
+    def pre_update(self, persist_type):
+        self.events.append("pre_update")
+
+    def post_save(self, persist_type):
+        self.events.append("post_save")
+
+    def post_update(self, persist_type):
+        self.events.append("post_update")
+
+    def fail_store(self, persist_type, exception):
+        self.events.append("fail_store")
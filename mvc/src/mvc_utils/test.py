@@ -34,6 +34,7 @@ from . import utils
 from . import mocks
 from . import system
 from . import controller
+from . import entity_model
 from . import exceptions
 
 
@@ -52,6 +53,7 @@ class MVCUtilsTest(colony.Test):
             TemplateFileACLTestCase,
             TemplateProcessMethodsTestCase,
             ExceptionsTestCase,
+            EntityModelStoreManyTestCase,
         )
 
     def set_up(self, test_case):
@@ -776,3 +778,101 @@ class ExceptionsTestCase(colony.ColonyTestCase):
         ]
         for exception in exception_list:
             self.assertTrue(isinstance(exception, exceptions.ValidationError))
+
+
+class EntityModelStoreManyTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Entity Model Store Many test case"
+
+    def test_store_many(self):
+        entity_manager = mocks.MockEntityManager()
+
+        class TestModel(mocks.MockEntityModel):
+            _entity_manager = entity_manager
+
+        models = [
+            TestModel("first"),
+            TestModel("second", persisted=True),
+            TestModel("third"),
+        ]
+
+        entity_model._class_store_many(TestModel, models)
+
+        self.assertEqual(
+            entity_manager.calls,
+            [
+                ("begin",),
+                ("save_many", [models[0], models[2]]),
+                ("update_many", [models[1]], True),
+                ("commit",),
+            ],
+        )
+        self.assertEqual(
+            models[0].events,
+            ["pre_save", "validate", "detach", "attach", "post_save"],
+        )
+        self.assertEqual(
+            models[1].events,
+            ["pre_update", "validate", "detach", "attach", "post_update"],
+        )
+        for model in models:
+            self.assertEqual(model.entity_manager, entity_manager)
+
+    def test_store_many_persist_type(self):
+        entity_manager = mocks.MockEntityManager()
+
+        class TestModel(mocks.MockEntityModel):
+            _entity_manager = entity_manager
+
+        models = [
+            TestModel("first"),
+            TestModel("second", persisted=True),
+        ]
+
+        entity_model._class_store_many(
+            TestModel,
+            models,
+            persist_type=entity_model.PERSIST_SAVE,
+            validate=False,
+            hooks=False,
+        )
+
+        self.assertEqual(
+            entity_manager.calls,
+            [
+                ("begin",),
+                ("save_many", [models[0]]),
+                ("update_many", [], True),
+                ("commit",),
+            ],
+        )
+        self.assertEqual(models[0].events, ["detach", "attach"])
+        self.assertEqual(models[1].events, ["detach", "attach"])
+
+    def test_store_many_failure(self):
+        entity_manager = mocks.MockEntityManager(fail=True)
+
+        class TestModel(mocks.MockEntityModel):
+            _entity_manager = entity_manager
+
+        models = [
+            TestModel("first"),
+            TestModel("second", persisted=True),
+        ]
+
+        self.assertRaises(
+            RuntimeError,
+            entity_model._class_store_many,
+            TestModel,
+            models,
+        )
+        self.assertEqual(entity_manager.calls[-1], ("rollback",))
+        self.assertEqual(
+            models[0].events,
+            ["pre_save", "validate", "detach", "fail_store", "attach"],
+        )
+        self.assertEqual(
+            models[1].events,
+            ["pre_update", "validate", "detach", "fail_store", "attach"],
+        )
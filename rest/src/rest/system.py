@@ -30,7 +30,9 @@ __license__ = "Apache License, Version 2.0"
 
 import re
 import os
+import zlib
 import time
+import heapq
 import shelve
 import datetime
 import threading
@@ -44,6 +46,11 @@ try:
 except ImportError:
     ipaddress = None
 
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
 REGEX_COMPILATION_LIMIT = 99
 """ The regex compilation limit """
 
@@ -107,6 +114,26 @@ considered valid as an interval to mark a session as
 dirty for the new calculus of expire time, this value
 avoids an exhaustion on flushing the session data """
 
+DEFAULT_SHARDS = 8
+""" The default number of shards (databases) to be used by
+the SQLite session, sessions are distributed among the shards
+by their identifier and each shard is accessed concurrently """
+
+DEFAULT_GC_INTERVAL = 300
+""" The default amount of seconds between garbage collection
+operations for the session engines that support periodic
+garbage collection (cheap operation) """
+
+DEFAULT_SWEEP_INTERVAL = 1.0
+""" The default amount of seconds between each iteration of
+the background sweeper of the in-memory session storage, a
+zero value disables the background sweeper """
+
+DEFAULT_SWEEP_SLICE = 1000
+""" The default maximum number of expire index entries to be
+visited by each sweep slice, bounding the amount of time the
+storage lock is held by the sweeper """
+
 SESSION_ALIAS = dict(file="shelve")
 """ The map that associated simpler name with the alias
 for the session engine resolution, this allows for more
@@ -209,6 +236,16 @@ class REST(colony.System):
         # infra-structure into the current system (as expected)
         self.debug("Successfully loaded %s session" % self.session_c.__name__)
 
+    def unload(self):
+        """
+        Unloads the REST system, unloading the currently assigned
+        session class (stopping its background sweeper).
+        """
+
+        # unloads the session infra-structure, this should stop any
+        # background thread and close the underlying storage
+        self.session_c.unload()
+
     def get_handler_filename(self):
         """
         Retrieves the handler filename.
@@ -2517,6 +2554,32 @@ class RESTSession(object):
     this value is unset the next session access should trigger
     a garbage collection operation (may block some time) """
 
+    SWEEP = True
+    """ Flag that controls if the in-memory storage should be indexed
+    by expire time and swept by a background thread, the session
+    implementations with their own storage should unset this value """
+
+    EXPIRE_HEAP = None
+    """ The heap of (expire time, session id) tuples that indexes the
+    in-memory storage by expire time, entries may be stale (extended
+    or removed sessions) and are revalidated when popped """
+
+    SWEEP_LOCK = threading.RLock()
+    """ The lock that controls the access to the expire index and
+    the removal of the expired sessions from the storage """
+
+    SWEEP_STATS = None
+    """ The map containing the statistics of the sweep operations,
+    including the number of expired sessions and the sweep latency """
+
+    SWEEPER = None
+    """ The background thread that is going to be sweeping the expired
+    sessions from the storage in bounded slices """
+
+    SWEEP_EVENT = None
+    """ The event used to signal the background sweeper thread that
+    it should stop its execution (unload operation) """
+
     session_id = None
     """ The session id used to securely identify each
     session, this value should be secure enough to avoid
@@ -2612,15 +2675,26 @@ class RESTSession(object):
     def load(cls):
         cls.STORAGE = cls.STORAGE or dict()
         cls.GC_PENDING = True
+        if not cls.SWEEP:
+            return
+        cls.EXPIRE_HEAP = cls.EXPIRE_HEAP or []
+        cls.SWEEP_STATS = cls.SWEEP_STATS or dict(
+            expired=0, sweeps=0, sweep_time=0.0, maximum_sweep_time=0.0
+        )
+        cls._start_sweeper()
 
     @classmethod
     def unload(cls):
+        cls._stop_sweeper()
         cls.STORAGE = None
+        cls.EXPIRE_HEAP = None
         cls.GC_PENDING = False
 
     @classmethod
     def clear(cls):
         cls.STORAGE.clear()
+        if cls.EXPIRE_HEAP:
+            del cls.EXPIRE_HEAP[:]
 
     @classmethod
     def count(cls):
@@ -2639,6 +2713,7 @@ class RESTSession(object):
             cls.load()
         session = cls(*args, **kwargs)
         cls.STORAGE[session.session_id] = session
+        cls.SWEEP and cls._index(session)
         return session
 
     @classmethod
@@ -2658,11 +2733,22 @@ class RESTSession(object):
 
     @classmethod
     def expire(cls, sid):
-        del cls.STORAGE[sid]
+        # uses the non strict removal of the session as the
+        # background sweeper may have already removed it
+        cls.STORAGE.pop(sid, None)
 
     @classmethod
     def gc(cls):
         cls.GC_PENDING = False
+
+        # in case the storage is indexed by expire time the garbage
+        # collection is performed using the index, meaning that its
+        # cost is proportional to the number of expired sessions
+        if cls.SWEEP:
+            while cls.sweep(limit=DEFAULT_SWEEP_SLICE):
+                pass
+            return
+
         expired_sids = []
         for sid in cls.STORAGE:
             session = cls.STORAGE.get(sid, None)
@@ -2674,6 +2760,131 @@ class RESTSession(object):
         for sid in expired_sids:
             cls.expire(sid)
 
+    @classmethod
+    def sweep(cls, limit=None):
+        """
+        Removes the expired sessions from the in-memory storage using
+        the expire time index, visiting at most the provided number
+        of index entries so that the lock is held for a bounded time.
+
+        :type limit: int
+        :param limit: The maximum number of index entries to be visited
+        in this sweep slice, in case it's not provided there's no limit.
+        :rtype: bool
+        :return: If there are still expired entries pending in the index,
+        meaning that another sweep slice should be performed.
+        """
+
+        start = time.time()
+        visited = 0
+        expired = 0
+
+        cls.SWEEP_LOCK.acquire()
+        try:
+            heap = cls.EXPIRE_HEAP
+            storage = cls.STORAGE
+            if not heap or storage == None:
+                return False
+
+            # pops the index entries that are due, re-indexing the
+            # sessions that have been extended in the meantime and
+            # removing the ones that are effectively expired
+            while heap and heap[0][0] <= start:
+                if limit and visited == limit:
+                    break
+                visited += 1
+                _expire_time, sid = heapq.heappop(heap)
+                session = storage.get(sid, None)
+                if not session:
+                    continue
+                if session.expire_time > start:
+                    heapq.heappush(heap, (session.expire_time, sid))
+                    continue
+                storage.pop(sid, None)
+                expired += 1
+
+            pending = bool(heap) and heap[0][0] <= start
+        finally:
+            cls.SWEEP_LOCK.release()
+
+        # updates the sweep statistics with the number of expired
+        # sessions and the latency of the current sweep slice
+        sweep_time = time.time() - start
+        stats = cls.SWEEP_STATS
+        if stats:
+            stats["expired"] += expired
+            stats["sweeps"] += 1
+            stats["sweep_time"] = sweep_time
+            stats["maximum_sweep_time"] = max(stats["maximum_sweep_time"], sweep_time)
+
+        return pending
+
+    @classmethod
+    def stats(cls):
+        """
+        Retrieves the statistics of the session storage, including
+        the number of sessions and the latency of the sweep operations.
+
+        :rtype: Dictionary
+        :return: The map containing the statistics of the storage.
+        """
+
+        stats = dict(cls.SWEEP_STATS or {})
+        stats["count"] = cls.count() if cls.STORAGE != None else 0
+        stats["indexed"] = len(cls.EXPIRE_HEAP or [])
+        return stats
+
+    @classmethod
+    def _index(cls, session):
+        cls.SWEEP_LOCK.acquire()
+        try:
+            if cls.EXPIRE_HEAP == None:
+                cls.EXPIRE_HEAP = []
+            heapq.heappush(cls.EXPIRE_HEAP, (session.expire_time, session.session_id))
+        finally:
+            cls.SWEEP_LOCK.release()
+
+    @classmethod
+    def _start_sweeper(cls):
+        interval = colony.conf(
+            "SESSION_SWEEP_INTERVAL", DEFAULT_SWEEP_INTERVAL, cast=float
+        )
+        if not interval > 0:
+            return
+        if cls.SWEEPER and cls.SWEEPER.is_alive():
+            return
+        cls.SWEEP_EVENT = threading.Event()
+        cls.SWEEPER = threading.Thread(
+            target=cls._sweeper, args=(cls.SWEEP_EVENT, interval), name="Sweeper"
+        )
+        cls.SWEEPER.daemon = True
+        cls.SWEEPER.start()
+
+    @classmethod
+    def _stop_sweeper(cls):
+        sweeper = cls.SWEEPER
+        if not sweeper:
+            return
+        cls.SWEEP_EVENT.set()
+        cls.SWEEPER = None
+        cls.SWEEP_EVENT = None
+        if not sweeper == threading.current_thread():
+            sweeper.join()
+
+    @classmethod
+    def _sweeper(cls, event, interval):
+        sweep_slice = colony.conf("SESSION_SWEEP_SLICE", DEFAULT_SWEEP_SLICE, cast=int)
+        while True:
+            event.wait(interval)
+            if event.is_set():
+                break
+
+            # runs the sweep operation in bounded slices releasing the
+            # lock between them, so that the request handling threads
+            # are only blocked for short periods of time
+            while cls.sweep(limit=sweep_slice) and not event.is_set():
+                pass
+
     def update(self, domain=None, include_sub_domain=False, secure=False):
         self.start(domain=domain, include_sub_domain=include_sub_domain, secure=secure)
 
@@ -2984,6 +3195,9 @@ class ShelveSession(RESTSession):
     never be used under at concurrent based environment.
     """
 
+    SWEEP = False
+    """ The sweep flag is unset as the session uses its own storage """
+
     SHELVE = None
     """ The global reference to the shelve file that is
     going to be used in the session storage process, this
@@ -3071,6 +3285,180 @@ class ShelveSession(RESTSession):
         cls.SHELVE.sync()
 
 
+class SqliteSession(RESTSession):
+    """
+    SQLite based implementation of the REST session, that stores
+    the serialized sessions in a set of SQLite databases (shards)
+    selected using the session identifier.
+
+    Only the dirty sessions are persisted on flush and the expire
+    time of the sessions is indexed, so that the garbage collection
+    only visits the expired sessions. This is a thread safe session
+    implementation as the access to each shard is locked.
+    """
+
+    SWEEP = False
+    """ The sweep flag is unset as the session uses its own storage """
+
+    SHARDS = None
+    """ The list of shards, tuples with the SQLite connection and
+    the lock that controls the access to it, used in the storage
+    process, this variable starts with the unset value (not loaded) """
+
+    GC_TIMESTAMP = 0.0
+    """ The timestamp of the last garbage collection operation,
+    used to trigger the periodic garbage collection """
+
+    @classmethod
+    def load(cls, file_path="session.sqlite", shards=None):
+        super(SqliteSession, cls).load()
+        if not sqlite3:
+            raise RuntimeError("SQLite is not available")
+        if cls.SHARDS:
+            return
+        shards = shards or colony.conf("SESSION_SHARDS", DEFAULT_SHARDS, cast=int)
+        base_path = colony.conf("SESSION_PATH", "")
+        base_path = os.path.abspath(base_path)
+        exists_path = os.path.exists(base_path)
+        if not exists_path:
+            os.makedirs(base_path)
+        file_path = os.path.join(base_path, file_path)
+        name, extension = os.path.splitext(file_path)
+        _shards = []
+        for index in colony.legacy.xrange(shards):
+            shard_path = "%s.%d%s" % (name, index, extension)
+            connection = sqlite3.connect(
+                shard_path, check_same_thread=False, isolation_level=None
+            )
+            connection.execute("pragma journal_mode = wal")
+            connection.execute("pragma synchronous = normal")
+            connection.execute(
+                "create table if not exists session ("
+                "sid text primary key, expire_time real not null, data blob not null)"
+            )
+            connection.execute(
+                "create index if not exists session_expire_time "
+                "on session (expire_time)"
+            )
+            _shards.append((connection, threading.Lock()))
+        cls.SHARDS = _shards
+
+    @classmethod
+    def unload(cls):
+        super(SqliteSession, cls).unload()
+        for connection, lock in cls.SHARDS or []:
+            lock.acquire()
+            try:
+                connection.close()
+            finally:
+                lock.release()
+        cls.SHARDS = None
+
+    @classmethod
+    def clear(cls):
+        for shard in cls.SHARDS:
+            cls._execute(shard, "delete from session")
+
+    @classmethod
+    def count(cls):
+        if not cls.SHARDS:
+            cls.load()
+        count = 0
+        for shard in cls.SHARDS:
+            count += cls._execute(shard, "select count(1) from session", fetch=True)[0][
+                0
+            ]
+        return count
+
+    @classmethod
+    def keys(cls):
+        if not cls.SHARDS:
+            cls.load()
+        for shard in cls.SHARDS:
+            rows = cls._execute(shard, "select sid from session", fetch=True)
+            for row in rows:
+                yield row[0]
+
+    @classmethod
+    def new(cls, *args, **kwargs):
+        if not cls.SHARDS:
+            cls.load()
+        session = cls(*args, **kwargs)
+        session._store()
+        session.mark(dirty=False)
+        return session
+
+    @classmethod
+    def get_s(cls, sid):
+        if not cls.SHARDS:
+            cls.load()
+        if cls.GC_PENDING or time.time() - cls.GC_TIMESTAMP > DEFAULT_GC_INTERVAL:
+            cls.gc()
+        rows = cls._execute(
+            cls._get_shard(sid),
+            "select expire_time, data from session where sid = ?",
+            (sid,),
+            fetch=True,
+        )
+        if not rows:
+            return None
+        expire_time, data = rows[0]
+        if time.time() > expire_time:
+            cls.expire(sid)
+            return None
+        session = colony.legacy.cPickle.loads(bytes(data))
+        if not isinstance(session, RESTSession):
+            cls.expire(sid)
+            return None
+        return session
+
+    @classmethod
+    def expire(cls, sid):
+        cls._execute(cls._get_shard(sid), "delete from session where sid = ?", (sid,))
+
+    @classmethod
+    def gc(cls):
+        cls.GC_PENDING = False
+        cls.GC_TIMESTAMP = time.time()
+        for shard in cls.SHARDS:
+            cls._execute(
+                shard, "delete from session where expire_time < ?", (cls.GC_TIMESTAMP,)
+            )
+
+    @classmethod
+    def _get_shard(cls, sid):
+        # uses a stable hash of the session identifier (the same
+        # across processes) to select the shard for the session
+        sid_b = sid.encode("utf-8") if colony.legacy.is_unicode(sid) else sid
+        index = (zlib.crc32(sid_b) & 0xFFFFFFFF) % len(cls.SHARDS)
+        return cls.SHARDS[index]
+
+    @classmethod
+    def _execute(cls, shard, query, arguments=(), fetch=False):
+        connection, lock = shard
+        lock.acquire()
+        try:
+            cursor = connection.execute(query, arguments)
+            return cursor.fetchall() if fetch else None
+        finally:
+            lock.release()
+
+    def flush(self):
+        if not self.is_dirty():
+            return
+        self.mark(dirty=False)
+        self._store()
+
+    def _store(self):
+        cls = self.__class__
+        session_s = colony.legacy.cPickle.dumps(self, protocol=2)
+        cls._execute(
+            cls._get_shard(self.session_id),
+            "insert or replace into session (sid, expire_time, data) values (?, ?, ?)",
+            (self.session_id, self.expire_time, sqlite3.Binary(session_s)),
+        )
+
+
 class RedisSession(RESTSession):
     """
     Redis based session that uses a Redis server to store a
@@ -3085,6 +3473,9 @@ class RedisSession(RESTSession):
     variables must be set to define the connection with Redis.
     """
 
+    SWEEP = False
+    """ The sweep flag is unset as the session uses its own storage """
+
     REDIS = None
     """ The underlying Redis connection object that will be
     used for the storage and loading of sessions, this connection
@@ -28,7 +28,11 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import os
 import time
+import shutil
+import tempfile
+import threading
 
 import colony
 
@@ -48,6 +52,7 @@ class RESTTest(colony.Test):
             RESTSystemTestCase,
             RESTRequestTestCase,
             RESTSessionTestCase,
+            SqliteSessionTestCase,
             CookieTestCase,
             ExceptionsTestCase,
             RegressionTestCase,
@@ -790,11 +795,22 @@ class RESTSessionTestCase(colony.ColonyTestCase):
     def setUp(self):
         colony.ColonyTestCase.setUp(self)
         self._saved_storage = system.RESTSession.STORAGE
+        self._saved_heap = system.RESTSession.EXPIRE_HEAP
+        self._saved_start = system.RESTSession.__dict__["_start_sweeper"]
         system.RESTSession.STORAGE = {}
+        system.RESTSession.EXPIRE_HEAP = []
         system.RESTSession.GC_PENDING = True
 
+        # disables the background sweeper thread so that the (empty)
+        # storage loading does not leave a thread running, the sweep
+        # operations are run explicitly by the tests instead
+        system.RESTSession._start_sweeper = classmethod(lambda cls: None)
+
     def tearDown(self):
+        system.RESTSession._stop_sweeper()
+        system.RESTSession._start_sweeper = self._saved_start
         system.RESTSession.STORAGE = self._saved_storage
+        system.RESTSession.EXPIRE_HEAP = self._saved_heap
 
     def test_initialization(self):
         session = system.RESTSession("test_session", timeout=100, maximum_timeout=1000)
@@ -897,6 +913,44 @@ class RESTSessionTestCase(colony.ColonyTestCase):
         time.sleep(0.2)
         self.assertEqual(system.RESTSession.get_s("expire_check"), None)
 
+    def test_sweep(self):
+        for index in range(10):
+            system.RESTSession.new("sweep_expired_%d" % index, timeout=-10)
+        system.RESTSession.new("sweep_valid", timeout=1000)
+
+        # runs a bounded sweep slice that should only visit part of the
+        # expired sessions leaving the remaining ones pending
+        pending = system.RESTSession.sweep(limit=4)
+        self.assertEqual(pending, True)
+        self.assertEqual(system.RESTSession.count(), 7)
+
+        while system.RESTSession.sweep(limit=4):
+            pass
+
+        self.assertEqual(system.RESTSession.count(), 1)
+        self.assertIn("sweep_valid", system.RESTSession.STORAGE)
+
+    def test_sweep_extended(self):
+        session = system.RESTSession.new("sweep_extended", timeout=-10)
+        session.set_expire_time(time.time() + 1000)
+
+        pending = system.RESTSession.sweep()
+
+        self.assertEqual(pending, False)
+        self.assertIn("sweep_extended", system.RESTSession.STORAGE)
+
+    def test_stats(self):
+        system.RESTSession.new("stats_expired", timeout=-10)
+        system.RESTSession.new("stats_valid", timeout=1000)
+        system.RESTSession.gc()
+
+        stats = system.RESTSession.stats()
+
+        self.assertEqual(stats["count"], 1)
+        self.assertEqual(stats["expired"] >= 1, True)
+        self.assertEqual(stats["sweeps"] >= 1, True)
+        self.assertEqual(stats["sweep_time"] >= 0.0, True)
+
     def test_dirty_flag(self):
         session = system.RESTSession("dirty_test")
 
@@ -1185,6 +1239,119 @@ class ExceptionsTestCase(colony.ColonyTestCase):
             self.assertTrue(isinstance(exception, exceptions.BadServiceRequest))
 
 
+class SqliteSessionTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "SQLite Session test case"
+
+    def setUp(self):
+        colony.ColonyTestCase.setUp(self)
+        if not system.sqlite3:
+            self.skipTest("SQLite is not available")
+        self.base_path = tempfile.mkdtemp()
+        system.SqliteSession.unload()
+        system.SqliteSession.load(
+            file_path=os.path.join(self.base_path, "session.sqlite"), shards=2
+        )
+
+    def tearDown(self):
+        system.SqliteSession.unload()
+        shutil.rmtree(self.base_path, ignore_errors=True)
+
+    def test_new_session(self):
+        session = system.SqliteSession.new("new_session_id")
+
+        self.assertEqual(session.session_id, "new_session_id")
+        self.assertEqual(session.is_dirty(), False)
+        self.assertEqual(system.SqliteSession.count(), 1)
+        self.assertEqual(list(system.SqliteSession.keys()), ["new_session_id"])
+
+        session = system.SqliteSession.get_s("new_session_id")
+
+        self.assertNotEqual(session, None)
+        self.assertEqual(session.session_id, "new_session_id")
+        self.assertEqual(session.is_dirty(), False)
+
+        self.assertEqual(system.SqliteSession.get_s("unknown_session_id"), None)
+
+    def test_flush(self):
+        session = system.SqliteSession.new("flush_session_id")
+        session.set_attribute("key", "value")
+        session.flush()
+
+        session = system.SqliteSession.get_s("flush_session_id")
+        self.assertEqual(session.get_attribute("key"), "value")
+
+        # changes the attributes without marking the session as dirty
+        # so that the flush operation is a no-op (not persisted)
+        session.attributes_map["key"] = "other"
+        session.flush()
+
+        session = system.SqliteSession.get_s("flush_session_id")
+        self.assertEqual(session.get_attribute("key"), "value")
+
+    def test_expire(self):
+        system.SqliteSession.new("expire_session_id")
+        system.SqliteSession.expire("expire_session_id")
+
+        self.assertEqual(system.SqliteSession.get_s("expire_session_id"), None)
+        self.assertEqual(system.SqliteSession.count(), 0)
+
+    def test_gc(self):
+        system.SqliteSession.new("expired_session_id", timeout=-10)
+        system.SqliteSession.new("valid_session_id")
+
+        self.assertEqual(system.SqliteSession.count(), 2)
+
+        system.SqliteSession.gc()
+
+        self.assertEqual(system.SqliteSession.count(), 1)
+        self.assertEqual(system.SqliteSession.get_s("expired_session_id"), None)
+        self.assertNotEqual(system.SqliteSession.get_s("valid_session_id"), None)
+
+    def test_shards(self):
+        for index in range(32):
+            system.SqliteSession.new("session_id_%d" % index)
+
+        counts = [
+            shard[0].execute("select count(1) from session").fetchone()[0]
+            for shard in system.SqliteSession.SHARDS
+        ]
+
+        self.assertEqual(len(counts), 2)
+        self.assertEqual(sum(counts), 32)
+        self.assertNotIn(0, counts)
+        self.assertEqual(
+            sorted(system.SqliteSession.keys()),
+            sorted("session_id_%d" % index for index in range(32)),
+        )
+
+        system.SqliteSession.clear()
+
+        self.assertEqual(system.SqliteSession.count(), 0)
+
+    def test_threads(self):
+        def create(prefix):
+            for index in range(25):
+                session = system.SqliteSession.new("%s_%d" % (prefix, index))
+                session.set_attribute("index", index)
+                session.flush()
+
+        threads = [
+            threading.Thread(target=create, args=("thread_%d" % index,))
+            for index in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(system.SqliteSession.count(), 100)
+
+        session = system.SqliteSession.get_s("thread_3_24")
+        self.assertEqual(session.get_attribute("index"), 24)
+
+
 class RegressionTestCase(colony.ColonyTestCase):
     """
     Regression tests for critical bug fixes in the REST system.
@@ -1198,10 +1365,14 @@ class RegressionTestCase(colony.ColonyTestCase):
     def setUp(self):
         colony.ColonyTestCase.setUp(self)
         self._saved_storage = system.RESTSession.STORAGE
+        self._saved_start = system.RESTSession.__dict__["_start_sweeper"]
         system.RESTSession.STORAGE = {}
         system.RESTSession.GC_PENDING = True
+        system.RESTSession._start_sweeper = classmethod(lambda cls: None)
 
     def tearDown(self):
+        system.RESTSession._stop_sweeper()
+        system.RESTSession._start_sweeper = self._saved_start
         system.RESTSession.STORAGE = self._saved_storage
 
     def test_gc_does_not_raise_on_expired_sessions(self):
@@ -68,6 +68,10 @@ class RESTPlugin(colony.Plugin):
         self.system = rest.REST(self)
         self.test = rest.RESTTest(self)
 
+    def unload_plugin(self):
+        colony.Plugin.unload_plugin(self)
+        self.system.unload()
+
     @colony.load_allowed
     def load_allowed(self, plugin, capability):
         colony.Plugin.load_allowed(self, plugin, capability)
@@ -27,6 +27,7 @@ __license__ = "Apache License, Version 2.0"
 
 from . import asynchronous
 from . import exceptions
+from . import prefork
 from . import synchronous
 from . import system
 from . import test
@@ -45,13 +46,18 @@ from .exceptions import (
     PortStarvationReached,
     ConnectionChangeFailure,
 )
+from .prefork import PreforkMaster
 from .synchronous import (
     AbstractServiceConnectionHandler,
     AbstractServiceConnectionlessHandler,
 )
 from .system import ServiceUtils
 from .test import ServiceUtilsTest
-from .threads import ServiceAcceptingThread, ServiceExecutionThread
+from .threads import (
+    ServiceAcceptingThread,
+    ServiceExecutionThread,
+    ServiceDispatchThread,
+)
 
 from .asynchronous import AbstractService as AbstractServiceAsync
 from .synchronous import AbstractService as AbstractServiceSync
@@ -28,16 +28,19 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import os
 import time
 import errno
-import heapq
 import select
 import socket
 import threading
+import collections
 
 import colony
 
+from . import timers
 from . import threads
+from . import prefork
 from . import exceptions
 
 _EPOLLIN = 0x001
@@ -89,17 +92,52 @@ ALL = READ | WRITE | ERROR
 """ The all operations flag that aggregates all the conditions
 for the registration operation """
 
-POLL_TIMEOUT = 0.2
+POLL_TIMEOUT = 1.0
 """ The maximum amount of time a pool operation will wait
-before unblocking, this value is critical to a quick shutdown
-of depending plugins, if the value is to high a lot of time
-is required for shutdown if the value is too low a lot of
-computer resources may be "consumed" """
+before unblocking, the effective timeout is computed from
+the nearest timer deadline and the loop is woken (wake socket)
+on shutdown, so this value only bounds the idle wait """
 
 PENDING_TIMEOUT = 5.0
 """ The timeout to be used to cancel connection in the
 handshake pending state (not possible to accept) """
 
+IDLE_TIMEOUT = 300.0
+""" The default timeout (in seconds) after which an idle
+(keep alive) client connection is closed """
+
+GATHER_COUNT = 64
+""" The maximum number of buffers to be gathered from the write
+buffer into a single (vectored) send operation """
+
+GATHER_SIZE = 262144
+""" The maximum number of bytes to be gathered from the write
+buffer into a single (vectored) send operation """
+
+COALESCE_SIZE = 16384
+""" The maximum number of bytes of gathered buffers that are joined
+into a single buffer when vectored sends are not available """
+
+READ_TIMEOUT = 30.0
+""" The default timeout (in seconds) for the reading of a
+request, counted from its last received bytes (the deadline
+is extended whenever data arrives for the request) """
+
+WORKERS = 0
+""" The default number of worker processes for the prefork
+mode, a zero value means that the prefork mode is disabled
+and the service runs in the current process """
+
+PIPELINE_THREADS = 0
+""" The default number of worker threads to be used for the
+parallel handling of the pipelined requests of a connection,
+a zero value means that requests are handled inline (main loop) """
+
+PIPELINE_SIZE = 16
+""" The maximum number of requests of a single connection that
+may be in flight (dispatched but not yet written) at a given time,
+the reading of the connection is paused while it's reached """
+
 
 class AbstractService(object):
     """
@@ -136,10 +174,23 @@ class AbstractService(object):
     """ The flag value that controls if the service is currently
     running, should be set on start and disabled on stop  """
 
-    time_events = []
-    """ The list of pending events to be handled in a time based
-    fashion, the process that handles these events is considered a timer
-    and this time is part of the main event loop """
+    timer_wheel = None
+    """ The (hierarchical) timer wheel holding the pending events to
+    be handled in a time based fashion, the wheel is advanced as part
+    of the main event loop and its timers may be canceled """
+
+    poll_deadline = None
+    """ The time at which the current poll operation of the main
+    loop is going to timeout, used to decide if the loop must be
+    woken for a timer with an earlier deadline """
+
+    idle_timeout = IDLE_TIMEOUT
+    """ The timeout (in seconds) after which an idle (keep alive)
+    client connection is closed """
+
+    read_timeout = READ_TIMEOUT
+    """ The timeout (in seconds) for the reading of a request,
+    counted from its last received bytes """
 
     handlers_map = {}
     """ The map that contains the association between the socket fd and
@@ -175,6 +226,42 @@ class AbstractService(object):
     closing operation before continue with the unloading of the plugin
     (providing a blocking call on the unload plugin) """
 
+    workers = 0
+    """ The number of worker processes to be forked (prefork mode)
+    in case it's zero the service runs in the current process """
+
+    reuse_port = False
+    """ If the port should be reused by the worker processes of the
+    prefork mode, meaning that each one binds its own socket """
+
+    prefork_master = None
+    """ The prefork master controller, responsible for the forking
+    and supervision of the worker processes (prefork mode) """
+
+    pipeline_threads = 0
+    """ The number of worker threads used for the parallel handling
+    of the pipelined requests, in case it's zero the requests are
+    handled inline in the main loop """
+
+    dispatch_threads = []
+    """ The list of worker threads that handle the requests that
+    have been dispatched by the pipelined connections """
+
+    dispatch_queue = None
+    """ The queue of callables (dispatched requests) pending to be
+    executed by one of the worker threads """
+
+    dispatch_condition = None
+    """ The condition that controls the access to the dispatch queue """
+
+    ready_queue = None
+    """ The queue of client connections that have requests ready to
+    be written, to be processed by the main loop thread """
+
+    wake_sockets = None
+    """ The pair of sockets used to wake the main loop (poll) once a
+    dispatched request has been handled by a worker thread """
+
     def __init__(self, service_utils, service_utils_plugin, parameters={}):
         """
         Constructor of the class.
@@ -201,8 +288,27 @@ class AbstractService(object):
         self.socket_parameters = parameters.get("socket_parameters", {})
         self.service_configuration = parameters.get("service_configuration", {})
         self.extra_parameters = parameters.get("extra_parameters", {})
+        self.workers = parameters.get("workers", WORKERS)
+        self.reuse_port = parameters.get("reuse_port", False)
+        self.pipeline_threads = parameters.get("pipeline_threads", None)
+        self.idle_timeout = parameters.get("idle_timeout", None)
+        self.read_timeout = parameters.get("read_timeout", None)
+
+        # in case no idle or read timeouts have been
+        # provided the default values are used instead
+        if self.idle_timeout == None:
+            self.idle_timeout = IDLE_TIMEOUT
+        if self.read_timeout == None:
+            self.read_timeout = READ_TIMEOUT
+
+        # in case no pipeline threads value has been provided
+        # the global configuration (or the default) is used
+        if self.pipeline_threads == None:
+            self.pipeline_threads = colony.conf(
+                "SERVICE_PIPELINE_THREADS", PIPELINE_THREADS, cast=int
+            )
 
-        self.time_events = []
+        self.poll_deadline = 0.0
         self.service_sockets = []
         self.service_socket_end_point_map = {}
         self.handlers_map = {}
@@ -223,6 +329,17 @@ class AbstractService(object):
             self.extra_parameters,
         )
         self.service_execution_thread = threads.ServiceExecutionThread(self)
+        self.service_execution_thread.scheduler = self.add_time_handler
+
+        # creates the structures for the dispatching of the pipelined
+        # requests and the worker threads that are going to handle them
+        self.dispatch_queue = collections.deque()
+        self.dispatch_condition = threading.Condition()
+        self.ready_queue = collections.deque()
+        self.dispatch_threads = [
+            threads.ServiceDispatchThread(self)
+            for _index in colony.legacy.xrange(self.pipeline_threads)
+        ]
 
         # in case no end points are defined and there is a socket provider
         # a default end point is created with those values as they are considered
@@ -254,6 +371,10 @@ class AbstractService(object):
             self.add_handler(client_socket_fd, client_connection.read_handler, READ)
             self.add_handler(client_socket_fd, client_connection.write_handler, WRITE)
             self.add_handler(client_socket_fd, client_connection.error_handler, ERROR)
+
+            # schedules the (idle) timeout for the newly
+            # created client connection
+            client_connection.refresh()
         except Exception:
             # removes the partially registered socket from the internal
             # structures to avoid leaking the file descriptor
@@ -360,7 +481,76 @@ class AbstractService(object):
                         pass
 
     def add_time_handler(self, time, callback_method):
-        heapq.heappush(self.time_events, (time, callback_method))
+        """
+        Adds a time handler (timer) that calls the given callback
+        method once the given time is reached, this operation is of
+        constant time and may be called from any thread.
+
+        :type time: float
+        :param time: The time (unix timestamp) for the calling.
+        :type callback_method: Callable
+        :param callback_method: The callable to be called.
+        :rtype: Timer
+        :return: The timer that has been scheduled, may be
+        used to cancel the calling of the callback method.
+        """
+
+        # converts the time into the monotonic clock (used by the timer
+        # wheel) and adds the timer to the timer wheel, in case its deadline
+        # is earlier than the one of the current poll wakes the loop
+        # so that the poll timeout is re-computed
+        deadline = timers.monotonic(time)
+        timer = self.timer_wheel.add(deadline, callback_method)
+        deadline < self.poll_deadline and self._wake()
+        return timer
+
+    def remove_time_handler(self, timer):
+        """
+        Removes (cancels) the given time handler (timer) so that
+        its callback method is not called, constant time operation.
+
+        :type timer: Timer
+        :param timer: The timer to be canceled.
+        """
+
+        self.timer_wheel.cancel(timer)
+
+    def dispatch(self, callable):
+        """
+        Dispatches the given callable (request handling) to be
+        executed by one of the worker threads of the service.
+
+        :type callable: Callable
+        :param callable: The callable to be executed in a worker thread.
+        """
+
+        # acquires the dispatch condition
+        self.dispatch_condition.acquire()
+
+        try:
+            # adds the callable to the dispatch queue and notifies
+            # one of the worker threads so that it's executed
+            self.dispatch_queue.append(callable)
+            self.dispatch_condition.notify()
+        finally:
+            # releases the dispatch condition
+            self.dispatch_condition.release()
+
+    def notify_ready(self, client_connection):
+        """
+        Notifies the main loop that the given client connection has
+        dispatched requests ready to be written, this method is meant
+        to be called from the worker threads.
+
+        :type client_connection: ClientConnection
+        :param client_connection: The client connection that has
+        requests ready to be written.
+        """
+
+        # adds the client connection to the ready queue and wakes
+        # the main loop so that the queue is processed immediately
+        self.ready_queue.append(client_connection)
+        self._wake()
 
     def start_service(self):
         """
@@ -368,15 +558,27 @@ class AbstractService(object):
         """
 
         try:
+            # creates and binds the service sockets, in the prefork
+            # mode this happens before the forking (shared sockets)
+            # unless the port is reused by the worker processes
+            if not self.workers or not self.reuse_port:
+                self._create_service_sockets()
+                self._bind_service_sockets()
+
+            # in case the prefork mode is enabled forks the worker
+            # processes, the master process only returns from the
+            # call once the service has been stopped
+            if self.workers and not self._prefork():
+                return
+
             # starts the background threads and then creates the
             # base infra-structure for the service so that the
             # internal service structures are properly created
             self._start_threads()
             self._create_base()
 
-            # creates and activates the service sockets so that
-            # new incoming connection may be accepted
-            self._create_service_sockets()
+            # activates the service sockets so that new
+            # incoming connection may be accepted
             self._activate_service_sockets()
 
             # runs the main loop, this is the blocking call
@@ -398,6 +600,7 @@ class AbstractService(object):
             # no longer be handled (loop closed)
             self._disable_service_sockets()
             self._remove_client_sockets()
+            self._destroy_base()
 
             # sets the service connection close end event
             # meaning that the unload call may unblock
@@ -408,6 +611,15 @@ class AbstractService(object):
             # useful (provided support for next loop)
             self.stop_flag = False
 
+            # in case the current process is a worker process of
+            # the prefork mode the background threads are stopped
+            # and the process exits (must not return to the caller)
+            if self.prefork_master and self.prefork_master.worker:
+                try:
+                    self._stop_threads()
+                finally:
+                    self.prefork_master.exit()
+
     def stop_service(self):
         """
         Stops the service.
@@ -416,8 +628,10 @@ class AbstractService(object):
         # sets the service connection active flag as false
         self.service_connection_active = False
 
-        # sets the stop flag
+        # sets the stop flag and wakes the loop
+        # so that the stop is handled immediately
         self.stop_flag = True
+        self._wake()
 
         # waits for the service connection close end event
         self.service_connection_close_end_event.wait()
@@ -425,9 +639,28 @@ class AbstractService(object):
         # clears the service connection close end event
         self.service_connection_close_end_event.clear()
 
+        # in case the current process is the master of the prefork
+        # mode there are no background threads to be stopped
+        if self.prefork_master and self.prefork_master.is_master():
+            return
+
         # stops the background threads
         self._stop_threads()
 
+    def reload_service(self):
+        """
+        Reloads the service, in the prefork mode the worker processes
+        are gracefully replaced by a new generation of workers.
+        """
+
+        # in case the service is not running in the prefork
+        # mode there's nothing to be reloaded, returns immediately
+        if not self.prefork_master:
+            return
+
+        # schedules the reload of the worker processes
+        self.prefork_master.reload()
+
     def _create_service_sockets(self):
         """
         Creates the service sockets according to the
@@ -489,32 +722,54 @@ class AbstractService(object):
             # sets the end point in the service socket end point map
             self.service_socket_end_point_map[service_socket] = end_point
 
-    def _activate_service_sockets(self):
+    def _bind_service_sockets(self):
         """
-        Activates the service socket, registering it for the basic
-        read and error event in the poll instance.
+        Binds the service sockets to the host and port defined in
+        the end points and starts the listening in them.
 
-        This method must be controller by the current abstract service
-        handler and no other object.
+        This operation is separated from the activation so that the
+        sockets may be shared by the worker processes (prefork mode).
         """
 
         # iterates over the complete set of service sockets and the end points
-        # to active the sockets and then registers them for polling
+        # to bind the sockets and start listening in them
         for service_socket, end_point in zip(self.service_sockets, self.end_points):
             # unpacks the end point, these values will be used for the
-            # proper activation of the service socket
+            # proper binding of the service socket
             _socket_provider, bind_host, port, _socket_parameters = end_point
 
             # sets the socket to be able to reuse the socket, this is
             # important to make it possible to open new service sockets
             service_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
 
+            # in case the port is meant to be reused (by the various worker
+            # processes) sets the proper option, the kernel balances the
+            # new connections among the sockets bound to the same port
+            if self.reuse_port and hasattr(socket, "SO_REUSEPORT"):
+                service_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
             # binds the service socket to the bind host and port
             # defined by the end point tuple and then starts the
             # listening operation waiting for new connections
             service_socket.bind((bind_host, port))
             service_socket.listen(30)
 
+    def _activate_service_sockets(self):
+        """
+        Activates the service socket, registering it for the basic
+        read and error event in the poll instance.
+
+        This method must be controller by the current abstract service
+        handler and no other object.
+        """
+
+        # iterates over the complete set of service sockets and the end points
+        # to active the sockets and then registers them for polling
+        for service_socket, end_point in zip(self.service_sockets, self.end_points):
+            # unpacks the end point, these values will be used for the
+            # proper activation of the service socket
+            _socket_provider, bind_host, port, _socket_parameters = end_point
+
             # creates the service connection instance that will be
             # responsible for the handling of new client connections
             service_connection = ServiceConnection(
@@ -536,12 +791,52 @@ class AbstractService(object):
             # responsible for the acceptance of new incoming connections
             self.add_handler(socket_fd, service_connection.read_handler, READ)
 
+    def _prefork(self):
+        """
+        Starts the prefork mode, forking the worker processes that are
+        going to run the service loop, this call only returns in the
+        master process once the service has been stopped.
+
+        :rtype: bool
+        :return: If the current process should run the service loop
+        (worker process).
+        """
+
+        # creates the prefork master and starts it, forking the
+        # worker processes and supervising them (master process)
+        self.prefork_master = prefork.PreforkMaster(
+            self, self.workers, self._is_running, self._stop_loop
+        )
+        loop = self.prefork_master.start()
+
+        # in case the port is reused the service sockets are only
+        # created (and bound) by the worker process itself
+        if loop and self.reuse_port:
+            self._create_service_sockets()
+            self._bind_service_sockets()
+
+        # returns if the current process should
+        # run the service loop (worker process)
+        return loop
+
+    def _is_running(self):
+        return not self.stop_flag
+
+    def _stop_loop(self):
+        self.stop_flag = True
+        self._wake()
+
     def _create_base(self):
         """
         Creates the base infra-structure for the running of the
         service, this includes setting the connection as active.
         """
 
+        # creates the timer wheel from the current value of the monotonic
+        # clock, so that no ticks are walked for the time elapsed before
+        # the start of the loop (eg: forked worker) or on clock steps
+        self.timer_wheel = timers.TimerWheel(timers.clock())
+
         # sets the initial poll instance, using the best available
         # polling mechanism for the current platform, epoll is
         # preferred on Linux, kqueue on BSD/macOS, poll is used
@@ -556,9 +851,93 @@ class AbstractService(object):
         else:
             self.poll_instance = SelectPolling()
 
+        # creates the pair of sockets used to wake the main loop (stop,
+        # timers and pipelined requests), in case the platform does not
+        # support it the loop is only woken on the poll timeout
+        if hasattr(socket, "socketpair"):
+            self.wake_sockets = socket.socketpair()
+            for wake_socket in self.wake_sockets:
+                wake_socket.setblocking(0)
+            wake_fd = self.wake_sockets[0].fileno()
+            self.socket_fd_map[wake_fd] = self.wake_sockets[0]
+            self.poll_instance.register(wake_fd, READ)
+            self.add_handler(wake_fd, self._wake_handler, READ)
+
         # sets the service connection active flag as true
         self.service_connection_active = True
 
+    def _destroy_base(self):
+        """
+        Destroys the base infra-structure for the running of the
+        service, releasing the sockets used to wake the loop.
+        """
+
+        # in case there are no wake sockets there's
+        # nothing to be destroyed, returns immediately
+        if not self.wake_sockets:
+            return
+
+        # unregisters the reading side of the wake sockets
+        # from the internal structures and closes both sides
+        wake_fd = self.wake_sockets[0].fileno()
+        self.remove_handler(wake_fd, self._wake_handler, READ)
+        self.socket_fd_map.pop(wake_fd, None)
+        self.poll_instance.unregister(wake_fd)
+        for wake_socket in self.wake_sockets:
+            wake_socket.close()
+        self.wake_sockets = None
+
+    def _wake(self):
+        """
+        Wakes the main loop (in case it's blocked in the poll)
+        by writing a byte into the wake socket.
+        """
+
+        # in case there are no wake sockets the loop is
+        # not possible to wake, returns immediately
+        if not self.wake_sockets:
+            return
+
+        try:
+            # sends a dummy byte through the writing side of the wake
+            # sockets, a full buffer means that the loop is already
+            # pending to be woken so the error is ignored
+            self.wake_sockets[1].send(b"_")
+        except socket.error:
+            pass
+
+    def _wake_handler(self, _socket):
+        try:
+            # drains the bytes that have been written to wake the
+            # loop, the ready queue is processed by the loop itself
+            _socket.recv(4096)
+        except socket.error:
+            pass
+
+    def _process_ready(self):
+        """
+        Processes the client connections that have dispatched
+        requests ready to be written (flushing them in order).
+        """
+
+        # iterates while there are client connections
+        # in the ready queue to be processed
+        while self.ready_queue:
+            # pops the client connection from the ready queue
+            # and flushes its pipeline (writes the ready responses)
+            client_connection = self.ready_queue.popleft()
+
+            try:
+                client_connection.flush_pipeline()
+            except Exception as exception:
+                # prints a warning message message using the service
+                # plugin and closes the client connection
+                self.service_plugin.warning(
+                    "Runtime problem: %s, while flushing pipeline"
+                    % colony.legacy.UNICODE(exception)
+                )
+                client_connection.close()
+
     def _loop(self):
         """
         Method representing the main loop for
@@ -573,9 +952,14 @@ class AbstractService(object):
             if self.stop_flag:
                 break
 
-            # pools the poll instance to retrieve the
-            # current loop events
-            events = self.poll_instance.poll(POLL_TIMEOUT)
+            # computes the poll timeout from the nearest deadline of
+            # the timer wheel and polls the poll instance to retrieve
+            # the current loop events
+            current_time = timers.clock()
+            timeout = self.timer_wheel.timeout(current_time, POLL_TIMEOUT)
+            self.poll_deadline = current_time + timeout
+            events = self.poll_instance.poll(timeout)
+            self.poll_deadline = 0.0
 
             # iterates over all the events to
             # call the proper handlers
@@ -594,36 +978,23 @@ class AbstractService(object):
                 write and self.call_handlers_tuple((socket_fd, write))
                 error and self.call_handlers_tuple((socket_fd, error))
 
-            # retrieves the current time, to be able to use
-            # it for comparison against the target times
-            # and then starts the counter that controls the
-            # amount of expired time events
-            current_time = time.time()
-            expired_count = 0
-
-            # iterates over all the time events to handle the
-            # ones that have "expired"
-            for time_event in self.time_events:
-                # unpacks the time part of the event and tests it,
-                # in case the time for execution has not been
-                # yet reached (finished callback execution)
-                _time = time_event[0]
-                if _time > current_time:
-                    break
-
-                # retrieves the callback part of the event
-                # and calls it (event handling)
-                callback = time_event[1]
-                callback()
-
-                # increments the counter that controls the
-                # events that have expired (deferred popping)
-                expired_count += 1
-
-            # pops the processes elements from the time events
-            # list (deferred popping, avoids list corruption)
-            for _index in colony.legacy.xrange(expired_count):
-                heapq.heappop(self.time_events)
+            # processes the client connections that have dispatched
+            # requests ready to be written (in order)
+            self._process_ready()
+
+            # advances the timer wheel up until the current time and
+            # calls the callbacks of the timers that have expired
+            expired = self.timer_wheel.advance(timers.clock())
+            for timer in expired:
+                try:
+                    timer.callback()
+                except Exception as exception:
+                    # prints a warning message message using the service
+                    # plugin (this message is considered important)
+                    self.service_plugin.warning(
+                        "Runtime problem: %s, while handling timer"
+                        % colony.legacy.UNICODE(exception)
+                    )
 
     def _disable_service_sockets(self):
         """
@@ -678,6 +1049,10 @@ class AbstractService(object):
         # starts the service execution (background) thread
         self.service_execution_thread.start()
 
+        # starts the worker threads for the dispatched requests
+        for dispatch_thread in self.dispatch_threads:
+            dispatch_thread.start()
+
     def _stop_threads(self):
         """
         Stars the base threads for background execution.
@@ -690,6 +1065,13 @@ class AbstractService(object):
         # (background) thread
         self.service_execution_thread.join()
 
+        # stops and joins the worker threads for the
+        # dispatched requests (in case there are any)
+        for dispatch_thread in self.dispatch_threads:
+            dispatch_thread.stop()
+        for dispatch_thread in self.dispatch_threads:
+            dispatch_thread.join()
+
 
 class SelectPolling(object):
     """
@@ -1333,10 +1715,15 @@ class ServiceConnection(Connection):
     """ The map associating the socket fd with the respective
     close handler method or function """
 
+    timers_association = {}
+    """ The map associating the socket fd with the timer that
+    closes the pending connection (handshake timeout) """
+
     def __init__(self, service, socket, connection_address, connection_port):
         Connection.__init__(self, service, socket, connection_address, connection_port)
 
         self.handlers_association = {}
+        self.timers_association = {}
 
     def read_handler(self, _socket):
         # iterates continuously to accept the various
@@ -1501,12 +1888,16 @@ class ServiceConnection(Connection):
         self.service.poll_instance.register(socket_fd, READ | ERROR)
         self.service.add_handler(socket_fd, handshake_handler, READ)
 
-        self.service.add_time_handler(time.time() + PENDING_TIMEOUT, close_handler)
+        self.timers_association[socket_fd] = self.service.add_time_handler(
+            time.time() + PENDING_TIMEOUT, close_handler
+        )
 
     def _disable_pending(
         self, service_connection, service_address, socket_fd, close_connection=True
     ):
         handshake_handler = self.handlers_association[socket_fd]
+        timer = self.timers_association.pop(socket_fd, None)
+        timer and timer.cancel()
         del self.service.socket_fd_map[socket_fd]
         del self.service.address_fd_map[socket_fd]
         del self.service.pending_fd_map[socket_fd]
@@ -1519,17 +1910,45 @@ class ClientConnection(Connection):
     pending_data_buffer = []
     """ The buffer that holds the pending data """
 
-    write_data_buffer = []
-    """ The buffer to hold the data pending to be sent """
+    write_data_buffer = None
+    """ The buffer (queue) to hold the data pending to be sent, the
+    front of the queue (next data to be sent) is the right end """
+
+    vectored = False
+    """ If the connection is able to send multiple buffers in a single
+    (scatter/gather) operation using the sendmsg system call """
 
     service_execution_thread = None
     """ The service execution thread """
 
+    pipeline = None
+    """ The queue of requests (pipeline connections) that are in
+    flight for the connection, their responses are written in the
+    order of this queue (order of arrival) """
+
+    paused = False
+    """ Flag that controls if the reading of the connection is paused
+    because the pipeline is saturated """
+
+    reading = False
+    """ Flag that controls if a request is currently being read,
+    meaning that part of it has been received (but not all) """
+
+    timer = None
+    """ The timer for the current deadline of the connection, either
+    the idle timeout or the request read timeout """
+
+    timer_read = False
+    """ If the current timer is the one for the request read
+    timeout (otherwise it's the idle timeout) """
+
     def __init__(self, service, socket, connection_address, connection_port):
         Connection.__init__(self, service, socket, connection_address, connection_port)
 
         self.pending_data_buffer = []
-        self.write_data_buffer = []
+        self.write_data_buffer = collections.deque()
+        self.pipeline = collections.deque()
+        self.vectored = hasattr(socket, "sendmsg") and not self.is_secure()
 
         self.chunk_size = 4096
         self.connection_request_timeout = 10
@@ -1554,6 +1973,11 @@ class ClientConnection(Connection):
         if not self.is_open():
             return
 
+        # cancels the timer of the connection (if any) as the
+        # timeouts no longer apply to the connection
+        self.timer and self.timer.cancel()
+        self.timer = None
+
         # removes the socket from the service, this should
         # properly close the socket
         self.service.remove_socket(self.socket)
@@ -1566,9 +1990,19 @@ class ClientConnection(Connection):
         self.service.client_service.handle_closed(self)
         self.call_delegate("on_close", self)
 
+        # flushes the pipeline so that the requests that have
+        # already been handled are properly closed
+        self.flush_pipeline()
+
     def read_handler(self, _socket):
         # iterates continuously
         while True:
+            # in case the pipeline is saturated the reading is
+            # paused until the in flight requests are written
+            if self.is_saturated():
+                self.pause()
+                return
+
             try:
                 # receives the data from the socket
                 data = _socket.recv(self.chunk_size)
@@ -1595,45 +2029,277 @@ class ClientConnection(Connection):
                 # data to be processed)
                 return
 
-            # iterates while there is data available to
-            # be processed
-            while data:
-                # tries to retrieve the request from the given data (only a successful
-                # parse is valid for request handling)
-                request = self.service.client_service.retrieve_request_data(self, data)
+            # processes the received data, handling (or dispatching)
+            # every complete request that is contained in it
+            self.process_data(data)
+
+            # refreshes the timer of the connection according to the
+            # current state (reading of a request or idle)
+            self.is_open() and self.refresh()
+
+    def process_data(self, data=None):
+        """
+        Processes the given data (or the pending data in case no
+        data is provided) retrieving and handling all the complete
+        requests contained in it (pipelining support).
+
+        :type data: String
+        :param data: The data to be processed, in case it's not
+        provided the pending data is used instead.
+        """
+
+        # in case no data is provided the pending data
+        # is used as the data to be processed
+        data = data or self.pop_pending_data()
+
+        # iterates while there is data available to
+        # be processed
+        while data:
+            # in case the pipeline is saturated the data is returned
+            # to the (front of the) pending data buffer and the reading
+            # is paused until the pipeline is flushed
+            if self.is_saturated():
+                self.pending_data_buffer.insert(0, data)
+                self.pause()
+                return
+
+            # tries to retrieve the request from the given data (only a successful
+            # parse is valid for request handling)
+            request = self.service.client_service.retrieve_request_data(self, data)
+
+            # updates the reading flag, in case no request was retrieved
+            # the request is still being read (partial request)
+            self.reading = not request
 
-                # handles the request using the client service (in case the request is valid)
-                request and self.service.client_service.handle_request(self, request)
+            # handles the request using the client service (in case the request is valid)
+            request and self.dispatch_request(request)
 
-                # pops the pending data from the client service and sets it
-                # as the current data
-                data = self.pop_pending_data()
+            # pops the pending data from the client service and sets it
+            # as the current data
+            data = self.pop_pending_data()
+
+    def dispatch_request(self, request):
+        """
+        Dispatches the given request for handling, in case there are
+        worker threads and the client service allows it the request is
+        handled in parallel, otherwise it's handled inline (in order).
+
+        :type request: Object
+        :param request: The (complete) request to be handled.
+        """
+
+        # retrieves the client service and checks if the request
+        # may be dispatched for handling in a worker thread
+        client_service = self.service.client_service
+        is_dispatchable = getattr(client_service, "is_dispatchable", None)
+        dispatchable = (
+            self.service.pipeline_threads
+            and is_dispatchable
+            and is_dispatchable(self, request)
+        )
+
+        # in case the request is not dispatchable it must be handled
+        # inline, immediately in case there's no request in flight or
+        # otherwise once all the previous requests have been written
+        if not dispatchable:
+            if self.pipeline:
+                self.pipeline.append(PipelineConnection(self, request, inline=True))
+            else:
+                client_service.handle_request(self, request)
+            return
+
+        # creates the pipeline connection for the request, adds it to
+        # the pipeline (ordering) and dispatches it to the workers
+        pipeline_connection = PipelineConnection(self, request)
+        self.pipeline.append(pipeline_connection)
+        self.service.dispatch(pipeline_connection.handle)
+
+    def flush_pipeline(self):
+        """
+        Flushes the pipeline of the connection, writing the responses
+        of the requests that have already been handled in the order
+        of arrival of the requests (stops at the first pending one).
+
+        Must be called from the main loop thread.
+        """
+
+        # iterates while there are requests in the pipeline
+        while self.pipeline:
+            # retrieves the request at the head of the pipeline, in
+            # case it's still being handled the flush stops, as the
+            # following responses must wait for it (ordering)
+            pipeline_connection = self.pipeline[0]
+            if not pipeline_connection.inline and not pipeline_connection.done:
+                break
+
+            # pops the request from the pipeline as it's going
+            # to be written (or discarded) now
+            self.pipeline.popleft()
+
+            # in case the connection is already closed the handled
+            # request is closed (releases resources) and skipped
+            if not self.is_open():
+                self.service.client_service.handle_closed(pipeline_connection)
+                continue
+
+            # in case the request is meant to be handled inline it's
+            # handled now (all the previous requests have been written)
+            if pipeline_connection.inline:
+                self.service.client_service.handle_request(
+                    self, pipeline_connection.request
+                )
+                continue
+
+            # activates the pipeline connection, writing the buffered
+            # response into the connection and enabling direct writes
+            pipeline_connection.activate()
+
+        # in case the connection is closed or the reading is not paused
+        # there's nothing remaining to be done, returns immediately
+        if not self.is_open() or not self.paused:
+            return
+
+        # in case the pipeline is still saturated the reading
+        # must remain paused, returns immediately
+        if self.is_saturated():
+            return
+
+        # resumes the reading of the connection and processes the
+        # pending data (requests) that has been retained
+        self.resume()
+        self.process_data()
+
+    def is_saturated(self):
+        """
+        Checks if the pipeline of the connection is saturated, either
+        because the maximum number of requests in flight has been reached
+        or because a request is waiting to be handled inline.
+
+        :rtype: bool
+        :return: If the pipeline of the connection is saturated.
+        """
+
+        # in case the pipeline is empty it's not
+        # possible to be saturated (fast path)
+        if not self.pipeline:
+            return False
+
+        # the pipeline is saturated in case the limit of requests is
+        # reached or if the last request must be handled inline (barrier)
+        return len(self.pipeline) >= PIPELINE_SIZE or self.pipeline[-1].inline
+
+    def refresh(self):
+        """
+        Refreshes the timer of the connection according to its state,
+        in case a request is being read the read timeout is scheduled
+        otherwise the idle timeout is used.
+
+        As the refresh is done for every read of the connection the
+        read deadline is extended whenever data arrives, so that only
+        stalled requests are timed out (not slow but active ones), note
+        that these operations are of constant time (timer wheel).
+        """
+
+        # schedules the proper timeout, read timeout for the
+        # request being read or otherwise the idle timeout
+        timeout = (
+            self.service.read_timeout if self.reading else self.service.idle_timeout
+        )
+        self.schedule(timeout, read=self.reading)
+
+    def schedule(self, timeout, read=False):
+        """
+        Schedules the timer of the connection for the given timeout,
+        replacing the currently scheduled one (canceled).
+
+        :type timeout: float
+        :param timeout: The timeout (in seconds) for the timer.
+        :type read: bool
+        :param read: If the timer is the request read timeout.
+        """
+
+        self.timer and self.timer.cancel()
+        self.timer = self.service.add_time_handler(
+            time.time() + timeout, self.timeout_handler
+        )
+        self.timer_read = read
+
+    def timeout_handler(self):
+        # unsets the timer of the connection, as it has
+        # expired, in case the connection is already closed
+        # there's nothing remaining to be done
+        self.timer = None
+        if not self.is_open():
+            return
+
+        # in case the connection is busy (requests in flight or data
+        # pending to be written) the timeout is re-scheduled as the
+        # connection is not considered to be idle (or stalled)
+        if self.is_busy():
+            self.timer_read = False
+            self.refresh()
+            return
+
+        # closes the connection, the timeout (idle or
+        # request read) has been reached
+        self.close()
+
+    def is_busy(self):
+        """
+        Checks if the connection is busy, meaning that there are
+        requests in flight or data pending to be written.
+
+        :rtype: bool
+        :return: If the connection is busy.
+        """
+
+        return (self.pipeline or self.write_data_buffer) and True or False
+
+    def pause(self):
+        # in case the reading is already paused or the connection
+        # is closed returns immediately (nothing to be done)
+        if self.paused or not self.is_open():
+            return
+
+        # unregisters the socket fd for the read event
+        # and sets the connection as paused
+        self.unregister(self.socket_fd, READ)
+        self.paused = True
+
+    def resume(self):
+        # in case the reading is not paused
+        # returns immediately (nothing to be done)
+        if not self.paused:
+            return
+
+        # registers the socket fd for the read event
+        # and sets the connection as not paused
+        self.register(self.socket_fd, READ)
+        self.paused = False
 
     def write_handler(self, _socket):
         # iterates over the write data buffer
         while self.write_data_buffer:
-            # retrieves the data (last element) from the write
-            # data buffer and checks the type of it
-            data = self.write_data_buffer[-1]
-            data_type = type(data)
-
-            # in case the type is a tuple (callback
-            # exists)
-            if data_type == tuple:
-                # unpacks the data into data and
-                # callback information
-                data, callback = data
-            # otherwise no callback exists
+            # retrieves the data (front element) from the write
+            # data buffer, in case it's a file region it's sent
+            # alone, otherwise the (memory) buffers at the front
+            # of the write data buffer are gathered to be sent
+            data, callback = self._unpack(self.write_data_buffer[-1])
+            if isinstance(data, FileData):
+                buffers, count = None, 1
             else:
-                # unsets the callback value
-                callback = None
+                buffers, data_bytes, callback = self._gather()
+                count = len(buffers)
 
             try:
-                # retrieves the data bytes (length)
-                data_bytes = len(data)
-
-                # tries to send the data through the socket
-                sent_bytes = _socket.send(data)
+                # tries to send the data through the socket, in case the
+                # data is a file region it's sent directly from the file
+                # descriptor (kernel level copy), otherwise the gathered
+                # buffers are sent in a single operation
+                if buffers == None:
+                    sent_bytes = data.send(_socket)
+                else:
+                    sent_bytes = self._send(_socket, buffers, data_bytes)
             except socket.error as exception:
                 # in case the exception is normal, the operation did not
                 # complete or the socket would block nothing should be done
@@ -1653,22 +2319,16 @@ class ClientConnection(Connection):
                     # upper layers may properly handle it
                     raise
 
-            # pops the element from the write data buffer
-            self.write_data_buffer.pop()
-
-            # in case the data was not completely
-            # sent (sent bytes not complete)
-            if sent_bytes < data_bytes:
-                # retrieves the "pending" data (including callback) and
-                # inserts it in first place in the write
-                # data buffer (queue)
-                pending_data = (data[sent_bytes:], callback)
-                self.write_data_buffer.append(pending_data)
-            # otherwise in case there is a callback to be called
-            else:
-                # calls the callback, with the
-                # error flag unset (in case it's defined)
-                callback and callback(False)
+            # consumes the sent bytes from the write data buffer, in case
+            # not all the data was sent the remaining data is kept in the
+            # front of the buffer and the next send is attempted
+            if not self._consume(count, sent_bytes):
+                continue
+
+            # calls the callback, with the error flag unset (in case
+            # it's defined), the callback is always associated with
+            # the last of the buffers that have been sent
+            callback and callback(False)
 
         # unregisters the socket fd for the write event
         self.unregister(self.socket_fd, WRITE)
@@ -1677,6 +2337,103 @@ class ClientConnection(Connection):
         # closes the client connection
         self.close()
 
+    def _unpack(self, item):
+        # in case the item is a tuple it contains both the
+        # data and the callback, otherwise there's no callback
+        if type(item) == tuple:
+            return item
+        return item, None
+
+    def _gather(self):
+        """
+        Gathers the (memory) buffers at the front of the write data
+        buffer to be sent in a single operation, the gathering stops
+        at a file region or after a buffer with a callback, as the
+        callback may write new data to the front of the buffer.
+
+        :rtype: Tuple
+        :return: The gathered buffers, their total size in bytes and
+        the callback associated with the last of the buffers.
+        """
+
+        buffers = []
+        data_bytes = 0
+        callback = None
+
+        # iterates over the write data buffer starting from
+        # the front of it (right end) gathering the buffers
+        for item in reversed(self.write_data_buffer):
+            data, callback = self._unpack(item)
+            if isinstance(data, FileData):
+                callback = None
+                break
+            buffers.append(data)
+            data_bytes += len(data)
+            if callback or len(buffers) == GATHER_COUNT or data_bytes >= GATHER_SIZE:
+                break
+
+        return buffers, data_bytes, callback
+
+    def _send(self, _socket, buffers, data_bytes):
+        """
+        Sends the given buffers through the socket, using a vectored
+        (scatter/gather) send in case it's available or otherwise joining
+        the buffers in case they're small enough.
+
+        :type _socket: Socket
+        :param _socket: The socket to be used in the sending.
+        :type buffers: List
+        :param buffers: The buffers to be sent (in order).
+        :type data_bytes: int
+        :param data_bytes: The total size in bytes of the buffers.
+        :rtype: int
+        :return: The number of bytes that have been sent.
+        """
+
+        if len(buffers) == 1:
+            return _socket.send(buffers[0])
+        if self.vectored:
+            return _socket.sendmsg(buffers)
+        if data_bytes <= COALESCE_SIZE:
+            return _socket.send(b"".join(buffers))
+        return _socket.send(buffers[0])
+
+    def _consume(self, count, sent_bytes):
+        """
+        Consumes the given number of sent bytes from the front of the
+        write data buffer, the partially sent data is replaced by a view
+        over its remaining part (no copy of the data is done).
+
+        :type count: int
+        :param count: The number of items (buffers) that have been
+        gathered for sending from the front of the write data buffer.
+        :type sent_bytes: int
+        :param sent_bytes: The number of bytes that have been sent.
+        :rtype: bool
+        :return: If all the gathered items have been completely sent.
+        """
+
+        for _index in colony.legacy.xrange(count):
+            # retrieves the item at the front of the write data
+            # buffer and in case it has been completely sent pops
+            # it from the buffer and continues to the next one
+            data, callback = self._unpack(self.write_data_buffer[-1])
+            data_bytes = len(data)
+            if sent_bytes >= data_bytes:
+                self.write_data_buffer.pop()
+                sent_bytes -= data_bytes
+                continue
+
+            # otherwise the item has only been partially sent and it's
+            # replaced by its remaining part, memory buffers are sliced
+            # using a view to avoid the copy of the (remaining) data
+            if not isinstance(data, (FileData, memoryview)):
+                data = memoryview(data)
+            self.write_data_buffer[-1] = (data[sent_bytes:], callback)
+            return False
+
+        return True
+
     def write(self, data, write_front=False):
         # in case the connection status is closed
         if not self.connection_status:
@@ -1692,7 +2449,7 @@ class ClientConnection(Connection):
         else:
             # adds the data to the write buffer
             # in the back part of the buffer
-            self.write_data_buffer.insert(0, data)
+            self.write_data_buffer.appendleft(data)
 
         # registers the socket fd for the write event (in
         # case it's not already registered)
@@ -1744,6 +2501,46 @@ class ClientConnection(Connection):
         message_tuple = (message, callback)
         self.write(message_tuple, write_front)
 
+    def send_file(self, file, offset, count, callback=None, write_front=False):
+        """
+        Sends the region of the given file directly from its file
+        descriptor, avoiding the copy of the contents into user space.
+
+        This method should only be used in case the connection supports
+        sendfile operations (check `supports_sendfile`).
+
+        :type file: File
+        :param file: The (regular) file to be sent.
+        :type offset: int
+        :param offset: The offset in the file to start sending from.
+        :type count: int
+        :param count: The number of bytes of the file to be sent.
+        :type callback: Function
+        :param callback: The callback to be called once the complete
+        region has been sent (or in case there's an error).
+        :type write_front: bool
+        :param write_front: If the file region should be written to the
+        front of the write buffer.
+        """
+
+        file_data = FileData(file, offset, count)
+        file_tuple = (file_data, callback)
+        self.write(file_tuple, write_front)
+
+    def supports_sendfile(self):
+        """
+        Checks if the connection is able to send files directly
+        from their file descriptors (kernel level copy).
+
+        Only plain (non secure) connections in systems that provide
+        the sendfile system call are able to do so.
+
+        :rtype: bool
+        :return: If the connection supports sendfile operations.
+        """
+
+        return hasattr(os, "sendfile") and not self.is_secure()
+
     def is_open(self):
         return self.connection_status
 
@@ -1812,3 +2609,208 @@ class ClientConnection(Connection):
         # returns the boolean value base on the status
         # of the pending data buffer
         return self.pending_data_buffer and True or False
+
+
+class PipelineConnection(object):
+    """
+    Proxy to a client connection used for the handling of a single
+    request in a worker thread (pipelining), the writes are buffered
+    until all the previous requests of the connection have been written
+    and then forwarded directly to the client connection.
+
+    The proxy is considered equal (and hashes the same) to the client
+    connection so that maps keyed by connection remain valid.
+    """
+
+    connection = None
+    """ The client connection that is being proxied """
+
+    request = None
+    """ The request that is handled through the proxy """
+
+    request_data = {}
+    """ The request data map private to the request, merged into
+    the one of the client connection on activation """
+
+    write_data_buffer = []
+    """ The buffer that holds the data written while the proxy is
+    not active (same ordering semantics as the client connection) """
+
+    inline = False
+    """ If the request must be handled inline in the main loop
+    thread (not dispatched) once it reaches the pipeline head """
+
+    done = False
+    """ Flag that controls if the request has already been handled """
+
+    active = False
+    """ Flag that controls if the proxy is active, meaning that the
+    writes are forwarded directly to the client connection """
+
+    closed = False
+    """ Flag that controls if the closing of the client connection
+    has been requested while the proxy was not active """
+
+    def __init__(self, connection, request, inline=False):
+        self.connection = connection
+        self.request = request
+        self.inline = inline
+
+        self.request_data = {}
+        self.write_data_buffer = []
+        self.lock = threading.RLock()
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+    def __repr__(self):
+        return repr(self.connection)
+
+    def __hash__(self):
+        return hash(self.connection)
+
+    def __eq__(self, other):
+        if isinstance(other, PipelineConnection):
+            other = other.connection
+        return self.connection is other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def handle(self):
+        """
+        Handles the request using the client service, this method
+        is meant to be executed in a worker thread.
+        """
+
+        # retrieves the service associated with the
+        # client connection (to be used for handling)
+        service = self.connection.service
+
+        try:
+            # handles the request using the proxy as the
+            # connection so that the writes are buffered
+            service.client_service.handle_request(self, self.request)
+        except Exception:
+            # requests the closing of the connection as the
+            # request was not properly handled and re-raises
+            self.close()
+            raise
+        finally:
+            # sets the request as handled and notifies the main
+            # loop so that the response is written (in order)
+            self.done = True
+            service.notify_ready(self.connection)
+
+    def activate(self):
+        """
+        Activates the proxy writing the buffered data into the client
+        connection, from this point on the writes are direct.
+
+        Must be called from the main loop thread.
+        """
+
+        self.lock.acquire()
+
+        try:
+            # merges the request data into the one of the client
+            # connection (provides indirect access to the request)
+            self.connection.request_data.update(self.request_data)
+
+            # writes the buffered data into the back of the client
+            # connection write buffer (front of the buffer is the end)
+            for data in reversed(self.write_data_buffer):
+                self.connection.write(data)
+
+            # clears the buffer and sets the proxy as active
+            self.write_data_buffer = []
+            self.active = True
+        finally:
+            self.lock.release()
+
+        # closes the client connection in case the closing
+        # was requested while the proxy was not active
+        self.closed and self.connection.close()
+
+    def close(self):
+        self.lock.acquire()
+
+        try:
+            # in case the proxy is not active the closing is deferred
+            # until the activation (buffered data must be written)
+            if not self.active:
+                self.closed = True
+                return
+        finally:
+            self.lock.release()
+
+        # closes the client connection directly
+        self.connection.close()
+
+    def write(self, data, write_front=False):
+        self.lock.acquire()
+
+        try:
+            # in case the proxy is not active the data is buffered
+            # using the same ordering semantics of the client connection
+            if not self.active:
+                if write_front:
+                    self.write_data_buffer.append(data)
+                else:
+                    self.write_data_buffer.insert(0, data)
+                return
+
+            # writes the data directly into the client connection
+            self.connection.write(data, write_front)
+        finally:
+            self.lock.release()
+
+    def send(self, message, response_timeout=None, retries=None, write_front=False):
+        self.write(message, write_front)
+
+    def send_callback(
+        self, message, callback, response_timeout=None, retries=None, write_front=False
+    ):
+        message_tuple = (message, callback)
+        self.write(message_tuple, write_front)
+
+    def send_file(self, file, offset, count, callback=None, write_front=False):
+        file_data = FileData(file, offset, count)
+        file_tuple = (file_data, callback)
+        self.write(file_tuple, write_front)
+
+
+class FileData(object):
+    """
+    Class that represents a region of a file that is meant to be
+    sent through a socket using the sendfile system call.
+
+    The object behaves like a bytes buffer in terms of length and
+    slicing so that the write buffer logic may handle it transparently.
+    """
+
+    file = None
+    """ The file object from which the data is going to be sent """
+
+    offset = 0
+    """ The offset in the file of the first byte to be sent """
+
+    count = 0
+    """ The number of bytes of the region to be sent """
+
+    def __init__(self, file, offset, count):
+        self.file = file
+        self.offset = offset
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, key):
+        start = key.start or 0
+        return FileData(self.file, self.offset + start, self.count - start)
+
+    def send(self, _socket):
+        return os.sendfile(
+            _socket.fileno(), self.file.fileno(), self.offset, self.count
+        )
@@ -28,6 +28,8 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import time
+
 
 class MockPlugin(object):
     def __init__(self):
@@ -75,3 +77,32 @@ class MockSocket(object):
 
     def listen(self, backlog):
         pass
+
+
+class MockClientService(object):
+    """
+    Simple line based client service, each request is a line
+    with the number of "ticks" to wait before the response (the
+    request itself) is sent, a zero value request must be handled
+    inline (not dispatchable).
+    """
+
+    def __init__(self):
+        self.closed = []
+
+    def retrieve_request_data(self, service_connection, data):
+        request, separator, pending = data.partition(b"\n")
+        if not separator:
+            return None
+        service_connection.add_pending_data(pending)
+        return request
+
+    def handle_request(self, service_connection, request):
+        time.sleep(int(request) * 0.05)
+        service_connection.send(request)
+
+    def handle_closed(self, service_connection):
+        self.closed.append(service_connection)
+
+    def is_dispatchable(self, service_connection, request):
+        return not request == b"0"
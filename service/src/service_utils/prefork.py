@@ -0,0 +1,338 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import time
+import signal
+
+import colony
+
+SUPERVISE_TIMEOUT = 0.5
+""" The time (in seconds) in between supervision iterations
+of the master process (reaping and respawning of workers) """
+
+STOP_TIMEOUT = 30.0
+""" The maximum time (in seconds) a worker process is given
+to gracefully finish before being killed """
+
+
+class PreforkMaster(object):
+    """
+    Controller for the master process of the prefork mode, forks
+    the configured number of worker processes (each one running the
+    service loop) respawning them in case they die and replacing
+    them gracefully on reload.
+
+    The listening sockets are meant to be created (and bound) before
+    the forking so that they're shared by the worker processes, unless
+    the port is reused (each worker binds its own socket).
+    """
+
+    abstract_service = None
+    """ The abstract service reference """
+
+    workers = 0
+    """ The number of worker processes to be kept running """
+
+    running = None
+    """ The callable that checks if the service should remain running,
+    used by the master process to control the supervision """
+
+    stopper = None
+    """ The callable that stops the service loop, called in the worker
+    process upon the (graceful) termination signal """
+
+    worker = False
+    """ Flag that controls if the current process is a worker
+    process (forked from the master process) """
+
+    forked = False
+    """ Flag that controls if at least one worker process has
+    been forked (the current process acts as master) """
+
+    generation = 0
+    """ The current generation of worker processes, incremented
+    on every reload of the workers """
+
+    pids = {}
+    """ The map associating the pid of the running worker processes
+    with the generation they belong to """
+
+    deadlines = {}
+    """ The map associating the pid of the worker processes that are
+    being stopped with the time limit for their termination """
+
+    reload_flag = False
+    """ Flag that controls if the workers should be reloaded in the
+    next supervision iteration """
+
+    def __init__(self, abstract_service, workers, running, stopper):
+        """
+        Constructor of the class.
+
+        :type abstract_service: AbstractService
+        :param abstract_service: The abstract service reference.
+        :type workers: int
+        :param workers: The number of worker processes to be kept running.
+        :type running: Callable
+        :param running: The callable that checks if the service should
+        remain running (master supervision).
+        :type stopper: Callable
+        :param stopper: The callable that stops the service loop (worker).
+        """
+
+        self.abstract_service = abstract_service
+        self.workers = workers
+        self.running = running
+        self.stopper = stopper
+
+        self.pids = {}
+        self.deadlines = {}
+
+    def start(self):
+        """
+        Starts the prefork mode forking the worker processes and then
+        supervising them until the service is stopped.
+
+        In case the platform does not support forking the current
+        process runs the service loop itself (single process).
+
+        :rtype: bool
+        :return: If the current process should run the service loop,
+        this is the case for the worker processes, the master process
+        only returns once the service has been stopped.
+        """
+
+        # in case the platform does not support the forking of the
+        # process prints a warning and runs in single process mode
+        if not hasattr(os, "fork"):
+            self.abstract_service.service_utils_plugin.warning(
+                "Prefork mode not supported in the current platform"
+            )
+            return True
+
+        # sets the handler for the reload signal (in case it's
+        # possible) and spawns the initial generation of workers
+        self._set_master_signals()
+        for _index in colony.legacy.xrange(self.workers):
+            if self._spawn():
+                return True
+
+        try:
+            # iterates while the service is running supervising the
+            # worker processes, in case a (new) worker process is
+            # spawned the control flow must be returned to it
+            while self.running():
+                if self._supervise():
+                    return True
+                time.sleep(SUPERVISE_TIMEOUT)
+        finally:
+            # stops the complete set of worker processes in case
+            # this is the master process (no more supervision)
+            not self.worker and self._stop_all()
+
+        # returns invalid, the master process should not
+        # run the service loop (service stopped)
+        return False
+
+    def reload(self):
+        """
+        Schedules the graceful reload of the worker processes, a new
+        generation of workers is spawned and the previous one stopped.
+        """
+
+        self.reload_flag = True
+
+    def exit(self, code=0):
+        """
+        Exits the current (worker) process immediately, should
+        be called by the worker process once the loop is finished.
+
+        :type code: int
+        :param code: The exit code for the process.
+        """
+
+        os._exit(code)
+
+    def is_master(self):
+        """
+        Checks if the current process is acting as the master
+        process of the prefork mode.
+
+        :rtype: bool
+        :return: If the current process is the master process.
+        """
+
+        return self.forked and not self.worker
+
+    def _spawn(self):
+        """
+        Spawns (forks) a new worker process for the current generation.
+
+        :rtype: bool
+        :return: If the current process is the (new) worker process.
+        """
+
+        # forks the current process, in case the pid is zero
+        # the current process is the (new) worker process
+        pid = os.fork()
+        if pid == 0:
+            self.worker = True
+            self.pids = {}
+            self.deadlines = {}
+            self._set_worker_signals()
+            return True
+
+        # sets the master as forked and registers the
+        # pid of the worker for the current generation
+        self.forked = True
+        self.pids[pid] = self.generation
+        return False
+
+    def _supervise(self):
+        """
+        Runs a supervision iteration, reaping the finished worker
+        processes, reloading and respawning them as required.
+
+        :rtype: bool
+        :return: If the current process is a (new) worker process.
+        """
+
+        # reaps the worker processes that have finished, printing
+        # a warning for the ones that finished unexpectedly
+        for pid in self._reap():
+            if pid in self.deadlines:
+                del self.deadlines[pid]
+                continue
+            self.abstract_service.service_utils_plugin.warning(
+                "Worker process %d finished unexpectedly" % pid
+            )
+
+        # in case the reload is scheduled the generation is incremented
+        # and the workers of the previous generations are stopped, the
+        # new generation is spawned (below) as part of the respawning
+        if self.reload_flag:
+            self.reload_flag = False
+            self.generation += 1
+            for pid in list(self.pids):
+                self._stop(pid)
+
+        # spawns as many workers as required to fill the
+        # current generation (respawns the dead workers)
+        generation = [
+            pid
+            for pid, _generation in colony.legacy.items(self.pids)
+            if _generation == self.generation
+        ]
+        for _index in colony.legacy.xrange(self.workers - len(generation)):
+            if self._spawn():
+                return True
+
+        # kills the workers that are being stopped and that have
+        # not finished before their termination time limit
+        current = time.time()
+        for pid, deadline in colony.legacy.items(self.deadlines):
+            if deadline > current:
+                continue
+            self._kill(pid, signal.SIGKILL)
+
+        # returns invalid, the current process
+        # is (still) the master process
+        return False
+
+    def _stop(self, pid):
+        # sends the (graceful) termination signal to the worker
+        # and sets the time limit for it to finish
+        self._kill(pid, signal.SIGTERM)
+        self.deadlines[pid] = time.time() + STOP_TIMEOUT
+
+    def _stop_all(self):
+        # stops the complete set of worker processes, and waits
+        # for them to finish (until the time limit is reached)
+        for pid in list(self.pids):
+            self._stop(pid)
+        while self.pids and time.time() < max(self.deadlines.values()):
+            self._reap()
+            time.sleep(SUPERVISE_TIMEOUT / 5.0)
+
+        # kills the workers that did not finish in time and
+        # waits for them so that no zombie processes remain
+        for pid in list(self.pids):
+            self._kill(pid, signal.SIGKILL)
+            self._wait(pid, block=True)
+        self.pids.clear()
+        self.deadlines.clear()
+
+    def _reap(self):
+        # waits (without blocking) for each of the worker processes
+        # (only the workers, other children are not touched)
+        reaped = [pid for pid in list(self.pids) if self._wait(pid)]
+        for pid in reaped:
+            del self.pids[pid]
+        return reaped
+
+    def _wait(self, pid, block=False):
+        # waits for the worker process, in case the process is
+        # no longer a child of the current one it's considered
+        # to be finished (nothing to wait for)
+        options = 0 if block else os.WNOHANG
+        try:
+            _pid, _status = os.waitpid(pid, options)
+        except OSError:
+            return True
+        return _pid == pid
+
+    def _kill(self, pid, signal_number):
+        try:
+            os.kill(pid, signal_number)
+        except OSError:
+            pass
+
+    def _set_master_signals(self):
+        # sets the reload signal handler in the master process, this
+        # is only possible in case the service is running in the main
+        # thread (otherwise the reload must be triggered by the service)
+        if not hasattr(signal, "SIGHUP"):
+            return
+        try:
+            signal.signal(signal.SIGHUP, lambda signum, frame: self.reload())
+        except ValueError:
+            pass
+
+    def _set_worker_signals(self):
+        # sets the termination signal handler in the worker process to
+        # gracefully stop the service loop, the interrupt signal is ignored
+        # as the stopping of the workers is controlled by the master process
+        try:
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.stopper())
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            hasattr(signal, "SIGHUP") and signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        except ValueError:
+            pass
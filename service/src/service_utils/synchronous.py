@@ -28,7 +28,9 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import os
 import time
+import errno
 import socket
 import select
 import threading
@@ -36,6 +38,7 @@ import threading
 import colony
 
 from . import threads
+from . import prefork
 from . import exceptions
 
 BIND_HOST = ""
@@ -68,6 +71,11 @@ MAXIMUM_NUMBER_WORKS_THREAD = 10
 WORK_SCHEDULING_ALGORITHM = 1
 """ The work scheduling algorithm """
 
+WORKERS = 0
+""" The default number of worker processes for the prefork
+mode, a zero value means that the prefork mode is disabled
+and the service runs in the current process """
+
 POLL_TIMEOUT = 1
 """ The poll timeout """
 
@@ -134,6 +142,14 @@ if EPOLL_SUPPORT:
     REGISTER_MASK = NEW_VALUE_MASK  # @UndefinedVariable
     """ The register mask value """
 
+# in case the current system supports poll, used
+# for the waiting on the (single) connection sockets
+# as it's not limited in the value of the file descriptors
+if hasattr(select, "poll"):
+    POLL_SUPPORT = True
+else:
+    POLL_SUPPORT = False
+
 
 class AbstractService(object):
     """
@@ -218,6 +234,15 @@ class AbstractService(object):
     service_execution_thread = None
     """ The service execution thread """
 
+    workers = WORKERS
+    """ The number of worker processes to be forked (prefork mode) """
+
+    reuse_port = False
+    """ If the port should be reused by the worker processes """
+
+    prefork_master = None
+    """ The prefork master controller (prefork mode) """
+
     def __init__(self, service_utils, service_utils_plugin, parameters={}):
         """
         Constructor of the class.
@@ -255,6 +280,8 @@ class AbstractService(object):
         )
         self.request_timeout = parameters.get("request_timeout", REQUEST_TIMEOUT)
         self.response_timeout = parameters.get("response_timeout", RESPONSE_TIMEOUT)
+        self.workers = parameters.get("workers", WORKERS)
+        self.reuse_port = parameters.get("reuse_port", False)
 
         self.service_sockets = []
         self.service_socket_end_point_map = {}
@@ -284,18 +311,25 @@ class AbstractService(object):
         """
 
         try:
+            # creates and activates the service sockets, in the prefork
+            # mode this happens before the forking (shared sockets)
+            # unless the port is reused by the worker processes
+            if not self.workers or not self.reuse_port:
+                self._create_service_sockets()
+                self._activate_service_sockets()
+
+            # in case the prefork mode is enabled forks the worker
+            # processes, the master process only returns from the
+            # call once the service has been stopped
+            if self.workers and not self._prefork():
+                return
+
             # starts the background threads
             self._start_threads()
 
             # creates the work pool
             self._create_pool()
 
-            # creates and sets the service sockets
-            self._create_service_sockets()
-
-            # activates and listens the service sockets
-            self._activate_service_sockets()
-
             # in case the service type is connection
             if self.service_type == CONNECTION_TYPE_VALUE:
                 # runs the loop for connection type
@@ -322,6 +356,15 @@ class AbstractService(object):
             # sets the service connection close end event
             self.service_connection_close_end_event.set()
 
+            # in case the current process is a worker process of
+            # the prefork mode the pool and the background threads
+            # are stopped and the process exits (must not return)
+            if self.prefork_master and self.prefork_master.worker:
+                try:
+                    self._stop_worker()
+                finally:
+                    self.prefork_master.exit()
+
     def stop_service(self):
         """
         Stops the service.
@@ -339,6 +382,34 @@ class AbstractService(object):
         # clears the service connection close end event
         self.service_connection_close_end_event.clear()
 
+        # in case the current process is the master of the prefork
+        # mode there's no pool nor background threads to be stopped
+        if self.prefork_master and self.prefork_master.is_master():
+            return
+
+        # stops the pool and the background threads
+        self._stop_worker()
+
+    def reload_service(self):
+        """
+        Reloads the service, in the prefork mode the worker processes
+        are gracefully replaced by a new generation of workers.
+        """
+
+        # in case the service is not running in the prefork
+        # mode there's nothing to be reloaded, returns immediately
+        if not self.prefork_master:
+            return
+
+        # schedules the reload of the worker processes
+        self.prefork_master.reload()
+
+    def _stop_worker(self):
+        """
+        Stops the work pool and the background threads, finishing
+        the handling of the current connections.
+        """
+
         # stops all the pool tasks
         self.service_client_pool.stop_pool_tasks()
 
@@ -348,6 +419,40 @@ class AbstractService(object):
         # stops the background threads
         self._stop_threads()
 
+    def _prefork(self):
+        """
+        Starts the prefork mode, forking the worker processes that are
+        going to run the service loop, this call only returns in the
+        master process once the service has been stopped.
+
+        :rtype: bool
+        :return: If the current process should run the service loop
+        (worker process).
+        """
+
+        # creates the prefork master and starts it, forking the
+        # worker processes and supervising them (master process)
+        self.prefork_master = prefork.PreforkMaster(
+            self, self.workers, self._is_running, self._stop_loop
+        )
+        loop = self.prefork_master.start()
+
+        # in case the port is reused the service sockets are only
+        # created (and activated) by the worker process itself
+        if loop and self.reuse_port:
+            self._create_service_sockets()
+            self._activate_service_sockets()
+
+        # returns if the current process should
+        # run the service loop (worker process)
+        return loop
+
+    def _is_running(self):
+        return not self.service_connection_close_event.isSet()
+
+    def _stop_loop(self):
+        self.service_connection_close_event.set()
+
     def _create_pool(self):
         """
         Creates the work pool according to the
@@ -615,6 +720,11 @@ class AbstractService(object):
             # sets the socket to be able to reuse the socket
             service_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
 
+            # in case the port is meant to be reused (by the various
+            # worker processes) sets the proper option in the socket
+            if self.reuse_port and hasattr(socket, "SO_REUSEPORT"):
+                service_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
             # defines the bind parameters
             bind_parameters = (bind_host, port)
 
@@ -1039,34 +1149,9 @@ class AbstractServiceConnectionHandler(object):
         # opens the service connection
         service_connection.open()
 
-        # retrieves the connection socket file descriptor
-        connection_socket_file_descriptor = connection_socket.fileno()
-
-        # adds the service connection to the service connections list
-        self.service_connections_list.append(service_connection)
-
-        # adds the connection socket to the service connection sockets list
-        self.service_connection_sockets_list.append(connection_socket)
-
-        # sets the service connection in the service connections map
-        self.service_connections_map[connection_socket] = service_connection
-
-        # sets the connection socket in the connection socket file descriptor
-        # connection socket map
-        self.connection_socket_file_descriptor_connection_socket_map[
-            connection_socket_file_descriptor
-        ] = connection_socket
-
-        # sets the connection socket file descriptor in the connection socket connection
-        # socket file descriptor map
-        self.connection_socket_connection_socket_file_descriptor_map[
-            connection_socket
-        ] = connection_socket_file_descriptor
-
-        if EPOLL_SUPPORT:
-            self.__add_connection_epoll(
-                connection_socket, connection_address, connection_port
-            )
+        # registers the service connection in the
+        # current service connection handler
+        self.__register_connection(service_connection)
 
         # sets the initial cancel timeout
         service_connection.cancel(self.connection_timeout)
@@ -1111,6 +1196,101 @@ class AbstractServiceConnectionHandler(object):
         # closes the service connection
         service_connection.close()
 
+        # unregisters the service connection from the
+        # current service connection handler
+        self.__unregister_connection(
+            service_connection, connection_socket_file_descriptor
+        )
+
+    def detach_work(self, work_reference):
+        """
+        Detaches the work (connection) from the current service
+        connection handler without closing it, so that it may be
+        attached to another service connection handler.
+
+        :type work_reference: Object
+        :param work_reference: The reference to the work to be detached.
+        :rtype: ServiceConnection
+        :return: The detached service connection.
+        """
+
+        # unpacks the work reference retrieving the connection socket
+        # and retrieves the associated service connection
+        connection_socket, _connection_address, _connection_port = work_reference
+        service_connection = self.service_connections_map[connection_socket]
+
+        # retrieves the connection socket file descriptor
+        connection_socket_file_descriptor = (
+            self.__get_connection_socket_file_descriptor(connection_socket)
+        )
+
+        if EPOLL_SUPPORT:
+            self.__remove_connection_epoll(service_connection)
+
+        # unregisters the service connection from the
+        # current service connection handler
+        self.__unregister_connection(
+            service_connection, connection_socket_file_descriptor
+        )
+
+        # returns the detached service connection
+        return service_connection
+
+    def attach_work(self, work_reference, service_connection):
+        """
+        Attaches the (previously detached) work (connection) to
+        the current service connection handler.
+
+        :type work_reference: Object
+        :param work_reference: The reference to the work to be attached.
+        :type service_connection: ServiceConnection
+        :param service_connection: The detached service connection.
+        """
+
+        # sets the current service connection handler in the service
+        # connection and registers it in the current handler
+        service_connection.service_connection_handler = self
+        self.__register_connection(service_connection)
+
+    def __register_connection(self, service_connection):
+        # retrieves the connection socket and its file descriptor
+        connection_socket = service_connection.get_base_connection_socket()
+        connection_socket_file_descriptor = connection_socket.fileno()
+
+        # adds the service connection to the service connections list
+        self.service_connections_list.append(service_connection)
+
+        # adds the connection socket to the service connection sockets list
+        self.service_connection_sockets_list.append(connection_socket)
+
+        # sets the service connection in the service connections map
+        self.service_connections_map[connection_socket] = service_connection
+
+        # sets the connection socket in the connection socket file descriptor
+        # connection socket map
+        self.connection_socket_file_descriptor_connection_socket_map[
+            connection_socket_file_descriptor
+        ] = connection_socket
+
+        # sets the connection socket file descriptor in the connection socket connection
+        # socket file descriptor map
+        self.connection_socket_connection_socket_file_descriptor_map[
+            connection_socket
+        ] = connection_socket_file_descriptor
+
+        if EPOLL_SUPPORT:
+            self.__add_connection_epoll(
+                connection_socket,
+                service_connection.connection_address,
+                service_connection.connection_port,
+            )
+
+    def __unregister_connection(
+        self, service_connection, connection_socket_file_descriptor
+    ):
+        # retrieves the connection socket
+        connection_socket = service_connection.get_base_connection_socket()
+
         # removes the connection from the service connections list
         self.service_connections_list.remove(service_connection)
 
@@ -1204,6 +1384,10 @@ class AbstractServiceConnectionHandler(object):
             # that is ready for reading
             ready_service_connection = self.service_connections_map[ready_socket]
 
+            # accounts the event for the connection (work) so that
+            # the work pool is able to balance the connections
+            self.processed_work(ready_service_connection.get_connection_tuple())
+
             try:
                 # handles the current request, retrieving the return value
                 return_value = self.client_service.handle_request(
@@ -1743,6 +1927,14 @@ class ServiceConnection(object):
     _read_buffer = []
     """ The read buffer """
 
+    _read_poll = None
+    """ The poll object used to wait for the connection
+    socket to be ready for reading """
+
+    _write_poll = None
+    """ The poll object used to wait for the connection
+    socket to be ready for writing """
+
     _read_lock = None
     """ The read lock """
 
@@ -1887,6 +2079,11 @@ class ServiceConnection(object):
         # sets the socket to non blocking mode
         self.connection_socket.setblocking(0)
 
+        # unsets the poll objects so that they're re-created
+        # for the new (upgraded) connection socket
+        self._read_poll = None
+        self._write_poll = None
+
     def execute_background(self, callable, retries=0, timeout=0.0, timestamp=None):
         """
         Executes the given callable object in a background
@@ -1969,6 +2166,50 @@ class ServiceConnection(object):
             # releases the write lock
             self._write_lock.release()
 
+    def send_file(self, file, offset, count, response_timeout=None):
+        """
+        Sends the region of the given file directly from its file
+        descriptor, avoiding the copy of the contents into user space.
+        Raises an exception in case there is a problem sending
+        the file.
+
+        This method should only be used in case the connection supports
+        sendfile operations (check `supports_sendfile`).
+
+        :type file: File
+        :param file: The (regular) file to be sent.
+        :type offset: int
+        :param offset: The offset in the file to start sending from.
+        :type count: int
+        :param count: The number of bytes of the file to be sent.
+        :type response_timeout: float
+        :param response_timeout: The timeout to be used in data sending.
+        """
+
+        # acquires the write lock
+        self._write_lock.acquire()
+
+        try:
+            # sends the file region
+            self._send_file(file, offset, count, response_timeout)
+        finally:
+            # releases the write lock
+            self._write_lock.release()
+
+    def supports_sendfile(self):
+        """
+        Checks if the connection is able to send files directly
+        from their file descriptors (kernel level copy).
+
+        Only plain (non secure) connections in systems that provide
+        the sendfile system call are able to do so.
+
+        :rtype: bool
+        :return: If the connection supports sendfile operations.
+        """
+
+        return hasattr(os, "sendfile") and not self.is_secure()
+
     def is_async(self):
         """
         Retrieves if the current connection is
@@ -2171,12 +2412,12 @@ class ServiceConnection(object):
             # in case the read buffer element length is greater
             # than the chunk size
             if read_buffer_element_length > chunk_size:
-                # retrieves the (sub) read buffer element
-                read_buffer_element = read_buffer_element[:chunk_size]
-
                 # retrieves the read buffer element remaining
                 read_buffer_element_remaining = read_buffer_element[chunk_size:]
 
+                # retrieves the (sub) read buffer element
+                read_buffer_element = read_buffer_element[:chunk_size]
+
                 # inserts the read buffer element remaining in the read buffer
                 self._read_buffer.insert(0, read_buffer_element_remaining)
 
@@ -2189,17 +2430,16 @@ class ServiceConnection(object):
         # iterates continuously
         while True:
             try:
-                # runs the select in the connection socket, with timeout
-                selected_values = select.select(
-                    [self.connection_socket], [], [], request_timeout
-                )
+                # waits for the connection socket to be
+                # ready for reading, with timeout
+                ready = self._wait(False, request_timeout)
             except Exception as exception:
                 # raises the request closed exception
                 raise exceptions.RequestClosed(
                     "invalid socket: %s" % colony.legacy.UNICODE(exception)
                 )
 
-            if selected_values == ([], [], []):
+            if not ready:
                 # raises the server request timeout exception
                 raise exceptions.ServerRequestTimeout("%is timeout" % request_timeout)
             try:
@@ -2277,28 +2517,32 @@ class ServiceConnection(object):
             response_timeout and response_timeout or self.connection_response_timeout
         )
 
-        # retrieves the number of bytes in the message
+        # creates a view over the message (in case it's a buffer) so
+        # that the partial sends are tracked by an offset without any
+        # copy of the message, and retrieves the number of bytes in it
+        if isinstance(message, (bytes, bytearray)):
+            message = memoryview(message)
         number_bytes = len(message)
+        offset = 0
 
         # iterates continuously
         while True:
             try:
-                # runs the select in the connection socket, with timeout
-                selected_values = select.select(
-                    [], [self.connection_socket], [], response_timeout
-                )
+                # waits for the connection socket to be
+                # ready for writing, with timeout
+                ready = self._wait(True, response_timeout)
             except Exception as exception:
                 # raises the request closed exception
                 raise exceptions.RequestClosed(
                     "invalid socket: %s" % colony.legacy.UNICODE(exception)
                 )
 
-            if selected_values == ([], [], []):
+            if not ready:
                 # raises the server response timeout exception
                 raise exceptions.ClientResponseTimeout("%is timeout" % response_timeout)
             try:
                 # sends the data in chunks
-                number_bytes_sent = self.connection_socket.send(message)
+                number_bytes_sent = self.connection_socket.send(message[offset:])
             except Exception as exception:
                 # in case the number of retries (available)
                 # is greater than zero
@@ -2316,17 +2560,132 @@ class ServiceConnection(object):
                         "problem sending data: " + colony.legacy.UNICODE(exception)
                     )
 
-            # decrements the number of bytes sent
-            number_bytes -= number_bytes_sent
+            # increments the offset with the number of bytes sent
+            offset += number_bytes_sent
 
-            # in case the number of bytes (pending)
-            # is zero (the transfer is complete)
-            if number_bytes == 0:
+            # in case the offset reached the number of bytes
+            # in the message (the transfer is complete)
+            if offset >= number_bytes:
                 # breaks the cycle
                 break
+
+    def _send_file(self, file, offset, count, response_timeout=None):
+        """
+        Sends the region of the given file to the socket using
+        the sendfile system call.
+        This method is not thread safe.
+
+        :type file: File
+        :param file: The (regular) file to be sent.
+        :type offset: int
+        :param offset: The offset in the file to start sending from.
+        :type count: int
+        :param count: The number of bytes of the file to be sent.
+        :type response_timeout: float
+        :param response_timeout: The timeout to be used in data sending.
+        """
+
+        # retrieves the response timeout
+        response_timeout = (
+            response_timeout and response_timeout or self.connection_response_timeout
+        )
+
+        # retrieves the file descriptors of both the socket
+        # and the file to be used in the sendfile calls
+        socket_fd = self.connection_socket.fileno()
+        file_fd = file.fileno()
+
+        # iterates while there are bytes pending
+        # to be sent from the file region
+        while count > 0:
+            try:
+                # waits for the connection socket to be
+                # ready for writing, with timeout
+                ready = self._wait(True, response_timeout)
+            except Exception as exception:
+                # raises the request closed exception
+                raise exceptions.RequestClosed(
+                    "invalid socket: %s" % colony.legacy.UNICODE(exception)
+                )
+
+            if not ready:
+                # raises the server response timeout exception
+                raise exceptions.ClientResponseTimeout("%is timeout" % response_timeout)
+            try:
+                # sends the file region (or part of it) from the file
+                # descriptor directly to the socket
+                number_bytes_sent = os.sendfile(socket_fd, file_fd, offset, count)
+            except Exception as exception:
+                # raises the client response timeout exception
+                raise exceptions.ServerResponseTimeout(
+                    "problem sending data: " + colony.legacy.UNICODE(exception)
+                )
+
+            # in case no bytes were sent the file has been
+            # truncated in the meantime (end of file)
+            if number_bytes_sent == 0:
+                raise exceptions.ServerResponseTimeout(
+                    "problem sending data: unexpected end of file"
+                )
+
+            # updates the offset and the count of bytes pending
+            # according to the number of bytes sent
+            offset += number_bytes_sent
+            count -= number_bytes_sent
+
+    def _wait(self, write, timeout):
+        """
+        Waits for the connection socket to be ready for reading
+        or writing (according to the write flag) for the given
+        timeout, the poll system call is used when available as
+        it's not limited in the value of the file descriptors.
+        This method is not thread safe (for the same operation).
+
+        :type write: bool
+        :param write: If the wait should be for writing, otherwise
+        the wait is for reading.
+        :type timeout: float
+        :param timeout: The timeout (in seconds) for the wait.
+        :rtype: bool
+        :return: If the connection socket is ready for the operation,
+        in case the timeout was reached false is returned.
+        """
+
+        # in case there's no poll support falls back to the
+        # select system call (limited in file descriptors)
+        if not POLL_SUPPORT:
+            sockets = [self.connection_socket]
+            selected_values = (
+                select.select([], sockets, [], timeout)
+                if write
+                else select.select(sockets, [], [], timeout)
+            )
+            return not selected_values == ([], [], [])
+
+        # retrieves the poll object for the operation and in case
+        # it does not exists creates it registering the connection
+        # socket for the operation (reused for the next waits)
+        poll = write and self._write_poll or self._read_poll
+        if poll == None:
+            poll = select.poll()
+            poll.register(
+                self.connection_socket, write and select.POLLOUT or select.POLLIN
+            )
+            if write:
+                self._write_poll = poll
             else:
-                # creates the new message
-                message = message[number_bytes * -1 :]
+                self._read_poll = poll
+
+        # polls the connection socket (timeout in milliseconds)
+        # and in case the file descriptor is invalid (eg: closed
+        # socket) raises an error as the select would
+        events = poll.poll(None if timeout == None else timeout * 1000)
+        for _fd, event in events:
+            if event & select.POLLNVAL:
+                raise socket.error(errno.EBADF, os.strerror(errno.EBADF))
+
+        # returns if the connection socket is ready
+        return events and True or False
 
     def _call_connection_opened_handlers(self):
         """
@@ -28,11 +28,21 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import os
 import select
+import time
+import signal
 import socket
+import tempfile
+import threading
+import collections
 
 import colony
 
+from . import timers
+from . import threads
+from . import prefork
+from . import synchronous
 from . import asynchronous
 from . import exceptions
 from . import mocks
@@ -51,6 +61,12 @@ class ServiceUtilsTest(colony.Test):
             Epoll2PollingTestCase,
             KqueuePollingTestCase,
             AbstractServiceTestCase,
+            PipelineTestCase,
+            PreforkTestCase,
+            TimerWheelTestCase,
+            FileDataTestCase,
+            WriteTestCase,
+            ServiceConnectionTestCase,
             ExceptionsTestCase,
         )
 
@@ -835,9 +851,526 @@ class AbstractServiceTestCase(colony.ColonyTestCase):
         service.client_connection_map = {}
         service.poll_instance = asynchronous.SelectPolling()
         service.service_execution_thread = None
+        service.timer_wheel = timers.TimerWheel(timers.clock())
+        service.poll_deadline = 0.0
         return service
 
 
+class PipelineTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Pipeline test case"
+
+    def test_ordering(self):
+        server, client = socket.socketpair()
+        service = self._create_service()
+
+        try:
+            connection = asynchronous.ClientConnection(
+                service, server, "127.0.0.1", 8080
+            )
+            connection.process_data(b"3\n1\n2\n")
+
+            self.assertEqual(len(connection.pipeline), 3)
+
+            self._wait(service, connection)
+        finally:
+            self._stop_service(service)
+            server.close()
+            client.close()
+
+        self.assertEqual(len(connection.pipeline), 0)
+        self.assertEqual(
+            list(reversed(connection.write_data_buffer)), [b"3", b"1", b"2"]
+        )
+
+    def test_inline(self):
+        server, client = socket.socketpair()
+        service = self._create_service()
+
+        try:
+            connection = asynchronous.ClientConnection(
+                service, server, "127.0.0.1", 8080
+            )
+            connection.process_data(b"2\n0\n1\n")
+
+            self.assertEqual(len(connection.pipeline), 2)
+            self.assertEqual(connection.paused, True)
+            self.assertEqual(connection.pending_data(), True)
+
+            self._wait(service, connection)
+        finally:
+            self._stop_service(service)
+            server.close()
+            client.close()
+
+        self.assertEqual(connection.paused, False)
+        self.assertEqual(connection.pending_data(), False)
+        self.assertEqual(
+            list(reversed(connection.write_data_buffer)), [b"2", b"0", b"1"]
+        )
+
+    def test_proxy(self):
+        server, client = socket.socketpair()
+        service = self._create_service(pipeline_threads=0)
+
+        try:
+            connection = asynchronous.ClientConnection(
+                service, server, "127.0.0.1", 8080
+            )
+            pipeline_connection = asynchronous.PipelineConnection(connection, b"1")
+
+            self.assertEqual(pipeline_connection, connection)
+            self.assertEqual(hash(pipeline_connection), hash(connection))
+            self.assertEqual(pipeline_connection.connection_port, 8080)
+
+            pipeline_connection.send(b"b")
+            pipeline_connection.send(b"a", write_front=True)
+            connection.send(b"c")
+
+            self.assertEqual(list(connection.write_data_buffer), [b"c"])
+
+            pipeline_connection.request_data["_request"] = b"1"
+            pipeline_connection.activate()
+            pipeline_connection.send(b"d")
+
+            self.assertEqual(
+                list(reversed(connection.write_data_buffer)),
+                [b"c", b"a", b"b", b"d"],
+            )
+            self.assertEqual(connection.request_data["_request"], b"1")
+        finally:
+            server.close()
+            client.close()
+
+    def _create_service(self, pipeline_threads=2):
+        """
+        Creates a minimal abstract service instance, with the
+        structures required for pipelining, for testing purposes.
+
+        :type pipeline_threads: int
+        :param pipeline_threads: The number of worker threads to
+        be started for the handling of the dispatched requests.
+        :rtype: AbstractService
+        :return: The created service instance.
+        """
+
+        service = asynchronous.AbstractService.__new__(asynchronous.AbstractService)
+        service.service_plugin = mocks.MockPlugin()
+        service.service_utils_plugin = mocks.MockPlugin()
+        service.client_service = mocks.MockClientService()
+        service.poll_instance = asynchronous.SelectPolling()
+        service.pipeline_threads = pipeline_threads
+        service.dispatch_queue = collections.deque()
+        service.dispatch_condition = threading.Condition()
+        service.ready_queue = collections.deque()
+        service.wake_sockets = None
+        service.dispatch_threads = []
+        for _index in range(pipeline_threads):
+            dispatch_thread = threads.ServiceDispatchThread(service)
+            dispatch_thread.start()
+            service.dispatch_threads.append(dispatch_thread)
+        return service
+
+    def _stop_service(self, service):
+        for dispatch_thread in service.dispatch_threads:
+            dispatch_thread.stop()
+        for dispatch_thread in service.dispatch_threads:
+            dispatch_thread.join()
+
+    def _wait(self, service, connection, timeout=5.0):
+        target = time.time() + timeout
+        while (connection.pipeline or connection.pending_data()) and (
+            time.time() < target
+        ):
+            service._process_ready()
+            time.sleep(0.01)
+
+
+class PreforkTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Prefork test case"
+
+    def test_supervise(self):
+        if not hasattr(os, "fork"):
+            return
+
+        service = asynchronous.AbstractService.__new__(asynchronous.AbstractService)
+        service.service_utils_plugin = mocks.MockPlugin()
+
+        stopped = []
+        iterations = []
+        snapshots = []
+
+        def running():
+            iterations.append(True)
+            snapshots.append(sorted(master.pids))
+            if len(iterations) == 2:
+                os.kill(snapshots[-1][0], signal.SIGKILL)
+            if len(iterations) == 4:
+                master.reload()
+            return len(iterations) < 7
+
+        def stopper():
+            stopped.append(True)
+
+        master = prefork.PreforkMaster(service, 2, running, stopper)
+
+        handler = signal.getsignal(signal.SIGHUP)
+        try:
+            loop = master.start()
+        finally:
+            signal.signal(signal.SIGHUP, handler)
+
+        if loop:
+            try:
+                while not stopped:
+                    time.sleep(0.05)
+            finally:
+                master.exit()
+
+        self.assertEqual(master.is_master(), True)
+        self.assertEqual(master.pids, {})
+        self.assertEqual(master.generation, 1)
+        self.assertEqual(len(snapshots[0]), 2)
+        self.assertNotIn(snapshots[1][0], snapshots[3])
+        self.assertEqual(len(snapshots[3]), 2)
+        self.assertEqual(len(snapshots[6]), 2)
+        self.assertEqual(set(snapshots[3]) & set(snapshots[6]), set())
+
+
+class TimerWheelTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Timer Wheel test case"
+
+    def test_advance(self):
+        wheel = timers.TimerWheel(1000.0)
+        fired = []
+
+        wheel.add(1000.5, lambda: fired.append(1))
+        wheel.add(1000.05, lambda: fired.append(0))
+        wheel.add(1100.0, lambda: fired.append(2))
+        wheel.add(90000.0, lambda: fired.append(3))
+
+        self.assertEqual(wheel.count, 4)
+
+        for timer in wheel.advance(1000.04):
+            timer.callback()
+
+        self.assertEqual(fired, [])
+
+        for timer in wheel.advance(1001.0):
+            timer.callback()
+
+        self.assertEqual(fired, [0, 1])
+        self.assertEqual(wheel.count, 2)
+
+        for timer in wheel.advance(1100.0):
+            timer.callback()
+
+        self.assertEqual(fired, [0, 1, 2])
+
+        for timer in wheel.advance(90000.0):
+            timer.callback()
+
+        self.assertEqual(fired, [0, 1, 2, 3])
+        self.assertEqual(wheel.count, 0)
+
+    def test_cancel(self):
+        wheel = timers.TimerWheel(1000.0)
+
+        timer = wheel.add(1010.0, None)
+        other = wheel.add(1020.0, None)
+
+        self.assertEqual(timer.is_active(), True)
+
+        timer.cancel()
+        timer.cancel()
+
+        self.assertEqual(timer.is_active(), False)
+        self.assertEqual(wheel.count, 1)
+        self.assertEqual(wheel.advance(1030.0), [other])
+        self.assertEqual(other.is_active(), False)
+        self.assertEqual(wheel.count, 0)
+
+    def test_due(self):
+        wheel = timers.TimerWheel(1000.0)
+
+        timer = wheel.add(900.0, None)
+
+        self.assertEqual(wheel.timeout(1000.0, 1.0), 0.0)
+        self.assertEqual(wheel.advance(1000.0), [timer])
+
+    def test_gap(self):
+        wheel = timers.TimerWheel(1000.0)
+
+        initial = time.time()
+        self.assertEqual(wheel.advance(1000.0 + 21600.0), [])
+        self.assertEqual(wheel.tick, 2260000)
+
+        fired = []
+
+        wheel.add(22600.5, lambda: fired.append(0))
+        wheel.add(80000.0, lambda: fired.append(1))
+        wheel.add(190000.0, lambda: fired.append(2))
+
+        for timer in wheel.advance(80000.0):
+            timer.callback()
+
+        self.assertEqual(fired, [0, 1])
+
+        for timer in wheel.advance(400000.0):
+            timer.callback()
+
+        self.assertEqual(fired, [0, 1, 2])
+        self.assertEqual(wheel.count, 0)
+        self.assertEqual(wheel.tick, 40000000)
+        self.assertTrue(time.time() - initial < 1.0)
+
+    def test_timeout(self):
+        wheel = timers.TimerWheel(1000.0)
+
+        self.assertEqual(wheel.timeout(1000.0, 1.0), 1.0)
+
+        wheel.add(1000.2, None)
+
+        self.assertAlmostEqual(wheel.timeout(1000.0, 1.0), 0.2, places=5)
+
+    def test_connection(self):
+        mock_plugin = mocks.MockPlugin()
+        mock_socket = mocks.MockSocket(10)
+
+        service = asynchronous.AbstractService.__new__(asynchronous.AbstractService)
+        service.service_plugin = mock_plugin
+        service.handlers_map = {}
+        service.socket_fd_map = {}
+        service.address_fd_map = {}
+        service.client_connection_map = {}
+        service.poll_instance = asynchronous.SelectPolling()
+        service.service_execution_thread = None
+        service.timer_wheel = timers.TimerWheel(timers.clock())
+        service.poll_deadline = 0.0
+        service.client_service = mocks.MockClientService()
+        service.idle_timeout = 10.0
+        service.read_timeout = 5.0
+
+        service.add_socket(mock_socket, ("127.0.0.1", 12345), 8080)
+        connection = service.client_connection_map[mock_socket]
+
+        self.assertEqual(connection.timer.is_active(), True)
+        self.assertEqual(connection.timer_read, False)
+
+        connection.process_data(b"1")
+        connection.refresh()
+
+        self.assertEqual(connection.reading, True)
+        self.assertEqual(connection.timer_read, True)
+
+        # receives more data for the request and verifies that the
+        # read deadline is extended (timer replaced) as it's active
+        timer = connection.timer
+        connection.process_data(b"2")
+        connection.refresh()
+
+        self.assertEqual(timer.is_active(), False)
+        self.assertEqual(connection.timer.is_active(), True)
+        self.assertEqual(connection.timer_read, True)
+
+        for timer in service.timer_wheel.advance(timers.clock() + 6.0):
+            timer.callback()
+
+        self.assertEqual(connection.is_open(), False)
+        self.assertEqual(mock_socket._closed, True)
+        self.assertEqual(connection.timer, None)
+
+
+class FileDataTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "File Data test case"
+
+    def _skip_if_no_sendfile(self):
+        """
+        Returns true if the sendfile system call is not
+        available on the current platform.
+        """
+
+        return not hasattr(os, "sendfile")
+
+    def test_slice(self):
+        file_data = asynchronous.FileData(None, 10, 100)
+
+        self.assertEqual(len(file_data), 100)
+
+        file_data = file_data[40:]
+
+        self.assertEqual(file_data.offset, 50)
+        self.assertEqual(len(file_data), 60)
+
+    def test_write_handler(self):
+        if self._skip_if_no_sendfile():
+            return
+
+        contents = b"0123456789" * 1024
+
+        file = tempfile.TemporaryFile()
+        file.write(contents)
+        file.flush()
+
+        server, client = socket.socketpair()
+        results = []
+
+        try:
+            service = asynchronous.AbstractService.__new__(asynchronous.AbstractService)
+            service.poll_instance = asynchronous.SelectPolling()
+            connection = asynchronous.ClientConnection(
+                service, server, "127.0.0.1", 8080
+            )
+
+            connection.send(b"header")
+            connection.send_file(file, 10, 1000, callback=results.append)
+            connection.write_handler(server)
+
+            data = b""
+            while len(data) < 1006:
+                data += client.recv(4096)
+        finally:
+            file.close()
+            server.close()
+            client.close()
+
+        self.assertEqual(data, b"header" + contents[10:1010])
+        self.assertEqual(results, [False])
+        self.assertEqual(list(connection.write_data_buffer), [])
+
+
+class WriteTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Write test case"
+
+    def _create_connection(self, _socket):
+        service = asynchronous.AbstractService.__new__(asynchronous.AbstractService)
+        service.poll_instance = asynchronous.SelectPolling()
+        return asynchronous.ClientConnection(service, _socket, "127.0.0.1", 8080)
+
+    def test_gather(self):
+        for vectored in (True, False):
+            server, client = socket.socketpair()
+            results = []
+
+            try:
+                connection = self._create_connection(server)
+                connection.vectored = vectored and hasattr(server, "sendmsg")
+
+                connection.send(b"first")
+                connection.send_callback(b"second", results.append)
+                connection.send(b"third")
+                connection.write_handler(server)
+
+                data = b""
+                while len(data) < 16:
+                    data += client.recv(4096)
+            finally:
+                server.close()
+                client.close()
+
+            self.assertEqual(data, b"firstsecondthird")
+            self.assertEqual(results, [False])
+            self.assertEqual(list(connection.write_data_buffer), [])
+
+    def test_partial(self):
+        class PartialSocket(object):
+            def __init__(self):
+                self.data = b""
+
+            def send(self, data):
+                data = bytes(data[:3])
+                self.data += data
+                return len(data)
+
+            def fileno(self):
+                return 0
+
+        _socket = PartialSocket()
+        results = []
+
+        connection = self._create_connection(_socket)
+        connection.vectored = False
+        connection.unregister = lambda socket_fd, operation: None
+
+        connection.send_callback(b"abcd", results.append)
+        connection.send(b"efghij")
+        connection.write_handler(_socket)
+
+        self.assertEqual(_socket.data, b"abcdefghij")
+        self.assertEqual(results, [False])
+        self.assertEqual(list(connection.write_data_buffer), [])
+
+
+class ServiceConnectionTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Service Connection test case"
+
+    def _create_connection(self, _socket):
+        _socket.setblocking(0)
+        return synchronous.ServiceConnection(
+            None, None, _socket, "127.0.0.1", 8080, 1.0, 1.0, 4096
+        )
+
+    def test_send_receive(self):
+        server, client = socket.socketpair()
+        message = b"0123456789" * 100000
+        received = []
+
+        try:
+            sender = self._create_connection(server)
+            receiver = self._create_connection(client)
+
+            def receive():
+                size = 0
+                while size < len(message):
+                    data = receiver.receive()
+                    received.append(data)
+                    size += len(data)
+
+            thread = threading.Thread(target=receive)
+            thread.start()
+            sender.send(message)
+            thread.join()
+        finally:
+            server.close()
+            client.close()
+
+        self.assertEqual(b"".join(received), message)
+        self.assertEqual(max(len(data) for data in received) <= 4096, True)
+
+    def test_receive_timeout(self):
+        server, client = socket.socketpair()
+
+        try:
+            connection = self._create_connection(server)
+            self.assertRaises(exceptions.ServerRequestTimeout, connection.receive, 0.1)
+        finally:
+            server.close()
+            client.close()
+
+    def test_receive_closed(self):
+        server, client = socket.socketpair()
+        client.close()
+
+        try:
+            connection = self._create_connection(server)
+            self.assertEqual(connection.receive(), b"")
+        finally:
+            server.close()
+
+        self.assertRaises(exceptions.RequestClosed, connection.receive)
+
+
 class ExceptionsTestCase(colony.ColonyTestCase):
     @staticmethod
     def get_description():
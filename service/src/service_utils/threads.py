@@ -172,6 +172,11 @@ class ServiceExecutionThread(threading.Thread):
     callable_queue_condition = None
     """ The condition that controls the callable queue """
 
+    scheduler = None
+    """ The (optional) scheduler used for the callables to be executed
+    in the future, should receive the timestamp and the callback (eg:
+    timer wheel based), otherwise the callable queue is used """
+
     def __init__(self, abstract_service):
         """
         Constructor of the class.
@@ -265,6 +270,15 @@ class ServiceExecutionThread(threading.Thread):
             self.callable_queue_condition.release()
 
     def add_callable(self, callable, retries=0, timeout=0.0, timestamp=None):
+        # in case there's a scheduler and the callable is meant to be
+        # executed in the future it's delegated to the scheduler that
+        # adds the callable (to the queue) once the timestamp is reached
+        if self.scheduler and timestamp and timestamp > time.time():
+            self.scheduler(
+                timestamp, lambda: self.add_callable(callable, retries, timeout)
+            )
+            return
+
         # acquires the callable queue condition
         self.callable_queue_condition.acquire()
 
@@ -282,3 +296,85 @@ class ServiceExecutionThread(threading.Thread):
         finally:
             # releases the callable queue condition
             self.callable_queue_condition.release()
+
+
+class ServiceDispatchThread(threading.Thread):
+    """
+    Class that handles the execution of the requests that
+    have been dispatched (pipelining) by the connections of
+    an asynchronous service.
+    """
+
+    abstract_service = None
+    """ The abstract service reference """
+
+    stop_flag = False
+    """ The flag that controls the execution of the thread """
+
+    def __init__(self, abstract_service):
+        """
+        Constructor of the class.
+        """
+        threading.Thread.__init__(self)
+
+        self.abstract_service = abstract_service
+
+        self.daemon = True
+
+    def run(self):
+        # unsets the stop flag
+        self.stop_flag = False
+
+        # retrieves the dispatch queue and condition, shared
+        # among the complete set of dispatch threads
+        dispatch_queue = self.abstract_service.dispatch_queue
+        dispatch_condition = self.abstract_service.dispatch_condition
+
+        # iterates continuously
+        while True:
+            # acquires the dispatch condition
+            dispatch_condition.acquire()
+
+            try:
+                # iterates while the dispatch queue is empty
+                # and the stop flag is not set, waiting for the
+                # dispatch condition
+                while not dispatch_queue and not self.stop_flag:
+                    dispatch_condition.wait(CONDITION_TIMEOUT)
+
+                # in case the stop flag is set must break
+                # the loop immediately
+                if self.stop_flag:
+                    break
+
+                # pops the callable to be executed from the
+                # (front of the) dispatch queue
+                callable = dispatch_queue.popleft()
+            finally:
+                # releases the dispatch condition
+                dispatch_condition.release()
+
+            try:
+                # calls the callable object
+                callable()
+            except Exception as exception:
+                # prints a warning message about the problem executing callable
+                self.abstract_service.service_utils_plugin.warning(
+                    "Error executing dispatched callable: "
+                    + colony.legacy.UNICODE(exception)
+                )
+
+    def stop(self):
+        # retrieves the dispatch condition and acquires it
+        dispatch_condition = self.abstract_service.dispatch_condition
+        dispatch_condition.acquire()
+
+        try:
+            # sets the stop flag and notifies all the threads
+            # waiting on the dispatch condition so that the
+            # event loop is stopped immediately
+            self.stop_flag = True
+            dispatch_condition.notify_all()
+        finally:
+            # releases the dispatch condition
+            dispatch_condition.release()
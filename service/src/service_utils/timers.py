@@ -0,0 +1,390 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import math
+import time
+import threading
+
+import colony
+
+RESOLUTION = 0.01
+""" The resolution (in seconds) of the timer wheel, this is
+the duration of each tick (slot) of the lowest level """
+
+SLOTS_BITS = 6
+""" The number of bits used to index the slots of each of the
+levels of the wheel (a power of two number of slots) """
+
+LEVELS = 4
+""" The number of levels (wheels) of the hierarchical timer wheel,
+with the default values the range is of around two days, timers
+beyond the range are cascaded until they fit """
+
+
+def clock():
+    """
+    Retrieves the current value (in seconds) of the monotonic clock
+    used to drive the timer wheel, unaffected by steps of the system
+    clock, falls back to the wall clock when not available.
+
+    :rtype: float
+    :return: The current value of the monotonic clock.
+    """
+
+    return time.monotonic() if hasattr(time, "monotonic") else time.time()
+
+
+def monotonic(timestamp):
+    """
+    Converts the given unix timestamp into the equivalent value
+    of the monotonic clock (as returned by the clock function).
+
+    :type timestamp: float
+    :param timestamp: The unix timestamp to be converted.
+    :rtype: float
+    :return: The equivalent value of the monotonic clock.
+    """
+
+    return timestamp - time.time() + clock()
+
+
+class Timer(object):
+    """
+    Timer scheduled in a timer wheel, the callback is called once
+    the deadline is reached unless the timer is canceled before.
+    """
+
+    wheel = None
+    """ The timer wheel in which the timer is scheduled """
+
+    deadline = None
+    """ The deadline (monotonic clock) for the timer """
+
+    expires = None
+    """ The tick at which the timer expires (deadline in ticks) """
+
+    callback = None
+    """ The callable to be called once the timer expires """
+
+    slot = None
+    """ The slot (set) of the wheel where the timer is currently
+    placed, allows the constant time cancel of the timer """
+
+    def __init__(self, wheel, deadline, callback):
+        self.wheel = wheel
+        self.deadline = deadline
+        self.callback = callback
+
+    def cancel(self):
+        """
+        Cancels the timer so that the callback is not called, this
+        is a constant time operation (removal from the slot).
+        """
+
+        self.wheel.cancel(self)
+
+    def is_active(self):
+        """
+        Checks if the timer is still active (scheduled and
+        neither expired nor canceled).
+
+        :rtype: bool
+        :return: If the timer is still active.
+        """
+
+        return not self.slot == None
+
+
+class TimerWheel(object):
+    """
+    Hierarchical timer wheel providing constant time add and cancel
+    operations, each level contains a fixed number of slots (sets of
+    timers) and the timers of the upper levels are cascaded into the
+    lower ones as the time advances.
+
+    The wheel is thread safe, timers may be added or canceled from
+    any thread while it's advanced by the main loop thread.
+    """
+
+    resolution = RESOLUTION
+    """ The duration (in seconds) of each tick of the wheel """
+
+    bits = SLOTS_BITS
+    """ The number of bits used for the indexing of the slots """
+
+    tick = 0
+    """ The current (last processed) tick of the wheel """
+
+    count = 0
+    """ The number of active timers in the wheel """
+
+    levels = []
+    """ The list of levels (lists of slots) of the wheel """
+
+    due = None
+    """ The set of timers that have already expired and are
+    pending to be called in the next advance of the wheel """
+
+    def __init__(self, current, resolution=RESOLUTION, bits=SLOTS_BITS, levels=LEVELS):
+        """
+        Constructor of the class.
+
+        :type current: float
+        :param current: The current time (monotonic clock) that is
+        going to be used as the starting point of the wheel.
+        :type resolution: float
+        :param resolution: The duration (in seconds) of each tick.
+        :type bits: int
+        :param bits: The number of bits for the indexing of the slots.
+        :type levels: int
+        :param levels: The number of levels of the wheel.
+        """
+
+        self.resolution = resolution
+        self.bits = bits
+        self.size = 1 << bits
+        self.mask = self.size - 1
+        self.tick = int(current / resolution)
+
+        self.count = 0
+        self.levels = [
+            [set() for _index in colony.legacy.xrange(self.size)]
+            for _level in colony.legacy.xrange(levels)
+        ]
+        self.due = set()
+        self.lock = threading.RLock()
+
+    def add(self, deadline, callback):
+        """
+        Adds a new timer to the wheel that calls the given callback
+        once the deadline is reached.
+
+        :type deadline: float
+        :param deadline: The deadline (monotonic clock) for the timer.
+        :type callback: Callable
+        :param callback: The callable to be called on expiration.
+        :rtype: Timer
+        :return: The timer that has been scheduled (may be canceled).
+        """
+
+        timer = Timer(self, deadline, callback)
+        timer.expires = int(math.ceil(deadline / self.resolution))
+
+        self.lock.acquire()
+        try:
+            self._place(timer)
+            self.count += 1
+        finally:
+            self.lock.release()
+
+        return timer
+
+    def cancel(self, timer):
+        """
+        Cancels the given timer, removing it from the wheel.
+
+        :type timer: Timer
+        :param timer: The timer to be canceled.
+        """
+
+        self.lock.acquire()
+        try:
+            # in case the timer is no longer scheduled (expired
+            # or already canceled) there's nothing to be done
+            if timer.slot == None:
+                return
+
+            # removes the timer from its slot (constant time)
+            # and updates the number of active timers
+            timer.slot.discard(timer)
+            timer.slot = None
+            self.count -= 1
+        finally:
+            self.lock.release()
+
+    def advance(self, current):
+        """
+        Advances the wheel up until the given time, returning the
+        timers that have expired (ordered by deadline).
+
+        The callbacks of the expired timers are not called by the
+        wheel, that's the responsibility of the caller.
+
+        :type current: float
+        :param current: The current time (monotonic clock).
+        :rtype: List
+        :return: The list of timers that have expired.
+        """
+
+        self.lock.acquire()
+        try:
+            return self._collect(int(current / self.resolution))
+        finally:
+            self.lock.release()
+
+    def timeout(self, current, maximum):
+        """
+        Computes the time (in seconds) until the nearest deadline of
+        the wheel, to be used as the timeout for the polling.
+
+        The search is limited to the lowest level of the wheel, beyond
+        it the time until the next cascade is returned instead.
+
+        :type current: float
+        :param current: The current time (monotonic clock).
+        :type maximum: float
+        :param maximum: The maximum timeout to be returned.
+        :rtype: float
+        :return: The time until the nearest deadline (bounded).
+        """
+
+        self.lock.acquire()
+        try:
+            # in case there are no active timers the maximum
+            # timeout is returned immediately
+            if not self.count:
+                return maximum
+
+            # in case there are due timers the wheel must be
+            # advanced immediately (no timeout)
+            if self.due:
+                return 0.0
+
+            # iterates over the slots of the lowest level (starting
+            # on the next tick) to find the nearest deadline tick,
+            # in case there's none the next cascade tick is used
+            slots = self.levels[0]
+            target = (self.tick | self.mask) + 1
+            for offset in colony.legacy.xrange(1, self.size):
+                tick = self.tick + offset
+                if slots[tick & self.mask]:
+                    target = tick
+                    break
+                if not tick & self.mask:
+                    target = tick
+                    break
+        finally:
+            self.lock.release()
+
+        # converts the target tick into the timeout value (in
+        # seconds) taking into account the maximum timeout
+        timeout = target * self.resolution - current
+        return max(0.0, min(timeout, maximum))
+
+    def _collect(self, target):
+        # creates the list that will hold the expired timers, starting
+        # with the timers that were already due (added in the past)
+        expired = list(self.due)
+        self.due = set()
+
+        # iterates over the ticks until the target one, cascading
+        # the upper levels and collecting the timers of each tick
+        while self.tick < target:
+            # counts the lowest levels that are empty, as nothing
+            # happens until the next cascade of the first non empty
+            # level the ticks until its boundary are skipped, in case
+            # the complete wheel is empty jumps straight to the target
+            empty = 0
+            for slots in self.levels:
+                if any(slots):
+                    break
+                empty += 1
+            if empty == len(self.levels):
+                self.tick = target
+                break
+            if empty:
+                shift = self.bits * empty
+                boundary = ((self.tick >> shift) + 1) << shift
+                self.tick = min(target, boundary) - 1
+
+            self.tick += 1
+
+            # cascades the levels whose lower bits have wrapped,
+            # moving their timers (of the current slot) down
+            for level in colony.legacy.xrange(1, len(self.levels)):
+                shift = self.bits * level
+                if self.tick & ((1 << shift) - 1):
+                    break
+                slots = self.levels[level]
+                index = (self.tick >> shift) & self.mask
+                slot = slots[index]
+                slots[index] = set()
+                for timer in slot:
+                    self._place(timer)
+
+            # collects the timers for the current tick (lowest level)
+            # including the ones that have been cascaded as due
+            slots = self.levels[0]
+            index = self.tick & self.mask
+            slot = slots[index]
+            slots[index] = set()
+            expired.extend(slot)
+            expired.extend(self.due)
+            self.due = set()
+
+        # unsets the slot of the expired timers (no longer scheduled)
+        # and updates the number of active timers in the wheel
+        for timer in expired:
+            timer.slot = None
+        self.count -= len(expired)
+
+        # sorts the expired timers by deadline so that the
+        # callbacks are called in the order of their deadlines
+        expired.sort(key=lambda timer: timer.deadline)
+        return expired
+
+    def _place(self, timer):
+        # in case the timer has already expired (in terms of tick)
+        # it's added to the due list to be called in the next advance
+        if timer.expires <= self.tick:
+            self.due.add(timer)
+            timer.slot = self.due
+            return
+
+        # finds the lowest level for which the timer fits in the
+        # current rotation, the upper level is used as fallback
+        # (the timer is cascaded until it fits)
+        levels = len(self.levels)
+        for level in colony.legacy.xrange(levels):
+            shift = self.bits * level
+            delta = (timer.expires >> shift) - (self.tick >> shift)
+            if delta < self.size:
+                break
+        else:
+            level = levels - 1
+            shift = self.bits * level
+            delta = self.mask
+
+        # adds the timer to the slot of the level and sets the
+        # slot in the timer (allows constant time cancel)
+        index = ((self.tick >> shift) + delta) & self.mask
+        slot = self.levels[level][index]
+        slot.add(timer)
+        timer.slot = slot
@@ -78,3 +78,18 @@ class MockErrorHandlerPlugin(object):
 class MockServiceConnection(object):
     def __init__(self, address=("127.0.0.1", 8080)):
         self.connection_address = address
+        self.request_data = {}
+        self.pending_data_buffer = []
+
+    def add_pending_data(self, pending_data):
+        if not pending_data:
+            return
+        self.pending_data_buffer.append(pending_data)
+
+    def pop_pending_data(self):
+        if not self.pending_data_buffer:
+            return None
+        return self.pending_data_buffer.pop(0)
+
+    def pending_data(self):
+        return len(self.pending_data_buffer) > 0
@@ -87,6 +87,11 @@ CHUNK_SIZE = 4096
 operations, should be chosen taking into account a
 different set of factors (eg: page size or disk blocks) """
 
+MAXIMUM_MESSAGE_SIZE = 1073741824
+""" The default maximum size (in bytes) of the message (body)
+of a request, requests declaring a larger content length are
+refused before any data is received """
+
 SERVER_NAME = "Hive-Colony-Web"
 """ The server name used as the main part of the
 identification process of the server """
@@ -252,6 +257,10 @@ WWW_AUTHENTICATE_VALUE = "WWW-Authenticate"
 CHUNKED_VALUE = "chunked"
 """ The chunked value """
 
+HTTP_1_1_VERSION = "HTTP/1.1"
+""" The HTTP 1.1 version value, the first version of
+the protocol to support the chunked transfer encoding """
+
 KEEP_ALIVE_LOWER_VALUE = "keep-alive"
 """ The keep alive lower value """
 
@@ -288,6 +297,9 @@ ENCODING_VALUE = "encoding"
 ENCODING_HANDLER_VALUE = "encoding_handler"
 """ The encoding handler value """
 
+ENCODING_STREAM_VALUE = "encoding_stream"
+""" The encoding stream value """
+
 LOG_FILE_VALUE = "log_file"
 """ The log file value """
 
@@ -303,9 +315,28 @@ DEFAULT_CONTENT_TYPE_CHARSET_VALUE = "default_content_type_charset"
 DEFAULT_CACHE_CONTROL_VALUE = "no-cache, must-revalidate"
 """ The default cache control value """
 
+DEFAULT_MAXIMUM_MESSAGE_SIZE_VALUE = "default_maximum_message_size"
+""" The default maximum message size value """
+
 UPGRADE_MESSAGE_SIZE_MAP = {WEB_SOCKET_VALUE: 8}
 """ The upgrade message size map """
 
+START_LINE_STATE = 1
+""" The parser state where the start line of the
+request is still being waited for """
+
+HEADERS_STATE = 2
+""" The parser state where the header lines are
+being parsed (one line at a time) """
+
+MESSAGE_STATE = 3
+""" The parser state where the message (body) is being
+received into the message buffer """
+
+FINISHED_STATE = 4
+""" The parser state where the request has been
+completely parsed and is ready to be handled """
+
 
 class ServiceHTTP(colony.System):
     """
@@ -333,6 +364,16 @@ class ServiceHTTP(colony.System):
     http_service_configuration = {}
     """ The HTTP service configuration """
 
+    http_service_virtual_servers_map = {}
+    """ The map associating the hostname of each virtual server
+    with its (pre-merged) service configuration, this map is
+    compiled once per configuration change """
+
+    http_service_redirections_tries_map = {}
+    """ The map associating the name of each virtual server (none
+    for the base configuration) with the prefix trie compiled from
+    its redirections, kept apart from the configuration maps """
+
     def __init__(self, plugin):
         colony.System.__init__(self, plugin)
         self.http_service_handler_plugin_map = {}
@@ -340,6 +381,8 @@ class ServiceHTTP(colony.System):
         self.http_service_authentication_handler_plugins_map = {}
         self.http_service_error_handler_plugins_map = {}
         self.http_service_configuration = {}
+        self.http_service_virtual_servers_map = {}
+        self.http_service_redirections_tries_map = {}
 
     def start_service(self, parameters):
         """
@@ -375,6 +418,18 @@ class ServiceHTTP(colony.System):
         # starts the HTTP service
         self.http_service.stop_service()
 
+    def reload_service(self, parameters):
+        """
+        Reloads the service, in the prefork mode the worker
+        processes are gracefully replaced by new ones.
+
+        :type parameters: Dictionary
+        :param parameters: The parameters to reload the service.
+        """
+
+        # reloads the HTTP service
+        self.http_service.reload_service()
+
     def http_service_handler_load(self, http_service_handler_plugin):
         # retrieves the plugin handler name
         handler_name = http_service_handler_plugin.get_handler_name()
@@ -491,9 +546,16 @@ class ServiceHTTP(colony.System):
         # copies the service configuration to the HTTP service configuration
         colony.map_copy(service_configuration, self.http_service_configuration)
 
+        # compiles the service configuration so that the per request
+        # resolution is reduced to simple lookups (no merging)
+        self._compile_service_configuration()
+
     def unset_service_configuration_property(self):
-        # cleans the HTTP service configuration
+        # cleans the HTTP service configuration and the compiled
+        # virtual servers and redirections maps (invalidation)
         colony.map_clean(self.http_service_configuration)
+        colony.map_clean(self.http_service_virtual_servers_map)
+        colony.map_clean(self.http_service_redirections_tries_map)
 
     def _get_service_configuration(self):
         """
@@ -505,6 +567,184 @@ class ServiceHTTP(colony.System):
 
         return self.http_service_configuration
 
+    def _compile_service_configuration(self):
+        """
+        Compiles the current service configuration, merging the
+        configuration of each of the virtual servers with the base
+        configuration and creating the redirection prefix tries.
+
+        This method should be called whenever the service configuration
+        changes, as it invalidates any previously compiled value.
+        """
+
+        # retrieves the base service configuration and cleans the currently
+        # compiled virtual servers and redirections maps (invalidation)
+        service_configuration = self.http_service_configuration
+        colony.map_clean(self.http_service_virtual_servers_map)
+        colony.map_clean(self.http_service_redirections_tries_map)
+
+        # compiles the redirections of the base service configuration
+        # setting the trie under the invalid (base) virtual server name
+        self.http_service_redirections_tries_map[None] = self._compile_redirections(
+            service_configuration
+        )
+
+        # retrieves the virtual servers map and the resolution
+        # order to be used in the merging of them
+        virtual_servers = service_configuration.get("virtual_servers", {})
+        resolution_order = virtual_servers.get(
+            RESOLUTION_ORDER_VALUE, colony.legacy.iterkeys(virtual_servers)
+        )
+
+        # iterates over all the virtual servers to merge their configuration
+        # with the base one, note that only the first occurrence of an hostname
+        # in the resolution order is taken into account
+        for virtual_server_name in resolution_order:
+            if virtual_server_name in self.http_service_virtual_servers_map:
+                continue
+            if not virtual_server_name in virtual_servers:
+                continue
+            virtual_server_value = virtual_servers[virtual_server_name]
+            if not type(virtual_server_value) == dict:
+                continue
+
+            # merges the base service configuration with the virtual server
+            # one and compiles the redirections of the resulting map
+            virtual_server_configuration = self._merge_values(
+                service_configuration, virtual_server_value
+            )
+            self.http_service_redirections_tries_map[virtual_server_name] = (
+                self._compile_redirections(virtual_server_configuration)
+            )
+
+            # sets the merged configuration in the virtual servers
+            # map so that it may be used by the request handling
+            self.http_service_virtual_servers_map[virtual_server_name] = (
+                virtual_server_configuration
+            )
+
+    def _compile_redirections(self, service_configuration):
+        """
+        Compiles the redirections of the given service configuration
+        into a prefix trie, the configuration is not changed.
+
+        :type service_configuration: Dictionary
+        :param service_configuration: The service configuration map
+        to have its redirections compiled.
+        :rtype: PrefixTrie
+        :return: The prefix trie for the redirections resolution order.
+        """
+
+        # retrieves the redirections map and its resolution order, that
+        # defaults to the names of the redirections (excluding the values
+        # set by the configuration loading) and uses it to build the trie
+        redirections = service_configuration.get("redirections", {})
+        resolution_order = redirections.get(RESOLUTION_ORDER_VALUE, None)
+        if resolution_order == None:
+            resolution_order = [
+                name
+                for name in redirections
+                if not name in (RESOLUTION_ORDER_VALUE, RESOLUTION_ORDER_REGEX_VALUE)
+            ]
+        return PrefixTrie(resolution_order)
+
+    def _merge_values(self, target_value, source_value):
+        """
+        Merges two values into one, the type of the values
+        is taken into account and the merge only occurs when
+        the type is list or dictionary.
+
+        :type target_list: Object
+        :param target_list: The target value to be used.
+        :type source_list: Object
+        :param source_list: The source value to be used.
+        :rtype: Object
+        :return: The final resulting value.
+        """
+
+        # retrieves the types for both the target and
+        # the source values
+        target_value_type = type(target_value)
+        source_value_type = type(source_value)
+
+        # in case both types are the same (no conflict)
+        if target_value_type == source_value_type:
+            # in case the type is dictionary
+            if target_value_type == dict:
+                # merges both maps
+                return self._merge_maps(target_value, source_value)
+            # in case the type is list
+            elif target_value_type == list or target_value_type == tuple:
+                # merges both list
+                return self._merge_lists(target_value, source_value)
+            # in case it's a different type
+            else:
+                # returns the source value (no possible merge)
+                return source_value
+        else:
+            # returns the source value (no possible merge)
+            return source_value
+
+    def _merge_lists(self, target_list, source_list):
+        """
+        Merges two lists into one, the source list is made
+        prioritaire, and is taken into account first.
+
+        :type target_list: List
+        :param target_list: The target list to be used.
+        :type source_list: List
+        :param source_list: The source list to be used.
+        :rtype: List
+        :return: The final resulting list.
+        """
+
+        # creates the final list
+        final_list = []
+
+        # extends the list with both lists
+        final_list.extend(source_list)
+        final_list.extend(target_list)
+
+        # returns the final list
+        return final_list
+
+    def _merge_maps(self, target_map, source_map):
+        """
+        Merges two maps into one, the source map is made
+        prioritaire, and is taken into account first.
+
+        :type target_map: Dictionary
+        :param target_map: The target map to be used.
+        :type source_map: List
+        :param source_map: The source map to be used.
+        :rtype: List
+        :return: The final resulting map.
+        """
+
+        # copies the target map as the final map
+        final_map = copy.copy(target_map)
+
+        # iterates over all the source map values
+        for source_key, source_value in colony.legacy.items(source_map):
+            # in case the source key exists in the
+            # final map, merge is required
+            if source_key in final_map:
+                # retrieves the target value
+                target_value = final_map[source_key]
+
+                # merges both maps returning the final value
+                final_value = self._merge_values(target_value, source_value)
+
+                # sets the ginal value in the final map
+                final_map[source_key] = final_value
+            # otherwise no merge is required
+            else:
+                # sets the source value in the final map
+                final_map[source_key] = source_value
+
+        # returns the final map
+        return final_map
+
     def _get_encoding_handler(self, encoding):
         # in case no encoding is defined returns an invalid value
         # to the caller method (could not find anything)
@@ -525,6 +765,18 @@ class ServiceHTTP(colony.System):
         # returns the encoding handler
         return encoding_handler
 
+    def _get_encoding_stream(self, encoding):
+        # in case no encoding is defined returns an invalid value
+        # to the caller method (could not find anything)
+        if not encoding:
+            return None
+
+        # retrieves the HTTP service encoding handler plugin and
+        # returns the encode stream method in case it's available
+        # (the plugin supports the streaming of the encoding)
+        http_service_encoding_plugin = self.http_service_encoding_plugins_map[encoding]
+        return getattr(http_service_encoding_plugin, "encode_stream", None)
+
     def _generate_service_parameters(self, parameters):
         """
         Retrieves the service parameters map from the base parameters
@@ -590,6 +842,11 @@ class ServiceHTTP(colony.System):
         work_scheduling_algorithm = service_configuration.get(
             "default_work_scheduling_algorithm", WORK_SCHEDULING_ALGORITHM
         )
+        pipeline_threads = service_configuration.get("default_pipeline_threads", None)
+        workers = service_configuration.get("default_workers", 0)
+        idle_timeout = service_configuration.get("default_idle_timeout", None)
+        read_timeout = service_configuration.get("default_read_timeout", None)
+        reuse_port = service_configuration.get("default_reuse_port", False)
         http_log_file_path = service_configuration.get("log_file_path", None)
 
         # uses the global configuration to try to configure some of the
@@ -597,6 +854,8 @@ class ServiceHTTP(colony.System):
         bind_host = colony.conf("SERVER_HOST", BIND_HOST)
         port = colony.conf("SERVER_PORT", port, cast=int)
         ssl = colony.conf("SERVER_SSL", False, cast=bool)
+        workers = colony.conf("SERVER_WORKERS", workers, cast=int)
+        reuse_port = colony.conf("SERVER_REUSE_PORT", reuse_port, cast=bool)
 
         # creates the proper string definition of the connection type
         # and uses it to create the (full) end point definition tuple
@@ -624,8 +883,10 @@ class ServiceHTTP(colony.System):
         )
         self.http_log_file and self.http_log_file.open()
 
-        # retrieves the encoding handler for the given encoding
+        # retrieves the encoding handler and the (optional) encoding
+        # stream factory for the given encoding
         encoding_handler = self._get_encoding_handler(encoding)
+        encoding_stream = self._get_encoding_stream(encoding)
 
         # creates the pool configuration map
         pool_configuration = dict(
@@ -642,6 +903,7 @@ class ServiceHTTP(colony.System):
         extra_parameters = dict(
             encoding=encoding,
             encoding_handler=encoding_handler,
+            encoding_stream=encoding_stream,
             log_file=self.http_log_file,
         )
 
@@ -664,6 +926,11 @@ class ServiceHTTP(colony.System):
             connection_timeout=connection_timeout,
             request_timeout=request_timeout,
             response_timeout=response_timeout,
+            pipeline_threads=pipeline_threads,
+            workers=workers,
+            reuse_port=reuse_port,
+            idle_timeout=idle_timeout,
+            read_timeout=read_timeout,
         )
 
         # returns the parameters
@@ -708,9 +975,15 @@ class HTTPClientServiceHandler(object):
     encoding_handler = None
     """ The encoding handler """
 
+    encoding_stream = None
+    """ The factory of streaming encoders """
+
     content_type_charset = DEFAULT_CHARSET
     """ The content type charset """
 
+    maximum_message_size = MAXIMUM_MESSAGE_SIZE
+    """ The maximum size (in bytes) of the message of a request """
+
     log_file = None
     """ The log file """
 
@@ -750,10 +1023,18 @@ class HTTPClientServiceHandler(object):
 
         self.encoding = extra_parameters.get(ENCODING_VALUE, None)
         self.encoding_handler = extra_parameters.get(ENCODING_HANDLER_VALUE, None)
+        self.encoding_stream = extra_parameters.get(ENCODING_STREAM_VALUE, None)
         self.log_file = extra_parameters.get(LOG_FILE_VALUE, None)
         self.content_type_charset = self.service_configuration.get(
             DEFAULT_CONTENT_TYPE_CHARSET_VALUE, DEFAULT_CHARSET
         )
+        self.maximum_message_size = colony.conf(
+            "SERVER_MAXIMUM_SIZE",
+            self.service_configuration.get(
+                DEFAULT_MAXIMUM_MESSAGE_SIZE_VALUE, MAXIMUM_MESSAGE_SIZE
+            ),
+            cast=int,
+        )
 
     def handle_opened(self, service_connection):
         pass
@@ -789,6 +1070,35 @@ class HTTPClientServiceHandler(object):
         # handles the service connection with the request handler
         return request_handler(service_connection, request)
 
+    def is_dispatchable(self, service_connection, request):
+        """
+        Checks if the given request may be handled in parallel with
+        the other (pipelined) requests of the service connection.
+
+        Requests of connections with a "custom" request handler and
+        protocol upgrade requests must be handled in order.
+
+        :type service_connection: ServiceConnection
+        :param service_connection: The service connection to be used.
+        :type request: HTTPRequest
+        :param request: The request to be checked.
+        :rtype: bool
+        :return: If the request may be handled in parallel.
+        """
+
+        # in case the service connection contains a "custom" request
+        # handler (eg: websocket) the request is not dispatchable
+        if service_connection in self.service_connection_request_handler_map:
+            return False
+
+        # in case the request is an upgrade request the protocol of
+        # the connection may change and so it's not dispatchable
+        if UPGRADE_VALUE in request.headers_map:
+            return False
+
+        # returns valid (the request is dispatchable)
+        return True
+
     def default_request_handler(self, service_connection, request=None):
         # retrieves the HTTP service handler plugins map
         http_service_handler_plugins_map = (
@@ -808,6 +1118,10 @@ class HTTPClientServiceHandler(object):
             # returns false (connection closed)
             return False
 
+        # updates the service connection of the request, as the
+        # request may be handled through a (pipeline) proxy connection
+        request.service_connection = service_connection
+
         try:
             # prints debug message about request
             self.service_plugin.debug("Handling request: %s" % str(request))
@@ -1132,247 +1446,37 @@ class HTTPClientServiceHandler(object):
         :return: The request from the received message.
         """
 
-        # creates the string buffer for the message
-        message = service_connection.request_data.get("message", colony.StringBuffer())
-
-        # creates a request object
-        request = service_connection.request_data.get(
-            "request", HTTPRequest(self, service_connection, self.content_type_charset)
-        )
-
-        # retrieves the various values from the request data that are going
-        # to be used for the parsing of the HTTP response starting them  in
-        # case they are not already initialized, special note for the message
-        # offset index that represents the offset byte to the initialization
-        # of the message content
-        start_line_loaded = service_connection.request_data.get(
-            "start_line_loaded", False
-        )
-        header_loaded = service_connection.request_data.get("header_loaded", False)
-        message_loaded = service_connection.request_data.get("message_loaded", False)
-        message_offset_index = service_connection.request_data.get(
-            "message_offset_index", 0
-        )
-        message_size = service_connection.request_data.get("message_size", 0)
-        received_data_size = service_connection.request_data.get(
-            "received_data_size", 0
-        )
-        start_line_index = service_connection.request_data.get("start_line_index", 0)
-        end_header_index = service_connection.request_data.get("end_header_index", 0)
-
-        # sets the "initial" return request to invalid
-        return_request = None
-
-        # sets the "continue" process flag
-        process_flag = True
-
-        # retrieves the data length
-        data_length = len(data)
-
-        # increments the received data size (counter)
-        received_data_size += data_length
-
-        # writes the data to the string buffer
-        message.write(data)
-
-        # in case the header is not loaded or the message contents are completely loaded
-        if (
-            not header_loaded
-            or received_data_size >= message_offset_index + message_size
-        ):
-            # retrieves the message value from the string buffer
-            message_value = message.get_value()
-        # in case there's no need to inspect the message contents
-        else:
-            # unsets the process flag
-            process_flag = False
-
-        # in case the start line is not loaded
-        if process_flag and not start_line_loaded:
-            # finds the first new line value
-            start_line_index = message_value.find(b"\r\n")
-
-            # in case there is a new line value found
-            if not start_line_index == -1:
-                # retrieves the start line, ensures that it's represented as a
-                # string value (default encoding applies) and then splits it
-                # around the complete set of components (should be three)
-                start_line = message_value[:start_line_index]
-                start_line = colony.legacy.str(start_line)
-                start_line_splitted = start_line.split(" ", 2)
-
-                # retrieves the start line splitted length
-                start_line_splitted_length = len(start_line_splitted)
-
-                # in case the length of the splitted line is not valid
-                if not start_line_splitted_length == 3:
-                    # raises the HTTP invalid data exception
-                    raise exceptions.HTTPInvalidDataException(
-                        "invalid data received: " + start_line
-                    )
-
-                # retrieve the operation type the path and the protocol version
-                # from the start line splitted and then sets these various values
-                # into the current request object
-                operation_type, path, protocol_version = start_line_splitted
-                request.set_operation_type(operation_type)
-                request.set_path(path)
-                request.set_protocol_version(protocol_version)
-
-                # sets the start line loaded flag
-                start_line_loaded = True
-
-        # in case the header is not loaded
-        if process_flag and not header_loaded:
-            # retrieves the end header index (two new lines)
-            end_header_index = message_value.find(b"\r\n\r\n")
-
-            # in case the end header index is found
-            if not end_header_index == -1:
-                # sets the message offset index as the end header index
-                # plus the two sequences of newlines (four characters)
-                message_offset_index = end_header_index + 4
-
-                # sets the header loaded flag
-                header_loaded = True
-
-                # retrieves the start header index
-                start_header_index = start_line_index + 2
-
-                # retrieves the headers part of the message
-                headers = message_value[start_header_index:end_header_index]
-
-                # splits the headers by line
-                headers_splitted = headers.split(b"\r\n")
-
-                # iterates over the headers lines
-                for header_splitted in headers_splitted:
-                    # finds the header separator
-                    division_index = header_splitted.find(b":")
-
-                    # retrieves the header name and the value for it and then
-                    # converts both of the values to plain based unicode values
-                    header_name = header_splitted[:division_index].strip()
-                    header_value = header_splitted[division_index + 1 :].strip()
-                    header_name = colony.legacy.str(header_name)
-                    header_value = colony.legacy.str(header_value)
-
-                    # sets the header in the headers map so that it may be used
-                    # latter for further reference operations (as required)
-                    request.headers_map[header_name] = header_value
-                    request.headers_in[header_name] = header_value
-
-                # parses the get attributes, this will load
-                # the attributes associated with the URL
-                request.__parse_get_attributes__()
-
-                # in case the content length is defined in the headers map
-                if CONTENT_LENGTH_VALUE in request.headers_map:
-                    # retrieves the message size
-                    message_size = int(request.headers_map[CONTENT_LENGTH_VALUE])
-                elif CONTENT_LENGTH_LOWER_VALUE in request.headers_map:
-                    # retrieves the message size
-                    message_size = int(request.headers_map[CONTENT_LENGTH_LOWER_VALUE])
-                elif UPGRADE_VALUE in request.headers_map:
-                    # retrieves the upgrade (type) value
-                    upgrade = request.headers_map[UPGRADE_VALUE]
-
-                    # in case the upgrade (type) exists in the
-                    # upgrade message size map
-                    if upgrade in UPGRADE_MESSAGE_SIZE_MAP:
-                        # retrieves the message size for the upgrade (type)
-                        message_size = UPGRADE_MESSAGE_SIZE_MAP[upgrade]
-                    # otherwise
-                    else:
-                        # sets the message size to zero (not set)
-                        message_size = 0
-
-                        # sets the return request as the request (valid), then
-                        # unsets the process flag and sets the message as loaded
-                        return_request = request
-                        process_flag = False
-                        message_loaded = True
-
-                # in case there is no content length defined in the headers map
-                else:
-                    # sets the message size to zero (not set)
-                    message_size = 0
-
-                    # sets the return request as the request (valid), then
-                    # unsets the process flag and sets the message as loaded
-                    return_request = request
-                    process_flag = False
-                    message_loaded = True
-
-        # in case the header is not loaded
-        if process_flag and not message_loaded and header_loaded:
-            # retrieves the start message size
-            start_message_index = end_header_index + 4
-
-            # retrieves the message value length
-            message_value_length = len(message_value)
-
-            # calculates the message value message length
-            message_value_message_length = message_value_length - start_message_index
-
-            # in case the length of the message value message is the same
-            # as the message size
-            if message_value_message_length == message_size:
-                # retrieves the message part of the message value
-                message_value_message = message_value[start_message_index:]
-
-                # sets the message loaded flag
-                message_loaded = True
-
-                # sets the received message
-                request.received_message = message_value_message
-
-                # decodes the request if necessary
-                self.decode_request(request)
-
-                # sets the return request as the request (valid), then
-                # unsets the process flag and sets the message as loaded
-                return_request = request
-                process_flag = False
-                message_loaded = True
-
-        # in case the message is not yet loaded (not enough data)
-        if not message_loaded:
-            # saves the various state values representing the current
-            # request parsing state
-            service_connection.request_data["message"] = message
-            service_connection.request_data["request"] = request
-            service_connection.request_data["start_line_loaded"] = start_line_loaded
-            service_connection.request_data["header_loaded"] = header_loaded
-            service_connection.request_data["message_loaded"] = message_loaded
-            service_connection.request_data["message_offset_index"] = (
-                message_offset_index
-            )
-            service_connection.request_data["message_size"] = message_size
-            service_connection.request_data["received_data_size"] = received_data_size
-            service_connection.request_data["start_line_index"] = start_line_index
-            service_connection.request_data["end_header_index"] = end_header_index
-
-            # returns the empty (request)
-            return return_request
+        # retrieves the parser currently associated with the service
+        # connection, in case there's none (new request) a new request
+        # is created together with the parser that will fill it
+        parser = service_connection.request_data.get("parser", None)
+        if not parser:
+            request = HTTPRequest(self, service_connection, self.content_type_charset)
+            parser = HTTPRequestParser(request, maximum_size=self.maximum_message_size)
+            service_connection.request_data["parser"] = parser
+
+        # feeds the newly received data to the parser, this operation
+        # only touches the new bytes (incremental) and returns the request
+        # only in case it has been completely parsed
+        request = parser.parse(data)
+
+        # in case the request is not yet complete (not enough data)
+        # returns immediately, keeping the parser in the request data
+        if not request:
+            return None
 
         # "resets" the request data map
         service_connection.request_data = {}
 
-        # calculates the complete message size
-        complete_message_size = message_size + message_offset_index
-
-        # in case the received data size is larger than
-        # the complete message size
-        if received_data_size > complete_message_size:
-            # retrieves the pending data
-            pending_data = message_value[complete_message_size:]
-
-            # adds the pending data to the service connection
+        # in case the parser received more data than the one required
+        # for the request (pipelining) adds it as pending data so that
+        # it's used for the next request parsing
+        pending_data = parser.get_pending_data()
+        if pending_data:
             service_connection.add_pending_data(pending_data)
 
-        # returns the return request request
-        return return_request
+        # returns the (complete) request
+        return request
 
     def decode_request(self, request):
         """
@@ -1502,14 +1606,22 @@ class HTTPClientServiceHandler(object):
 
     def send_request(self, service_connection, request):
         # in case the encoding is defined for the current request
-        # meaning that the default one is not going to be used
-        if self.encoding:
+        # meaning that the default one is not going to be used, note
+        # that contents already encoded by the handler (eg: precompressed
+        # files) are not encoded again
+        is_encoded = CONTENT_ENCODING_VALUE in request.response_headers_map
+        if self.encoding and not is_encoded:
             # sets the encoded flag, handler and the name of
             # the encoding that has been chosen for the message
             request.encoded = True
             request.set_encoding_handler(self.encoding_handler)
+            request.set_encoding_stream(self.encoding_stream)
             request.set_encoding_name(self.encoding)
 
+            # converts the (mediated or chunked) request so that its
+            # contents are encoded chunk by chunk (bounded memory)
+            request.stream_encoding()
+
         # in case the request is mediated
         if request.is_mediated():
             self.send_request_mediated(service_connection, request)
@@ -1600,6 +1712,16 @@ class HTTPClientServiceHandler(object):
         # retrieves the result value
         result_value = request.get_result()
 
+        # tries to retrieve the file region to be sent directly from the
+        # kernel, in case it's available the sendfile path is used instead
+        # of the chunk based one (mediated writer)
+        file_region = self._get_file_region(service_connection, request)
+        if file_region:
+            self.send_request_sendfile_async(
+                service_connection, request, result_value, file_region
+            )
+            return
+
         try:
             # sends the result value to the client and sets the request
             # mediated writer as the callback handler
@@ -1635,6 +1757,14 @@ class HTTPClientServiceHandler(object):
             # raises the HTTP data sending exception
             raise exceptions.HTTPDataSendingException("problem sending data")
 
+        # tries to retrieve the file region to be sent directly from the
+        # kernel, in case it's available the sendfile path is used instead
+        # of the chunk based one
+        file_region = self._get_file_region(service_connection, request)
+        if file_region:
+            self.send_request_sendfile_sync(service_connection, request, file_region)
+            return
+
         # continuous loop
         while True:
             try:
@@ -1670,6 +1800,69 @@ class HTTPClientServiceHandler(object):
                 request.mediated_handler.close()
                 raise
 
+    def send_request_sendfile_async(
+        self, service_connection, request, result_value, file_region
+    ):
+        def request_sendfile_writer(send_error=False):
+            # prints a debug message about the end of the sendfile
+            # operation in case it was successful
+            if not send_error:
+                self.service_plugin.debug(
+                    "Completed transfer of request mediated (sendfile)"
+                )
+
+            # closes the mediated handler (no more data is
+            # going to be sent from it)
+            request.mediated_handler.close()
+
+        # unpacks the file region into the file and the
+        # offset and count of bytes to be sent from it
+        file, offset, count = file_region
+
+        try:
+            # sends the result value to the client followed by the file
+            # region that is sent directly from the file descriptor, the
+            # sendfile writer is set as the callback handler
+            service_connection.send(result_value)
+            service_connection.send_file(
+                file, offset, count, callback=request_sendfile_writer
+            )
+        except self.service_utils_exception_class as exception:
+            # error in the client side
+            self.service_plugin.error(
+                "Problem sending request mediated: " + colony.legacy.UNICODE(exception)
+            )
+
+            # closes the mediated handler
+            request.mediated_handler.close()
+
+            # raises the HTTP data sending exception
+            raise exceptions.HTTPDataSendingException("problem sending data")
+
+    def send_request_sendfile_sync(self, service_connection, request, file_region):
+        # unpacks the file region into the file and the
+        # offset and count of bytes to be sent from it
+        file, offset, count = file_region
+
+        try:
+            # sends the file region directly from the file descriptor
+            # to the connection socket (no user space copy)
+            service_connection.send_file(file, offset, count)
+        except self.service_utils_exception_class as exception:
+            # prints the error message about the error in the client
+            # side and then raises the HTTP data sending exception
+            self.service_plugin.error(
+                "Problem sending request mediated: " + colony.legacy.UNICODE(exception)
+            )
+            raise exceptions.HTTPDataSendingException("problem sending data")
+        finally:
+            # closes the mediated handler (no more
+            # data is going to be sent from it)
+            request.mediated_handler.close()
+
+        # prints a debug message about the end of the transfer
+        self.service_plugin.debug("Completed transfer of request mediated (sendfile)")
+
     def send_request_chunked(self, service_connection, request):
         # checks if the service connection is of type asynchronous
         service_connection_is_async = service_connection.is_async()
@@ -1804,7 +1997,7 @@ class HTTPClientServiceHandler(object):
 
                     try:
                         # sends the final empty chunk
-                        service_connection.send("0\r\n\r\n")
+                        service_connection.send(b"0\r\n\r\n")
                     except self.service_utils_exception_class as exception:
                         # error in the client side
                         self.service_plugin.error(
@@ -1825,13 +2018,13 @@ class HTTPClientServiceHandler(object):
                     length_chunk_value = len(chunk_value)
 
                     # sets the value for the hexadecimal length part of the chunk
-                    length_chunk_value_hexadecimal_string = (
+                    length_chunk_value_hexadecimal_string = colony.legacy.bytes(
                         "%X\r\n" % length_chunk_value
                     )
 
                     # sets the message value
                     message_value = (
-                        length_chunk_value_hexadecimal_string + chunk_value + "\r\n"
+                        length_chunk_value_hexadecimal_string + chunk_value + b"\r\n"
                     )
 
                     # sends the message value to the client
@@ -1845,7 +2038,7 @@ class HTTPClientServiceHandler(object):
 
                     # raises the HTTP data sending exception
                     raise exceptions.HTTPDataSendingException("problem sending data")
-            finally:
+            except:
                 # closes the chunk handler
                 request.chunk_handler.close()
 
@@ -2009,6 +2202,44 @@ class HTTPClientServiceHandler(object):
 
         del self.service_connection_request_handler_map[service_connection]
 
+    def _get_file_region(self, service_connection, request):
+        """
+        Retrieves the file region (file, offset and count) that may
+        be sent directly from the kernel for the given mediated request.
+
+        The region is only available for plain connections in systems
+        that support sendfile, for mediated handlers that expose such
+        region and for requests that are not encoded.
+
+        :type service_connection: ServiceConnection
+        :param service_connection: The service connection that is
+        going to be used to send the request.
+        :type request: HTTPRequest
+        :param request: The (mediated) request to be sent.
+        :rtype: Tuple
+        :return: The file region tuple or an invalid value in case
+        the sendfile path should not be used.
+        """
+
+        # in case the request is encoded the encoded contents must be
+        # sent (no direct file access), returns invalid
+        if request.encoded:
+            return None
+
+        # in case either the mediated handler does not expose the file
+        # region or the connection is not able to use sendfile (eg: secure
+        # connections), returns invalid (fallback to chunk sending)
+        if not hasattr(request.mediated_handler, "get_file_region"):
+            return None
+        if not hasattr(service_connection, "supports_sendfile"):
+            return None
+        if not service_connection.supports_sendfile():
+            return None
+
+        # returns the file region from the mediated handler, this
+        # value may still be invalid (handler decision)
+        return request.mediated_handler.get_file_region()
+
     def _process_redirection(self, request, service_configuration):
         """
         Processes the redirection stage of the HTTP request, this
@@ -2029,13 +2260,20 @@ class HTTPClientServiceHandler(object):
             "redirections", {}
         )
 
-        # retrieves the service configuration redirections order
-        service_configuration_redirections_order = (
-            service_configuration_redirections.get(
-                RESOLUTION_ORDER_VALUE,
-                colony.legacy.iterkeys(service_configuration_redirections),
-            )
+        # retrieves the prefix trie for the redirections of the virtual
+        # server of the request (compiled with the configuration) in case
+        # it's not available (not compiled) creates a new one from the
+        # resolution order of the redirections
+        redirections_tries_map = (
+            self.service_plugin.system.http_service_redirections_tries_map
         )
+        service_configuration_redirections_trie = redirections_tries_map.get(
+            request.virtual_server_name, None
+        )
+        if not service_configuration_redirections_trie:
+            service_configuration_redirections_trie = (
+                self.service_plugin.system._compile_redirections(service_configuration)
+            )
 
         # (saves) the old/original path as the base path, this is going
         # to be used in case no rule is matched at this stage
@@ -2049,65 +2287,62 @@ class HTTPClientServiceHandler(object):
         # of the redirection (possibly recursive) cycle
         current_path = request.original_path
 
-        # iterates over the service configuration redirection names
-        for (
-            service_configuration_redirection_name
-        ) in service_configuration_redirections_order:
-            # in case the path is not found in the request path, skips
-            # the current iteration, as there's nothing to be done
-            if not current_path.find(service_configuration_redirection_name) == 0:
-                continue
+        # retrieves the name of the redirection to be applied, the first one
+        # in the resolution order that is a prefix of the current path
+        service_configuration_redirection_name = (
+            service_configuration_redirections_trie.match(current_path)
+        )
 
-            # sets the handler base path as the service configuration
-            # redirection name and then retrieve the proper service
-            # configuration redirection specification
-            request.handler_base_path = service_configuration_redirection_name
-            service_configuration_redirection = service_configuration_redirections[
-                service_configuration_redirection_name
-            ]
+        # in case no redirection matches the current path there's
+        # nothing to be done, returns immediately
+        if service_configuration_redirection_name == None:
+            return
 
-            # retrieves the target path and the recursive redirection
-            # flag value for context resolution
-            target_path = service_configuration_redirection.get(
-                "target", service_configuration_redirection_name
-            )
-            recursive_redirection = service_configuration_redirection.get(
-                "recursive_redirection", False
-            )
+        # sets the handler base path as the service configuration
+        # redirection name and then retrieve the proper service
+        # configuration redirection specification
+        request.handler_base_path = service_configuration_redirection_name
+        service_configuration_redirection = service_configuration_redirections[
+            service_configuration_redirection_name
+        ]
 
-            # retrieves the sub request path as the request from the redirection name path
-            # in front, so that only the remainder after the prefix is retrieved
-            sub_request_path = current_path[
-                len(service_configuration_redirection_name) :
-            ]
+        # retrieves the target path and the recursive redirection
+        # flag value for context resolution
+        target_path = service_configuration_redirection.get(
+            "target", service_configuration_redirection_name
+        )
+        recursive_redirection = service_configuration_redirection.get(
+            "recursive_redirection", False
+        )
 
-            # in case the recursive redirection is disabled and there is a sub-directory
-            # in the sub request path
-            if not recursive_redirection and not sub_request_path.find("/") == -1:
-                # breaks the loop because the request is not meant to be recursively redirected
-                # and it contains a sub-directory
-                break
+        # retrieves the sub request path as the request from the redirection name path
+        # in front, so that only the remainder after the prefix is retrieved
+        sub_request_path = current_path[len(service_configuration_redirection_name) :]
 
-            # retrieves the new (redirected) path in the request by stripping
-            # both parts of the path to avoid problems with duplicated slashes
-            current_path = target_path.rstrip("/") + "/" + sub_request_path.lstrip("/")
+        # in case the recursive redirection is disabled and there is a sub-directory
+        # in the sub request path
+        if not recursive_redirection and not sub_request_path.find("/") == -1:
+            # returns immediately because the request is not meant to be recursively
+            # redirected and it contains a sub-directory
+            return
 
-            # sets the new path in the request, avoids the overriding
-            # of the original path by unsetting the flag
-            request.set_path(current_path, set_original_path=False)
+        # retrieves the new (redirected) path in the request by stripping
+        # both parts of the path to avoid problems with duplicated slashes
+        current_path = target_path.rstrip("/") + "/" + sub_request_path.lstrip("/")
 
-            # sets the redirect configuration in the request as the current
-            # service configuration (still pending redirect confirmation, it
-            # will be confirmed in the process redirection)
-            request.redirect_configuration = service_configuration_redirection
+        # sets the new path in the request, avoids the overriding
+        # of the original path by unsetting the flag
+        request.set_path(current_path, set_original_path=False)
 
-            # sets the redirection validation flag and the the
-            # redirected flag in the request
-            request.redirection_validation = True
-            request.redirected = True
+        # sets the redirect configuration in the request as the current
+        # service configuration (still pending redirect confirmation, it
+        # will be confirmed in the process redirection)
+        request.redirect_configuration = service_configuration_redirection
 
-            # breaks the loop
-            break
+        # sets the redirection validation flag and the the
+        # redirected flag in the request
+        request.redirection_validation = True
+        request.redirected = True
 
     def _process_domain(self, request, service_connection, service_configuration):
         """
@@ -2545,7 +2780,7 @@ class HTTPClientServiceHandler(object):
         """
         Retrieves the service configuration for the given request.
         This retrieval takes into account the request target and characteristics
-        to merge the virtual servers configurations.
+        to select the (pre-merged) virtual server configuration.
 
         :type request: HTTPRequest
         :param request: The request to be used in the resolution
@@ -2557,164 +2792,45 @@ class HTTPClientServiceHandler(object):
         # retrieves the base service configuration
         service_configuration = self.service_configuration
 
-        # retrieves the host value from the request headers
-        host = request.headers_map.get(HOST_VALUE, None)
-
-        # in case the host is defined
-        if host:
-            # retrieves the virtual servers map
-            service_configuration_virtual_servers = service_configuration.get(
-                "virtual_servers", {}
-            )
-
-            # retrieves the service configuration virtual servers resolution order
-            service_configuration_virtual_servers_resolution_order = (
-                service_configuration_virtual_servers.get(
-                    RESOLUTION_ORDER_VALUE,
-                    colony.legacy.iterkeys(service_configuration_virtual_servers),
-                )
-            )
+        # unsets the virtual server of the request, as by default
+        # the base configuration is the one to be used
+        request.virtual_server_name = None
 
-            # splits the host value (to try
-            # to retrieve hostname and port)
-            host_splitted = host.split(":")
-
-            # retrieves the host splitted length
-            host_splitted_length = len(host_splitted)
-
-            # in case the host splitted length is two,
-            # retrieves the hostname and the port
-            if host_splitted_length == 2:
-                hostname, _port = host_splitted
-            # otherwise sets the hostname as the host
-            # (for size one)
-            else:
-                hostname = host
-
-            # in case the hostname exists in the service configuration virtual servers map
-            if hostname in service_configuration_virtual_servers:
-                # iterates over the service configuration virtual server names
-                for (
-                    service_configuration_virtual_server_name
-                ) in service_configuration_virtual_servers_resolution_order:
-                    # in case this is the hostname
-                    if hostname == service_configuration_virtual_server_name:
-                        # retrieves the service configuration virtual server value
-                        service_configuration_virtual_server_value = (
-                            service_configuration_virtual_servers[
-                                service_configuration_virtual_server_name
-                            ]
-                        )
-
-                        # merges the service configuration map with the service configuration virtual server value,
-                        # to retrieve the final service configuration for this request
-                        service_configuration = self._merge_values(
-                            service_configuration,
-                            service_configuration_virtual_server_value,
-                        )
-
-                        # breaks the loop
-                        break
-
-        # returns the service configuration
-        return service_configuration
-
-    def _merge_values(self, target_value, source_value):
-        """
-        Merges two values into one, the type of the values
-        is taken into account and the merge only occurs when
-        the type is list or dictionary.
+        # retrieves the host value from the request headers, in
+        # case it's not defined the base configuration is used
+        host = request.headers_map.get(HOST_VALUE, None)
+        if not host:
+            return service_configuration
 
-        :type target_list: Object
-        :param target_list: The target value to be used.
-        :type source_list: Object
-        :param source_list: The source value to be used.
-        :rtype: Object
-        :return: The final resulting value.
-        """
+        # splits the host value (to try
+        # to retrieve hostname and port)
+        host_splitted = host.split(":")
 
-        # retrieves the types for both the target and
-        # the source values
-        target_value_type = type(target_value)
-        source_value_type = type(source_value)
+        # retrieves the host splitted length
+        host_splitted_length = len(host_splitted)
 
-        # in case both types are the same (no conflict)
-        if target_value_type == source_value_type:
-            # in case the type is dictionary
-            if target_value_type == dict:
-                # merges both maps
-                return self._merge_maps(target_value, source_value)
-            # in case the type is list
-            elif target_value_type == list or target_value_type == tuple:
-                # merges both list
-                return self._merge_lists(target_value, source_value)
-            # in case it's a different type
-            else:
-                # returns the source value (no possible merge)
-                return source_value
+        # in case the host splitted length is two,
+        # retrieves the hostname and the port
+        if host_splitted_length == 2:
+            hostname, _port = host_splitted
+        # otherwise sets the hostname as the host
+        # (for size one)
         else:
-            # returns the source value (no possible merge)
-            return source_value
-
-    def _merge_lists(self, target_list, source_list):
-        """
-        Merges two lists into one, the source list is made
-        prioritaire, and is taken into account first.
-
-        :type target_list: List
-        :param target_list: The target list to be used.
-        :type source_list: List
-        :param source_list: The source list to be used.
-        :rtype: List
-        :return: The final resulting list.
-        """
-
-        # creates the final list
-        final_list = []
-
-        # extends the list with both lists
-        final_list.extend(source_list)
-        final_list.extend(target_list)
-
-        # returns the final list
-        return final_list
-
-    def _merge_maps(self, target_map, source_map):
-        """
-        Merges two maps into one, the source map is made
-        prioritaire, and is taken into account first.
-
-        :type target_map: Dictionary
-        :param target_map: The target map to be used.
-        :type source_map: List
-        :param source_map: The source map to be used.
-        :rtype: List
-        :return: The final resulting map.
-        """
-
-        # copies the target map as the final map
-        final_map = copy.copy(target_map)
-
-        # iterates over all the source map values
-        for source_key, source_value in colony.legacy.items(source_map):
-            # in case the source key exists in the
-            # final map, merge is required
-            if source_key in final_map:
-                # retrieves the target value
-                target_value = final_map[source_key]
+            hostname = host
 
-                # merges both maps returning the final value
-                final_value = self._merge_values(target_value, source_value)
-
-                # sets the ginal value in the final map
-                final_map[source_key] = final_value
-            # otherwise no merge is required
-            else:
-                # sets the source value in the final map
-                final_map[source_key] = source_value
+        # retrieves the map of compiled virtual servers configuration
+        # (pre-merged) and tries to retrieve the configuration for the
+        # hostname, defaulting to the base configuration
+        virtual_servers_map = (
+            self.service_plugin.system.http_service_virtual_servers_map
+        )
+        if not hostname in virtual_servers_map:
+            return service_configuration
 
-        # returns the final map
-        return final_map
+        # sets the virtual server in the request, used to retrieve the
+        # compiled values (eg: redirections trie) of the virtual server
+        request.virtual_server_name = hostname
+        return virtual_servers_map[hostname]
 
 
 class HTTPRequest(object):
@@ -2753,6 +2869,10 @@ class HTTPRequest(object):
     handler_base_path = "none"
     """ The handler base path (before redirection) """
 
+    virtual_server_name = None
+    """ The name of the virtual server whose configuration
+    is used for the request (none for the base one) """
+
     filename = "none"
     """ The filename """
 
@@ -2837,6 +2957,10 @@ class HTTPRequest(object):
     encoding_type = "none"
     """ The encoding type """
 
+    encoding_stream = None
+    """ The factory of streaming encoders to be used for the
+    chunk by chunk encoding of mediated and chunked contents """
+
     chunk_handler = None
     """ The chunk handler """
 
@@ -3190,6 +3314,41 @@ class HTTPRequest(object):
         self.chunked_encoding = True
         self.chunk_handler = GeneratorHandler(generator)
 
+    def stream_encoding(self):
+        """
+        Converts the current request (in case it's mediated or chunked)
+        so that its contents are encoded chunk by chunk using a streaming
+        encoder, avoiding the loading of the complete contents in memory.
+
+        As the size of the encoded contents is not known in advance
+        mediated requests are converted into chunked ones, which is
+        only possible for HTTP/1.1 clients.
+        """
+
+        # in case the request is not encoded or there's no streaming
+        # encoder for the encoding there's nothing to be done
+        if not self.encoded or not self.encoding_stream:
+            return
+
+        # retrieves the handler that is going to be wrapped by the
+        # encoder handler, the mediated handler is only converted
+        # for clients that support the chunked transfer encoding
+        if self.mediated:
+            if not self.protocol_version == HTTP_1_1_VERSION:
+                return
+            handler = self.mediated_handler
+            self.mediated = False
+            self.mediated_handler = None
+        elif self.chunked_encoding:
+            handler = self.chunk_handler
+        else:
+            return
+
+        # sets the request as chunked and wraps the handler with
+        # a new encoder handler using a new streaming encoder
+        self.chunked_encoding = True
+        self.chunk_handler = EncoderHandler(handler, self.encoding_stream())
+
     def flush(self):
         pass
 
@@ -3537,6 +3696,12 @@ class HTTPRequest(object):
     def get_encoding_handler(self):
         return self.encoding_handler
 
+    def set_encoding_stream(self, encoding_stream):
+        self.encoding_stream = encoding_stream
+
+    def get_encoding_stream(self):
+        return self.encoding_stream
+
     def set_encoding_name(self, encoding_name):
         self.encoding_name = encoding_name
 
@@ -3984,3 +4149,407 @@ class GeneratorHandler(object):
 
     def close(self):
         self.generator.close()
+
+
+class EncoderHandler(object):
+    """
+    The chunk handler class that wraps another (mediated or
+    chunked) handler encoding its chunks using a streaming
+    encoder, so that memory usage is bounded by the chunk size.
+    """
+
+    handler = None
+    """ The handler that is being wrapped, from which the
+    (non encoded) chunks are going to be retrieved """
+
+    encoder = None
+    """ The streaming encoder that is going to be used for
+    the encoding of the chunks of the wrapped handler """
+
+    _flushed = False
+    """ The flag that controls if the encoder has already
+    been flushed (no more chunks available) """
+
+    def __init__(self, handler, encoder):
+        self.handler = handler
+        self.encoder = encoder
+
+    def encode_file(self, encoding_handler, encoding_name):
+        pass
+
+    def get_size(self):
+        return None
+
+    def get_chunk(self, chunk_size=CHUNK_SIZE):
+        # iterates until a non empty encoded chunk is available, as
+        # the encoder may buffer data an empty value would otherwise
+        # be interpreted as the end of the contents
+        while not self._flushed:
+            chunk = self.handler.get_chunk(chunk_size)
+            if chunk:
+                chunk = self.encoder.compress(colony.legacy.bytes(chunk))
+            else:
+                chunk = self.encoder.flush()
+                self._flushed = True
+            if chunk:
+                return chunk
+        return None
+
+    def close(self):
+        self.handler.close()
+
+
+class HTTPRequestParser(object):
+    """
+    The incremental HTTP request parser class, responsible for
+    the parsing of a request from a series of data chunks.
+
+    The parser keeps the scan offset across chunks so that each
+    received byte is inspected only once, and stores the message
+    (body) in a buffer that grows (geometrically) up to the size
+    declared by the content length as the data is received.
+    """
+
+    request = None
+    """ The request that is going to be populated with
+    the values resulting from the parsing """
+
+    state = START_LINE_STATE
+    """ The current state of the parser, should be one of
+    the state constants defined at the module level """
+
+    buffer = None
+    """ The buffer that holds the start line and the header
+    bytes while they are not completely parsed """
+
+    line_offset = 0
+    """ The offset in the buffer of the first byte of the
+    line that is currently being parsed """
+
+    scan_offset = 0
+    """ The offset in the buffer from which the search for
+    the next line separator should be resumed """
+
+    message = None
+    """ The buffer that is going to hold the message (body)
+    of the request, grown as the data is received """
+
+    message_size = 0
+    """ The expected size (in bytes) of the message """
+
+    maximum_size = MAXIMUM_MESSAGE_SIZE
+    """ The maximum size (in bytes) allowed for the message,
+    larger content lengths are refused as invalid data """
+
+    message_offset = 0
+    """ The number of message bytes already received """
+
+    pending_data = None
+    """ The data received after the end of the request, that
+    should be used for the parsing of the next request """
+
+    def __init__(self, request, maximum_size=MAXIMUM_MESSAGE_SIZE):
+        self.request = request
+        self.maximum_size = maximum_size
+
+        self.buffer = bytearray()
+
+    def parse(self, data):
+        """
+        Parses the provided chunk of data, updating the internal
+        state of the parser accordingly.
+
+        :type data: String
+        :param data: The chunk of data to be parsed.
+        :rtype: HTTPRequest
+        :return: The request in case it has been completely parsed
+        or an invalid value otherwise.
+        """
+
+        # in case the parser is still waiting for the start line
+        # or the headers, adds the data to the buffer and parses
+        # the newly available lines
+        if self.state in (START_LINE_STATE, HEADERS_STATE):
+            self.buffer.extend(data)
+            self._parse_lines()
+
+            # in case the parser is still in the lines part of the
+            # request not enough data is available, returns immediately
+            if self.state in (START_LINE_STATE, HEADERS_STATE):
+                return None
+
+            # retrieves the remaining data from the buffer (after the
+            # headers) and releases the buffer as it's no longer needed
+            data = bytes(self.buffer[self.line_offset :])
+            self.buffer = None
+
+            # in case the request has already been finished (no message)
+            # the remaining data is considered pending
+            if self.state == FINISHED_STATE:
+                self.pending_data = data
+
+        # in case the parser is waiting for message data and there's
+        # data available, copies it into the message buffer
+        if self.state == MESSAGE_STATE and data:
+            self._parse_message(data)
+
+        # returns the request only in case the parsing of it
+        # has been finished (otherwise returns invalid)
+        return self.request if self.state == FINISHED_STATE else None
+
+    def get_pending_data(self):
+        return self.pending_data
+
+    def _parse_lines(self):
+        # iterates while the parser is still processing lines
+        # (start line and headers)
+        while self.state in (START_LINE_STATE, HEADERS_STATE):
+            # tries to find the next line separator starting from the
+            # scan offset (previously scanned bytes are not touched)
+            end_index = self.buffer.find(b"\r\n", self.scan_offset)
+
+            # in case no separator was found the scan offset is updated
+            # so that the next search starts at the last byte (which may
+            # be the first byte of a separator)
+            if end_index == -1:
+                self.scan_offset = max(len(self.buffer) - 1, self.line_offset)
+                return
+
+            # retrieves the line from the buffer and updates both the
+            # line and the scan offsets to the byte after the separator
+            line = bytes(self.buffer[self.line_offset : end_index])
+            self.line_offset = end_index + 2
+            self.scan_offset = self.line_offset
+
+            # processes the line according to the current state, note
+            # that an empty line marks the end of the headers
+            if self.state == START_LINE_STATE:
+                self._parse_start_line(line)
+            elif line:
+                self._parse_header(line)
+            else:
+                self._parse_end_headers()
+
+    def _parse_start_line(self, line):
+        # ensures that the start line is represented as a string value
+        # (default encoding applies) and then splits it around the complete
+        # set of components (should be three)
+        start_line = colony.legacy.str(line)
+        start_line_splitted = start_line.split(" ", 2)
+
+        # in case the length of the splitted line is not valid
+        # raises the HTTP invalid data exception
+        if not len(start_line_splitted) == 3:
+            raise exceptions.HTTPInvalidDataException(
+                "invalid data received: " + start_line
+            )
+
+        # retrieve the operation type the path and the protocol version
+        # from the start line splitted and then sets these various values
+        # into the current request object
+        operation_type, path, protocol_version = start_line_splitted
+        self.request.set_operation_type(operation_type)
+        self.request.set_path(path)
+        self.request.set_protocol_version(protocol_version)
+
+        # updates the state so that the header lines
+        # are parsed from now on
+        self.state = HEADERS_STATE
+
+    def _parse_header(self, line):
+        # finds the header separator
+        division_index = line.find(b":")
+
+        # retrieves the header name and the value for it and then
+        # converts both of the values to plain based unicode values
+        header_name = line[:division_index].strip()
+        header_value = line[division_index + 1 :].strip()
+        header_name = colony.legacy.str(header_name)
+        header_value = colony.legacy.str(header_value)
+
+        # sets the header in the headers map so that it may be used
+        # latter for further reference operations (as required)
+        self.request.headers_map[header_name] = header_value
+        self.request.headers_in[header_name] = header_value
+
+    def _parse_end_headers(self):
+        # retrieves the request and its headers map
+        # to be used in the message size resolution
+        request = self.request
+        headers_map = request.headers_map
+
+        # parses the get attributes, this will load
+        # the attributes associated with the URL
+        request.__parse_get_attributes__()
+
+        # resolves the size of the message from the content length
+        # header or from the upgrade (type) message size
+        if CONTENT_LENGTH_VALUE in headers_map:
+            message_size = self._parse_content_length(headers_map[CONTENT_LENGTH_VALUE])
+        elif CONTENT_LENGTH_LOWER_VALUE in headers_map:
+            message_size = self._parse_content_length(
+                headers_map[CONTENT_LENGTH_LOWER_VALUE]
+            )
+        elif headers_map.get(UPGRADE_VALUE, None) in UPGRADE_MESSAGE_SIZE_MAP:
+            message_size = UPGRADE_MESSAGE_SIZE_MAP[headers_map[UPGRADE_VALUE]]
+        else:
+            message_size = None
+
+        # in case there's no message size defined the request
+        # does not contain a message and is finished
+        if message_size == None:
+            self.state = FINISHED_STATE
+            return
+
+        # allocates the initial message buffer, limited to a chunk so
+        # that the declared size is only allocated as data is received
+        self.message = bytearray(min(message_size, CHUNK_SIZE))
+        self.message_size = message_size
+        self.state = MESSAGE_STATE
+
+        # in case the message is empty there's no data to be
+        # received and the message is finished immediately
+        if message_size == 0:
+            self._finish_message()
+
+    def _parse_message(self, data):
+        # calculates the number of bytes from the data that belong
+        # to the message (the remaining bytes are pending)
+        data_length = len(data)
+        remaining = self.message_size - self.message_offset
+        count = data_length if data_length < remaining else remaining
+        end_offset = self.message_offset + count
+
+        # in case the buffer is not large enough for the new bytes it's
+        # grown (doubling its size) so that the number of re-allocations
+        # is logarithmic, never growing beyond the size of the message
+        message_length = len(self.message)
+        if end_offset > message_length:
+            grown_length = max(end_offset, message_length * 2)
+            grown_length = min(grown_length, self.message_size)
+            self.message.extend(bytearray(grown_length - message_length))
+
+        # copies the message bytes into the buffer and
+        # updates the message offset accordingly
+        self.message[self.message_offset : end_offset] = (
+            data if count == data_length else memoryview(data)[:count]
+        )
+        self.message_offset = end_offset
+
+        # in case there's data after the message it's considered
+        # to be pending (for the next request)
+        if count < data_length:
+            self.pending_data = data[count:]
+
+        # in case the message has been completely received
+        # finishes the message (and the request)
+        if self.message_offset == self.message_size:
+            self._finish_message()
+
+    def _parse_content_length(self, content_length):
+        # verifies that the content length is a plain sequence of digits
+        # (no sign or spaces) and that it's within the maximum size, so
+        # that no invalid or excessive allocation is ever performed
+        content_length = content_length.strip()
+        if not content_length or content_length.strip("0123456789"):
+            raise exceptions.HTTPInvalidDataException(
+                "invalid content length: " + content_length
+            )
+        message_size = int(content_length)
+        if message_size > self.maximum_size:
+            raise exceptions.HTTPInvalidDataException(
+                "content length exceeds maximum size: %d" % message_size
+            )
+        return message_size
+
+    def _finish_message(self):
+        # sets the received message in the request, releasing the
+        # message buffer as it's no longer required
+        self.request.received_message = bytes(self.message)
+        self.message = None
+
+        # sets the parser as finished and decodes the
+        # request if necessary (using the owner service)
+        self.state = FINISHED_STATE
+        self.request.service.decode_request(self.request)
+
+
+class PrefixTrie(object):
+    """
+    The prefix trie class, that indexes a series of (string)
+    prefixes so that the ones that match a certain value may
+    be found in time proportional to the size of such value.
+
+    The order of the prefixes is kept so that the first one
+    (in order) matching the value is the one returned.
+    """
+
+    root = None
+    """ The root node of the trie, each node is a map associating
+    the next character with the child node """
+
+    def __init__(self, prefixes=()):
+        self.root = {}
+
+        for index, prefix in enumerate(prefixes):
+            self.add(prefix, index)
+
+    def add(self, prefix, index):
+        """
+        Adds the given prefix to the trie with the provided
+        order index, in case the prefix already exists the
+        previous (lower) index is kept.
+
+        :type prefix: String
+        :param prefix: The prefix to be added to the trie.
+        :type index: int
+        :param index: The order index of the prefix.
+        """
+
+        # in case the prefix is not a string (eg: invalid
+        # values in the configuration) it's ignored
+        if not colony.legacy.is_string(prefix):
+            return
+
+        # iterates over the complete set of characters in the
+        # prefix creating the nodes as required
+        node = self.root
+        for character in prefix:
+            node = node.setdefault(character, {})
+
+        # sets the prefix value (index and prefix) in the final
+        # node, unless it's already set (lower index)
+        if None in node:
+            return
+        node[None] = (index, prefix)
+
+    def match(self, value):
+        """
+        Retrieves the first prefix (in order) that matches
+        the given value, walking the trie through the value.
+
+        :type value: String
+        :param value: The value to be matched against the prefixes.
+        :rtype: String
+        :return: The first prefix matching the value or an invalid
+        value in case no prefix matches.
+        """
+
+        # starts the best (prefix) value as the one in the
+        # root node (empty prefix) in case it exists
+        node = self.root
+        best = node.get(None, None)
+
+        # iterates over the characters of the value walking the
+        # trie and keeping the prefix with the lowest index
+        for character in value:
+            node = node.get(character, None)
+            if node == None:
+                break
+            current = node.get(None, None)
+            if current and (not best or current[0] < best[0]):
+                best = current
+
+        # returns the prefix of the best value found
+        # or invalid in case no prefix matches
+        return best[1] if best else None
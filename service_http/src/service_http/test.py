@@ -28,6 +28,9 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import zlib
+import time
+
 import colony
 
 from . import system
@@ -44,7 +47,9 @@ class ServiceHTTPTest(colony.Test):
     def get_bundle(self):
         return (
             HTTPRequestTestCase,
+            HTTPRequestParserTestCase,
             ServiceHTTPBaseTestCase,
+            PrefixTrieTestCase,
             StatusMessagesTestCase,
             ExceptionsTestCase,
         )
@@ -81,6 +86,225 @@ class HTTPRequestTestCase(colony.ColonyTestCase):
         address = request.get_connection_address()
         self.assertEqual(address, ("127.0.0.1", 8080))
 
+    def test_stream_encoding(self):
+        # creates a chunked (generator based) request and sets it as
+        # encoded using a raw deflate stream as the streaming encoder
+        chunks = [b"hello world " * 1024 for _index in range(8)]
+        request = system.HTTPRequest(service_connection=mocks.MockServiceConnection())
+        request.write_generator(iter(chunks))
+        request.encoded = True
+        request.set_encoding_stream(zlib.compressobj)
+        request.stream_encoding()
+
+        # retrieves the complete set of encoded chunks and verifies
+        # that the joined value decodes into the original contents
+        encoded = []
+        while True:
+            chunk = request.chunk_handler.get_chunk()
+            if not chunk:
+                break
+            encoded.append(chunk)
+        self.assertEqual(request.is_chunked_encoded(), True)
+        self.assertEqual(zlib.decompress(b"".join(encoded)), b"".join(chunks))
+
+        # verifies that a mediated request for an HTTP 1.0 client is
+        # not converted (the chunked encoding is not supported)
+        request = system.HTTPRequest(service_connection=mocks.MockServiceConnection())
+        request.mediated = True
+        request.protocol_version = "HTTP/1.0"
+        request.encoded = True
+        request.set_encoding_stream(zlib.compressobj)
+        request.stream_encoding()
+        self.assertEqual(request.is_mediated(), True)
+        self.assertEqual(request.is_chunked_encoded(), False)
+
+
+class HTTPRequestParserTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "HTTP Request Parser test case"
+
+    def setUp(self):
+        colony.ColonyTestCase.setUp(self)
+        self.handler = system.HTTPClientServiceHandler(
+            mocks.MockPlugin(), None, {}, Exception, {}
+        )
+
+    def test_simple(self):
+        connection = mocks.MockServiceConnection()
+        data = b"GET /index.html?name=value HTTP/1.1\r\nHost: localhost\r\n\r\n"
+
+        request = self.handler.retrieve_request_data(connection, data)
+
+        self.assertNotEqual(request, None)
+        self.assertEqual(request.operation_type, "GET")
+        self.assertEqual(request.resource_path, "/index.html")
+        self.assertEqual(request.protocol_version, "HTTP/1.1")
+        self.assertEqual(request.headers_map, dict(Host="localhost"))
+        self.assertEqual(request.query_string, "name=value")
+        self.assertEqual(request.received_message, None)
+        self.assertEqual(connection.request_data, {})
+        self.assertEqual(connection.pending_data(), False)
+
+    def test_byte_chunks(self):
+        connection = mocks.MockServiceConnection()
+        data = (
+            b"POST /upload HTTP/1.1\r\nHost: localhost\r\n"
+            b"Content-Type: application/octet-stream\r\n"
+            b"Content-Length: 5\r\n\r\nhello"
+        )
+
+        for index in range(len(data) - 1):
+            request = self.handler.retrieve_request_data(
+                connection, data[index : index + 1]
+            )
+            self.assertEqual(request, None)
+
+        request = self.handler.retrieve_request_data(connection, data[-1:])
+
+        self.assertNotEqual(request, None)
+        self.assertEqual(request.operation_type, "POST")
+        self.assertEqual(request.headers_map["Host"], "localhost")
+        self.assertEqual(request.headers_map["Content-Length"], "5")
+        self.assertEqual(request.received_message, b"hello")
+
+    def test_pipelined(self):
+        connection = mocks.MockServiceConnection()
+        data = (
+            b"POST /first HTTP/1.1\r\n"
+            b"Content-Type: application/octet-stream\r\n"
+            b"Content-Length: 3\r\n\r\nabc"
+            b"GET /second HTTP/1.1\r\n\r\n"
+            b"GET /third HTTP/1.1\r\n"
+        )
+
+        request = self.handler.retrieve_request_data(connection, data)
+
+        self.assertEqual(request.resource_path, "/first")
+        self.assertEqual(request.received_message, b"abc")
+
+        pending_data = connection.pop_pending_data()
+        request = self.handler.retrieve_request_data(connection, pending_data)
+
+        self.assertEqual(request.resource_path, "/second")
+        self.assertEqual(request.received_message, None)
+
+        pending_data = connection.pop_pending_data()
+        request = self.handler.retrieve_request_data(connection, pending_data)
+
+        self.assertEqual(request, None)
+        self.assertEqual(connection.pending_data(), False)
+
+        request = self.handler.retrieve_request_data(connection, b"\r\n")
+
+        self.assertEqual(request.resource_path, "/third")
+
+    def test_empty_message(self):
+        connection = mocks.MockServiceConnection()
+        data = b"POST /empty HTTP/1.1\r\nContent-Length: 0\r\n\r\n"
+
+        request = self.handler.retrieve_request_data(connection, data)
+
+        self.assertNotEqual(request, None)
+        self.assertEqual(request.received_message, colony.legacy.UNICODE(""))
+
+    def test_invalid_start_line(self):
+        connection = mocks.MockServiceConnection()
+
+        self.assertRaises(
+            exceptions.HTTPInvalidDataException,
+            lambda: self.handler.retrieve_request_data(connection, b"INVALID\r\n"),
+        )
+
+    def test_invalid_content_length(self):
+        for content_length in (b"-1", b"abc", b"", b"1e3", b"+5", b"99999999999"):
+            connection = mocks.MockServiceConnection()
+            data = (
+                b"POST /upload HTTP/1.1\r\nContent-Length: "
+                + content_length
+                + b"\r\n\r\n"
+            )
+            self.assertRaises(
+                exceptions.HTTPInvalidDataException,
+                lambda: self.handler.retrieve_request_data(connection, data),
+            )
+
+        # verifies that the maximum size is honoured, being the limit
+        # itself still accepted as a valid content length
+        self.handler.maximum_message_size = 4
+        connection = mocks.MockServiceConnection()
+        data = b"POST /upload HTTP/1.1\r\nContent-Length: 5\r\n\r\n"
+        self.assertRaises(
+            exceptions.HTTPInvalidDataException,
+            lambda: self.handler.retrieve_request_data(connection, data),
+        )
+        data = (
+            b"POST /upload HTTP/1.1\r\n"
+            b"Content-Type: application/octet-stream\r\n"
+            b"Content-Length: 4\r\n\r\nabcd"
+        )
+        request = self.handler.retrieve_request_data(connection, data)
+        self.assertEqual(request.received_message, b"abcd")
+
+    def test_message_growth(self):
+        connection = mocks.MockServiceConnection()
+        message_size = system.CHUNK_SIZE * 5 + 3
+        data = colony.legacy.bytes(
+            "POST /upload HTTP/1.1\r\n"
+            "Content-Type: application/octet-stream\r\n"
+            "Content-Length: %d\r\n\r\n" % message_size
+        )
+
+        # verifies that the initial buffer is limited to a chunk and
+        # that it grows as the data is received (up to the message size)
+        request = self.handler.retrieve_request_data(connection, data)
+        parser = connection.request_data["parser"]
+        self.assertEqual(request, None)
+        self.assertEqual(len(parser.message), system.CHUNK_SIZE)
+
+        contents = bytes(bytearray(index % 256 for index in range(message_size)))
+        for index in range(0, message_size, 1000):
+            request = self.handler.retrieve_request_data(
+                connection, contents[index : index + 1000]
+            )
+            if request:
+                break
+            self.assertTrue(len(parser.message) <= message_size)
+
+        self.assertEqual(request.received_message, contents)
+
+    def test_linear_time(self):
+        small_time = self._parse_chunked(25 * 1024 * 1024)
+        large_time = self._parse_chunked(100 * 1024 * 1024)
+
+        # the large message is four times the size of the small one so
+        # a linear parser should take roughly four times as long, the
+        # margin is wide enough to be stable while still catching any
+        # quadratic behaviour (that would result in sixteen times)
+        self.assertTrue(large_time < small_time * 8.0)
+
+    def _parse_chunked(self, message_size, chunk_size=4096):
+        connection = mocks.MockServiceConnection()
+        header = colony.legacy.bytes(
+            "POST /upload HTTP/1.1\r\n"
+            "Content-Type: application/octet-stream\r\n"
+            "Content-Length: %d\r\n\r\n" % message_size
+        )
+        chunk = b"x" * chunk_size
+
+        start_time = time.time()
+
+        request = self.handler.retrieve_request_data(connection, header)
+        for _index in range(message_size // chunk_size):
+            request = self.handler.retrieve_request_data(connection, chunk)
+
+        end_time = time.time()
+
+        self.assertNotEqual(request, None)
+        self.assertEqual(len(request.received_message), message_size)
+
+        return end_time - start_time
+
 
 class ServiceHTTPBaseTestCase(colony.ColonyTestCase):
     @staticmethod
@@ -227,6 +451,76 @@ class ServiceHTTPBaseTestCase(colony.ColonyTestCase):
         service.unset_service_configuration_property()
         self.assertEqual(service.http_service_configuration, {})
 
+    def test_configuration_virtual_servers(self):
+        mock_plugin = mocks.MockPlugin()
+        service = system.ServiceHTTP(mock_plugin)
+        mock_plugin.system = service
+
+        config = mocks.MockConfigurationProperty(
+            {
+                "default_handler": "file",
+                "redirections": {"/old/": {"target": "/new/"}},
+                "virtual_servers": {
+                    "hive.pt": {
+                        "default_handler": "colony",
+                        "redirections": {"/blog/": {"target": "/posts/"}},
+                    }
+                },
+            }
+        )
+
+        service.set_service_configuration_property(config)
+
+        self.assertIn("hive.pt", service.http_service_virtual_servers_map)
+
+        # verifies that the redirections tries are kept in the service
+        # (per virtual server) and that the configuration is unchanged
+        tries_map = service.http_service_redirections_tries_map
+        self.assertEqual(sorted(tries_map, key=str), [None, "hive.pt"])
+        self.assertEqual(tries_map[None].match("/old/page"), "/old/")
+        self.assertEqual(tries_map["hive.pt"].match("/blog/entry"), "/blog/")
+        self.assertEqual(tries_map["hive.pt"].match("/old/page"), "/old/")
+        self.assertEqual(tries_map["hive.pt"].match("resolution_order_regex"), None)
+        self.assertEqual(tries_map["hive.pt"].match("resolution_order_trie"), None)
+        self.assertEqual(
+            sorted(service.http_service_configuration["redirections"]),
+            ["/old/", "resolution_order_regex"],
+        )
+        self.assertEqual(
+            sorted(service.http_service_virtual_servers_map["hive.pt"]["redirections"]),
+            ["/blog/", "/old/", "resolution_order_regex"],
+        )
+
+        handler = system.HTTPClientServiceHandler(
+            mock_plugin, None, service.http_service_configuration, Exception, {}
+        )
+
+        request = system.HTTPRequest(handler)
+        request.headers_map["Host"] = "hive.pt:8080"
+        configuration = handler._get_service_configuration(request)
+
+        self.assertEqual(configuration["default_handler"], "colony")
+        self.assertIn("/old/", configuration["redirections"])
+        self.assertIn("/blog/", configuration["redirections"])
+
+        request.set_path("/blog/entry")
+        handler._process_redirection(request, configuration)
+
+        self.assertEqual(request.path, "/posts/entry")
+        self.assertEqual(request.handler_base_path, "/blog/")
+
+        request = system.HTTPRequest(handler)
+        request.headers_map["Host"] = "localhost"
+        configuration = handler._get_service_configuration(request)
+
+        self.assertEqual(configuration["default_handler"], "file")
+        self.assertNotIn("/blog/", configuration["redirections"])
+
+        service.unset_service_configuration_property()
+
+        self.assertEqual(service.http_service_virtual_servers_map, {})
+        self.assertEqual(service.http_service_redirections_tries_map, {})
+
     def test_multiple_handlers(self):
         mock_plugin = mocks.MockPlugin()
         service = system.ServiceHTTP(mock_plugin)
@@ -241,6 +535,44 @@ class ServiceHTTPBaseTestCase(colony.ColonyTestCase):
             self.assertIn(handler_name, service.http_service_handler_plugins_map)
 
 
+class PrefixTrieTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Prefix Trie test case"
+
+    def test_match(self):
+        trie = system.PrefixTrie(("/static/", "/api/", "/"))
+
+        self.assertEqual(trie.match("/static/logo.png"), "/static/")
+        self.assertEqual(trie.match("/api/users"), "/api/")
+        self.assertEqual(trie.match("/index.html"), "/")
+        self.assertEqual(trie.match("static"), None)
+
+    def test_match_order(self):
+        trie = system.PrefixTrie(("/", "/static/"))
+
+        self.assertEqual(trie.match("/static/logo.png"), "/")
+
+        trie = system.PrefixTrie(("/static/images/", "/static/"))
+
+        self.assertEqual(trie.match("/static/images/logo.png"), "/static/images/")
+        self.assertEqual(trie.match("/static/logo.png"), "/static/")
+
+    def test_match_empty(self):
+        trie = system.PrefixTrie()
+
+        self.assertEqual(trie.match("/index.html"), None)
+
+        trie = system.PrefixTrie(("",))
+
+        self.assertEqual(trie.match("/index.html"), "")
+
+    def test_non_string(self):
+        trie = system.PrefixTrie(("/api/", None, 1))
+
+        self.assertEqual(trie.match("/api/users"), "/api/")
+
+
 class StatusMessagesTestCase(colony.ColonyTestCase):
     @staticmethod
     def get_description():
@@ -27,6 +27,7 @@ __license__ = "Apache License, Version 2.0"
 
 from . import exceptions
 from . import system
+from . import test
 
 from .exceptions import (
     ServiceHTTPFileException,
@@ -34,3 +35,4 @@ from .exceptions import (
     NotImplementedException,
 )
 from .system import ServiceHTTPFile
+from .test import ServiceHTTPFileTest
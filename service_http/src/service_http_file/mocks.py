@@ -0,0 +1,61 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+
+class MockPlugin(object):
+    def __init__(self):
+        self.messages = []
+
+    def debug(self, message):
+        self.messages.append(message)
+
+
+class MockService(object):
+    def __init__(self, encoding=None):
+        self.encoding = encoding
+        self.encoded = []
+
+    def encoding_handler(self, contents):
+        self.encoded.append(contents)
+        return b"encoded:" + contents
+
+
+class MockRequest(object):
+    def __init__(self, headers=None, service=None):
+        self.headers = headers or {}
+        self.response_headers = {}
+        self.service = service or MockService()
+
+    def get_header(self, name):
+        return self.headers.get(name, None)
+
+    def set_header(self, name, value):
+        self.response_headers[name] = value
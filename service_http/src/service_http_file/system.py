@@ -31,8 +31,11 @@ __license__ = "Apache License, Version 2.0"
 import os
 import re
 import stat
+import time
 import hashlib
 import datetime
+import threading
+import collections
 
 import colony
 
@@ -65,6 +68,56 @@ RELATIVE_PATHS_REGEX = re.compile(RELATIVE_PATHS_REGEX_VALUE)
 ACCEPT_RANGES_VALUE = "Accept-Ranges"
 """ The accept ranges value """
 
+ACCEPT_ENCODING_VALUE = "Accept-Encoding"
+""" The accept encoding value """
+
+CONTENT_ENCODING_VALUE = "Content-Encoding"
+""" The content encoding value """
+
+VARY_VALUE = "Vary"
+""" The vary value """
+
+GZIP_ENCODING = "gzip"
+""" The name of the gzip encoding, the one used by
+the precompressed (sidecar) files """
+
+IDENTITY_ENCODING = "identity"
+""" The name of the identity encoding, meaning that
+the file is sent as is (no encoding) """
+
+ANY_ENCODING = "*"
+""" The wildcard value that matches any encoding not
+explicitly listed in the accept encoding header """
+
+SIDECAR_EXTENSION = ".gz"
+""" The extension of the precompressed (sidecar) file
+that may exist next to the original file """
+
+VARIANT_CACHE_SIZE = 67108864
+""" The default maximum size (in bytes) of the encoded
+variants kept in memory by the variant cache """
+
+VARIANT_FILE_SIZE_LIMIT = 8388608
+""" The default maximum size (in bytes) of a file for it
+to be encoded and cached in memory """
+
+ETAG_CACHE_SIZE = 4096
+""" The maximum number of entries in the etag cache, after
+which the cache is cleared """
+
+FILE_CACHE_TTL = 1.0
+""" The default amount of time (in seconds) for which the
+file system values (stat, contents and descriptors) are
+cached before being refreshed """
+
+FILE_CACHE_ENTRIES = 1024
+""" The default maximum number of entries (per kind) kept
+in the file cache """
+
+FILE_CACHE_CONTENTS_SIZE = 16777216
+""" The default maximum size (in bytes) of the contents of
+the small files kept in memory by the file cache """
+
 CONTENT_RANGE_VALUE = "Content-Range"
 """ The content range value """
 
@@ -104,10 +157,25 @@ class ServiceHTTPFile(colony.System):
     handler_configuration = {}
     """ The handler configuration """
 
+    variant_cache = None
+    """ The cache of the encoded variants of the files, avoiding
+    the encoding of the same file for every request """
+
+    etag_cache = {}
+    """ The map associating the modification and size values of
+    a file with the etag value computed for them """
+
+    file_cache = None
+    """ The cache of the file system values (resolved base paths,
+    stat results, contents and file descriptors) of the hot files """
+
     def __init__(self, plugin):
         colony.System.__init__(self, plugin)
         self.directory_handler_plugins_map = {}
         self.handler_configuration = {}
+        self.variant_cache = VariantCache()
+        self.etag_cache = {}
+        self.file_cache = FileCache()
 
     def get_handler_name(self):
         """
@@ -162,11 +230,13 @@ class ServiceHTTPFile(colony.System):
 
         # retrieves the real base directory, resolving it using
         # both the resources manager and the plugin manager (this is quite
-        # an expensive operation)
-        real_base_directory = resources_manager_plugin.get_real_string_value(
-            base_directory
+        # an expensive operation so the result is cached)
+        real_base_directory = self.file_cache.resolve(
+            base_directory,
+            lambda name: plugin_manager.resolve_file_path(
+                resources_manager_plugin.get_real_string_value(name)
+            ),
         )
-        real_base_directory = plugin_manager.resolve_file_path(real_base_directory)
 
         # in case the real base directory was not resolved
         # (file was not found using the plugin system)
@@ -206,14 +276,13 @@ class ServiceHTTPFile(colony.System):
         # prints a debug message
         self.plugin.debug("Trying to retrieve system file '%s'" % complete_path)
 
-        # in case the paths does not exist
-        if not os.path.exists(complete_path):
+        # retrieves the (cached) file stat, in case it's not
+        # available the path does not exist
+        file_stat = self.file_cache.stat(complete_path)
+        if not file_stat:
             # raises file not found exception with 404 HTTP error code
             raise exceptions.FileNotFoundException(resource_path, 404)
 
-        # retrieves the file stat
-        file_stat = os.stat(complete_path)
-
         # retrieves the modified timestamp
         modified_timestamp = file_stat[stat.ST_MTIME]
 
@@ -221,6 +290,16 @@ class ServiceHTTPFile(colony.System):
         # modified timestamp
         etag_value = self._compute_etag(file_stat, modified_timestamp)
 
+        # selects the encoded variant of the file to be served (if any)
+        # according to the encodings accepted by the client, in such
+        # case the etag is made specific to the variant (representation)
+        is_directory = stat.S_ISDIR(file_stat[stat.ST_MODE])
+        encoding = None
+        if not is_directory:
+            encoding = self._select_encoding(request, complete_path, file_stat)
+        if encoding:
+            etag_value = etag_value[:-1] + "-" + encoding + '"'
+
         # verifies the resource to validate any modification
         if not request.verify_resource_modification(modified_timestamp, etag_value):
             # sets the request mime type
@@ -252,13 +331,15 @@ class ServiceHTTPFile(colony.System):
         request.set_etag(etag_value)
 
         # in case the complete path is a directory
-        if os.path.isdir(complete_path):
+        if is_directory:
             # processes the path as a directory
             self._process_directory(request, complete_path)
         # otherwise
         else:
             # processes the path as a file
-            self._process_file(request, complete_path)
+            self._process_file(
+                request, complete_path, encoding=encoding, file_stat=file_stat
+            )
 
     def directory_handler_load(self, directory_handler_plugin):
         # retrieves the plugin directory handler name
@@ -284,10 +365,31 @@ class ServiceHTTPFile(colony.System):
         # copies the handler configuration to the handler configuration
         colony.map_copy(handler_configuration, self.handler_configuration)
 
+        # updates the maximum size of the variant cache and the time
+        # to live of the file cache according to the (new) configuration
+        self.variant_cache.max_size = self.handler_configuration.get(
+            "variant_cache_size", VARIANT_CACHE_SIZE
+        )
+        self.file_cache.ttl = self.handler_configuration.get(
+            "file_cache_ttl", FILE_CACHE_TTL
+        )
+        self.file_cache.clear()
+
     def unset_handler_configuration_property(self):
         # cleans the handler configuration
         colony.map_clean(self.handler_configuration)
 
+    def get_cache_stats(self):
+        """
+        Retrieves the statistics (counters and hit rates) of the
+        file cache, to be used for diagnostics.
+
+        :rtype: Dictionary
+        :return: The map containing the statistics of the file cache.
+        """
+
+        return self.file_cache.stats()
+
     def default_directory_handler(self, request, directory_list):
         """
         The default directory handler for exception sending.
@@ -417,7 +519,7 @@ class ServiceHTTPFile(colony.System):
         # handles the directory list
         self._handle_directory_list(self.handler_configuration, request, directory_list)
 
-    def _process_file(self, request, complete_path):
+    def _process_file(self, request, complete_path, encoding=None, file_stat=None):
         """
         Processes a file request for the given complete
         path and request.
@@ -426,22 +528,60 @@ class ServiceHTTPFile(colony.System):
         :param request: The HTTP request to be handled.
         :type complete_path: String
         :param complete_path: The complete path to the file.
+        :type encoding: String
+        :param encoding: The name of the encoding of the variant
+        of the file to be sent, in case it's not set the file is
+        sent as is (identity).
+        :type file_stat: Dictionary
+        :param file_stat: The file stat values dictionary.
         """
 
-        # opens the requested file
-        file = open(complete_path, "rb")
+        # in case an encoding is defined opens the encoded variant of
+        # the file and sets the content encoding header so that the
+        # service does not encode the contents (again)
+        if encoding:
+            file, file_size = self._open_variant(
+                request, complete_path, file_stat, encoding
+            )
+            request.set_header(CONTENT_ENCODING_VALUE, encoding)
+
+        # otherwise the requested file is sent as is, using the
+        # file cache to avoid the file system operations
+        else:
+            # retrieves the file size from the (cached) stat result
+            file_stat = file_stat or self.file_cache.stat(complete_path)
+            file_size = file_stat[stat.ST_SIZE]
+
+            # in case the file is small the (cached) contents of
+            # it are written directly into the request
+            if file_size <= CHUNK_FILE_SIZE_LIMIT:
+                self._process_ranges(request, file_size)
+                file_contents = self.file_cache.contents(complete_path, file_stat)
+                request.write(file_contents, 1, False)
+                return
 
-        # retrieves the file size
-        file_size = os.path.getsize(complete_path)
+            # opens the requested file (shared file descriptor)
+            file = self.file_cache.open(complete_path, file_stat)
 
-        # processes and retrieves the ranges to be used
+        # processes and retrieves the ranges to be used, note that
+        # for encoded variants the ranges refer to the encoded bytes
         ranges = self._process_ranges(request, file_size)
 
+        # retrieves the sendfile flag from the handler configuration
+        # controlling if the file may be sent directly from the kernel,
+        # only possible for file system based files (not memory ones)
+        sendfile = self.handler_configuration.get("sendfile", True)
+        sendfile = sendfile and hasattr(file, "fileno")
+
         # in case the file size is bigger than
         # the chunk file size limit
         if file_size > CHUNK_FILE_SIZE_LIMIT:
-            # creates the chunk handler instance
-            chunk_handler = ChunkHandler(file, file_size, ranges)
+            # creates the chunk handler instance, using the sendfile
+            # based one in case it's enabled, note that the service is
+            # responsible for the fallback to the chunk based sending
+            # for connections where sendfile is not possible (eg: secure)
+            chunk_handler_class = sendfile and SendfileHandler or ChunkHandler
+            chunk_handler = chunk_handler_class(file, file_size, ranges)
 
             # processes the ranges value in the chunk handler
             chunk_handler.process_ranges()
@@ -600,6 +740,178 @@ class ServiceHTTPFile(colony.System):
         # returns the ranges number list
         return ranges_number_list
 
+    def _select_encoding(self, request, complete_path, file_stat):
+        """
+        Selects the encoding of the variant of the file to be sent
+        for the given request, taking into account the encodings
+        accepted by the client, the existence of a precompressed
+        (sidecar) file and the encoding configured for the service.
+
+        :type request: HTTPRequest
+        :param request: The HTTP request to be handled.
+        :type complete_path: String
+        :param complete_path: The complete path to the file.
+        :type file_stat: Dictionary
+        :param file_stat: The file stat values dictionary.
+        :rtype: String
+        :return: The name of the encoding of the variant to be sent
+        or an invalid value in case the file should be sent as is.
+        """
+
+        # retrieves the encoding configured for the service (on the fly
+        # encoding) and verifies if there's a fresh sidecar for the file,
+        # in case there's none of them there's no variant to be selected
+        service_encoding = getattr(request.service, "encoding", None)
+        has_sidecar = self._has_sidecar(complete_path, file_stat)
+        if not service_encoding and not has_sidecar:
+            return None
+
+        # the response is now dependent on the encodings accepted
+        # by the client so the caches must be notified about it
+        request.set_header(VARY_VALUE, ACCEPT_ENCODING_VALUE)
+
+        # retrieves the encodings accepted by the client and in case the
+        # gzip one is accepted and there's a sidecar file it's selected
+        encodings = self._accepted_encodings(request)
+        if has_sidecar and self._is_accepted(encodings, GZIP_ENCODING):
+            return GZIP_ENCODING
+
+        # verifies if the service encoding is accepted by the client, in
+        # case the client refuses the identity encoding the variant is
+        # the only acceptable response and is always selected
+        if not service_encoding or not self._is_accepted(encodings, service_encoding):
+            return None
+        if not self._is_accepted(encodings, IDENTITY_ENCODING):
+            return service_encoding
+
+        # verifies if the variant cache is enabled and the file is small
+        # enough to be encoded in memory, otherwise the service encodes
+        # the contents (on the fly)
+        if not self.handler_configuration.get("variant_cache", True):
+            return None
+        size_limit = self.handler_configuration.get(
+            "variant_size_limit", VARIANT_FILE_SIZE_LIMIT
+        )
+        if file_stat[stat.ST_SIZE] > size_limit:
+            return None
+        return service_encoding
+
+    def _open_variant(self, request, complete_path, file_stat, encoding):
+        """
+        Opens the variant of the file encoded with the given encoding,
+        using the sidecar file in case it exists or the variant cache,
+        encoding the file (and caching it) in case of a miss.
+
+        :type request: HTTPRequest
+        :param request: The HTTP request to be handled.
+        :type complete_path: String
+        :param complete_path: The complete path to the file.
+        :type file_stat: Dictionary
+        :param file_stat: The file stat values dictionary.
+        :type encoding: String
+        :param encoding: The name of the encoding of the variant.
+        :rtype: Tuple
+        :return: The file object of the variant and its size.
+        """
+
+        # in case there's a fresh sidecar file for the gzip encoding it's
+        # opened and returned immediately (precompressed contents)
+        sidecar_path = complete_path + SIDECAR_EXTENSION
+        if encoding == GZIP_ENCODING and self._has_sidecar(complete_path, file_stat):
+            sidecar_stat = self.file_cache.stat(sidecar_path)
+            sidecar_file = self.file_cache.open(sidecar_path, sidecar_stat)
+            return sidecar_file, sidecar_stat[stat.ST_SIZE]
+
+        # tries to retrieve the encoded contents from the variant cache
+        # for the current version of the file and in case of a miss
+        # encodes the file using the service's encoding handler
+        key = (complete_path, encoding)
+        version = (file_stat[stat.ST_MTIME], file_stat[stat.ST_SIZE])
+        contents = self.variant_cache.get(key, version)
+        if contents == None:
+            file = open(complete_path, "rb")
+            try:
+                contents = file.read()
+            finally:
+                file.close()
+            contents = request.service.encoding_handler(contents)
+            self.variant_cache.set(key, version, contents)
+
+            # in case the writing of sidecar files is enabled the
+            # encoded contents are stored next to the file
+            sidecar = self.handler_configuration.get("sidecar", False)
+            if sidecar and encoding == GZIP_ENCODING:
+                self._write_sidecar(sidecar_path, contents)
+
+        # creates a memory file with the encoded contents and
+        # returns it together with the size of the contents
+        file = colony.StringBuffer(False)
+        file.write(contents)
+        file.seek(0)
+        return file, len(contents)
+
+    def _has_sidecar(self, complete_path, file_stat):
+        # tries to retrieve the (cached) stat of the sidecar file, in
+        # case it does not exist there's no sidecar for the file
+        sidecar_stat = self.file_cache.stat(complete_path + SIDECAR_EXTENSION)
+        if not sidecar_stat:
+            return False
+
+        # the sidecar is only considered valid in case it's not
+        # older than the file (otherwise it's stale)
+        return sidecar_stat[stat.ST_MTIME] >= file_stat[stat.ST_MTIME]
+
+    def _write_sidecar(self, sidecar_path, contents):
+        # writes the contents to a temporary file and then renames
+        # it to the sidecar path so that no partial sidecar file is
+        # ever visible, failures (eg: read only) are ignored
+        temporary_path = sidecar_path + ".tmp"
+        try:
+            file = open(temporary_path, "wb")
+            try:
+                file.write(contents)
+            finally:
+                file.close()
+            os.rename(temporary_path, sidecar_path)
+        except (IOError, OSError) as exception:
+            self.plugin.debug(
+                "Problem writing sidecar file '%s': %s"
+                % (sidecar_path, colony.legacy.UNICODE(exception))
+            )
+
+    def _accepted_encodings(self, request):
+        # retrieves the accept encoding header and splits it into the
+        # various encodings, associating each of them with its quality
+        # (including the zero ones, that explicitly refuse the encoding)
+        accept_encoding = request.get_header(ACCEPT_ENCODING_VALUE) or ""
+        encodings = {}
+        for value in accept_encoding.split(","):
+            parts = [part.strip() for part in value.split(";")]
+            if not parts[0]:
+                continue
+            quality = 1.0
+            for part in parts[1:]:
+                if not part.startswith("q="):
+                    continue
+                try:
+                    quality = float(part[2:])
+                except ValueError:
+                    quality = 0.0
+            encodings[parts[0].lower()] = quality
+        return encodings
+
+    def _is_accepted(self, encodings, encoding):
+        # in case the encoding is explicitly listed its quality is
+        # used, otherwise the wildcard one is used (if defined)
+        if encoding in encodings:
+            return encodings[encoding] > 0.0
+        if ANY_ENCODING in encodings:
+            return encodings[ANY_ENCODING] > 0.0
+
+        # the identity encoding is always acceptable unless it's
+        # explicitly refused, the other ones must be listed
+        return encoding == IDENTITY_ENCODING
+
     def _compute_etag(self, file_stat, modified_timestamp):
         """
         Computes the etag for the given file stat and
@@ -613,12 +925,16 @@ class ServiceHTTPFile(colony.System):
         :return: The etag value.
         """
 
+        # retrieves the size and tries to retrieve the etag for
+        # both the modification and the size values from the cache
+        size = file_stat[stat.ST_SIZE]
+        etag_value = self.etag_cache.get((modified_timestamp, size), None)
+        if etag_value:
+            return etag_value
+
         # retrieves the MD5 builder
         md5 = hashlib.md5()
 
-        # retrieves the size
-        size = file_stat[stat.ST_SIZE]
-
         # creates the modification plus size string
         modification_size_string = str(modified_timestamp + size)
 
@@ -633,6 +949,12 @@ class ServiceHTTPFile(colony.System):
         etag_value = md5.hexdigest()
         etag_value = '"' + etag_value + '"'
 
+        # stores the etag value in the cache, clearing it in case
+        # the limit has been reached (avoids unbounded growth)
+        if len(self.etag_cache) >= ETAG_CACHE_SIZE:
+            self.etag_cache.clear()
+        self.etag_cache[(modified_timestamp, size)] = etag_value
+
         # returns the etag value
         return etag_value
 
@@ -741,6 +1063,495 @@ class ServiceHTTPFile(colony.System):
         return comparator
 
 
+class VariantCache(object):
+    """
+    The variant cache class, that keeps the encoded variants
+    of the files in memory in a least recently used fashion
+    bounded by the total size (in bytes) of the variants.
+    """
+
+    max_size = VARIANT_CACHE_SIZE
+    """ The maximum size (in bytes) of the variants in the cache,
+    after which the least recently used entries are discarded """
+
+    size = 0
+    """ The current size (in bytes) of the variants in the cache """
+
+    entries = None
+    """ The ordered map associating the key (path and encoding)
+    with the version and the encoded contents, the order of the
+    map is the usage order (most recent at the end) """
+
+    lock = None
+    """ The lock that controls the access to the entries, as
+    files are served from multiple threads """
+
+    def __init__(self, max_size=VARIANT_CACHE_SIZE):
+        self.max_size = max_size
+        self.size = 0
+        self.entries = collections.OrderedDict()
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, version):
+        """
+        Retrieves the encoded contents cached for the given key in
+        case they're still valid for the provided version.
+
+        :type key: Tuple
+        :param key: The key (path and encoding) of the variant.
+        :type version: Tuple
+        :param version: The current version of the file (modification
+        time and size).
+        :rtype: String
+        :return: The cached encoded contents or an invalid value in
+        case there's no valid entry for the key.
+        """
+
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry == None:
+                return None
+            _version, contents = entry
+            if not _version == version:
+                self.size -= len(contents)
+                return None
+            self.entries[key] = entry
+            return contents
+
+    def set(self, key, version, contents):
+        """
+        Sets the encoded contents for the given key and version,
+        discarding the least recently used entries in case the
+        size limit is reached.
+
+        :type key: Tuple
+        :param key: The key (path and encoding) of the variant.
+        :type version: Tuple
+        :param version: The version of the file that was used
+        in the encoding of the contents.
+        :type contents: String
+        :param contents: The encoded contents of the file.
+        """
+
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if not entry == None:
+                self.size -= len(entry[1])
+            if len(contents) > self.max_size:
+                return
+            self.entries[key] = (version, contents)
+            self.size += len(contents)
+            while self.size > self.max_size:
+                _key, (_version, _contents) = self.entries.popitem(last=False)
+                self.size -= len(_contents)
+
+
+class FileCache(object):
+    """
+    The file cache class, that keeps the results of the file
+    system operations for the hot files (stat results, contents
+    of small files and open file descriptors) for a short period
+    of time (TTL), avoiding the system calls for every request.
+
+    The open file descriptors are shared among requests using the
+    position independent reads (pread) and are only closed once
+    they're no longer in use by any request (reference counting).
+    """
+
+    ttl = FILE_CACHE_TTL
+    """ The amount of time (in seconds) for which the cached
+    values are considered valid, after which they're refreshed """
+
+    max_entries = FILE_CACHE_ENTRIES
+    """ The maximum number of entries (per kind) in the cache,
+    after which the least recently used ones are discarded """
+
+    max_contents = FILE_CACHE_CONTENTS_SIZE
+    """ The maximum size (in bytes) of the file contents kept
+    in memory, after which the least recently used are discarded """
+
+    paths_map = None
+    """ The ordered map associating the name of a (base) path with
+    the tuple of expiration timestamp and resolved path """
+
+    stats_map = None
+    """ The ordered map associating the path with the tuple of
+    expiration timestamp and stat result (or invalid if missing) """
+
+    contents_map = None
+    """ The ordered map associating the path with the tuple of
+    version and the contents of the (small) file """
+
+    files_map = None
+    """ The ordered map associating the path with the open
+    file entry (shared file descriptor) """
+
+    contents_size = 0
+    """ The current size (in bytes) of the cached file contents """
+
+    counters = {}
+    """ The map containing the hit and miss counters for the
+    various kinds of cached values, used for diagnostics """
+
+    lock = None
+    """ The lock that controls the access to the internal
+    structures, as files are served from multiple threads """
+
+    def __init__(
+        self,
+        ttl=FILE_CACHE_TTL,
+        max_entries=FILE_CACHE_ENTRIES,
+        max_contents=FILE_CACHE_CONTENTS_SIZE,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_contents = max_contents
+        self.paths_map = collections.OrderedDict()
+        self.stats_map = collections.OrderedDict()
+        self.contents_map = collections.OrderedDict()
+        self.files_map = collections.OrderedDict()
+        self.contents_size = 0
+        self.counters = dict(
+            path_hits=0,
+            path_misses=0,
+            stat_hits=0,
+            stat_misses=0,
+            contents_hits=0,
+            contents_misses=0,
+            open_hits=0,
+            open_misses=0,
+        )
+        self.lock = threading.RLock()
+
+    def resolve(self, name, resolver):
+        """
+        Resolves the given (base) path name using the provided resolver,
+        using the cached value in case it has not yet expired.
+
+        :type name: String
+        :param name: The name of the path to be resolved.
+        :type resolver: Function
+        :param resolver: The function to be called with the name for
+        the resolution of the path in case of a cache miss.
+        :rtype: String
+        :return: The resolved path for the name.
+        """
+
+        # tries to retrieve a non expired resolved path for the name
+        # from the cache returning it immediately in case it exists
+        current = time.time()
+        with self.lock:
+            entry = self.paths_map.get(name, None)
+            if entry and entry[0] > current:
+                self.counters["path_hits"] += 1
+                return entry[1]
+            self.counters["path_misses"] += 1
+
+        # resolves the path and stores it in the cache, discarding
+        # the oldest entries in case the limit has been reached
+        path = resolver(name)
+        with self.lock:
+            self.paths_map.pop(name, None)
+            self.paths_map[name] = (current + self.ttl, path)
+            while len(self.paths_map) > self.max_entries:
+                self.paths_map.popitem(last=False)
+
+        return path
+
+    def stat(self, path):
+        """
+        Retrieves the stat result for the given path, using the
+        cached value in case it has not yet expired.
+
+        :type path: String
+        :param path: The path to the file to retrieve the stat.
+        :rtype: stat_result
+        :return: The stat result for the path or an invalid value
+        in case the path does not exist.
+        """
+
+        # tries to retrieve a non expired stat result for the path
+        # from the cache returning it immediately in case it exists
+        current = time.time()
+        with self.lock:
+            entry = self.stats_map.get(path, None)
+            if entry and entry[0] > current:
+                self.counters["stat_hits"] += 1
+                return entry[1]
+            self.counters["stat_misses"] += 1
+
+        # runs the stat operation for the path, considering the path
+        # as missing in case the operation fails (cached as well)
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            file_stat = None
+
+        # stores the stat result in the cache, discarding the
+        # oldest entries in case the limit has been reached
+        with self.lock:
+            self.stats_map.pop(path, None)
+            self.stats_map[path] = (current + self.ttl, file_stat)
+            while len(self.stats_map) > self.max_entries:
+                self.stats_map.popitem(last=False)
+
+        return file_stat
+
+    def contents(self, path, file_stat):
+        """
+        Retrieves the complete contents of the (small) file in the
+        given path, using the cached value in case the version of
+        the file (modification time and size) has not changed.
+
+        :type path: String
+        :param path: The path to the file to be read.
+        :type file_stat: stat_result
+        :param file_stat: The stat result for the file.
+        :rtype: String
+        :return: The complete contents of the file.
+        """
+
+        # tries to retrieve the contents of the file for the
+        # current version of it, returning them in case of a hit
+        version = self._version(file_stat)
+        with self.lock:
+            entry = self.contents_map.pop(path, None)
+            if entry and entry[0] == version:
+                self.contents_map[path] = entry
+                self.counters["contents_hits"] += 1
+                return entry[1]
+            if entry:
+                self.contents_size -= len(entry[1])
+            self.counters["contents_misses"] += 1
+
+        # reads the complete contents of the file
+        file = open(path, "rb")
+        try:
+            contents = file.read()
+        finally:
+            file.close()
+
+        # stores the contents in the cache, discarding the least
+        # recently used entries in case the limits are reached
+        with self.lock:
+            entry = self.contents_map.pop(path, None)
+            if entry:
+                self.contents_size -= len(entry[1])
+            self.contents_map[path] = (version, contents)
+            self.contents_size += len(contents)
+            while (
+                self.contents_size > self.max_contents
+                or len(self.contents_map) > self.max_entries
+            ):
+                _path, (_version, _contents) = self.contents_map.popitem(last=False)
+                self.contents_size -= len(_contents)
+
+        return contents
+
+    def open(self, path, file_stat):
+        """
+        Opens the file in the given path, re-using the cached file
+        descriptor in case the version of the file has not changed.
+
+        The returned file must be closed by the caller, which returns
+        the file descriptor to the cache (it's not closed).
+
+        :type path: String
+        :param path: The path to the file to be opened.
+        :type file_stat: stat_result
+        :param file_stat: The stat result for the file.
+        :rtype: File
+        :return: The file object for the path, shared among requests
+        in case the platform supports position independent reads.
+        """
+
+        # in case the platform does not support position independent
+        # reads the file descriptor can't be shared (regular open)
+        if not hasattr(os, "pread"):
+            return open(path, "rb")
+
+        # tries to retrieve the file entry for the current version of
+        # the file, in case it exists it's re-used (new reference)
+        version = self._version(file_stat)
+        with self.lock:
+            entry = self.files_map.pop(path, None)
+            if entry and entry.version == version:
+                self.files_map[path] = entry
+                self.counters["open_hits"] += 1
+                entry.references += 1
+                return SharedFile(self, entry)
+            if entry:
+                self._discard(entry)
+            self.counters["open_misses"] += 1
+
+        # opens the file (low level file descriptor) and creates the entry
+        # for it with a reference for the cache and another for the caller
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        entry = FileEntry(fd, version, file_stat[stat.ST_SIZE])
+        entry.references = 2
+
+        # stores the entry in the cache, discarding the least recently
+        # used entries in case the limit has been reached
+        with self.lock:
+            previous = self.files_map.pop(path, None)
+            if previous:
+                self._discard(previous)
+            self.files_map[path] = entry
+            while len(self.files_map) > self.max_entries:
+                _path, _entry = self.files_map.popitem(last=False)
+                self._discard(_entry)
+
+        return SharedFile(self, entry)
+
+    def release(self, entry):
+        """
+        Releases a reference to the given file entry, closing the
+        file descriptor in case there're no more references to it.
+
+        :type entry: FileEntry
+        :param entry: The file entry to be released.
+        """
+
+        with self.lock:
+            entry.references -= 1
+            if entry.references > 0:
+                return
+        os.close(entry.fd)
+
+    def clear(self):
+        """
+        Clears the complete set of cached values, closing the file
+        descriptors that are no longer in use.
+        """
+
+        with self.lock:
+            self.paths_map.clear()
+            self.stats_map.clear()
+            self.contents_map.clear()
+            self.contents_size = 0
+            entries = list(self.files_map.values())
+            self.files_map.clear()
+        for entry in entries:
+            self._discard(entry)
+
+    def stats(self):
+        """
+        Retrieves a map containing the counters and the hit rates
+        of the cache, to be used for diagnostics.
+
+        :rtype: Dictionary
+        :return: The map with the counters and hit rates.
+        """
+
+        with self.lock:
+            stats = dict(self.counters)
+            stats["stat_entries"] = len(self.stats_map)
+            stats["contents_entries"] = len(self.contents_map)
+            stats["contents_size"] = self.contents_size
+            stats["open_entries"] = len(self.files_map)
+        for name in ("path", "stat", "contents", "open"):
+            hits = stats[name + "_hits"]
+            total = hits + stats[name + "_misses"]
+            stats[name + "_rate"] = float(hits) / total if total else 0.0
+        return stats
+
+    def _discard(self, entry):
+        # releases the reference of the cache to the entry, closing
+        # the file descriptor in case it's no longer in use
+        self.release(entry)
+
+    def _version(self, file_stat):
+        return (
+            file_stat[stat.ST_INO],
+            file_stat[stat.ST_MTIME],
+            file_stat[stat.ST_SIZE],
+        )
+
+
+class FileEntry(object):
+    """
+    The entry of an open file descriptor in the file cache,
+    keeping the version of the file and the number of
+    references (cache and requests) to the descriptor.
+    """
+
+    fd = None
+    """ The low level file descriptor of the open file """
+
+    version = None
+    """ The version of the file (inode, modification time
+    and size) at the time of the opening """
+
+    size = 0
+    """ The size of the file at the time of the opening """
+
+    references = 0
+    """ The number of references to the file descriptor, once
+    it reaches zero the file descriptor is closed """
+
+    def __init__(self, fd, version, size):
+        self.fd = fd
+        self.version = version
+        self.size = size
+        self.references = 0
+
+
+class SharedFile(object):
+    """
+    File like object over a shared (cached) file descriptor, that
+    keeps its own position using position independent reads, so
+    that the same descriptor may be used by concurrent requests.
+    """
+
+    cache = None
+    """ The file cache that owns the shared file entry """
+
+    entry = None
+    """ The file entry containing the shared file descriptor """
+
+    position = 0
+    """ The current (logical) position in the file """
+
+    _closed = False
+    """ The flag that controls if the shared file has been closed
+    (reference returned to the cache) """
+
+    def __init__(self, cache, entry):
+        self.cache = cache
+        self.entry = entry
+        self.position = 0
+        self._closed = False
+
+    def fileno(self):
+        return self.entry.fd
+
+    def read(self, size=None):
+        if size == None or size < 0:
+            size = max(self.entry.size - self.position, 0)
+        data = os.pread(self.entry.fd, size, self.position)
+        self.position += len(data)
+        return data
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += self.entry.size
+        self.position = offset
+
+    def tell(self):
+        return self.position
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.cache.release(self.entry)
+
+
 class ChunkHandler(object):
     """
     The chunk handler class.
@@ -755,6 +1566,12 @@ class ChunkHandler(object):
     ranges = None
     """ The list of ranges """
 
+    offset = 0
+    """ The offset in the file of the first byte to be sent """
+
+    remaining = None
+    """ The number of bytes still to be sent from the file """
+
     _closed = False
     """ The falg that controls the close state of the chunk handler """
 
@@ -773,6 +1590,7 @@ class ChunkHandler(object):
         self.file = file
         self.file_size = file_size
         self.ranges = ranges
+        self.remaining = file_size
 
     def process_ranges(self):
         """
@@ -789,12 +1607,22 @@ class ChunkHandler(object):
 
         # retrieves both the initial and end value
         # from the first range
-        initial_value, _end_value = first_range
+        initial_value, end_value = first_range
 
-        # in case the initial value is valid
-        if not initial_value == -1:
-            # seeks the file into the initial value
-            self.file.seek(initial_value)
+        # resolves the initial and end values into the offset
+        # and the (inclusive) end index of the range, using the
+        # same defaults as the ones used in the content range
+        initial_value = 0 if initial_value == -1 else initial_value
+        end_value = self.file_size - 1 if end_value == -1 else end_value
+        end_value = min(end_value, self.file_size - 1)
+
+        # updates the offset and the remaining number of bytes
+        # so that only the range is sent
+        self.offset = initial_value
+        self.remaining = max(end_value - initial_value + 1, 0)
+
+        # seeks the file into the initial value
+        self.file.seek(initial_value)
 
     def encode_file(self, encoding_handler, encoding_name):
         """
@@ -823,8 +1651,11 @@ class ChunkHandler(object):
         # sets the new file
         self.file = file_contents_encoded_file_buffer
 
-        # sets the new file size
+        # sets the new file size and resets the offset and the
+        # remaining values as the complete encoded file is sent
         self.file_size = file_contents_encoded_file_buffer.tell()
+        self.offset = 0
+        self.remaining = self.file_size
 
         # seeks to the beginning of the file
         file_contents_encoded_file_buffer.seek(0)
@@ -837,7 +1668,7 @@ class ChunkHandler(object):
         :return: The size of the file being chunked.
         """
 
-        return self.file_size
+        return self.remaining
 
     def get_chunk(self, chunk_size=CHUNK_SIZE):
         """
@@ -855,7 +1686,11 @@ class ChunkHandler(object):
         if self._closed:
             return None
 
-        return self.file.read(chunk_size)
+        # reads the chunk from the file making sure that no
+        # more than the remaining bytes (range) are read
+        chunk = self.file.read(min(chunk_size, self.remaining))
+        self.remaining -= len(chunk)
+        return chunk
 
     def close(self):
         """
@@ -872,3 +1707,38 @@ class ChunkHandler(object):
 
         # closes the file
         self.file.close()
+
+
+class SendfileHandler(ChunkHandler):
+    """
+    The sendfile handler class, a chunk handler that exposes
+    the file region to be sent so that the service is able to
+    send it directly from the file descriptor (kernel level copy).
+    """
+
+    _encoded = False
+    """ The flag that controls if the file has been encoded, in
+    such case there's no file descriptor to be sent """
+
+    def encode_file(self, encoding_handler, encoding_name):
+        ChunkHandler.encode_file(self, encoding_handler, encoding_name)
+        self._encoded = True
+
+    def get_file_region(self):
+        """
+        Retrieves the region of the file that is meant to be sent
+        as a tuple containing the file, the offset and the count.
+
+        :rtype: Tuple
+        :return: The file region tuple or an invalid value in case
+        the file can't be sent directly (eg: encoded contents).
+        """
+
+        # in case the file has been encoded or the handler is already
+        # closed there's no file region to be sent, returns invalid
+        if self._encoded or self._closed:
+            return None
+
+        # returns the file region tuple using the currently
+        # defined offset and remaining number of bytes
+        return (self.file, self.offset, self.remaining)
@@ -0,0 +1,435 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import time
+import shutil
+import tempfile
+
+import colony
+
+from . import system
+from . import mocks
+
+
+class ServiceHTTPFileTest(colony.Test):
+    """
+    The service HTTP file infra-structure test class, responsible
+    for the returning of the associated tests.
+    """
+
+    def get_bundle(self):
+        return (VariantCacheTestCase, EncodingTestCase, FileCacheTestCase)
+
+    def set_up(self, test_case):
+        colony.Test.set_up(self, test_case)
+
+    def tear_down(self, test_case):
+        colony.Test.tear_down(self, test_case)
+
+
+class VariantCacheTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Variant Cache test case"
+
+    def test_simple(self):
+        cache = system.VariantCache(max_size=16)
+        cache.set(("hello.txt", "gzip"), (1, 5), b"hello")
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.size, 5)
+        self.assertEqual(cache.get(("hello.txt", "gzip"), (1, 5)), b"hello")
+        self.assertEqual(cache.get(("hello.txt", "deflate"), (1, 5)), None)
+
+        # verifies that a different version (changed file) invalidates
+        # the entry, removing it from the cache
+        self.assertEqual(cache.get(("hello.txt", "gzip"), (2, 5)), None)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+        # verifies that the setting of an existing key replaces the
+        # previous contents (and their size)
+        cache.set(("hello.txt", "gzip"), (1, 5), b"hello")
+        cache.set(("hello.txt", "gzip"), (2, 6), b"hello!")
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.size, 6)
+
+    def test_eviction(self):
+        cache = system.VariantCache(max_size=10)
+        cache.set("first", 1, b"12345")
+        cache.set("second", 1, b"1234")
+        self.assertEqual(cache.size, 9)
+
+        # uses the first entry so that the second one becomes the
+        # least recently used and is the one evicted on overflow
+        self.assertEqual(cache.get("first", 1), b"12345")
+        cache.set("third", 1, b"123")
+        self.assertEqual(cache.get("second", 1), None)
+        self.assertEqual(cache.get("first", 1), b"12345")
+        self.assertEqual(cache.get("third", 1), b"123")
+        self.assertEqual(cache.size, 8)
+
+        # verifies that contents larger than the cache are not
+        # stored (and that they don't evict the other entries)
+        cache.set("fourth", 1, b"12345678901")
+        self.assertEqual(cache.get("fourth", 1), None)
+        self.assertEqual(len(cache), 2)
+
+
+class EncodingTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Encoding test case"
+
+    def setUp(self):
+        colony.ColonyTestCase.setUp(self)
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "hello.txt")
+        self._write(self.path, b"hello world")
+
+    def tearDown(self):
+        colony.ColonyTestCase.tearDown(self)
+        shutil.rmtree(self.directory)
+
+    def test_accepted_encodings(self):
+        service = system.ServiceHTTPFile(mocks.MockPlugin())
+
+        request = mocks.MockRequest({"Accept-Encoding": "gzip;q=0.5, Deflate, br;q=x"})
+        encodings = service._accepted_encodings(request)
+        self.assertEqual(encodings, dict(gzip=0.5, deflate=1.0, br=0.0))
+        self.assertEqual(service._is_accepted(encodings, "gzip"), True)
+        self.assertEqual(service._is_accepted(encodings, "br"), False)
+        self.assertEqual(service._is_accepted(encodings, "compress"), False)
+        self.assertEqual(service._is_accepted(encodings, "identity"), True)
+
+        # verifies that the wildcard matches the encodings that are
+        # not explicitly listed (including the identity one)
+        request = mocks.MockRequest({"Accept-Encoding": "*, deflate;q=0"})
+        encodings = service._accepted_encodings(request)
+        self.assertEqual(service._is_accepted(encodings, "gzip"), True)
+        self.assertEqual(service._is_accepted(encodings, "deflate"), False)
+        self.assertEqual(service._is_accepted(encodings, "identity"), True)
+
+        request = mocks.MockRequest({"Accept-Encoding": "gzip, *;q=0"})
+        encodings = service._accepted_encodings(request)
+        self.assertEqual(service._is_accepted(encodings, "gzip"), True)
+        self.assertEqual(service._is_accepted(encodings, "identity"), False)
+
+        request = mocks.MockRequest({"Accept-Encoding": "identity;q=0"})
+        encodings = service._accepted_encodings(request)
+        self.assertEqual(service._is_accepted(encodings, "identity"), False)
+
+        request = mocks.MockRequest()
+        encodings = service._accepted_encodings(request)
+        self.assertEqual(encodings, {})
+        self.assertEqual(service._is_accepted(encodings, "gzip"), False)
+        self.assertEqual(service._is_accepted(encodings, "identity"), True)
+
+    def test_select_sidecar(self):
+        service = system.ServiceHTTPFile(mocks.MockPlugin())
+        file_stat = os.stat(self.path)
+
+        # verifies that without a sidecar file (and no service
+        # encoding) the file is sent as is (no vary header)
+        request = mocks.MockRequest({"Accept-Encoding": "gzip"})
+        self.assertEqual(service._select_encoding(request, self.path, file_stat), None)
+        self.assertEqual(request.response_headers, {})
+
+        # creates a fresh sidecar file and verifies that it's selected
+        # for the clients that accept gzip (explicitly or wildcard)
+        service = system.ServiceHTTPFile(mocks.MockPlugin())
+        self._write(self.path + ".gz", b"compressed")
+        for accept_encoding in ("gzip", "*", "deflate, *;q=0.1"):
+            request = mocks.MockRequest({"Accept-Encoding": accept_encoding})
+            encoding = service._select_encoding(request, self.path, file_stat)
+            self.assertEqual(encoding, "gzip")
+            self.assertEqual(request.response_headers, {"Vary": "Accept-Encoding"})
+
+        for accept_encoding in ("deflate", "gzip;q=0", "*;q=0", None):
+            headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+            request = mocks.MockRequest(headers)
+            encoding = service._select_encoding(request, self.path, file_stat)
+            self.assertEqual(encoding, None)
+            self.assertEqual(request.response_headers, {"Vary": "Accept-Encoding"})
+
+        # makes the sidecar older than the file (stale) and verifies
+        # that it's no longer selected
+        service = system.ServiceHTTPFile(mocks.MockPlugin())
+        mtime = file_stat.st_mtime
+        os.utime(self.path + ".gz", (mtime - 10, mtime - 10))
+        request = mocks.MockRequest({"Accept-Encoding": "gzip"})
+        self.assertEqual(service._select_encoding(request, self.path, file_stat), None)
+
+    def test_select_service(self):
+        service = system.ServiceHTTPFile(mocks.MockPlugin())
+        file_stat = os.stat(self.path)
+        gzip = mocks.MockService(encoding="gzip")
+
+        request = mocks.MockRequest({"Accept-Encoding": "gzip"}, gzip)
+        encoding = service._select_encoding(request, self.path, file_stat)
+        self.assertEqual(encoding, "gzip")
+        self.assertEqual(request.response_headers, {"Vary": "Accept-Encoding"})
+
+        request = mocks.MockRequest({"Accept-Encoding": "deflate"}, gzip)
+        self.assertEqual(service._select_encoding(request, self.path, file_stat), None)
+
+        # verifies that files over the size limit are not selected
+        # (encoded by the service) unless the client refuses the
+        # identity encoding, for which the variant is the only option
+        service.handler_configuration["variant_size_limit"] = 4
+        request = mocks.MockRequest({"Accept-Encoding": "gzip"}, gzip)
+        self.assertEqual(service._select_encoding(request, self.path, file_stat), None)
+        request = mocks.MockRequest({"Accept-Encoding": "gzip, identity;q=0"}, gzip)
+        encoding = service._select_encoding(request, self.path, file_stat)
+        self.assertEqual(encoding, "gzip")
+
+        service.handler_configuration["variant_cache"] = False
+        request = mocks.MockRequest({"Accept-Encoding": "*"}, gzip)
+        self.assertEqual(service._select_encoding(request, self.path, file_stat), None)
+
+    def test_open_variant(self):
+        service = system.ServiceHTTPFile(mocks.MockPlugin())
+        file_stat = os.stat(self.path)
+        gzip = mocks.MockService(encoding="gzip")
+
+        # opens the variant with no sidecar file, encoding it with
+        # the service encoding handler and caching the result
+        request = mocks.MockRequest({"Accept-Encoding": "gzip"}, gzip)
+        file, size = service._open_variant(request, self.path, file_stat, "gzip")
+        self.assertEqual(file.read(), b"encoded:hello world")
+        self.assertEqual(size, 19)
+        self.assertEqual(gzip.encoded, [b"hello world"])
+        self.assertEqual(os.path.exists(self.path + ".gz"), False)
+
+        # verifies that the second opening uses the variant cache
+        # (no new encoding of the contents)
+        file, size = service._open_variant(request, self.path, file_stat, "gzip")
+        self.assertEqual(file.read(), b"encoded:hello world")
+        self.assertEqual(gzip.encoded, [b"hello world"])
+
+        # enables the writing of the sidecar file and verifies that
+        # it's written on a cache miss (new service instance)
+        service = system.ServiceHTTPFile(mocks.MockPlugin())
+        service.handler_configuration["sidecar"] = True
+        file, size = service._open_variant(request, self.path, file_stat, "gzip")
+        self.assertEqual(self._read(self.path + ".gz"), b"encoded:hello world")
+        self.assertEqual(os.path.exists(self.path + ".gz.tmp"), False)
+
+        # changes the contents of the sidecar file and verifies that
+        # they're used as is for a new service (precompressed contents)
+        service = system.ServiceHTTPFile(mocks.MockPlugin())
+        self._write(self.path + ".gz", b"compressed")
+        file, size = service._open_variant(request, self.path, file_stat, "gzip")
+        try:
+            self.assertEqual(file.read(), b"compressed")
+            self.assertEqual(size, 10)
+        finally:
+            file.close()
+        self.assertEqual(len(gzip.encoded), 2)
+
+    def _write(self, path, contents):
+        file = open(path, "wb")
+        try:
+            file.write(contents)
+        finally:
+            file.close()
+
+    def _read(self, path):
+        file = open(path, "rb")
+        try:
+            return file.read()
+        finally:
+            file.close()
+
+
+class FileCacheTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "File Cache test case"
+
+    def setUp(self):
+        colony.ColonyTestCase.setUp(self)
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "hello.txt")
+        self._write(self.path, b"hello world")
+
+    def tearDown(self):
+        colony.ColonyTestCase.tearDown(self)
+        shutil.rmtree(self.directory)
+
+    def test_resolve(self):
+        cache = system.FileCache(ttl=0.05)
+        resolved = []
+
+        def resolver(name):
+            resolved.append(name)
+            return "/" + name
+
+        self.assertEqual(cache.resolve("base", resolver), "/base")
+        self.assertEqual(cache.resolve("base", resolver), "/base")
+        self.assertEqual(resolved, ["base"])
+
+        # waits for the expiration of the entry and verifies that
+        # the path is resolved again (revalidation)
+        time.sleep(0.1)
+        self.assertEqual(cache.resolve("base", resolver), "/base")
+        self.assertEqual(resolved, ["base", "base"])
+        self.assertEqual(cache.stats()["path_hits"], 1)
+        self.assertEqual(cache.stats()["path_misses"], 2)
+
+    def test_stat(self):
+        cache = system.FileCache(ttl=0.05)
+        missing = os.path.join(self.directory, "missing.txt")
+
+        self.assertEqual(cache.stat(self.path).st_size, 11)
+        self.assertEqual(cache.stat(missing), None)
+
+        # changes the file and verifies that the cached stat result is
+        # used until the TTL expires, after which it's refreshed
+        self._write(self.path, b"hello world!")
+        self._write(missing, b"hello")
+        self.assertEqual(cache.stat(self.path).st_size, 11)
+        self.assertEqual(cache.stat(missing), None)
+        time.sleep(0.1)
+        self.assertEqual(cache.stat(self.path).st_size, 12)
+        self.assertEqual(cache.stat(missing).st_size, 5)
+
+        stats = cache.stats()
+        self.assertEqual(stats["stat_hits"], 2)
+        self.assertEqual(stats["stat_misses"], 4)
+        self.assertEqual(stats["stat_rate"], 2.0 / 6.0)
+
+    def test_contents(self):
+        cache = system.FileCache(max_contents=16)
+        file_stat = os.stat(self.path)
+
+        self.assertEqual(cache.contents(self.path, file_stat), b"hello world")
+        self.assertEqual(cache.contents(self.path, file_stat), b"hello world")
+        self.assertEqual(cache.stats()["contents_hits"], 1)
+
+        # changes the file (new version) and verifies that the contents
+        # are read again, replacing the previous ones in the cache
+        self._write(self.path, b"hello world!")
+        file_stat = os.stat(self.path)
+        self.assertEqual(cache.contents(self.path, file_stat), b"hello world!")
+        self.assertEqual(cache.contents_size, 12)
+
+        # reads a second file that overflows the contents limit, which
+        # evicts the least recently used contents (first file)
+        other = os.path.join(self.directory, "other.txt")
+        self._write(other, b"other")
+        cache.contents(other, os.stat(other))
+        self.assertEqual(list(cache.contents_map.keys()), [other])
+        self.assertEqual(cache.contents_size, 5)
+
+    def test_open(self):
+        if not hasattr(os, "pread"):
+            return
+
+        cache = system.FileCache()
+        file_stat = os.stat(self.path)
+
+        # opens the file twice and verifies that the same descriptor
+        # is shared (one reference for the cache and one per file)
+        # and that each file keeps its own position
+        first = cache.open(self.path, file_stat)
+        second = cache.open(self.path, file_stat)
+        entry = first.entry
+        self.assertEqual(second.entry is entry, True)
+        self.assertEqual(entry.references, 3)
+        self.assertEqual(first.read(5), b"hello")
+        self.assertEqual(second.read(), b"hello world")
+        self.assertEqual(first.read(), b" world")
+        second.seek(-5, os.SEEK_END)
+        self.assertEqual(second.read(), b"world")
+        self.assertEqual(second.tell(), 11)
+
+        # closes the files (twice for the first one) and verifies that
+        # the references are released but the descriptor is kept open
+        # as it's still referenced by the cache
+        first.close()
+        first.close()
+        second.close()
+        self.assertEqual(entry.references, 1)
+        os.fstat(entry.fd)
+
+        # changes the file (new version) and verifies that a new entry
+        # is created, while the descriptor of the previous one is only
+        # closed once the request holding it is closed
+        first = cache.open(self.path, file_stat)
+        self._write(self.path, b"hello world!")
+        second = cache.open(self.path, os.stat(self.path))
+        self.assertEqual(second.entry is entry, False)
+        self.assertEqual(entry.references, 1)
+        self.assertEqual(first.read(), b"hello world")
+        first.close()
+        self.assertEqual(entry.references, 0)
+        self.assertRaises(OSError, os.fstat, entry.fd)
+        self.assertEqual(second.read(), b"hello world!")
+        second.close()
+
+        stats = cache.stats()
+        self.assertEqual(stats["open_hits"], 2)
+        self.assertEqual(stats["open_misses"], 2)
+        self.assertEqual(stats["open_entries"], 1)
+
+    def test_eviction(self):
+        if not hasattr(os, "pread"):
+            return
+
+        cache = system.FileCache(max_entries=1)
+        other = os.path.join(self.directory, "other.txt")
+        self._write(other, b"other")
+
+        # opens two files in a cache limited to one entry, so that the
+        # first one is evicted while still being read by a request
+        first = cache.open(self.path, os.stat(self.path))
+        second = cache.open(other, os.stat(other))
+        self.assertEqual(list(cache.files_map.keys()), [other])
+        self.assertEqual(first.entry.references, 1)
+        self.assertEqual(first.read(), b"hello world")
+        first.close()
+        self.assertRaises(OSError, os.fstat, first.entry.fd)
+
+        # clears the cache and verifies that the descriptor still in
+        # use by the request is only closed once it's released
+        cache.clear()
+        self.assertEqual(cache.stats()["open_entries"], 0)
+        self.assertEqual(second.read(), b"other")
+        second.close()
+        self.assertRaises(OSError, os.fstat, second.entry.fd)
+
+    def _write(self, path, contents):
+        file = open(path, "wb")
+        try:
+            file.write(contents)
+        finally:
+            file.close()
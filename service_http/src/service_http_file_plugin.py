@@ -46,7 +46,7 @@ class ServiceHTTPFilePlugin(colony.Plugin):
         colony.JYTHON_ENVIRONMENT,
         colony.IRON_PYTHON_ENVIRONMENT,
     ]
-    capabilities = ["http_service_handler"]
+    capabilities = ["http_service_handler", "test"]
     capabilities_allowed = ["directory_handler"]
     dependencies = [
         colony.PluginDependency("pt.hive.colony.plugins.format.mime"),
@@ -59,6 +59,7 @@ class ServiceHTTPFilePlugin(colony.Plugin):
         import service_http_file
 
         self.system = service_http_file.ServiceHTTPFile(self)
+        self.test = service_http_file.ServiceHTTPFileTest(self)
 
     @colony.load_allowed
     def load_allowed(self, plugin, capability):
@@ -96,6 +97,17 @@ class ServiceHTTPFilePlugin(colony.Plugin):
 
         return self.system.handle_request(request)
 
+    def get_cache_stats(self):
+        """
+        Retrieves the statistics (counters and hit rates) of the
+        file cache, to be used for diagnostics.
+
+        :rtype: Dictionary
+        :return: The map containing the statistics of the file cache.
+        """
+
+        return self.system.get_cache_stats()
+
     @colony.load_allowed_capability("directory_handler")
     def directory_handler_load_allowed(self, plugin, capability):
         self.system.directory_handler_load(plugin)
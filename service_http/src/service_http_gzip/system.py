@@ -51,3 +51,11 @@ class ServiceHTTPGzip(colony.System):
 
         # returns the contents string encoded
         return contents_string_encoded
+
+    def encode_stream(self):
+        # retrieves the gzip plugin
+        gzip_plugin = self.plugin.gzip_plugin
+
+        # creates a new streaming gzip compressor to be used
+        # in the chunk by chunk encoding of the contents
+        return gzip_plugin.gzip_stream()
@@ -57,3 +57,6 @@ class ServiceHTTPGzipPlugin(colony.Plugin):
 
     def encode_contents(self, contents_string):
         return self.system.encode_contents(contents_string)
+
+    def encode_stream(self):
+        return self.system.encode_stream()
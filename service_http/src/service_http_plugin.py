@@ -85,6 +85,9 @@ class ServiceHTTPPlugin(colony.Plugin):
     def stop_service(self, parameters):
         return self.system.stop_service(parameters)
 
+    def reload_service(self, parameters):
+        return self.system.reload_service(parameters)
+
     @colony.load_allowed_capability("http_service_handler")
     def http_service_handler_load_allowed(self, plugin, capability):
         self.system.http_service_handler_load(plugin)
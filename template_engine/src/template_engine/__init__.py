@@ -26,8 +26,10 @@ __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
 from . import ast
+from . import compiler
 from . import exceptions
 from . import system
+from . import test
 from . import util
 from . import visitor
 
@@ -42,6 +44,7 @@ from .ast import (
     SingleNode,
     CompositeNode,
 )
+from .compiler import Compiler
 from .exceptions import (
     TemplateEngineException,
     RuntimeError,
@@ -53,6 +56,7 @@ from .exceptions import (
     InvalidBooleanValue,
     InvalidSerializer,
 )
-from .system import TemplateEngine
+from .system import TemplateEngine, TemplateCache
+from .test import TemplateEngineTest
 from .util import Accessor, accessor
 from .visitor import Visitor, EvalVisitor
@@ -91,6 +91,12 @@ purely textual and a convention defines that if it starts with an 'n' character
 a negation should be done in the final boolean evaluation (not) """
 
 
+MUTABLE_TYPES = ("root", "include", "extends", "block", "cycle")
+""" The types of nodes whose structure or state is changed during
+the processing of the template, these nodes (and their ancestors)
+must be cloned for each processing of a cached tree """
+
+
 class AstNode(object):
     """
     The AST node class, this is the top level abstract
@@ -118,6 +124,11 @@ class AstNode(object):
     children of the current node, the maximum number
     of children is not limited """
 
+    static = None
+    """ Flag that controls if the sub tree of the node is
+    static (not changed by processing), computed on demand
+    by the is static method """
+
     def __init__(self):
         self.children = []
         self.supers = []
@@ -139,6 +150,55 @@ class AstNode(object):
     def set_value(self, value):
         self.value = value
 
+    def is_static(self):
+        """
+        Verifies if the sub tree of the current node is static, meaning
+        that neither its structure nor its state is changed during the
+        processing of the template (no mutable nodes in the sub tree).
+
+        The result is computed once and stored in the node.
+
+        :rtype: bool
+        :return: If the sub tree of the current node is static.
+        """
+
+        if self.static == None:
+            static = not self.get_type() in MUTABLE_TYPES
+            for child in self.children:
+                static = child.is_static() and static
+            self.static = static
+        return self.static
+
+    def clone(self):
+        """
+        Creates a structural copy of the current node and of its
+        sub tree, so that the processing (that changes the structure
+        of the tree) may be done without changing the original tree.
+
+        Static sub trees are not copied but shared, as they are
+        not changed during processing, the same happens for the
+        (immutable) values and attributes of the copied nodes.
+
+        :rtype: AstNode
+        :return: The cloned node or the node itself in case its
+        sub tree is static.
+        """
+
+        if self.is_static():
+            return self
+
+        cls = self.__class__
+        node = cls.__new__(cls)
+        node.__dict__.update(self.__dict__)
+        node.parent = None
+        node.super = None
+        node.children = [child.clone() for child in self.children]
+        for child in node.children:
+            if child.static:
+                continue
+            child.parent = node
+        return node
+
     def get_type(self):
         return "ast"
 
@@ -170,6 +230,11 @@ class RootNode(AstNode):
     the root and aggregating node and with no value set.
     """
 
+    compiled = None
+    """ The compiled (python) function for the tree of the root
+    node, this function is set by the template engine in case the
+    compilation mode is enabled and shared by the clones """
+
     def __init__(self):
         AstNode.__init__(self)
 
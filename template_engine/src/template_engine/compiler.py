@@ -0,0 +1,551 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import xml.sax.saxutils
+
+import colony
+
+from . import ast
+from . import visitor
+from . import exceptions
+
+INLINE_TYPES = (
+    "out",
+    "set",
+    "var",
+    "for",
+    "foreach",
+    "if",
+    "else",
+    "elif",
+    "cycle",
+    "count",
+    "block",
+)
+""" The types of nodes that are compiled into (inline) python
+code, the remaining nodes are delegated to the visitor and
+so processed by the interpreter at runtime """
+
+INLINE_METHODS = tuple("process_" + type for type in INLINE_TYPES)
+""" The names of the visitor methods for the inline types, the
+replacement of any of these methods disables the compiled code """
+
+CONDITION_TYPES = ("else", "elif", "endif")
+""" The types of the nodes that change the acceptance flag
+of the children of an if node (conditional branching) """
+
+INDENT = "    "
+""" The indentation string to be used in each level of
+the generated python source code """
+
+
+def _super():
+    return None
+
+
+class Compiler(object):
+    """
+    The compiler class for the template engine, responsible
+    for the conversion of a parsed (abstract syntax) tree into
+    a python function that generates the same output as the
+    interpreter (visitor) with the variable names, filters and
+    literal values computed once at compile time.
+
+    The generated function receives the (loaded) visitor and
+    a state map and writes the output to the visitor buffer.
+    """
+
+    lines = []
+    """ The list of lines of python source code that have
+    been generated for the tree that is being compiled """
+
+    constants = {}
+    """ The map associating the name of the global symbols of
+    the generated code with their values (constants and nodes) """
+
+    counter = 0
+    """ The counter used for the generation of unique names for
+    both the constants and the local variables of the code """
+
+    def __init__(self):
+        self.lines = []
+        self.constants = dict(
+            _unicode=colony.legacy.UNICODE,
+            _escape=xml.sax.saxutils.escape,
+            _quote=colony.quote,
+            _is_dictionary=colony.is_dictionary,
+            _conversion_map=visitor.CONVERSION_MAP,
+            _not_iterable=exceptions.VariableNotIterable,
+            _super=_super,
+        )
+        self.counter = 0
+
+    def compile(self, root_node):
+        """
+        Compiles the provided root node into a python function
+        with the same semantics as the visit of the tree.
+
+        Templates that extend other templates are not compiled as
+        the extends operation replaces the tree being processed.
+
+        :type root_node: RootNode
+        :param root_node: The (pristine) root node of the tree
+        that is going to be compiled.
+        :rtype: Function
+        :return: The compiled function or an invalid value in case
+        the tree is not able to be compiled.
+        """
+
+        if self._has_type(root_node, "extends"):
+            return None
+
+        self._line(0, "def render(_v, _s):")
+        self._line(1, "_w = _v.write")
+        self._line(1, "_g = _v.global_map")
+        self._line(1, "_f = _v.filters")
+        self._line(1, "_rm = _v._resolve_names")
+        self._line(1, "_rl = _v._resolve_locale")
+        self._line(1, "_bv = _v.get_boolean_value")
+        self._line(1, "_sv = _v._serialize_value")
+        self._line(1, "_ve = _v.variable_encoding")
+        self._line(1, "_v.visit(%s)" % self._constant(root_node))
+        for child in root_node.children:
+            self._node(child, 1)
+
+        # compiles the generated source code and runs it in a namespace
+        # containing the constants, note that trees too deep for the python
+        # compiler (nested blocks) are left to the interpreter
+        source = "\n".join(self.lines) + "\n"
+        namespace = dict(self.constants)
+        try:
+            code = compile(source, "<template>", "exec")
+        except (SyntaxError, RuntimeError):
+            return None
+        exec(code, namespace)
+        return namespace["render"]
+
+    def _node(self, node, depth):
+        if isinstance(node, ast.LiteralNode):
+            value = visitor.LITERAL_ESCAPE_REGEX.sub("$", node.value.value)
+            self._line(depth, "_w(%s)" % self._constant(value))
+            return
+
+        # in case the node is an inline one tries to generate its code,
+        # falling back to the interpreter (rollback of the code) in case
+        # the node is invalid (errors are then raised at runtime)
+        type = node.get_type() if hasattr(node, "get_attributes") else None
+        if type in INLINE_TYPES:
+            index = len(self.lines)
+            try:
+                method = getattr(self, "_node_" + type)
+                method(node, depth)
+                return
+            except Exception:
+                del self.lines[index:]
+
+        # delegates the node to the interpreter, cloning it first in case
+        # its processing changes the node (eg: include operations)
+        name = self._constant(node)
+        if node.is_static():
+            self._line(depth, "%s.accept(_v)" % name)
+        else:
+            self._line(depth, "%s.clone().accept(_v)" % name)
+
+    def _node_out(self, node, depth):
+        attributes = node.get_attributes()
+        meta = self._constant(attributes)
+
+        localize = self._boolean(attributes.get("localize", None), True)
+
+        value = attributes["value"]
+        value_n = self._value(value, depth, meta=meta, localize=localize)
+        prefix = self._value(
+            attributes.get("prefix", None), depth, localize=localize, default=""
+        )
+        format = attributes.get("format", None)
+        format_n = self._value(format, depth)
+        quote = self._boolean(attributes.get("quote", None))
+
+        # the xml escape flag may be changed by the filters of the value
+        # (eg: safe filter) so in such case it's read at runtime
+        xml_escape = attributes.get("xml_escape", None)
+        if self._filters(value):
+            xml_escape = self._local("xml_escape")
+            self._line(
+                depth, "%s = _bv(%s.get('xml_escape', None))" % (xml_escape, meta)
+            )
+        else:
+            xml_escape = self._boolean(xml_escape)
+        newline_convert = self._boolean(attributes.get("newline_convert", None))
+        convert = attributes.get("convert", None)
+        convert_n = self._value(convert, depth)
+        allow_empty = self._value(
+            attributes.get("allow_empty", None), depth, default=True
+        )
+        default = self._value(attributes.get("default", None), depth, localize=localize)
+        serializer = attributes.get("serializer", None)
+        serializer = serializer["value"] if serializer else None
+
+        if format:
+            self._line(
+                depth,
+                "%s = %s %% %s if %s and not %s == None else %s"
+                % (value_n, format_n, value_n, format_n, value_n, value_n),
+            )
+
+        invalid = self._local("invalid")
+        self._line(depth, "%s = (None,) if %s else (None, '')" % (invalid, allow_empty))
+        self._line(depth, "if %s in %s: %s = %s" % (value_n, invalid, value_n, default))
+        self._line(
+            depth, "if not (%s in %s and %s == None):" % (value_n, invalid, default)
+        )
+        depth += 1
+
+        if serializer:
+            self._line(
+                depth,
+                "%s = _v._get_serializer(%s)[0].dumps(%s)"
+                % (value_n, self._constant(serializer), value_n),
+            )
+        self._line(depth, "%s = _sv(%s)" % (value_n, value_n))
+        self._line(
+            depth,
+            "%s = type(%s) == _unicode and %s or _unicode(%s)"
+            % (value_n, value_n, value_n, value_n),
+        )
+        if convert:
+            method = self._local("method")
+            self._line(depth, "if %s:" % convert_n)
+            self._line(
+                depth + 1, "%s = _conversion_map.get(%s, None)" % (method, convert_n)
+            )
+            self._line(
+                depth + 1,
+                "%s = %s(%s) if %s else %s"
+                % (value_n, method, value_n, method, value_n),
+            )
+        self._line(depth, "if _ve: %s = %s.encode(_ve)" % (value_n, value_n))
+        if quote:
+            self._line(depth, "%s = %s.encode('utf-8')" % (value_n, value_n))
+            self._line(depth, "%s = _quote(%s, safe='/')" % (value_n, value_n))
+        if xml_escape:
+            self._line(depth, "if %s:" % xml_escape)
+            self._line(depth + 1, "%s = _escape(%s)" % (value_n, value_n))
+            self._line(
+                depth + 1, "%s = %s.replace('\"', '&quot;')" % (value_n, value_n)
+            )
+        if newline_convert:
+            self._line(depth, "%s = %s.replace('\\n', '<br/>')" % (value_n, value_n))
+        self._line(depth, "_w(%s + %s)" % (prefix, value_n))
+
+    def _node_set(self, node, depth):
+        self._node_var(node, depth)
+
+    def _node_var(self, node, depth):
+        attributes = node.get_attributes()
+        item = attributes["item"]["value"]
+        value = self._value(attributes["value"], depth)
+        self._line(depth, "_g[%s] = %s" % (self._constant(item), value))
+
+    def _node_for(self, node, depth):
+        self._node_foreach(node, depth)
+
+    def _node_foreach(self, node, depth):
+        attributes = node.get_attributes()
+        iterable = self._value(attributes["from"], depth)
+        item = self._literal(attributes.get("item", None))
+        index_ref = self._literal(attributes.get("index", None))
+        key_ref = self._literal(attributes.get("key", None))
+        start_index = self._literal(attributes.get("start_index", None))
+        index = self._local("index")
+        self._line(
+            depth, "%s = %d" % (index, int(start_index[1:-1]) if start_index else 1)
+        )
+
+        # in case the value is not iterable it's either an error (strict
+        # mode) or it's converted into a sequence (fallback strategy)
+        from_value = self._constant(attributes["from"]["value"])
+        self._line(depth, "if not hasattr(%s, '__iter__'):" % iterable)
+        self._line(depth + 1, "if _v.strict_mode:")
+        self._line(
+            depth + 2, "raise _not_iterable('value not iterable: ' + %s)" % from_value
+        )
+        self._line(
+            depth + 1, "elif not %s == None: %s = [%s]" % (iterable, iterable, iterable)
+        )
+        self._line(depth + 1, "else: %s = []" % iterable)
+
+        length = self._local("length")
+        loop = self._local("loop")
+        self._line(depth, "%s = len(%s)" % (length, iterable))
+        self._line(depth, "_g['loop'] = _g.get('loop', {})")
+        self._line(depth, "_g['loop']['length'] = %s" % length)
+        self._line(depth, "_g['loop']['cycle'] = _v._loop_cycle")
+        is_map = self._local("is_map")
+        self._line(depth, "%s = _is_dictionary(%s)" % (is_map, iterable))
+
+        # in case the item name is not defined the names of the values
+        # to be set depend on the type of the iterable (runtime)
+        if item:
+            item, key_ref, index_ref = (
+                self._constant(item),
+                self._constant(key_ref),
+                self._constant(index_ref),
+            )
+        else:
+            names = [self._local(name) for name in ("item", "key", "index")]
+            self._line(
+                depth,
+                "%s, %s, %s = (%s, %s, %s) if %s else (%s, None, None)"
+                % (
+                    names[0],
+                    names[1],
+                    names[2],
+                    self._constant(item),
+                    self._constant(key_ref),
+                    self._constant(index_ref),
+                    is_map,
+                    self._constant(key_ref),
+                ),
+            )
+            item, key_ref, index_ref = names
+
+        element = self._local("element")
+        first = self._local("first")
+        last = self._local("last")
+        self._line(depth, "for %s in %s:" % (element, iterable))
+        self._line(depth + 1, "%s = %s == 1" % (first, index))
+        self._line(depth + 1, "%s = %s == len(%s)" % (last, index, iterable))
+        self._line(depth + 1, "%s = _g['loop'] = _g.get('loop', {})" % loop)
+        self._line(depth + 1, "%s['index'] = %s" % (loop, index))
+        self._line(depth + 1, "%s['index0'] = %s - 1" % (loop, index))
+        self._line(depth + 1, "%s['first'] = %s" % (loop, first))
+        self._line(depth + 1, "%s['last'] = %s" % (loop, last))
+        self._line(depth + 1, "_g['is_first'] = %s" % first)
+        self._line(depth + 1, "_g['is_last'] = %s" % last)
+        self._line(
+            depth + 1,
+            "if %s: _g[%s] = %s[%s] if %s else %s"
+            % (item, item, iterable, element, is_map, element),
+        )
+        self._line(depth + 1, "if %s: _g[%s] = %s" % (index_ref, index_ref, index))
+        self._line(
+            depth + 1,
+            "if %s: _g[%s] = %s if %s else %s"
+            % (key_ref, key_ref, element, is_map, index),
+        )
+        self._line(depth + 1, "if _v.visit_childs:")
+        self._line(depth + 2, "pass")
+        for child in node.children:
+            self._node(child, depth + 2)
+        self._line(depth + 1, "%s += 1" % index)
+
+    def _node_if(self, node, depth):
+        accept = self._local("accept")
+        self._line(depth, "%s = %s" % (accept, self._comparison(node, depth)))
+
+        # the children are generated inside a (single iteration) loop so
+        # that the processing of them may be stopped at any point
+        self._line(depth, "while _v.visit_childs:")
+        for child in node.children:
+            type = child.get_type()
+            condition = isinstance(child, (ast.MatchNode, ast.EvalNode))
+            condition = condition and type in CONDITION_TYPES
+            if condition:
+                self._line(depth + 1, "if %s: break" % accept)
+                if type == "elif":
+                    comparison = self._comparison(child, depth + 1)
+                    self._line(depth + 1, "%s = %s" % (accept, comparison))
+                else:
+                    self._line(depth + 1, "%s = True" % accept)
+            self._line(depth + 1, "if %s == None: break" % accept)
+            self._line(depth + 1, "if %s:" % accept)
+            self._line(depth + 2, "pass")
+            if condition and type in ("else", "elif"):
+                continue
+            self._node(child, depth + 2)
+        self._line(depth + 1, "break")
+
+    def _node_else(self, node, depth):
+        self._line(depth, "pass")
+
+    def _node_elif(self, node, depth):
+        self._line(depth, "pass")
+
+    def _node_cycle(self, node, depth):
+        attributes = node.get_attributes()
+        values = self._value(attributes["values"], depth)
+        index = self._local("index")
+        key = self._constant(self._local("cycle"))
+        self._line(depth, "%s = %s.split(',')" % (values, values))
+        self._line(depth, "%s = _s.get(%s, None)" % (index, key))
+        self._line(depth, "if %s == None: %s = 0" % (index, index))
+        self._line(depth, "elif %s == len(%s) - 1: %s = 0" % (index, values, index))
+        self._line(depth, "else: %s += 1" % index)
+        self._line(depth, "_s[%s] = %s" % (key, index))
+        self._line(depth, "_w(%s[%s])" % (values, index))
+
+    def _node_count(self, node, depth):
+        attributes = node.get_attributes()
+        value = self._value(attributes["value"], depth)
+        self._line(depth, "%s = 0 if %s == None else len(%s)" % (value, value, value))
+        self._line(
+            depth,
+            "%s = type(%s) == _unicode and %s or _unicode(%s)"
+            % (value, value, value, value),
+        )
+        self._line(depth, "if _ve: %s = %s.encode(_ve)" % (value, value))
+        self._line(depth, "_w(%s)" % value)
+
+    def _node_block(self, node, depth):
+        # as templates with extends are not compiled the block has no
+        # super block and so the super function returns nothing
+        self._line(depth, "_g['super'] = _super")
+        self._line(depth, "if _v.visit_childs:")
+        self._line(depth + 1, "pass")
+        for child in node.children:
+            self._node(child, depth + 1)
+
+    def _comparison(self, node, depth):
+        attributes = node.get_attributes()
+        item = self._value(attributes["item"], depth)
+        value = self._value(attributes.get("value", None), depth)
+        operator = self._literal(attributes.get("operator", None))
+        comparison = visitor.COMPARISION_FUNCTIONS.get(operator, None)
+        if not comparison:
+            return item
+        return "%s(%s, %s)" % (self._constant(comparison), item, value)
+
+    def _value(self, attribute, depth, meta="None", localize=False, default=None):
+        """
+        Generates the code for the retrieval of the value of the
+        provided attribute, the semantics are the same as the ones
+        of the get value method of the visitor.
+
+        :type attribute: Dictionary
+        :param attribute: A map describing the attribute structure.
+        :type depth: int
+        :param depth: The indentation level of the generated code.
+        :type meta: String
+        :param meta: The expression for the meta-information map that
+        is passed to the filters (eg: XML escaping).
+        :type localize: bool
+        :param localize: If the value must be localized using the locale
+        bundles available at runtime.
+        :type default: Object
+        :param default: The default (fallback) value to be used if no
+        valid attribute is provided.
+        :rtype: String
+        :return: The name of the local variable that is going to hold
+        the value of the attribute at runtime.
+        """
+
+        name = self._local("value")
+        if not attribute:
+            self._line(depth, "%s = %s" % (name, self._constant(default)))
+            return name
+
+        # splits the original value into the variable name and filters
+        # and pre-computes the partial names of the variable, so that no
+        # parsing of the names is done at runtime
+        parts = attribute["original"].split("|")
+        filters = self._filters(attribute)
+        variable_name = parts[0].strip()
+        if not attribute["type"] == "variable":
+            value = self._constant(attribute["value"])
+        elif variable_name == "None":
+            value = "None"
+        else:
+            value = "_rm(%s)" % self._constant(self._names(variable_name))
+        if localize:
+            value = "_rl(%s)" % value
+        self._line(depth, "%s = %s" % (name, value))
+
+        for filter in filters:
+            self._line(
+                depth,
+                "%s = _rm(%s, %s, %s, _v, global_map=_f)"
+                % (name, self._constant(self._names(filter)), name, meta),
+            )
+
+        return name
+
+    def _filters(self, attribute):
+        if not attribute:
+            return []
+        parts = attribute["original"].split("|")
+        return [filter.strip() for filter in parts[1:]]
+
+    def _names(self, name):
+        # splits the complete variable name into its partial names
+        # using the same (regex) strategy as the visitor resolution
+        names = []
+        matches = visitor.NAMES_REGEX.finditer(name)
+        for match in matches:
+            names.append(name[match.start() : match.end()])
+        return tuple(names)
+
+    def _literal(self, attribute):
+        if attribute == None:
+            return None
+        return attribute["value"]
+
+    def _boolean(self, attribute, default=False):
+        if attribute == None:
+            return default
+        if type(attribute) == bool:
+            return attribute
+        value = attribute["value"]
+        if type(value) == bool:
+            return value
+        raise exceptions.InvalidBooleanValue("invalid boolean " + value)
+
+    def _has_type(self, node, type):
+        if node.get_type() == type:
+            return True
+        for child in node.children:
+            if self._has_type(child, type):
+                return True
+        return False
+
+    def _constant(self, value):
+        if value in (None, True, False) and type(value) in (type(None), bool):
+            return repr(value)
+        self.counter += 1
+        name = "_k%d" % self.counter
+        self.constants[name] = value
+        return name
+
+    def _local(self, name):
+        self.counter += 1
+        return "_%s%d" % (name, self.counter)
+
+    def _line(self, depth, line):
+        self.lines.append(INDENT * depth + line)
@@ -30,11 +30,14 @@ __license__ = "Apache License, Version 2.0"
 
 import os
 import re
+import threading
+import collections
 
 import colony
 
 from . import ast
 from . import visitor
+from . import compiler
 from . import exceptions
 
 OUTPUT_REGEX_VALUE = r"\{\{[^\}]*\}\}"
@@ -163,6 +166,11 @@ ESCAPE_EXTENSIONS = (
 for which the autoescape mode will be enabled  by
 default as expected by the end developer """
 
+CACHE_SIZE = 256
+""" The default maximum number of parsed templates that are
+kept in the template cache, after this limit is reached the
+least recently used templates are discarded """
+
 
 class TemplateEngine(colony.System):
     """
@@ -172,6 +180,21 @@ class TemplateEngine(colony.System):
     based on a visitor strategy.
     """
 
+    template_cache = None
+    """ The cache of parsed templates (root nodes) indexed by file
+    path and encoding, used to avoid the parsing of the same template
+    file for every processing (unless it changes) """
+
+    compile_mode = False
+    """ If the (cached) templates should be compiled into python
+    functions, avoiding the interpretation of the tree in every
+    processing, the generated output is the same in both modes """
+
+    def __init__(self, plugin):
+        colony.System.__init__(self, plugin)
+        self.template_cache = TemplateCache()
+        self.compile_mode = colony.conf("TEMPLATE_COMPILE", False, cast=bool)
+
     def parse_file_path(
         self,
         file_path,
@@ -180,33 +203,75 @@ class TemplateEngine(colony.System):
         process_methods_list=[],
         locale_bundles=None,
     ):
-        # verifies that the template file requested exists in the
-        # file system in case it does not raises an exception
-        if not os.path.exists(file_path):
+        # retrieves the stat information on the template file, in
+        # case it does not exist in the file system raises an exception
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
             raise exceptions.RuntimeError("'%s' template file not found" % file_path)
 
-        # opens the file for the reading of its contents
-        # the complete data will be read
-        file = open(file_path, "rb")
+        # creates the key and the version of the template file, the version
+        # is used to verify if the cached value is still valid (not changed)
+        # and tries to retrieve the parsed root node from the template cache
+        key = (os.path.abspath(file_path), encoding)
+        version = (file_stat.st_mtime, file_stat.st_size)
+        root_node = self.template_cache.get(key, version)
+
+        # in case there's no valid parsed root node in the cache the
+        # template file must be read and parsed and the resulting
+        # root node stored in the cache for latter usage
+        if root_node == None:
+            # opens the file for the reading of its contents
+            # the complete data will be read
+            file = open(file_path, "rb")
+
+            try:
+                # reads the complete set of contents from the file
+                # and parses them into the (abstract syntax) tree
+                file_contents = self._read_contents(file, encoding)
+                root_node = self.parse_contents(file_contents, file_path=file_path)
+            finally:
+                # closes the file no further reading operations
+                # will be done for the file (avoids leaks)
+                file.close()
+
+            # computes the static sub trees of the parsed root node (to be
+            # shared by the clones) and stores it in the template cache, note
+            # that this root node is never processed directly (pristine)
+            root_node.is_static()
+            self.template_cache.set(key, version, root_node)
+
+        # in case the compile mode is enabled and the cached root node
+        # was not yet compiled compiles it, the compiled function is then
+        # shared by the clones (false value for templates not compilable)
+        if self.compile_mode and root_node.compiled == None:
+            root_node.compiled = compiler.Compiler().compile(root_node) or False
+
+        # creates the template file for a clone of the cached root node, as
+        # the processing of the template changes the structure of the tree
+        # (eg: include and extends operations) and returns it
+        return self._template_file(
+            root_node.clone(),
+            file_path=file_path,
+            base_path=base_path,
+            encoding=encoding,
+            process_methods_list=process_methods_list,
+            locale_bundles=locale_bundles,
+        )
+
+    def invalidate(self, file_path=None):
+        """
+        Invalidates the cached (parsed) template for the given file
+        path, so that it's parsed again in the next usage.
 
-        try:
-            # parses the file, retrieving the template file structure
-            # that can be used for the execution of it
-            template_file = self.parse_file(
-                file,
-                file_path=file_path,
-                base_path=base_path,
-                encoding=encoding,
-                process_methods_list=process_methods_list,
-                locale_bundles=locale_bundles,
-            )
-        finally:
-            # closes the file no further reading operations
-            # will be done for the file (avoids leaks)
-            file.close()
-
-        # returns the template file
-        return template_file
+        In case no file path is provided the complete set of cached
+        templates is invalidated.
+
+        :type file_path: String
+        :param file_path: The path to the template file to be invalidated.
+        """
+
+        self.template_cache.invalidate(file_path=file_path)
 
     def parse_file_path_variable_encoding(
         self,
@@ -241,25 +306,27 @@ class TemplateEngine(colony.System):
         process_methods_list=[],
         locale_bundles=None,
     ):
-        # in case the locale bundles list is not defined must
-        # create a new list reference to handle it correctly
-        if locale_bundles == None:
-            locale_bundles = []
+        # reads the complete set of file contents and parses them
+        # into the (abstract syntax) tree and then creates the template
+        # file structure for the resulting root node
+        file_contents = self._read_contents(file, encoding)
+        root_node = self.parse_contents(file_contents, file_path=file_path)
+        return self._template_file(
+            root_node,
+            file_path=file_path,
+            base_path=base_path,
+            encoding=encoding,
+            process_methods_list=process_methods_list,
+            locale_bundles=locale_bundles,
+        )
 
+    def parse_contents(self, file_contents, file_path=None):
         # retrieves the proper extension of the template's file
         # path and then uses it to try to determine if the template
         # output operation should be automatically escaped
         extension = self._extension(file_path)
         xml_escape = self._extension_in(extension, ESCAPE_EXTENSIONS)
 
-        # reads the complete set of file contents and in case an
-        # encoding is defined decodes the provided file contents
-        # using the encoding value (may raise exception)
-        file_contents = file.read()
-        is_bytes = type(file_contents) == colony.legacy.BYTES
-        if encoding and is_bytes:
-            file_contents = file_contents.decode(encoding)
-
         # creates the match orderer list, this list will hold the various
         # definitions of matched tokens for the current template, and is
         # meant to be ordered two times for processing
@@ -486,6 +553,34 @@ class TemplateEngine(colony.System):
                 parent_node = stack[-1]
                 parent_node.add_child(node)
 
+        # returns the root node of the abstract syntax tree that
+        # has just been created for the template contents
+        return root_node
+
+    def _read_contents(self, file, encoding):
+        # reads the complete set of file contents and in case an
+        # encoding is defined decodes the provided file contents
+        # using the encoding value (may raise exception)
+        file_contents = file.read()
+        is_bytes = type(file_contents) == colony.legacy.BYTES
+        if encoding and is_bytes:
+            file_contents = file_contents.decode(encoding)
+        return file_contents
+
+    def _template_file(
+        self,
+        root_node,
+        file_path=None,
+        base_path=None,
+        encoding=None,
+        process_methods_list=[],
+        locale_bundles=None,
+    ):
+        # in case the locale bundles list is not defined must
+        # create a new list reference to handle it correctly
+        if locale_bundles == None:
+            locale_bundles = []
+
         # creates the template file structure that is going to be
         # used to represent the template in a abstract way this is
         # going to be the interface structure with the end user
@@ -651,6 +746,11 @@ class TemplateFile(object):
     the node reference that it corresponds, this map may be used for
     abstract syntax tree manipulations (eg: inheritance manipulation) """
 
+    compiled_state = {}
+    """ The map containing the state of the nodes (eg: cycle index)
+    for the processing of the template using the compiled function
+    of the root node, kept between processing operations """
+
     def __init__(
         self,
         manager=None,
@@ -691,6 +791,7 @@ class TemplateFile(object):
         self.visitor = visitor.EvalVisitor(self) if eval else visitor.Visitor(self)
         self.locale_bundles = []
         self.nodes = {}
+        self.compiled_state = {}
 
         self.index_nodes()
 
@@ -923,9 +1024,14 @@ class TemplateFile(object):
         # sets the complete set of attributes in the visitor
         # that is currently set in the template and then runs
         # the accept operation in the root node, this will
-        # trigger the generation of the template contents
+        # trigger the generation of the template contents, note
+        # that the compiled function is used instead if available
         self.load_visitor()
-        self.root_node.accept(self.visitor)
+        compiled = self._get_compiled()
+        if compiled:
+            compiled(self.visitor, self.compiled_state)
+        else:
+            self.root_node.accept(self.visitor)
 
         # retrieves the visitor string buffer, that should now
         # contains the final contents from template generation
@@ -1009,6 +1115,28 @@ class TemplateFile(object):
         self.locale_bundles.append(bundle)
         self.visitor.add_bundle(bundle)
 
+    def _get_compiled(self):
+        """
+        Retrieves the compiled function of the root node in case
+        it's able to be used with the current visitor, meaning that
+        the visitor is the default one and that no process method
+        of the compiled nodes has been replaced.
+
+        :rtype: Function
+        :return: The compiled function for the root node or an
+        invalid value in case it should not be used.
+        """
+
+        compiled = self.root_node.compiled
+        if not compiled:
+            return None
+        if not type(self.visitor) == visitor.Visitor:
+            return None
+        for method_name, _method in self.visitor.process_methods_list:
+            if method_name in compiler.INLINE_METHODS:
+                return None
+        return compiled
+
     def _index_node(self, node):
         """
         Index the provided template node, making sure that
@@ -1021,9 +1149,106 @@ class TemplateFile(object):
         current template infra-structure.
         """
 
+        if node.is_static():
+            return
         type = node.get_type()
         id = node.get_id()
         if type == "block":
             self.nodes[id] = node
         for node in node.children:
             self._index_node(node)
+
+
+class TemplateCache(object):
+    """
+    The template cache class, that keeps the parsed (root)
+    nodes of the template files in a least recently used
+    fashion, so that the same template file is not parsed
+    again until it changes in the file system.
+    """
+
+    max_size = CACHE_SIZE
+    """ The maximum number of entries in the cache, after
+    which the least recently used entries are discarded """
+
+    entries = None
+    """ The ordered map associating the key (path and encoding)
+    with the version and the root node, the order of the map
+    is the usage order (most recent at the end) """
+
+    lock = None
+    """ The lock that controls the access to the entries, as
+    templates may be parsed from multiple threads """
+
+    def __init__(self, max_size=CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = collections.OrderedDict()
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, version):
+        """
+        Retrieves the root node cached for the given key in case
+        it's still valid for the provided version.
+
+        :type key: Tuple
+        :param key: The key (path and encoding) of the template.
+        :type version: Tuple
+        :param version: The current version of the template file
+        (modification time and size).
+        :rtype: RootNode
+        :return: The cached root node or an invalid value in case
+        there's no valid entry for the key.
+        """
+
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry == None:
+                return None
+            _version, root_node = entry
+            if not _version == version:
+                return None
+            self.entries[key] = entry
+            return root_node
+
+    def set(self, key, version, root_node):
+        """
+        Sets the root node for the given key and version, discarding
+        the least recently used entries in case the limit is reached.
+
+        :type key: Tuple
+        :param key: The key (path and encoding) of the template.
+        :type version: Tuple
+        :param version: The version of the template file that was
+        used in the parsing of the root node.
+        :type root_node: RootNode
+        :param root_node: The (pristine) parsed root node.
+        """
+
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (version, root_node)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, file_path=None):
+        """
+        Invalidates the entries for the given file path (for every
+        encoding) or the complete set of entries in case no file
+        path is provided.
+
+        :type file_path: String
+        :param file_path: The path of the template file to be invalidated.
+        """
+
+        with self.lock:
+            if file_path == None:
+                self.entries.clear()
+                return
+            file_path = os.path.abspath(file_path)
+            for key in list(self.entries.keys()):
+                if not key[0] == file_path:
+                    continue
+                del self.entries[key]
@@ -0,0 +1,336 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import time
+import shutil
+import tempfile
+
+import colony
+
+from . import system
+from . import mocks
+from . import exceptions
+
+
+class TemplateEngineTest(colony.Test):
+    """
+    The template engine infra-structure test class, responsible
+    for the returning of the associated tests.
+    """
+
+    def get_bundle(self):
+        return (TemplateCacheTestCase, TemplateCompilerTestCase)
+
+    def set_up(self, test_case):
+        colony.Test.set_up(self, test_case)
+
+    def tear_down(self, test_case):
+        colony.Test.tear_down(self, test_case)
+
+
+class TemplateCacheTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Template Cache test case"
+
+    def setUp(self):
+        colony.ColonyTestCase.setUp(self)
+        self.directory = tempfile.mkdtemp()
+        self.template_engine = system.TemplateEngine(mocks.MockPlugin())
+
+    def tearDown(self):
+        colony.ColonyTestCase.tearDown(self)
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, contents, mtime=None):
+        file_path = os.path.join(self.directory, name)
+        file = open(file_path, "wb")
+        try:
+            file.write(colony.legacy.bytes(contents))
+        finally:
+            file.close()
+        if mtime:
+            os.utime(file_path, (mtime, mtime))
+        return file_path
+
+    def _process(self, file_path, **kwargs):
+        template_file = self.template_engine.parse_file_path(
+            file_path, encoding="utf-8"
+        )
+        for name, value in colony.legacy.items(kwargs):
+            template_file.assign(name, value)
+        return template_file.process()
+
+    def test_cache(self):
+        file_path = self._write("hello.tpl", "hello {{ name }}", mtime=1000)
+
+        self.assertEqual(self._process(file_path, name="world"), "hello world")
+        self.assertEqual(self._process(file_path, name="colony"), "hello colony")
+        self.assertEqual(len(self.template_engine.template_cache), 1)
+
+        template_file = self.template_engine.parse_file_path(
+            file_path, encoding="ascii"
+        )
+        other_file = self.template_engine.parse_file_path(file_path, encoding="ascii")
+        self.assertNotEqual(template_file.root_node, other_file.root_node)
+        self.assertEqual(len(self.template_engine.template_cache), 2)
+
+    def test_modified(self):
+        file_path = self._write("hello.tpl", "hello {{ name }}", mtime=1000)
+        self.assertEqual(self._process(file_path, name="world"), "hello world")
+
+        self._write("hello.tpl", "bye {{ name }}", mtime=2000)
+        self.assertEqual(self._process(file_path, name="world"), "bye world")
+
+    def test_invalidate(self):
+        file_path = self._write("hello.tpl", "hello {{ name }}", mtime=1000)
+        self.assertEqual(self._process(file_path, name="world"), "hello world")
+
+        self._write("hello.tpl", "hallo {{ name }}", mtime=1000)
+        self.assertEqual(self._process(file_path, name="world"), "hello world")
+
+        self.template_engine.invalidate(file_path)
+        self.assertEqual(self._process(file_path, name="world"), "hallo world")
+
+        self.template_engine.invalidate()
+        self.assertEqual(len(self.template_engine.template_cache), 0)
+
+    def test_extends(self):
+        base_path = self._write(
+            "base.tpl", "<{% block body %}base{% endblock %}>", mtime=1000
+        )
+        file_path = self._write(
+            "child.tpl",
+            "{% extends 'base.tpl' %}{% block body %}{{ name }}{% endblock %}",
+            mtime=1000,
+        )
+
+        self.assertEqual(self._process(file_path, name="first"), "<first>")
+        self.assertEqual(self._process(file_path, name="second"), "<second>")
+        self.assertEqual(self._process(base_path), "<base>")
+
+    def test_include(self):
+        self._write("item.tpl", "[{{ value }}]", mtime=1000)
+        file_path = self._write(
+            "list.tpl",
+            "{% for value in values %}{% include 'item.tpl' %}{% endfor %}",
+            mtime=1000,
+        )
+
+        self.assertEqual(self._process(file_path, values=[1, 2]), "[1][2]")
+        self.assertEqual(self._process(file_path, values=[3]), "[3]")
+
+    def test_cycle(self):
+        file_path = self._write(
+            "cycle.tpl",
+            "{% for value in values %}${cycle values='a,b' /}{% endfor %}",
+            mtime=1000,
+        )
+
+        self.assertEqual(self._process(file_path, values=[1, 2, 3]), "aba")
+        self.assertEqual(self._process(file_path, values=[1, 2, 3]), "aba")
+
+    def test_lru(self):
+        template_cache = system.TemplateCache(max_size=2)
+        template_cache.set("a", 1, "a")
+        template_cache.set("b", 1, "b")
+
+        self.assertEqual(template_cache.get("a", 1), "a")
+
+        template_cache.set("c", 1, "c")
+
+        self.assertEqual(template_cache.get("b", 1), None)
+        self.assertEqual(template_cache.get("a", 1), "a")
+        self.assertEqual(template_cache.get("c", 1), "c")
+        self.assertEqual(template_cache.get("c", 2), None)
+        self.assertEqual(len(template_cache), 1)
+
+
+class TemplateCompilerTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Template Compiler test case"
+
+    def setUp(self):
+        colony.ColonyTestCase.setUp(self)
+        self.directory = tempfile.mkdtemp()
+        self.interpreter = system.TemplateEngine(mocks.MockPlugin())
+        self.interpreter.compile_mode = False
+        self.compiler = system.TemplateEngine(mocks.MockPlugin())
+        self.compiler.compile_mode = True
+
+    def tearDown(self):
+        colony.ColonyTestCase.tearDown(self)
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, contents):
+        file_path = os.path.join(self.directory, name)
+        file = open(file_path, "wb")
+        try:
+            file.write(colony.legacy.bytes(contents))
+        finally:
+            file.close()
+        return file_path
+
+    def _process(self, template_engine, file_path, strict_mode=False, **kwargs):
+        template_file = template_engine.parse_file_path(file_path, encoding="utf-8")
+        template_file.set_strict_mode(strict_mode)
+        template_file.add_bundle(dict(hello="ola"))
+        for name, value in colony.legacy.items(kwargs):
+            template_file.assign(name, value)
+        template_file.process()
+        return template_file.process()
+
+    def _assert_same(self, file_path, **kwargs):
+        interpreted = self._process(self.interpreter, file_path, **kwargs)
+        compiled = self._process(self.compiler, file_path, **kwargs)
+        self.assertEqual(interpreted, compiled)
+        return compiled
+
+    def test_out(self):
+        file_path = self._write(
+            "out.html.tpl",
+            "{{ name }}{{ html }}{{ html|safe }}{{ html|e }}{{ missing }}"
+            "{{ none|default('empty') }}{{ hello }}${out value=hello localize=False /}"
+            "${out value=number format='%05d' /}${out value=none default='none' /}"
+            "${out value=empty allow_empty=False default='empty' /}"
+            "${out value=text newline_convert=True /}${out value=url quote=True /}"
+            "${out value=name prefix='name:' /}${count value=values /}",
+        )
+
+        result = self._assert_same(
+            file_path,
+            name="world",
+            html="<b>",
+            none=None,
+            hello="hello",
+            number=42,
+            empty="",
+            text="a\nb",
+            url="a b",
+            values=[1, 2],
+        )
+        self.assertEqual(
+            result,
+            "world&lt;b&gt;<b>&amp;lt;b&amp;gt;emptyolahello00042none"
+            "emptya<br/>ba%20bname:world2" * 2,
+        )
+
+    def test_control(self):
+        file_path = self._write(
+            "control.tpl",
+            "{% for value in values %}{{ loop.index }}:{{ value }}"
+            "{% if loop.last %}.{% elif value > 1 %},{% else %};{% endif %}"
+            "${cycle values='a,b' /}{% endfor %}"
+            "{% for key, value in map %}{{ key }}={{ value }}{% endfor %}"
+            "${foreach item=value from=number index=index}{{ index }}{{ value }}${/foreach}"
+            "${if item=none}none${else /}other${/if}{% set other = number %}{{ other }}"
+            "{% block body %}body{% endblock %}",
+        )
+
+        result = self._assert_same(
+            file_path, values=[1, 2, 3], map=dict(key="value"), number=42, none=None
+        )
+        self.assertEqual(
+            result, "1:1;a2:2,b3:3.akey=value14242body1:1;b2:2,a3:3.bkey=value14242body"
+        )
+
+    def test_strict(self):
+        file_path = self._write("strict.tpl", "{{ missing }}")
+
+        self.assertEqual(self._assert_same(file_path), "")
+        self.assertRaises(
+            exceptions.UndefinedVariable,
+            lambda: self._process(self.compiler, file_path, strict_mode=True),
+        )
+
+    def test_fallback(self):
+        self._write("item.tpl", "[{{ value }}]")
+        file_path = self._write(
+            "list.tpl",
+            "{% for value in values %}{% include 'item.tpl' %}{% endfor %}",
+        )
+        base_path = self._write("base.tpl", "<{% block body %}{% endblock %}>")
+        child_path = self._write(
+            "child.tpl", "{% extends 'base.tpl' %}{% block body %}child{% endblock %}"
+        )
+
+        self.assertEqual(self._assert_same(file_path, values=[1, 2]), "[1][2][1][2]")
+        self.assertEqual(self._assert_same(child_path), "<child><child>")
+        self.assertEqual(self._assert_same(base_path), "<><>")
+
+        template_file = self.compiler.parse_file_path(file_path, encoding="utf-8")
+        self.assertNotEqual(template_file.root_node.compiled, None)
+        template_file = self.compiler.parse_file_path(child_path, encoding="utf-8")
+        self.assertEqual(template_file.root_node.compiled, False)
+
+    def test_process_method(self):
+        file_path = self._write("method.tpl", "${upper value=name /}{{ name }}")
+
+        def process_upper(self, node):
+            self.write(node.get_attributes()["value"]["value"].upper())
+
+        def process_out(self, node):
+            self.write("out")
+
+        for process_methods_list, expected in (
+            ((("process_upper", process_upper),), "NAMEname"),
+            ((("process_out", process_out),), "NAMEout"),
+        ):
+            template_file = self.compiler.parse_file_path(
+                file_path,
+                encoding="utf-8",
+                process_methods_list=process_methods_list
+                + (("process_upper", process_upper),),
+            )
+            template_file.assign("name", "name")
+            self.assertEqual(template_file.process(), expected)
+
+    def test_benchmark(self):
+        file_path = self._write(
+            "benchmark.html.tpl",
+            "<tr>{% for row in rows %}<td>{{ row.name }}</td><td>{{ row.value|e }}"
+            "</td>{% if row.value > 10 %}big{% else %}small{% endif %}"
+            "${out value=row.name prefix='-' /}{% endfor %}</tr>\n" * 20,
+        )
+        rows = [dict(name="name%d" % index, value=index) for index in range(50)]
+
+        results = []
+        for template_engine in (self.interpreter, self.compiler):
+            initial = time.time()
+            result = self._process(template_engine, file_path, rows=rows)
+            results.append((result, time.time() - initial))
+
+        (interpreted, _interpreted_time), (compiled, _compiled_time) = results
+        self.assertEqual(
+            colony.legacy.bytes(interpreted, encoding="utf-8"),
+            colony.legacy.bytes(compiled, encoding="utf-8"),
+        )
@@ -1109,6 +1109,11 @@ class Visitor(object):
             part = name[match.start() : match.end()]
             names.append(part)
 
+        # runs the resolution for the complete set of partial names
+        # and returns the final resolved value to the caller method
+        return self._resolve_names(names, *args, **kwargs)
+
+    def _resolve_names(self, names, *args, **kwargs):
         # sets the initial value of the resolution process as the current
         # global map and then starts the resolution running it for the
         # complete set of "partial" attribute names (iterative resolution)
@@ -46,7 +46,7 @@ class TemplateEnginePlugin(colony.Plugin):
         colony.JYTHON_ENVIRONMENT,
         colony.IRON_PYTHON_ENVIRONMENT,
     ]
-    capabilities = ["template_engine"]
+    capabilities = ["template_engine", "test"]
     main_modules = ["template_engine"]
 
     def load_plugin(self):
@@ -54,6 +54,7 @@ class TemplateEnginePlugin(colony.Plugin):
         import template_engine
 
         self.system = template_engine.TemplateEngine(self)
+        self.test = template_engine.TemplateEngineTest(self)
 
     def parse_template(self, file_path, base_path=".", encoding="utf-8"):
         return self.system.parse_file_path(
@@ -62,3 +63,6 @@ class TemplateEnginePlugin(colony.Plugin):
 
     def parse_file(self, file):
         return self.system.parse_file(file)
+
+    def invalidate_template(self, file_path=None):
+        return self.system.invalidate(file_path=file_path)
@@ -30,6 +30,7 @@ __license__ = "Apache License, Version 2.0"
 
 import copy
 import threading
+import collections
 
 import colony
 
@@ -45,6 +46,14 @@ CONSTANT_SCHEDULING_ALGORITHM = 1
 DYNAMIC_SCHEDULING_ALGORITHM = 2
 """ The dynamic size scheduling algorithm value """
 
+DEFAULT_GROW_THRESHOLD = 1
+""" The default number of tasks waiting in the queue (with
+no idle thread to handle them) for the pool to grow """
+
+DEFAULT_SHRINK_TIMEOUT = 5.0
+""" The default time (in seconds) a thread (above the base
+number of threads) must be idle for the pool to shrink """
+
 START_THREAD_TASK_TYPE = "start_thread"
 """ The start thread task type """
 
@@ -108,6 +117,8 @@ class ThreadPool(colony.System):
         number_threads=DEFAULT_NUMBER_THREADS,
         scheduling_algorithm=CONSTANT_SCHEDULING_ALGORITHM,
         maximum_number_threads=DEFAULT_MAXIMUM_NUMBER_THREADS,
+        grow_threshold=None,
+        shrink_timeout=None,
     ):
         """
         Creates a new thread pool with the given name, description
@@ -123,6 +134,12 @@ class ThreadPool(colony.System):
         :param scheduling_algorithm: The thread pool scheduling algorithm.
         :type maximum_number_threads: int
         :param maximum_number_threads: The thread pool maximum number of threads.
+        :type grow_threshold: int
+        :param grow_threshold: The number of tasks waiting in the queue (with
+        no idle thread to handle them) for the thread pool to grow.
+        :type shrink_timeout: float
+        :param shrink_timeout: The time (in seconds) a thread must be idle
+        for the thread pool to shrink.
         :rtype: ThreadPoolImplementation
         :return: The created thread pool.
         """
@@ -130,6 +147,17 @@ class ThreadPool(colony.System):
         # retrieves the logger
         logger = self.plugin.logger
 
+        # retrieves the grow and shrink (hysteresis) values, falling
+        # back to the ones defined in the configuration
+        if grow_threshold == None:
+            grow_threshold = colony.conf(
+                "THREAD_POOL_GROW_THRESHOLD", DEFAULT_GROW_THRESHOLD, cast=int
+            )
+        if shrink_timeout == None:
+            shrink_timeout = colony.conf(
+                "THREAD_POOL_SHRINK_TIMEOUT", DEFAULT_SHRINK_TIMEOUT, cast=float
+            )
+
         # creates a new thread pool
         thread_pool = ThreadPoolImplementation(
             name=name,
@@ -137,6 +165,8 @@ class ThreadPool(colony.System):
             number_threads=number_threads,
             scheduling_algorithm=scheduling_algorithm,
             maximum_number_threads=maximum_number_threads,
+            grow_threshold=grow_threshold,
+            shrink_timeout=shrink_timeout,
             logger=logger,
         )
 
@@ -243,20 +273,33 @@ class ThreadPoolImplementation(object):
     maximum_number_threads = DEFAULT_MAXIMUM_NUMBER_THREADS
     """ The thread pool maximum number of threads """
 
+    grow_threshold = DEFAULT_GROW_THRESHOLD
+    """ The number of tasks waiting in the queue (with no
+    idle thread to handle them) for the thread pool to grow """
+
+    shrink_timeout = DEFAULT_SHRINK_TIMEOUT
+    """ The time (in seconds) a thread (above the base number
+    of threads) must be idle for the thread pool to shrink """
+
     logger = None
     """ The logger used """
 
     worker_threads_list = []
     """ The thread pool list of worker threads """
 
-    task_queue = []
+    idle_threads = None
+    """ The stack (most recently idle at the end) of the worker
+    threads waiting for tasks, may contain stale entries """
+
+    task_queue = None
     """ The thread pool task queue """
 
-    task_descriptor_running_queue = []
-    """ The thread pool running task descriptor queue """
+    task_descriptors_running = set()
+    """ The thread pool set of running task descriptors """
 
-    task_condition = None
-    """ The thread pool task condition """
+    task_lock = None
+    """ The thread pool task lock, that controls the access
+    to the task queue and to the idle threads """
 
     current_number_threads = 0
     """ The thread pool current number of threads """
@@ -264,8 +307,9 @@ class ThreadPoolImplementation(object):
     busy_threads = 0
     """ The thread pool number of busy threads """
 
-    thread_size_modification_semaphore = None
-    """ The thread pool thread size modification semaphore """
+    starting_threads = 0
+    """ The thread pool number of threads that have been created
+    but that are not yet waiting for tasks (starting) """
 
     def __init__(
         self,
@@ -274,6 +318,8 @@ class ThreadPoolImplementation(object):
         number_threads=DEFAULT_NUMBER_THREADS,
         scheduling_algorithm=CONSTANT_SCHEDULING_ALGORITHM,
         maximum_number_threads=DEFAULT_MAXIMUM_NUMBER_THREADS,
+        grow_threshold=DEFAULT_GROW_THRESHOLD,
+        shrink_timeout=DEFAULT_SHRINK_TIMEOUT,
         logger=None,
     ):
         """
@@ -289,6 +335,12 @@ class ThreadPoolImplementation(object):
         :param scheduling_algorithm: The thread pool scheduling algorithm.
         :type maximum_number_threads: int
         :param maximum_number_threads: The thread pool maximum number of threads.
+        :type grow_threshold: int
+        :param grow_threshold: The number of tasks waiting in the queue (with
+        no idle thread to handle them) for the thread pool to grow.
+        :type shrink_timeout: float
+        :param shrink_timeout: The time (in seconds) a thread must be idle
+        for the thread pool to shrink.
         :type logger: Log
         :param logger: The logger used.
         """
@@ -298,18 +350,20 @@ class ThreadPoolImplementation(object):
         self.number_threads = number_threads
         self.scheduling_algorithm = scheduling_algorithm
         self.maximum_number_threads = maximum_number_threads
+        self.grow_threshold = grow_threshold
+        self.shrink_timeout = shrink_timeout
         self.logger = logger
 
         self.worker_threads_list = []
-        self.task_queue = []
-        self.task_descriptor_running_queue = []
+        self.idle_threads = collections.deque()
+        self.task_queue = collections.deque()
+        self.task_descriptors_running = set()
 
-        self.task_condition = threading.Condition()
+        self.task_lock = threading.Lock()
 
         self.current_number_threads = 0
         self.busy_threads = 0
-
-        self.thread_size_modification_semaphore = threading.Semaphore()
+        self.starting_threads = 0
 
     def start_pool(self):
         """
@@ -333,7 +387,7 @@ class ThreadPoolImplementation(object):
         self.insert_worker_thread_task_all(worker_thread_task)
 
         # iterates over all the threads to join them
-        for thread in self.worker_threads_list:
+        for thread in list(self.worker_threads_list):
             # joins the thread
             thread.join()
 
@@ -350,13 +404,11 @@ class ThreadPoolImplementation(object):
             # removes the task from the task queue
             self.remove_worker_thread_task(task)
 
-        # creates a copy of the task descriptor running queue (to stop the task)
-        task_descriptor_running_queue_copy = copy.copy(
-            self.task_descriptor_running_queue
-        )
+        # creates a copy of the running task descriptors (to stop the task)
+        task_descriptors_running_copy = copy.copy(self.task_descriptors_running)
 
         # iterates over all the task descriptors running in the task descriptor running queue
-        for task_descriptor_running in task_descriptor_running_queue_copy:
+        for task_descriptor_running in task_descriptors_running_copy:
             # stops the running task descriptor
             task_descriptor_running.stop_task([])
 
@@ -365,17 +417,17 @@ class ThreadPoolImplementation(object):
         Creates a worker thread for the thread pool
         """
 
-        # constructs a new worker thread
-        worker_thread = WorkerThread(self)
-
-        # start the worker thread
-        worker_thread.start()
-
-        # inserts the thread into the current list of threads
-        self.worker_threads_list.append(worker_thread)
-
         # increments the current number of threads
-        self.current_number_threads += 1
+        # (under the task lock as it's shared)
+        self.task_lock.acquire()
+        try:
+            self.current_number_threads += 1
+            self.starting_threads += 1
+        finally:
+            self.task_lock.release()
+
+        # starts the new worker thread
+        self._start_worker_thread()
 
     def destroy_worker_thread(self):
         """
@@ -396,91 +448,19 @@ class ThreadPoolImplementation(object):
         :param worker_thread: The worker thread to be notified about destruction.
         """
 
-        # in case the worker thread exists in the current list of threads
-        if worker_thread in self.worker_threads_list:
-            # removes the worker thread from the current list of threads
-            self.worker_threads_list.remove(worker_thread)
+        # acquires the task lock
+        self.task_lock.acquire()
 
-        # increments the current number of threads
-        self.current_number_threads -= 1
-
-    def refresh_thread_pool_size(self, increment_size=True):
-        """
-        Refreshes the thread pool size, growing it if necessary.
-
-        :type increment_size: bool
-        :param increment_size: The increment of decrement thread pool size value.
-        """
-
-        # in case the current scheduling algorithm is dynamic scheduling
-        if self.scheduling_algorithm == DYNAMIC_SCHEDULING_ALGORITHM:
-            # in case increment size is active
-            if increment_size:
-                # retrieves the length of the task queue
-                task_queue_length = len(self.task_queue)
-
-                # calculates the required number of threads
-                required_threads = self.busy_threads + task_queue_length
-
-                # in case the number of current threads is less or equal
-                # than the the number of required threads
-                if self.current_number_threads <= required_threads:
-                    # in case the current number of threads is less
-                    # than the maximum number of threads
-                    if self.current_number_threads < self.maximum_number_threads:
-                        # prints a debug message about the thread pool grow
-                        self.logger.debug("Thread pool (%s) grown" % self.name)
-
-                        # creates a new worker thread
-                        self.create_worker_thread()
-            else:
-                # in case the current number of threads is greater that the default number
-                if self.current_number_threads > self.number_threads:
-                    # retrieves the length of the task queue
-                    task_queue_length = len(self.task_queue)
-
-                    # calculates the required number of threads
-                    required_threads = self.busy_threads + task_queue_length
-
-                    # in case the current number of threads is greater than the number
-                    # of required threads
-                    if self.current_number_threads > required_threads:
-                        # prints a debug message about the thread pool shrink
-                        self.logger.debug("Thread pool (%s) shrank" % self.name)
-
-                        # retrieves the task queue size
-                        task_queue_size = len(self.task_queue)
-
-                        # retrieves the difference between the current number of threads
-                        # and the busy threads (non busy threads) plus the size of the task queue
-                        difference_threads = (
-                            self.current_number_threads
-                            - self.busy_threads
-                            - task_queue_size
-                        )
-
-                        # retrieves the difference between the current number of threads and the default number of threads
-                        difference_current_threads_and_number_threads = (
-                            self.current_number_threads - self.number_threads
-                        )
-
-                        # in case the first difference is bigger than the second
-                        if (
-                            difference_threads
-                            > difference_current_threads_and_number_threads
-                        ):
-                            number_threads_destroy = (
-                                difference_current_threads_and_number_threads
-                            )
-                        else:
-                            number_threads_destroy = difference_threads
-
-                        # destroys the defined number of threads
-                        for _n_thread_destroy in colony.legacy.xrange(
-                            number_threads_destroy
-                        ):
-                            # destroys a worker thread
-                            self.destroy_worker_thread()
+        try:
+            # removes the worker thread from the
+            # current list of threads (if present)
+            self._remove_worker_thread(worker_thread)
+
+            # decrements the current number of threads
+            self.current_number_threads -= 1
+        finally:
+            # releases the task lock
+            self.task_lock.release()
 
     def insert_task(self, task_descriptor, start_method_args=[]):
         """
@@ -578,7 +558,9 @@ class ThreadPoolImplementation(object):
 
     def insert_worker_thread_task(self, worker_thread_task, insert_at_end=True):
         """
-        Inserts a worker thread task into the task queue.
+        Inserts a worker thread task into the task queue, waking
+        one of the idle worker threads (the most recently idle) or
+        growing the thread pool in case there's none available.
 
         :type worker_thread_task: WorkerThreadTask
         :param worker_thread_task: The worker thread task to
@@ -588,16 +570,35 @@ class ThreadPoolImplementation(object):
         inserted at the end of the queue or not.
         """
 
-        # refreshes the thread pool size
-        self.refresh_thread_pool_size()
+        # acquires the task lock
+        self.task_lock.acquire()
 
-        self.task_condition.acquire()
-        if insert_at_end:
-            self.task_queue.append(worker_thread_task)
-        else:
-            self.task_queue.insert(0, worker_thread_task)
-        self.task_condition.notify()
-        self.task_condition.release()
+        try:
+            # inserts the worker thread task into the task queue
+            # and retrieves an idle worker thread to wake
+            self._insert_worker_thread_task(worker_thread_task, insert_at_end)
+            worker_thread = self._pop_idle_thread()
+
+            # in case there's no idle worker thread to handle the task
+            # checks if the thread pool should grow, reserving the thread
+            grow = not worker_thread and self._should_grow()
+            if grow:
+                self.current_number_threads += 1
+                self.starting_threads += 1
+        finally:
+            # releases the task lock
+            self.task_lock.release()
+
+        # wakes the idle worker thread (in case there's one)
+        worker_thread and worker_thread.wake()
+
+        # in case the thread pool should grow starts a new worker thread
+        if grow:
+            # prints a debug message about the thread pool grow
+            self.logger and self.logger.debug("Thread pool (%s) grown" % self.name)
+
+            # starts a new worker thread
+            self._start_worker_thread()
 
     def insert_worker_thread_task_all(self, worker_thread_task, insert_at_end=True):
         """
@@ -613,15 +614,27 @@ class ThreadPoolImplementation(object):
         inserted at the end of the queue or not.
         """
 
-        # iterates over the number of currently available threads
-        for _n_thread in colony.legacy.xrange(self.number_threads):
-            self.task_condition.acquire()
-            if insert_at_end:
-                self.task_queue.append(worker_thread_task)
-            else:
-                self.task_queue.insert(0, worker_thread_task)
-            self.task_condition.notify()
-            self.task_condition.release()
+        # acquires the task lock
+        self.task_lock.acquire()
+
+        try:
+            # inserts one worker thread task per currently available
+            # thread and retrieves all the idle threads to wake them
+            for _n_thread in colony.legacy.xrange(self.current_number_threads):
+                self._insert_worker_thread_task(worker_thread_task, insert_at_end)
+            worker_threads = []
+            while True:
+                worker_thread = self._pop_idle_thread()
+                if not worker_thread:
+                    break
+                worker_threads.append(worker_thread)
+        finally:
+            # releases the task lock
+            self.task_lock.release()
+
+        # wakes all the idle worker threads
+        for worker_thread in worker_threads:
+            worker_thread.wake()
 
     def remove_worker_thread_task(self, worker_thread_task):
         """
@@ -632,14 +645,172 @@ class ThreadPoolImplementation(object):
         from the task queue.
         """
 
-        # refreshes the thread pool size
-        self.refresh_thread_pool_size()
+        # acquires the task lock
+        self.task_lock.acquire()
+
+        try:
+            # removes the worker thread task from the task
+            # queue (in case it's still there)
+            if worker_thread_task in self.task_queue:
+                self.task_queue.remove(worker_thread_task)
+        finally:
+            # releases the task lock
+            self.task_lock.release()
+
+    def get_worker_thread_task(self, worker_thread):
+        """
+        Retrieves the next worker thread task to be processed by the
+        given worker thread, blocking until a task is available.
+
+        In case the thread pool is dynamic and the worker thread has
+        been idle for longer than the shrink timeout (and the pool is
+        above its base number of threads) an invalid value is returned
+        and the worker thread must exit (the pool shrinks).
+
+        :type worker_thread: WorkerThread
+        :param worker_thread: The worker thread that is going to
+        process the worker thread task.
+        :rtype: WorkerThreadTask
+        :return: The worker thread task to be processed or invalid
+        in case the worker thread must exit.
+        """
+
+        # acquires the task lock
+        self.task_lock.acquire()
+
+        try:
+            # in case this is the first task for the worker
+            # thread it's no longer considered to be starting
+            if not worker_thread.started:
+                worker_thread.started = True
+                self.starting_threads -= 1
+
+            # iterates continuously (until a
+            # task is retrieved or timeout)
+            while True:
+                # in case there are tasks in the queue pops the
+                # first one and marks the thread as busy
+                if self.task_queue:
+                    self.busy_threads += 1
+                    return self.task_queue.popleft()
+
+                # retrieves the idle timeout for the worker thread, only
+                # defined in case the thread pool is able to shrink
+                timeout = self._get_idle_timeout()
+
+                # registers the worker thread as idle and waits (without
+                # the task lock) to be woken, for a new task, or timeout
+                worker_thread.idle = True
+                worker_thread.wake_event.clear()
+                self.idle_threads.append(worker_thread)
+                self.task_lock.release()
+                try:
+                    woken = worker_thread.wake_event.wait(timeout)
+                finally:
+                    self.task_lock.acquire()
+
+                # in case the worker thread is still flagged as idle it
+                # was not popped for a task (its idle entry becomes stale)
+                timed_out = not woken and worker_thread.idle
+                worker_thread.idle = False
+
+                # in case the worker thread timed out and the thread pool
+                # is still able to shrink, removes the worker thread
+                if timed_out and self._get_idle_timeout() != None:
+                    self._remove_worker_thread(worker_thread)
+                    self.current_number_threads -= 1
+                    self.logger and self.logger.debug(
+                        "Thread pool (%s) shrank" % self.name
+                    )
+                    return None
+        finally:
+            # releases the task lock
+            self.task_lock.release()
+
+    def notify_task_finished(self, worker_thread):
+        """
+        Notifies the thread pool that the worker thread has
+        finished the processing of its current task.
+
+        :type worker_thread: WorkerThread
+        :param worker_thread: The worker thread that finished the task.
+        """
+
+        # acquires the task lock
+        self.task_lock.acquire()
+
+        try:
+            # decrements the number of busy threads
+            self.busy_threads -= 1
+        finally:
+            # releases the task lock
+            self.task_lock.release()
+
+    def _start_worker_thread(self):
+        """
+        Starts a new worker thread for the thread pool, the thread
+        must already be accounted in the current number of threads.
+        """
+
+        # constructs a new worker thread and inserts it
+        # into the current list of threads
+        worker_thread = WorkerThread(self)
+        self.worker_threads_list.append(worker_thread)
 
-        self.task_condition.acquire()
-        if worker_thread_task in self.task_queue:
-            self.task_queue.remove(worker_thread_task)
-        self.task_condition.notify()
-        self.task_condition.release()
+        # start the worker thread
+        worker_thread.start()
+
+    def _remove_worker_thread(self, worker_thread):
+        # in case the worker thread exists in the current list of threads
+        if worker_thread in self.worker_threads_list:
+            # removes the worker thread from the current list of threads
+            self.worker_threads_list.remove(worker_thread)
+
+    def _insert_worker_thread_task(self, worker_thread_task, insert_at_end):
+        # inserts the worker thread task at the end or
+        # at the beginning of the task queue
+        if insert_at_end:
+            self.task_queue.append(worker_thread_task)
+        else:
+            self.task_queue.appendleft(worker_thread_task)
+
+    def _pop_idle_thread(self):
+        # pops the most recently idle worker thread (the others
+        # are left to timeout allowing the pool to shrink) skipping
+        # the stale entries (no longer idle worker threads)
+        while self.idle_threads:
+            worker_thread = self.idle_threads.pop()
+            if not worker_thread.idle:
+                continue
+            worker_thread.idle = False
+            return worker_thread
+        return None
+
+    def _should_grow(self):
+        # in case the scheduling algorithm is not dynamic
+        # the thread pool never grows
+        if not self.scheduling_algorithm == DYNAMIC_SCHEDULING_ALGORITHM:
+            return False
+
+        # in case the maximum number of threads
+        # has been reached the thread pool can't grow
+        if self.current_number_threads >= self.maximum_number_threads:
+            return False
+
+        # the thread pool grows in case the number of tasks waiting
+        # in the queue (not to be handled by the threads that are
+        # starting) reached the grow threshold (hysteresis)
+        pending = len(self.task_queue) - self.starting_threads
+        return pending >= self.grow_threshold
+
+    def _get_idle_timeout(self):
+        # the idle worker threads only timeout in case the thread
+        # pool is dynamic and above its base number of threads
+        if not self.scheduling_algorithm == DYNAMIC_SCHEDULING_ALGORITHM:
+            return None
+        if self.current_number_threads <= self.number_threads:
+            return None
+        return self.shrink_timeout
 
 
 class WorkerThread(threading.Thread):
@@ -650,6 +821,17 @@ class WorkerThread(threading.Thread):
     thread_pool = None
     """ The thread pool associated with this worker tread """
 
+    wake_event = None
+    """ The event used to wake the worker thread (while idle) """
+
+    idle = False
+    """ If the worker thread is currently idle, waiting for tasks
+    (controlled by the thread pool under its task lock) """
+
+    started = False
+    """ If the worker thread has already started waiting
+    for tasks (controlled by the thread pool) """
+
     def __init__(self, thread_pool):
         """
         Constructor of the class
@@ -662,9 +844,17 @@ class WorkerThread(threading.Thread):
         threading.Thread.__init__(self)
 
         self.thread_pool = thread_pool
+        self.wake_event = threading.Event()
 
         self.daemon = True
 
+    def wake(self):
+        """
+        Wakes the worker thread, while it's idle waiting for tasks.
+        """
+
+        self.wake_event.set()
+
     def run(self):
         """
         Starts the run of the thread.
@@ -673,33 +863,16 @@ class WorkerThread(threading.Thread):
         # retrieves the thread pool
         thread_pool = self.thread_pool
 
-        # retrieves the task queue from the thread pool
-        task_queue = thread_pool.task_queue
-
-        # retrieves the task descriptor running queue from the thread pool
-        task_descriptor_running_queue = thread_pool.task_descriptor_running_queue
-
-        # retrieves the task condition from the thread pool
-        task_condition = thread_pool.task_condition
+        # retrieves the running task descriptors from the thread pool
+        task_descriptors_running = thread_pool.task_descriptors_running
 
         # iterates continuously
         while True:
-            # acquires the task condition
-            task_condition.acquire()
-
-            # iterates while the task queue is empty
-            while not len(task_queue):
-                # waits for the task condition
-                task_condition.wait()
-
-            # increments the number of busy threads
-            thread_pool.busy_threads += 1
-
-            # retrieves the worker thread task to process
-            worker_thread_task = task_queue.pop(0)
-
-            # releases the task condition
-            task_condition.release()
+            # retrieves the worker thread task to process (blocking)
+            # and in case there's none the thread must exit (shrink)
+            worker_thread_task = thread_pool.get_worker_thread_task(self)
+            if worker_thread_task == None:
+                return
 
             # retrieves the worker thread task type
             worker_thread_task_type = worker_thread_task.task_type
@@ -712,8 +885,8 @@ class WorkerThread(threading.Thread):
                 pass
             # in case the worker thread task type is stop thread
             elif worker_thread_task_type == STOP_THREAD_TASK_TYPE:
-                # decrements the number of busy threads
-                thread_pool.busy_threads -= 1
+                # notifies the thread pool about the finished task
+                thread_pool.notify_task_finished(self)
 
                 # notifies the thread pool about thread destruction
                 thread_pool.notify_thread_destroyed(self)
@@ -728,14 +901,15 @@ class WorkerThread(threading.Thread):
                 # sets the worker thread for the task descriptor
                 task_descriptor.set_worker_thread(self)
 
-                # adds the task descriptor to the queue of running tasks descriptors
-                task_descriptor_running_queue.append(task_descriptor)
-
-                # starts the task represented by the task descriptor
-                task_descriptor.start_task(start_method_args)
+                # adds the task descriptor to the running tasks descriptors
+                task_descriptors_running.add(task_descriptor)
 
-                # removes the task descriptor from the queue of running tasks descriptors
-                task_descriptor_running_queue.remove(task_descriptor)
+                try:
+                    # starts the task represented by the task descriptor
+                    task_descriptor.start_task(start_method_args)
+                finally:
+                    # removes the task descriptor from the running tasks descriptors
+                    task_descriptors_running.discard(task_descriptor)
             # in case the worker thread task type is stop task
             elif worker_thread_task_type == STOP_TASK_TASK_TYPE:
                 # retrieves the task descriptor and the stop method arguments
@@ -758,11 +932,8 @@ class WorkerThread(threading.Thread):
                 # resumes the task represented by the task descriptor
                 task_descriptor.resume_task(resume_method_args)
 
-            # decrements the number of busy threads
-            thread_pool.busy_threads -= 1
-
-            # refreshes the thread pool size shrinking it if necessary
-            thread_pool.refresh_thread_pool_size(False)
+            # notifies the thread pool about the finished task
+            thread_pool.notify_task_finished(self)
 
 
 class WorkerThreadTask(object):
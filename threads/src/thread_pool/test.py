@@ -0,0 +1,209 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import time
+import threading
+
+import colony
+
+from . import system
+
+
+class ThreadPoolTest(colony.Test):
+    """
+    The thread pool infra-structure test class, responsible
+    for the returning of the associated tests.
+    """
+
+    def get_bundle(self):
+        return (ThreadPoolImplementationTestCase,)
+
+    def set_up(self, test_case):
+        colony.Test.set_up(self, test_case)
+
+    def tear_down(self, test_case):
+        colony.Test.tear_down(self, test_case)
+
+
+class ThreadPoolImplementationTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Thread Pool Implementation test case"
+
+    def setUp(self):
+        colony.ColonyTestCase.setUp(self)
+        self.release = threading.Event()
+        self.started = []
+        self.pools = []
+
+    def tearDown(self):
+        colony.ColonyTestCase.tearDown(self)
+        self.release.set()
+        for pool in self.pools:
+            pool.stop_pool()
+
+    def test_wake_one(self):
+        pool = self._create_pool(number_threads=3)
+        self._wait(lambda: len(pool.idle_threads) == 3)
+
+        # wraps the wake method of the worker threads so that the
+        # number of threads woken for a single task is counted
+        woken = []
+        for worker_thread in pool.worker_threads_list:
+            worker_thread.wake = self._wrap_wake(worker_thread, woken)
+
+        # inserts a task and verifies that only the most recently
+        # idle worker thread is woken (the others remain idle)
+        last = pool.idle_threads[-1]
+        descriptor = self._insert_task(pool)
+        self._wait(lambda: len(self.started) == 1)
+        self.assertEqual(woken, [last])
+        self.assertEqual(descriptor.get_worker_thread(), last)
+        self.assertEqual(
+            len([thread for thread in pool.worker_threads_list if thread.idle]), 2
+        )
+        self.assertEqual(pool.current_number_threads, 3)
+
+    def test_grow(self):
+        pool = self._create_pool(
+            number_threads=1,
+            scheduling_algorithm=system.DYNAMIC_SCHEDULING_ALGORITHM,
+            maximum_number_threads=3,
+            grow_threshold=2,
+        )
+        self._wait(lambda: len(pool.idle_threads) == 1)
+
+        # occupies the only worker thread and verifies that the pool
+        # only grows once the queue reaches the grow threshold
+        self._insert_task(pool)
+        self._wait(lambda: len(self.started) == 1)
+        self._insert_task(pool)
+        self.assertEqual(pool.current_number_threads, 1)
+        self._insert_task(pool)
+        self.assertEqual(pool.current_number_threads, 2)
+        self.assertEqual(len(pool.worker_threads_list), 2)
+        self._wait(lambda: len(self.started) == 2)
+
+        # verifies that the pool does not grow above the
+        # maximum number of threads
+        for _index in range(4):
+            self._insert_task(pool)
+        self.assertEqual(pool.current_number_threads, 3)
+        self._wait(lambda: len(self.started) == 3)
+
+        # releases the tasks and verifies that all of them
+        # are processed by the (grown) pool
+        self.release.set()
+        self._wait(lambda: len(self.started) == 7)
+
+    def test_shrink(self):
+        pool = self._create_pool(
+            number_threads=1,
+            scheduling_algorithm=system.DYNAMIC_SCHEDULING_ALGORITHM,
+            maximum_number_threads=3,
+            grow_threshold=1,
+            shrink_timeout=0.1,
+        )
+        self._wait(lambda: len(pool.idle_threads) == 1)
+
+        self._insert_task(pool)
+        self._wait(lambda: len(self.started) == 1)
+        self._insert_task(pool)
+        self.assertEqual(pool.current_number_threads, 2)
+        self._wait(lambda: len(self.started) == 2)
+
+        # releases the tasks and verifies that the pool shrinks back
+        # to its base number of threads after the shrink timeout
+        self.release.set()
+        self._wait(lambda: pool.current_number_threads == 1)
+        self.assertEqual(len(pool.worker_threads_list), 1)
+        time.sleep(0.3)
+        self.assertEqual(pool.current_number_threads, 1)
+        self.assertEqual(pool.worker_threads_list[0].is_alive(), True)
+
+    def test_stop_pool(self):
+        pool = self._create_pool(
+            number_threads=1,
+            scheduling_algorithm=system.DYNAMIC_SCHEDULING_ALGORITHM,
+            maximum_number_threads=3,
+            grow_threshold=1,
+            shrink_timeout=60.0,
+        )
+
+        self._wait(lambda: len(pool.idle_threads) == 1)
+        self._insert_task(pool)
+        self._wait(lambda: len(self.started) == 1)
+        self._insert_task(pool)
+        self._wait(lambda: len(self.started) == 2)
+        self.release.set()
+        self._wait(lambda: pool.busy_threads == 0)
+
+        # stops the pool and verifies that the worker threads
+        # added by the growth are joined as well
+        worker_threads = list(pool.worker_threads_list)
+        self.assertEqual(len(worker_threads), 2)
+        self.pools.remove(pool)
+        pool.stop_pool()
+        for worker_thread in worker_threads:
+            self.assertEqual(worker_thread.is_alive(), False)
+        self.assertEqual(pool.current_number_threads, 0)
+        self.assertEqual(pool.worker_threads_list, [])
+
+    def _create_pool(self, **kwargs):
+        pool = system.ThreadPoolImplementation(**kwargs)
+        pool.start_pool()
+        self.pools.append(pool)
+        return pool
+
+    def _insert_task(self, pool):
+        def start():
+            self.started.append(threading.current_thread())
+            self.release.wait()
+
+        descriptor = system.TaskDescriptor(start_method=start)
+        pool.insert_task(descriptor)
+        return descriptor
+
+    def _wrap_wake(self, worker_thread, woken):
+        wake = worker_thread.wake
+
+        def _wake():
+            woken.append(worker_thread)
+            wake()
+
+        return _wake
+
+    def _wait(self, condition, timeout=5.0):
+        deadline = time.time() + timeout
+        while not condition():
+            if time.time() > deadline:
+                self.fail("condition not met in %.1f seconds" % timeout)
+            time.sleep(0.005)
@@ -46,7 +46,7 @@ class ThreadPoolPlugin(colony.Plugin):
         colony.JYTHON_ENVIRONMENT,
         colony.IRON_PYTHON_ENVIRONMENT,
     ]
-    capabilities = ["threads", "thread_pool", "system_information"]
+    capabilities = ["threads", "thread_pool", "system_information", "test"]
     main_modules = ["thread_pool"]
 
     def load_plugin(self):
@@ -54,6 +54,7 @@ class ThreadPoolPlugin(colony.Plugin):
         import thread_pool
 
         self.system = thread_pool.ThreadPool(self)
+        self.test = thread_pool.ThreadPoolTest(self)
 
     def unload_plugin(self):
         colony.Plugin.unload_plugin(self)
@@ -66,6 +67,8 @@ class ThreadPoolPlugin(colony.Plugin):
         number_threads,
         scheduling_algorithm,
         maximum_number_threads,
+        grow_threshold=None,
+        shrink_timeout=None,
     ):
         return self.system.create_new_thread_pool(
             name,
@@ -73,6 +76,8 @@ class ThreadPoolPlugin(colony.Plugin):
             number_threads,
             scheduling_algorithm,
             maximum_number_threads,
+            grow_threshold=grow_threshold,
+            shrink_timeout=shrink_timeout,
         )
 
     def get_thread_task_descriptor_class(self):
@@ -28,12 +28,15 @@ __license__ = "Apache License, Version 2.0"
 from . import algorithms
 from . import exceptions
 from . import system
+from . import test
 
 from .algorithms import (
     WorkPoolAlgorithm,
     RandomAlgorithm,
     RoundRobinAlgorithm,
     SmartBusyAlgorithm,
+    LoadAwareAlgorithm,
 )
 from .exceptions import WorkPoolException, WorkPoolOperationException
 from .system import WorkPool
+from .test import WorkPoolTest
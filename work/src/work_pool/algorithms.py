@@ -31,6 +31,14 @@ __license__ = "Apache License, Version 2.0"
 import random
 import threading
 
+BALANCE_RATIO = 2.0
+""" The ratio between the event rates of the most and the least
+loaded work tasks above which the work is rebalanced """
+
+BALANCE_THRESHOLD = 10.0
+""" The minimum event rate (events per second) of a work task
+for it to be considered loaded (source of work to be moved) """
+
 
 class WorkPoolAlgorithm(object):
     """
@@ -40,6 +48,11 @@ class WorkPoolAlgorithm(object):
     work_pool = None
     """ The associated work pool """
 
+    steal_timeout = None
+    """ The timeout (in seconds) after which an idle work task
+    tries to steal work from the other work tasks, in case it's
+    not defined the idle work tasks never steal work """
+
     def __init__(self, work_pool):
         """
         Constructor of the class.
@@ -88,6 +101,22 @@ class WorkPoolAlgorithm(object):
 
         return None
 
+    def balance(self, work_task=None):
+        """
+        Balances the work between the work tasks of the work
+        pool, called periodically (after the sampling of the
+        event rates) and by the idle work tasks.
+
+        :type work_task: WorkTask
+        :param work_task: The idle work task that is trying to
+        steal work, in case it's not defined this is a periodic
+        balance of the work pool.
+        :rtype: bool
+        :return: If any work has been moved between work tasks.
+        """
+
+        return False
+
 
 class RandomAlgorithm(WorkPoolAlgorithm):
     """
@@ -375,3 +404,101 @@ class SmartBusyAlgorithm(WorkPoolAlgorithm):
         # returns the difference between the first value work count
         # and the second value work count
         return first_value_work_count - second_value_work_count
+
+
+class LoadAwareAlgorithm(WorkPoolAlgorithm):
+    """
+    The load aware algorithm for work pool manager, that
+    takes into account the rate of events processed by the
+    work tasks and that moves long lived works from the most
+    loaded work tasks into the least loaded (or idle) ones.
+    """
+
+    steal_timeout = 1.0
+    """ The timeout (in seconds) after which an idle work task
+    tries to steal work from the other work tasks """
+
+    def get_next(self):
+        """
+        Retrieves the next element of the work
+        pool to be retrieved, according to the algorithm.
+
+        :rtype: Object
+        :return: The next element to be retrieved,
+        according to the algorithm.
+        """
+
+        # retrieves the work tasks that meet the work conditions
+        # and in case there's none returns invalid
+        work_tasks = [
+            work_task
+            for work_task in self.work_pool.work_tasks_list
+            if self.work_pool._check_conditions(work_task)
+        ]
+        if not work_tasks:
+            return None
+
+        # returns the least loaded of the work tasks
+        return min(work_tasks, key=self._get_load)
+
+    def balance(self, work_task=None):
+        """
+        Balances the work between the work tasks of the work
+        pool, moving one work from the most loaded work task
+        into the least loaded one (or into the idle work task).
+
+        :type work_task: WorkTask
+        :param work_task: The idle work task that is trying to
+        steal work, in case it's not defined this is a periodic
+        balance of the work pool.
+        :rtype: bool
+        :return: If any work has been moved between work tasks.
+        """
+
+        # retrieves the work task with the highest event rate as
+        # the source of the work, a single work can't be split
+        # between work tasks so it must contain more than one
+        work_tasks_list = self.work_pool.work_tasks_list
+        source_work_task = max(work_tasks_list, key=self._get_rate)
+        if source_work_task.work_counter < 2:
+            return False
+        if source_work_task.event_rate < BALANCE_THRESHOLD:
+            return False
+
+        # in case there's no (idle) work task stealing the work, the
+        # target is the work task with the lowest event rate, and the
+        # difference in the event rates must be significant
+        if work_task == None:
+            work_tasks = [
+                _work_task
+                for _work_task in work_tasks_list
+                if not _work_task == source_work_task
+                and self.work_pool._check_conditions(_work_task)
+            ]
+            if not work_tasks:
+                return False
+            work_task = min(work_tasks, key=self._get_rate)
+            if source_work_task.event_rate < work_task.event_rate * BALANCE_RATIO:
+                return False
+
+        # in case the target work task is the source one
+        # there's nothing to be moved
+        if work_task == source_work_task:
+            return False
+
+        # selects the work to be moved from the source work task and
+        # requests its migration into the target work task (executed
+        # by the source work task as soon as it finishes processing)
+        work_reference = source_work_task._select_work()
+        if work_reference == None:
+            return False
+        source_work_task.request_migration(work_reference, work_task)
+        return True
+
+    def _get_load(self, work_task):
+        # the load of the work task is the rate of events
+        # with each work counting (at least) as one event
+        return work_task.event_rate + work_task.work_counter
+
+    def _get_rate(self, work_task):
+        return work_task.event_rate
@@ -0,0 +1,119 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+
+class MockThreadPoolPlugin(object):
+    def create_new_thread_pool(
+        self,
+        name,
+        description,
+        number_threads,
+        scheduling_algorithm,
+        maximum_number_threads,
+    ):
+        return MockThreadPool()
+
+
+class MockThreadPool(object):
+    def __init__(self):
+        self.tasks = []
+        self.started = False
+
+    def start_pool(self):
+        self.started = True
+
+    def stop_pool(self):
+        self.started = False
+
+    def stop_pool_tasks(self):
+        pass
+
+    def insert_task(self, task_descriptor):
+        self.tasks.append(task_descriptor)
+
+
+class MockTaskDescriptor(object):
+    def __init__(
+        self, start_method=None, stop_method=None, pause_method=None, resume_method=None
+    ):
+        self.start_method = start_method
+        self.stop_method = stop_method
+        self.pause_method = pause_method
+        self.resume_method = resume_method
+
+
+class MockWorkProcessingTask(object):
+    def __init__(self):
+        self.works = []
+        self.woken = 0
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def process(self):
+        pass
+
+    def wake(self):
+        self.woken += 1
+
+    def busy(self):
+        return False
+
+    def work_added(self, work_reference):
+        self.works.append(work_reference)
+
+    def work_removed(self, work_reference):
+        self.works.remove(work_reference)
+
+    def detach_work(self, work_reference):
+        self.works.remove(work_reference)
+        return "state:" + work_reference
+
+    def attach_work(self, work_reference, state):
+        self.works.append(work_reference)
+        self.state = state
+
+
+class MockSimpleWorkProcessingTask(object):
+    def __init__(self):
+        self.works = []
+
+    def wake(self):
+        pass
+
+    def work_added(self, work_reference):
+        self.works.append(work_reference)
+
+    def work_removed(self, work_reference):
+        self.works.remove(work_reference)
@@ -28,6 +28,7 @@ __copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import time
 import threading
 
 import colony
@@ -59,10 +60,14 @@ ROUND_ROBIN_WORK_SCHEDULING_ALGORITHM = 2
 SMART_BUSY_WORK_SCHEDULING_ALGORITHM = 3
 """ The smart busy work scheduling algorithm value """
 
+LOAD_AWARE_WORK_SCHEDULING_ALGORITHM = 4
+""" The load aware work scheduling algorithm value """
+
 WORK_SCHEDULING_ALGORITHM_NAME_MAP = {
     RANDOM_WORK_SCHEDULING_ALGORITHM: "random",
     ROUND_ROBIN_WORK_SCHEDULING_ALGORITHM: "round_robin",
     SMART_BUSY_WORK_SCHEDULING_ALGORITHM: "smart_busy",
+    LOAD_AWARE_WORK_SCHEDULING_ALGORITHM: "load_aware",
 }
 """ The work scheduling algorithm name map """
 
@@ -70,9 +75,19 @@ WORK_SCHEDULING_ALGORITHM_CLASS_MAP = {
     RANDOM_WORK_SCHEDULING_ALGORITHM: algorithms.RandomAlgorithm,
     ROUND_ROBIN_WORK_SCHEDULING_ALGORITHM: algorithms.RoundRobinAlgorithm,
     SMART_BUSY_WORK_SCHEDULING_ALGORITHM: algorithms.SmartBusyAlgorithm,
+    LOAD_AWARE_WORK_SCHEDULING_ALGORITHM: algorithms.LoadAwareAlgorithm,
 }
 """ The work scheduling algorithm class map """
 
+SAMPLE_INTERVAL = 1.0
+""" The interval (in seconds) between the samplings of
+the event rates of the work tasks (and their works) """
+
+RATE_FACTOR = 0.5
+""" The smoothing factor used in the (exponential) moving
+average of the event rates, higher values favour the most
+recent samplings """
+
 
 class WorkPool(colony.System):
     """
@@ -185,14 +200,16 @@ class WorkPool(colony.System):
             work_pool_thread_pool = work_pool.thread_pool
             work_pool_work_tasks_list = work_pool.work_tasks_list
 
-            # starts the work pool work counter
+            # starts the work pool work counter and event rate
             work_pool_work_counter = 0
+            work_pool_event_rate = 0.0
 
             # iterates over all the work pool task in the work pool tasks list
             for work_pool_work_task in work_pool_work_tasks_list:
-                # increments the work pool work counter with the
-                # work pool work task work counter
+                # increments the work pool work counter and event rate
+                # with the work pool work task values
                 work_pool_work_counter += work_pool_work_task.work_counter
+                work_pool_event_rate += work_pool_work_task.event_rate
 
             # retrieves the work pool thread pool name
             work_pool_thread_pool_name = work_pool_thread_pool.name
@@ -211,9 +228,21 @@ class WorkPool(colony.System):
                 maximum_number_works_thread * work_pool_work_tasks_list_length,
             )
 
+            # creates the work pool load string, with the per work task
+            # event rates (allows the detection of unbalanced work tasks)
+            work_pool_load_string = "%.1f (%s)" % (
+                work_pool_event_rate,
+                " / ".join(
+                    "%.1f" % work_task.event_rate
+                    for work_task in work_pool_work_tasks_list
+                ),
+            )
+
             # sets the instance value for the work pool information
             work_pool_information[work_pool_name] = (
                 work_pool_work_string,
+                work_pool_load_string,
+                work_pool.migration_counter,
                 work_pool_scheduling_algorithm_name,
                 work_pool_thread_pool_name,
             )
@@ -222,6 +251,8 @@ class WorkPool(colony.System):
         work_pool_item_columns = [
             {"type": "name", "value": "Pool Name"},
             {"type": "value", "value": "CUR / MAX"},
+            {"type": "value", "value": "Events/s"},
+            {"type": "value", "value": "Moved"},
             {"type": "value", "value": "Algorithm"},
             {"type": "value", "value": "Thread Pool"},
         ]
@@ -295,6 +326,22 @@ class WorkPoolImplementation(object):
     algorithm_manager = None
     """ The algorithm manager object reference """
 
+    sample_timestamp = None
+    """ The timestamp of the last sampling of the event rates """
+
+    sample_lock = None
+    """ The lock that controls the sampling of the event
+    rates and the balancing of the work """
+
+    migration_counter = 0
+    """ The number of works that have been moved between
+    work tasks (rebalanced or stolen) """
+
+    load_aware = False
+    """ If the work pool uses the load aware work scheduling
+    algorithm, the only one for which the event rates are
+    sampled and the work is balanced between work tasks """
+
     def __init__(
         self,
         thread_pool,
@@ -350,6 +397,9 @@ class WorkPoolImplementation(object):
         self.maximum_number_works_thread = maximum_number_works_thread
         self.work_scheduling_algorithm = work_scheduling_algorithm
         self.logger = logger
+        self.load_aware = (
+            work_scheduling_algorithm == LOAD_AWARE_WORK_SCHEDULING_ALGORITHM
+        )
 
         # creates the thread pool to be used for in the work pool
         self.thread_pool = thread_pool.create_new_thread_pool(
@@ -362,9 +412,13 @@ class WorkPoolImplementation(object):
 
         self.work_tasks_list = []
         self.work_tasks_access_lock = threading.RLock()
+        self.sample_timestamp = time.time()
+        self.sample_lock = threading.Lock()
 
-        # sets the remove work method in the work processing task class
+        # sets the remove work and processed work methods
+        # in the work processing task class
         self.work_processing_task_class.remove_work = remove_work
+        self.work_processing_task_class.processed_work = processed_work
 
     def start_pool(self):
         """
@@ -439,6 +493,62 @@ class WorkPoolImplementation(object):
             # releases the work tasks access lock
             self.work_tasks_access_lock.release()
 
+    def migrate_work(self, work_reference, source_work_task, target_work_task):
+        """
+        Moves the work from the source work task into the target work
+        task, the work processing task must support the detaching and
+        attaching of works (otherwise the work is not moved).
+        This method is thread safe and may be called
+        from different threads.
+
+        :type work_reference: Object
+        :param work_reference: The object used as reference for the work.
+        :type source_work_task: WorkTask
+        :param source_work_task: The work task currently holding the work.
+        :type target_work_task: WorkTask
+        :param target_work_task: The work task that is going to hold the work.
+        :rtype: bool
+        :return: If the work has been moved to the target work task.
+        """
+
+        # in case the work processing task does not support the
+        # detaching of works they can't be moved between work tasks
+        if not hasattr(self.work_processing_task_class, "detach_work"):
+            return False
+
+        # acquires the work tasks access lock
+        self.work_tasks_access_lock.acquire()
+
+        try:
+            # in case the target work task does not meet
+            # the conditions for new work returns immediately
+            if not self._check_conditions(target_work_task):
+                return False
+
+            # detaches the work from the source work task, in case
+            # it's no longer there (eg: removed) returns immediately
+            detached, state, rate = source_work_task.detach_work(work_reference)
+            if not detached:
+                return False
+
+            try:
+                # attaches the work to the target work task
+                target_work_task.attach_work(work_reference, state, rate)
+            except Exception:
+                # restores the work in the source work task
+                # and re-raises the exception
+                source_work_task.attach_work(work_reference, state, rate)
+                raise
+
+            # increments the migration counter
+            self.migration_counter += 1
+        finally:
+            # releases the work tasks access lock
+            self.work_tasks_access_lock.release()
+
+        # returns valid (work moved)
+        return True
+
     def get_thread_pool(self):
         """
         Retrieves the thread pool.
@@ -500,6 +610,55 @@ class WorkPoolImplementation(object):
         # returns true (valid)
         return True
 
+    def _balance_work(self, work_task=None):
+        """
+        Samples the event rates of the work tasks (in case the sample
+        interval has passed) and balances the work between them, only
+        one thread at a time balances the work (others return).
+
+        :type work_task: WorkTask
+        :param work_task: The idle work task that is trying to
+        steal work, in case it's not defined this is a periodic
+        balance of the work pool.
+        """
+
+        # in case the work pool does not use the load aware algorithm
+        # there's no sampling of the event rates nor balancing of work
+        if not self.load_aware:
+            return
+
+        # tries to acquire the sample lock (non blocking) in case
+        # another thread is already balancing returns immediately
+        if not self.sample_lock.acquire(False):
+            return
+
+        try:
+            # in case the sample interval has passed samples the
+            # event rates of the work tasks, otherwise only the idle
+            # work tasks (stealing) are allowed to balance the work
+            current_timestamp = time.time()
+            delta = current_timestamp - self.sample_timestamp
+            if delta >= SAMPLE_INTERVAL:
+                for _work_task in self.work_tasks_list:
+                    _work_task._sample(delta)
+                self.sample_timestamp = current_timestamp
+            elif work_task == None:
+                return
+
+            # balances the work between the work tasks
+            # according to the algorithm
+            self.algorithm_manager and self.algorithm_manager.balance(work_task)
+        finally:
+            # releases the sample lock
+            self.sample_lock.release()
+
+    def _get_steal_timeout(self):
+        # in case the algorithm manager is not yet created
+        # there's no stealing of work for the idle tasks
+        if not self.algorithm_manager:
+            return None
+        return self.algorithm_manager.steal_timeout
+
     def _work_added(self, work_task, work_reference):
         self.algorithm_manager.work_added(work_task, work_reference)
 
@@ -530,6 +689,22 @@ class WorkTask(object):
     work_access_condition = None
     """ The condition to control the access to work """
 
+    work_events = {}
+    """ The map associating the work reference with the number
+    of events processed since the last sampling """
+
+    work_rates = {}
+    """ The map associating the work reference with its
+    (smoothed) rate of events per second """
+
+    event_rate = 0.0
+    """ The (smoothed) rate of events per second processed
+    by the work task (for all of its works) """
+
+    migration = None
+    """ The pending migration of work to be executed by the work
+    task, the work reference and the target work task """
+
     def __init__(self, work_pool, work_processing_task):
         """
         Constructor of the class.
@@ -545,6 +720,8 @@ class WorkTask(object):
 
         self.work_list = []
         self.work_access_condition = threading.Condition()
+        self.work_events = {}
+        self.work_rates = {}
 
     def start(self):
         """
@@ -570,8 +747,21 @@ class WorkTask(object):
                     # returns immediately
                     return
 
-                # waits for the work access condition
-                self.work_access_condition.wait()
+                # waits for the work access condition, in case the
+                # work pool allows the stealing of work by the idle
+                # work tasks the wait is limited by the steal timeout
+                steal_timeout = self.work_pool._get_steal_timeout()
+                self.work_access_condition.wait(steal_timeout)
+
+                # in case there's still no work to be done tries to
+                # steal work from the other work tasks (releasing the
+                # work access condition so that work may be attached)
+                if steal_timeout and self.work_counter < 1 and not self.stop_flag:
+                    self.work_access_condition.release()
+                    try:
+                        self.work_pool._balance_work(self)
+                    finally:
+                        self.work_access_condition.acquire()
 
             try:
                 # calls the process method in the work
@@ -581,6 +771,11 @@ class WorkTask(object):
                 # release the work access condition
                 self.work_access_condition.release()
 
+            # executes the pending migration of work (if any) and
+            # balances the work between the work tasks of the work pool
+            self._migrate_work()
+            self.work_pool._balance_work()
+
         # calls the stop method in the work
         # processing task
         self.work_processing_task.stop()
@@ -678,6 +873,82 @@ class WorkTask(object):
             # releases the work access condition
             self.work_access_condition.release()
 
+    def request_migration(self, work_reference, work_task):
+        """
+        Requests the migration of the work into the given work task,
+        the migration is executed by the current work task as soon as
+        it finishes processing (avoids blocking the requester).
+
+        :type work_reference: Object
+        :param work_reference: The object used as reference for the work.
+        :type work_task: WorkTask
+        :param work_task: The work task that is going to hold the work.
+        """
+
+        # sets the pending migration and wakes the work
+        # processing task so that it's executed promptly
+        self.migration = (work_reference, work_task)
+        self.wake()
+
+    def detach_work(self, work_reference):
+        """
+        Detaches the work from the work task, without removing (closing)
+        it, so that it may be attached to another work task.
+
+        :type work_reference: Object
+        :param work_reference: The object used as reference for the work.
+        :rtype: Tuple
+        :return: If the work has been detached, the state of the work
+        (from the work processing task) and its rate of events.
+        """
+
+        # wakes the work processing task
+        self.wake()
+
+        # acquires the work access condition
+        self.work_access_condition.acquire()
+
+        try:
+            # in case the work reference is no longer
+            # present in the work list returns invalid
+            if not work_reference in self.work_list:
+                return False, None, 0.0
+
+            # calls the inner detach work method
+            state, rate = self._detach_work(work_reference)
+        finally:
+            # releases the work access condition
+            self.work_access_condition.release()
+
+        # returns valid with the state and the rate
+        return True, state, rate
+
+    def attach_work(self, work_reference, state, rate=0.0):
+        """
+        Attaches the (previously detached) work to the work task.
+
+        :type work_reference: Object
+        :param work_reference: The object used as reference for the work.
+        :type state: Object
+        :param state: The state of the work, as returned by the work
+        processing task upon detaching.
+        :type rate: float
+        :param rate: The rate of events of the work.
+        """
+
+        # wakes the work processing task
+        self.wake()
+
+        # acquires the work access condition
+        self.work_access_condition.acquire()
+
+        try:
+            # calls the inner attach work method
+            self._attach_work(work_reference, state, rate)
+        finally:
+            # releases the work access condition
+            self.work_access_condition.release()
+
     def add_work(self, work_reference):
         # wakes the work processing task
         self.wake()
@@ -756,6 +1027,174 @@ class WorkTask(object):
         # notifies the work pool about work removed
         self.work_pool._work_removed(self, work_reference)
 
+    def _detach_work(self, work_reference):
+        """
+        Inner method to detach work from the work task.
+        This method assumes that the work access condition is locked
+        and in possession of the current executing thread.
+
+        :type work_reference: Object
+        :param work_reference: The object used as reference for the work.
+        :rtype: Tuple
+        :return: The state of the work and its rate of events.
+        """
+
+        # detaches the work from the work processing task
+        # retrieving its state (to be used in the attaching)
+        state = self.work_processing_task.detach_work(work_reference)
+
+        # removes the work reference from the work list
+        # and decrements the work counter
+        self.work_list.remove(work_reference)
+        self.work_counter -= 1
+
+        # retrieves the rate of events for the work reference
+        rate = self.work_rates.get(work_reference, 0.0)
+
+        # notifies the work pool about work removed
+        self.work_pool._work_removed(self, work_reference)
+
+        # returns the state and the rate
+        return state, rate
+
+    def _attach_work(self, work_reference, state, rate):
+        """
+        Inner method to attach work to the work task.
+        This method assumes that the work access condition is locked
+        and in possession of the current executing thread.
+
+        :type work_reference: Object
+        :param work_reference: The object used as reference for the work.
+        :type state: Object
+        :param state: The state of the work (from the detaching).
+        :type rate: float
+        :param rate: The rate of events of the work.
+        """
+
+        # attaches the work to the work processing task
+        self.work_processing_task.attach_work(work_reference, state)
+
+        # adds the work reference to the work list, increments
+        # the work counter and sets the rate of events
+        self.work_list.append(work_reference)
+        self.work_counter += 1
+        self.work_rates[work_reference] = rate
+
+        # notifies the work access condition
+        self.work_access_condition.notify()
+
+        # notifies the work pool about work added
+        self.work_pool._work_added(self, work_reference)
+
+    def _migrate_work(self):
+        """
+        Inner method to execute the pending migration of work.
+        This method assumes that the work access condition is not
+        locked by the current executing thread.
+        """
+
+        # in case there's no pending migration
+        # returns immediately
+        if not self.migration:
+            return
+
+        # unpacks the pending migration and unsets it
+        work_reference, work_task = self.migration
+        self.migration = None
+
+        try:
+            # moves the work into the target work task
+            self.work_pool.migrate_work(work_reference, self, work_task)
+        except Exception as exception:
+            # prints a warning message about the failed migration
+            # (the work remains in the current work task)
+            self.work_pool.logger and self.work_pool.logger.warning(
+                "Problem while moving work between work tasks: %s"
+                % colony.legacy.UNICODE(exception)
+            )
+
+    def _work_processed(self, work_reference, count=1):
+        """
+        Inner method to account the events processed for the work.
+        This method should be called from the thread of the work
+        task (no locking is done).
+
+        :type work_reference: Object
+        :param work_reference: The object used as reference for the work.
+        :type count: int
+        :param count: The number of events processed.
+        """
+
+        # in case the work pool does not use the load aware algorithm
+        # the events are not accounted (they would never be sampled)
+        if not self.work_pool.load_aware:
+            return
+
+        self.work_events[work_reference] = (
+            self.work_events.get(work_reference, 0) + count
+        )
+
+    def _sample(self, delta):
+        """
+        Samples the events processed by the work task since the last
+        sampling, updating the (smoothed) event rates of the work task
+        and of its works, the values are approximate as no locking
+        is done (the processing of the work is not stopped).
+
+        :type delta: float
+        :param delta: The time (in seconds) since the last sampling.
+        """
+
+        # swaps the work events map so that the new
+        # events are accounted for the next sampling
+        work_events = self.work_events
+        self.work_events = {}
+
+        # creates the new work rates map (only for the works
+        # currently in the work task) and the event counter
+        work_rates = {}
+        event_counter = 0
+
+        # iterates over the current works updating their (smoothed)
+        # rates according to the number of events since the last sampling
+        for work_reference in list(self.work_list):
+            count = work_events.get(work_reference, 0)
+            rate = self.work_rates.get(work_reference, 0.0)
+            work_rates[work_reference] = rate + (count / delta - rate) * RATE_FACTOR
+            event_counter += count
+
+        # updates the work rates map and the (smoothed) event rate
+        self.work_rates = work_rates
+        self.event_rate += (event_counter / delta - self.event_rate) * RATE_FACTOR
+
+    def _select_work(self):
+        """
+        Selects the work to be moved from the work task to another
+        one, the work with the highest rate of events is kept (it
+        can't be split) and the next one (with events) is selected.
+
+        :rtype: Object
+        :return: The selected work reference or invalid in case
+        there's no work to be moved.
+        """
+
+        # sorts the (sampled) works by their rates of events
+        # and in case there's no second one returns invalid
+        work_rates = sorted(
+            colony.legacy.items(self.work_rates), key=lambda item: item[1], reverse=True
+        )
+        if len(work_rates) < 2:
+            return None
+
+        # in case the selected work has no events
+        # there's no point in moving it
+        work_reference, rate = work_rates[1]
+        if not rate > 0.0:
+            return None
+
+        # returns the selected work reference
+        return work_reference
+
 
 def remove_work(self, work_reference):
     """
@@ -768,3 +1207,19 @@ def remove_work(self, work_reference):
 
     # calls the remove work in the work task
     self.work_task._remove_work(work_reference)
+
+
+def processed_work(self, work_reference, count=1):
+    """
+    Processed work method to be included in the work processing
+    task, used to account the events processed for the work (for
+    the event rates used in the balancing of the work).
+
+    :type work_reference: Object
+    :param work_reference: The object used as reference for the work.
+    :type count: int
+    :param count: The number of events processed.
+    """
+
+    # accounts the processed work in the work task
+    self.work_task._work_processed(work_reference, count)
@@ -0,0 +1,250 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Colony Framework
+# Copyright (c) 2008-2024 Hive Solutions Lda.
+#
+# This file is part of Hive Colony Framework.
+#
+# Hive Colony Framework is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Colony Framework is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Colony Framework. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2024 Hive Solutions Lda."
+""" The copyright for the module """
+
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import colony
+
+from . import mocks
+from . import system
+from . import algorithms
+
+
+class WorkPoolTest(colony.Test):
+    """
+    The work pool infra-structure test class, responsible
+    for the returning of the associated tests.
+    """
+
+    def get_bundle(self):
+        return (WorkTaskTestCase, WorkPoolImplementationTestCase)
+
+    def set_up(self, test_case):
+        colony.Test.set_up(self, test_case)
+
+    def tear_down(self, test_case):
+        colony.Test.tear_down(self, test_case)
+
+
+def create_work_pool(
+    work_processing_task_class=mocks.MockWorkProcessingTask,
+    number_threads=2,
+    work_scheduling_algorithm=system.LOAD_AWARE_WORK_SCHEDULING_ALGORITHM,
+):
+    work_pool = system.WorkPoolImplementation(
+        mocks.MockThreadPoolPlugin(),
+        work_processing_task_class=work_processing_task_class,
+        task_descriptor_class=mocks.MockTaskDescriptor,
+        number_threads=number_threads,
+        maximum_number_works_thread=3,
+        work_scheduling_algorithm=work_scheduling_algorithm,
+    )
+    work_pool.start_pool()
+    return work_pool
+
+
+class WorkTaskTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Work Task test case"
+
+    def test_sample(self):
+        work_pool = create_work_pool()
+        work_task = work_pool.work_tasks_list[0]
+        work_task.add_work("first")
+        work_task.add_work("second")
+
+        # accounts the events for the works (including one that
+        # is no longer in the work task) and samples them
+        processing_task = work_task.get_work_processing_task()
+        processing_task.processed_work("first", 10)
+        processing_task.processed_work("second", 2)
+        processing_task.processed_work("removed", 4)
+        work_task._sample(2.0)
+
+        # verifies that the (smoothed) rates are computed only for
+        # the current works and that the events are reset
+        self.assertEqual(work_task.work_rates, dict(first=2.5, second=0.5))
+        self.assertEqual(work_task.event_rate, 3.0)
+        self.assertEqual(work_task.work_events, {})
+
+        # samples again with no events and verifies that the
+        # rates decay according to the rate factor
+        work_task._sample(1.0)
+        self.assertEqual(work_task.work_rates, dict(first=1.25, second=0.25))
+        self.assertEqual(work_task.event_rate, 1.5)
+
+    def test_select_work(self):
+        work_pool = create_work_pool()
+        work_task = work_pool.work_tasks_list[0]
+
+        work_task.work_rates = dict(first=10.0)
+        self.assertEqual(work_task._select_work(), None)
+
+        # verifies that the work with the highest rate is kept and
+        # that the second one is selected (in case it has events)
+        work_task.work_rates = dict(first=10.0, second=5.0, third=1.0)
+        self.assertEqual(work_task._select_work(), "second")
+        work_task.work_rates = dict(first=1.0, second=10.0, third=0.0)
+        self.assertEqual(work_task._select_work(), "first")
+        work_task.work_rates = dict(first=10.0, second=0.0)
+        self.assertEqual(work_task._select_work(), None)
+
+
+class WorkPoolImplementationTestCase(colony.ColonyTestCase):
+    @staticmethod
+    def get_description():
+        return "Work Pool Implementation test case"
+
+    def test_migrate_work(self):
+        work_pool = create_work_pool()
+        source, target = work_pool.work_tasks_list
+        source.add_work("first")
+        source.add_work("second")
+        source.work_rates["first"] = 4.0
+
+        # moves the work into the target work task and verifies that
+        # its state and rate are carried and the counters updated
+        result = work_pool.migrate_work("first", source, target)
+        self.assertEqual(result, True)
+        self.assertEqual(source.work_list, ["second"])
+        self.assertEqual(source.work_counter, 1)
+        self.assertEqual(target.work_list, ["first"])
+        self.assertEqual(target.work_counter, 1)
+        self.assertEqual(target.work_rates, dict(first=4.0))
+        self.assertEqual(target.get_work_processing_task().state, "state:first")
+        self.assertEqual(target.get_work_processing_task().works, ["first"])
+        self.assertEqual(work_pool.migration_counter, 1)
+
+        # verifies that a work no longer in the source work task
+        # and a target work task that is full are not moved
+        self.assertEqual(work_pool.migrate_work("first", source, target), False)
+        target.add_work("third")
+        target.add_work("fourth")
+        self.assertEqual(work_pool.migrate_work("second", source, target), False)
+        self.assertEqual(source.work_list, ["second"])
+        self.assertEqual(work_pool.migration_counter, 1)
+
+    def test_migrate_work_unsupported(self):
+        work_pool = create_work_pool(
+            work_processing_task_class=mocks.MockSimpleWorkProcessingTask
+        )
+        source, target = work_pool.work_tasks_list
+        source.add_work("first")
+
+        self.assertEqual(work_pool.migrate_work("first", source, target), False)
+        self.assertEqual(source.work_list, ["first"])
+
+    def test_balance(self):
+        work_pool = create_work_pool()
+        source, target = work_pool.work_tasks_list
+        algorithm = work_pool.algorithm_manager
+        source.add_work("first")
+        source.add_work("second")
+        source.work_rates = dict(first=40.0, second=20.0)
+
+        # verifies that a source work task below the threshold or
+        # without a significant difference is not balanced
+        source.event_rate = algorithms.BALANCE_THRESHOLD - 1.0
+        self.assertEqual(algorithm.balance(), False)
+        source.event_rate = 60.0
+        target.event_rate = 40.0
+        self.assertEqual(algorithm.balance(), False)
+
+        # balances the work into the least loaded work task, which
+        # requests the migration of the second work to the source
+        target.event_rate = 0.0
+        self.assertEqual(algorithm.balance(), True)
+        self.assertEqual(source.migration, ("second", target))
+        source._migrate_work()
+        self.assertEqual(source.migration, None)
+        self.assertEqual(source.work_list, ["first"])
+        self.assertEqual(target.work_list, ["second"])
+
+        # verifies that the source work task with a single work
+        # is not balanced (a work can't be split)
+        source.event_rate = 60.0
+        self.assertEqual(algorithm.balance(), False)
+
+    def test_balance_steal(self):
+        work_pool = create_work_pool()
+        source, target = work_pool.work_tasks_list
+        algorithm = work_pool.algorithm_manager
+        source.add_work("first")
+        source.add_work("second")
+        source.work_rates = dict(first=40.0, second=20.0)
+        source.event_rate = 60.0
+        target.event_rate = 50.0
+
+        # verifies that the (idle) work task steals the work even
+        # though the difference in the event rates is not significant
+        self.assertEqual(algorithm.balance(), False)
+        self.assertEqual(algorithm.balance(target), True)
+        self.assertEqual(source.migration, ("second", target))
+        self.assertEqual(algorithm.balance(source), False)
+
+    def test_balance_work(self):
+        work_pool = create_work_pool()
+        source, target = work_pool.work_tasks_list
+        source.add_work("first")
+        source.add_work("second")
+
+        # accounts the events for the works and forces the sampling
+        # (sample interval elapsed) so that the work is balanced
+        processing_task = source.get_work_processing_task()
+        processing_task.processed_work("first", 40)
+        processing_task.processed_work("second", 20)
+        work_pool.sample_timestamp -= system.SAMPLE_INTERVAL
+        work_pool._balance_work()
+
+        self.assertAlmostEqual(source.work_rates["first"], 20.0, places=1)
+        self.assertAlmostEqual(source.work_rates["second"], 10.0, places=1)
+        self.assertEqual(source.migration, ("second", target))
+
+    def test_balance_work_disabled(self):
+        work_pool = create_work_pool(
+            work_scheduling_algorithm=system.ROUND_ROBIN_WORK_SCHEDULING_ALGORITHM
+        )
+        source, _target = work_pool.work_tasks_list
+        source.add_work("first")
+        source.add_work("second")
+
+        # verifies that for the other algorithms the events are not
+        # accounted and that there's no sampling nor balancing
+        processing_task = source.get_work_processing_task()
+        processing_task.processed_work("first", 40)
+        processing_task.processed_work("second", 20)
+        self.assertEqual(source.work_events, {})
+
+        sample_timestamp = work_pool.sample_timestamp - system.SAMPLE_INTERVAL
+        work_pool.sample_timestamp = sample_timestamp
+        work_pool._balance_work()
+        self.assertEqual(work_pool.sample_timestamp, sample_timestamp)
+        self.assertEqual(source.work_rates, {})
+        self.assertEqual(source.migration, None)
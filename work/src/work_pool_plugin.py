@@ -46,7 +46,7 @@ class WorkPoolPlugin(colony.Plugin):
         colony.JYTHON_ENVIRONMENT,
         colony.IRON_PYTHON_ENVIRONMENT,
     ]
-    capabilities = ["work_pool", "system_information"]
+    capabilities = ["work_pool", "system_information", "test"]
     dependencies = [colony.PluginDependency("pt.hive.colony.plugins.threads.pool")]
     main_modules = ["work_pool"]
 
@@ -55,6 +55,7 @@ class WorkPoolPlugin(colony.Plugin):
         import work_pool
 
         self.system = work_pool.WorkPool(self)
+        self.test = work_pool.WorkPoolTest(self)
 
     def unload_plugin(self):
         colony.Plugin.unload_plugin(self)